@@ -0,0 +1,139 @@
+"""
+Benchmark of the evaluation of Metagame and Budget decks in a pool of worker processes (see the -p/--processes flag of
+mtggoldfish.py), against randomly generated decks so that it doesn't need MTGGoldfish.com or a deck cache.
+
+Besides the wall time of the evaluations for each number of processes, this measures the CPU time of the main process,
+which hands the decks out to the workers and merges their report entries into the reports no matter how many workers
+there are. Evaluating the decks can't get faster than that work allows, so the ratio of the single process evaluation
+time to it is the most that any number of processes can speed the evaluation up, even on a machine with fewer cores.
+
+Run from the root of the repository:
+    python benchmarks/benchmark_parallel_evaluation.py -n 6000 -p 1,2,4,8,16
+"""
+import os
+import random
+import sys
+import time
+from optparse import OptionParser
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mtggoldfish
+
+
+"""
+Return a Deck of randomly chosen cards
+
+:param random_generator: The random.Random to choose the cards with
+:param deck_name: The name of the deck
+:param card_names: The card names to choose from
+:param num_cards: The number of distinct cards in the deck
+"""
+def generate_deck(random_generator, deck_name, card_names, num_cards):
+    deck = mtggoldfish.Deck()
+    deck.deck_name = deck_name
+    deck.set_card_entries([(card_name, random_generator.randint(1, 4), round(random_generator.uniform(0.1, 60), 2),
+                            round(random_generator.uniform(0.01, 20), 2))
+                           for card_name in random_generator.sample(card_names, num_cards)])
+    deck.recompute_deck_prices()
+    return deck
+
+
+"""
+Return the number of seconds it takes to evaluate the given decks in a single process
+
+:param category: METAGAME_DECKS_CATEGORY or BUDGET_DECKS_CATEGORY
+:param decks: The list of Deck objects to evaluate
+:param owned_card_index: The OwnedCardIndex of the Owned Cards
+:param desired_decks: The list of desired Deck objects
+"""
+def time_single_process_evaluation(category, decks, owned_card_index, desired_decks):
+    start_time = time.time()
+    if category == mtggoldfish.METAGAME_DECKS_CATEGORY:
+        evaluator = mtggoldfish.StreamingMetagameEvaluator(owned_card_index)
+    else:
+        evaluator = mtggoldfish.StreamingBudgetEvaluator(owned_card_index, desired_decks)
+    for (deck_index, deck) in enumerate(decks):
+        evaluator.add_deck(deck_index, deck)
+    if category == mtggoldfish.METAGAME_DECKS_CATEGORY:
+        evaluator.get_ranking()
+    else:
+        evaluator.get_report()
+    return time.time() - start_time
+
+
+"""
+Return the number of seconds it takes to evaluate the given decks with a pool of the given number of worker
+processes, not counting the time it takes to start the workers, along with the CPU time that the main process spent on
+it (packing the decks, pickling them, and unpickling and merging the report entries, across all of its threads)
+
+:param category: METAGAME_DECKS_CATEGORY or BUDGET_DECKS_CATEGORY
+:param decks: The list of Deck objects to evaluate
+:param owned_card_index: The OwnedCardIndex of the Owned Cards
+:param desired_decks: The list of desired Deck objects
+:param num_processes: The number of worker processes
+"""
+def time_pool_evaluation(category, decks, owned_card_index, desired_decks, num_processes):
+    evaluation_pool = mtggoldfish.DeckEvaluationPool(num_processes, owned_card_index, mtggoldfish.DesiredCardIndex(desired_decks))
+
+    # Every worker is started (and has been set up) before the timing starts
+    for startup_batch in [evaluation_pool.executor.submit(time.sleep, 0.5) for worker in range(num_processes)]:
+        startup_batch.result()
+
+    if category == mtggoldfish.METAGAME_DECKS_CATEGORY:
+        evaluator = mtggoldfish.StreamingMetagameEvaluator(owned_card_index, evaluation_pool=evaluation_pool)
+    else:
+        evaluator = mtggoldfish.StreamingBudgetEvaluator(owned_card_index, desired_decks, evaluation_pool=evaluation_pool)
+    start_time = time.time()
+    start_cpu_time = time.process_time()
+    for (deck_index, deck) in enumerate(decks):
+        evaluator.add_deck(deck_index, deck)
+    evaluator.finish()
+    if category == mtggoldfish.METAGAME_DECKS_CATEGORY:
+        evaluator.get_ranking()
+    else:
+        evaluator.get_report()
+    elapsed_time = time.time() - start_time
+    main_process_cpu_time = time.process_time() - start_cpu_time
+    evaluation_pool.close()
+    return (elapsed_time, main_process_cpu_time)
+
+
+if __name__ == "__main__":
+    parser = OptionParser()
+    parser.add_option("-n", "--decks",
+        dest="num_decks",
+        type="int",
+        default=6000,
+        help="The number of Metagame/Budget decks to evaluate [default: %default]")
+    parser.add_option("-c", "--cards",
+        dest="num_cards_per_deck",
+        type="int",
+        default=40,
+        help="The number of distinct cards in each deck [default: %default]")
+    parser.add_option("-p", "--processes",
+        dest="process_counts",
+        default="1,2,4,8,16",
+        help="The comma separated numbers of worker processes to time the evaluations with [default: %default]")
+    (options, args) = parser.parse_args()
+
+    random_generator = random.Random(0)
+    card_names = ["Card %d" % (card_number) for card_number in range(4000)]
+    owned_cards = [{mtggoldfish.CARD_QTY_KEY: random_generator.randint(1, 4), mtggoldfish.CARD_NAME_KEY: card_name}
+                   for card_name in random_generator.sample(card_names, 400)]
+    desired_decks = [generate_deck(random_generator, "Desired Deck %d" % (deck_number), card_names, options.num_cards_per_deck)
+                     for deck_number in range(5)]
+    decks = [generate_deck(random_generator, "Deck %d" % (deck_number), card_names, options.num_cards_per_deck)
+             for deck_number in range(options.num_decks)]
+    owned_card_index = mtggoldfish.OwnedCardIndex(owned_cards)
+    process_counts = [int(num_processes) for num_processes in options.process_counts.split(",")]
+    print("%d decks of %d cards, %s CPU cores" % (options.num_decks, options.num_cards_per_deck, os.cpu_count()))
+
+    for category in [mtggoldfish.METAGAME_DECKS_CATEGORY, mtggoldfish.BUDGET_DECKS_CATEGORY]:
+        single_process_seconds = time_single_process_evaluation(category, decks, owned_card_index, desired_decks)
+        print("\n%s decks:" % (category))
+        print("   Single process: %.3fs" % (single_process_seconds))
+        for num_processes in process_counts:
+            (pool_seconds, main_process_cpu_seconds) = time_pool_evaluation(category, decks, owned_card_index, desired_decks, num_processes)
+            print("   %2d processes: %.3fs (%.2fx), main process CPU time %.3fs (%.1f us per deck, at most a %.1fx speedup)" % (
+                num_processes, pool_seconds, single_process_seconds / pool_seconds, main_process_cpu_seconds,
+                main_process_cpu_seconds * 1e6 / options.num_decks, single_process_seconds / main_process_cpu_seconds))
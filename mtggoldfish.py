@@ -3,20 +3,44 @@
 View README.md for usage: https://github.com/Mcaruano/MTGGoldfishScraper/blob/master/README.md
 """
 
-from __future__ import print_function
-import six
-from six.moves import cPickle as pickle
-from datetime import datetime
+from array import array
+import asyncio
+import bisect
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 import errno
+import heapq
+from html.parser import HTMLParser
+import math
+import mmap
+import multiprocessing
 from optparse import OptionParser
 import os
+import pickle
 from progress.bar import IncrementalBar
+import queue
+import random
 import re
+import sqlite3
+import struct
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
 import sys
+import tempfile
+import threading
 import time
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
+from urllib.request import Request, urlopen
+
+# NumPy is optional, as it's only needed by the "numpy" evaluation backend (see the -E/--evaluator flag)
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 __author__ = "Matthew Caruano"
 __date__ = "10/5/2017"
@@ -31,6 +55,8 @@ PRICE_INDEX = 3
 CARD_QTY_KEY = 'Card Quantity'
 CARD_NAME_KEY = 'Card Name'
 CARD_PRICE_KEY = 'Individual Card Price'
+CARD_PAPER_PRICE_KEY = 'Individual Card Paper Price'
+CARD_ONLINE_PRICE_KEY = 'Individual Card Online Price'
 
 # Final Owned Cards Report dict keys
 CARD_LIST_KEY = 'Card List'
@@ -43,22 +69,430 @@ DECK_PRICE_KEY = 'Deck Price'
 SHARED_CARDS_KEY = 'Shared Cards'
 SHARED_VALUE_KEY = 'Shared Value'
 
+# Extracted deck page dict keys
+PAGE_DECK_NAME_KEY = 'deck_name'
+PAGE_DECK_DATE_KEY = 'deck_date'
+PAGE_PAPER_ROWS_KEY = 'paper_rows'
+PAGE_ONLINE_ROWS_KEY = 'online_rows'
+
+# Page parsing engines
+PARSE_ENGINE_HTML = 'html'
+PARSE_ENGINE_SELENIUM = 'selenium'
+
+# Evaluation backends
+EVALUATION_BACKEND_PYTHON = 'python'
+EVALUATION_BACKEND_NUMPY = 'numpy'
+
+# The maximum number of decks that the NumPy evaluation backend scores at once
+VECTORIZED_EVALUATION_BATCH_SIZE = 256
+
+# The number of decks sent to an evaluation worker process at once (see DeckEvaluationPool)
+PARALLEL_EVALUATION_BATCH_SIZE = 128
+
+# Used for the plain HTTP requests made by the HTML parsing engine, as MTGGoldfish.com doesn't serve the default urllib client
+HTTP_USER_AGENT = 'Mozilla/5.0 (X11; Linux x86_64; rv:115.0) Gecko/20100101 Firefox/115.0'
+HTTP_TIMEOUT_SECONDS = 30
+
+# Elements which never have any children or end tag, so they shouldn't be left open while building the HTML element tree
+VOID_HTML_ELEMENTS = ['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'param', 'source', 'track', 'wbr']
+
+# Firefox preferences for the browser sessions used to load pages. All we read from a page is a couple of headers and the
+# deck tables (or the deck tiles of a landing page), so images, web fonts, media and known ad/tracking scripts are never loaded
+BROWSER_FETCH_PREFERENCES = {
+    'permissions.default.image': 2,
+    'gfx.downloadable_fonts.enabled': False,
+    'browser.display.use_document_fonts': 0,
+    'media.autoplay.default': 5,
+    'privacy.trackingprotection.enabled': True,
+    'privacy.trackingprotection.socialtracking.enabled': True,
+    'privacy.trackingprotection.cryptomining.enabled': True,
+    'privacy.trackingprotection.fingerprinting.enabled': True,
+}
+
+# Hand the page back as soon as the DOM is ready, rather than after every stylesheet and subresource has loaded. We then wait
+# explicitly for the element we actually need to read
+BROWSER_PAGE_LOAD_STRATEGY = 'eager'
+DECK_PAGE_READY_CLASS_NAME = 'deck-table-container'
+LANDING_PAGE_READY_CLASS_NAME = 'archetype-tile'
+
+# Put on the queue of fetched decks once every fetch has finished
+FETCHES_FINISHED = None
+
+# Cached decks older than this are reported as old, and should be updated
+OLD_CACHED_DECK_AGE_DAYS = 30
+
+# The cached decks are saved in batches of this many decks, each in a single transaction
+CACHE_SAVE_BATCH_SIZE = 25
+
+# Cached decks are loaded in batches of this many decks, each with a single query
+CACHE_LOAD_BATCH_SIZE = 500
+
+# When the deck cache is over its size limit, the least recently used decks are evicted in batches of this many decks
+CACHE_EVICTION_BATCH_SIZE = 25
+
+# The tables holding the cached decks and their revisions, which are what the size limit of the deck cache applies to.
+# Card prices and their history are kept no matter how many decks are evicted, so they don't count towards the limit
+CACHED_DECK_TABLES = ['decks', 'deck_entries', 'deck_revisions', 'deck_revision_entries']
+
+# The rough number of bytes each row takes up on top of its values, used to estimate the size of the cached decks when
+# SQLite wasn't built with the dbstat table
+ESTIMATED_SQLITE_ROW_OVERHEAD_BYTES = 12
+
+# A deck's revision history stores a full copy of the deck (a checkpoint) at least once every this many revisions, so
+# rebuilding any revision never has to replay more than this many sets of changes
+DECK_REVISION_CHECKPOINT_INTERVAL = 10
+
+# How long a write to the deck cache waits for another process sharing it to finish its own write
+SQLITE_BUSY_TIMEOUT_SECONDS = 60
+
+# Stay below the smallest limit on the number of parameters in a single SQLite query
+SQLITE_MAX_QUERY_PARAMETERS = 900
+
+DECK_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    deck_id TEXT PRIMARY KEY,
+    deck_name TEXT,
+    deck_url TEXT,
+    deck_date TEXT,
+    deck_paper_price REAL,
+    deck_online_price REAL,
+    cached_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cards (
+    card_id INTEGER PRIMARY KEY,
+    card_name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS deck_entries (
+    deck_id TEXT NOT NULL REFERENCES decks (deck_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    card_id INTEGER NOT NULL REFERENCES cards (card_id),
+    quantity INTEGER NOT NULL,
+    paper_price REAL,
+    online_price REAL,
+    PRIMARY KEY (deck_id, position)
+);
+CREATE INDEX IF NOT EXISTS deck_entries_by_card ON deck_entries (card_id);
+CREATE TABLE IF NOT EXISTS price_history (
+    card_id INTEGER NOT NULL REFERENCES cards (card_id),
+    price_date TEXT NOT NULL,
+    paper_price REAL,
+    online_price REAL,
+    PRIMARY KEY (card_id, price_date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS card_prices (
+    card_id INTEGER PRIMARY KEY REFERENCES cards (card_id),
+    paper_price REAL,
+    online_price REAL,
+    price_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deck_usage (
+    deck_id TEXT PRIMARY KEY,
+    times_used INTEGER NOT NULL,
+    last_used_date TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deck_revisions (
+    deck_id TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    cached_date TEXT NOT NULL,
+    is_checkpoint INTEGER NOT NULL,
+    num_cards INTEGER NOT NULL,
+    deck_name TEXT,
+    deck_url TEXT,
+    deck_date TEXT,
+    deck_paper_price REAL,
+    deck_online_price REAL,
+    PRIMARY KEY (deck_id, revision)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS deck_revision_entries (
+    deck_id TEXT NOT NULL,
+    revision INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    card_id INTEGER NOT NULL REFERENCES cards (card_id),
+    quantity INTEGER NOT NULL,
+    paper_price REAL,
+    online_price REAL,
+    PRIMARY KEY (deck_id, revision, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS scored_owned_cards (
+    position INTEGER PRIMARY KEY,
+    card_name TEXT NOT NULL,
+    quantity INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metagame_deck_scores (
+    deck_id TEXT NOT NULL,
+    uses_online_price INTEGER NOT NULL,
+    deck_score BLOB NOT NULL,
+    PRIMARY KEY (deck_id, uses_online_price)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS deck_score_versions (
+    deck_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS drop_score_of_new_deck_version AFTER INSERT ON deck_score_versions BEGIN
+    DELETE FROM metagame_deck_scores WHERE deck_id = NEW.deck_id;
+END;
+CREATE TRIGGER IF NOT EXISTS drop_score_of_updated_deck_version AFTER UPDATE ON deck_score_versions BEGIN
+    DELETE FROM metagame_deck_scores WHERE deck_id = NEW.deck_id;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_score_of_inserted_deck AFTER INSERT ON decks BEGIN
+    INSERT INTO deck_score_versions (deck_id, version) VALUES (NEW.deck_id, 1)
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_score_of_updated_deck AFTER UPDATE ON decks
+WHEN OLD.deck_name IS NOT NEW.deck_name OR OLD.deck_url IS NOT NEW.deck_url OR OLD.deck_date IS NOT NEW.deck_date
+    OR OLD.deck_paper_price IS NOT NEW.deck_paper_price OR OLD.deck_online_price IS NOT NEW.deck_online_price
+    OR (OLD.cached_date IS NOT NEW.cached_date AND EXISTS (
+        SELECT 1 FROM deck_entries JOIN card_prices ON card_prices.card_id = deck_entries.card_id
+        WHERE deck_entries.deck_id = NEW.deck_id AND card_prices.price_date > MIN(OLD.cached_date, NEW.cached_date)
+            AND card_prices.price_date <= MAX(OLD.cached_date, NEW.cached_date)
+            AND (card_prices.paper_price IS NOT deck_entries.paper_price
+                 OR (card_prices.online_price IS NOT NULL AND card_prices.online_price IS NOT deck_entries.online_price)))) BEGIN
+    INSERT INTO deck_score_versions (deck_id, version) VALUES (NEW.deck_id, 1)
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_score_of_deleted_deck AFTER DELETE ON decks BEGIN
+    INSERT INTO deck_score_versions (deck_id, version) VALUES (OLD.deck_id, 1)
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_score_of_deck_with_inserted_card AFTER INSERT ON deck_entries BEGIN
+    INSERT INTO deck_score_versions (deck_id, version) VALUES (NEW.deck_id, 1)
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_score_of_deck_with_updated_card AFTER UPDATE ON deck_entries BEGIN
+    INSERT INTO deck_score_versions (deck_id, version) VALUES (NEW.deck_id, 1)
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_score_of_deck_with_deleted_card AFTER DELETE ON deck_entries
+WHEN EXISTS (SELECT 1 FROM decks WHERE deck_id = OLD.deck_id) BEGIN
+    INSERT INTO deck_score_versions (deck_id, version) VALUES (OLD.deck_id, 1)
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_scores_of_priced_card AFTER INSERT ON card_prices BEGIN
+    INSERT INTO deck_score_versions (deck_id, version)
+    SELECT DISTINCT deck_entries.deck_id, 1 FROM deck_entries JOIN decks ON decks.deck_id = deck_entries.deck_id
+    WHERE deck_entries.card_id = NEW.card_id AND decks.cached_date < NEW.price_date
+        AND (NEW.paper_price IS NOT deck_entries.paper_price
+             OR (NEW.online_price IS NOT NULL AND NEW.online_price IS NOT deck_entries.online_price))
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS invalidate_scores_of_repriced_card AFTER UPDATE ON card_prices
+WHEN OLD.paper_price IS NOT NEW.paper_price OR OLD.online_price IS NOT NEW.online_price OR OLD.price_date IS NOT NEW.price_date BEGIN
+    INSERT INTO deck_score_versions (deck_id, version)
+    SELECT DISTINCT deck_entries.deck_id, 1 FROM deck_entries JOIN decks ON decks.deck_id = deck_entries.deck_id
+    WHERE deck_entries.card_id = NEW.card_id AND decks.cached_date < MAX(OLD.price_date, NEW.price_date)
+        AND ((OLD.paper_price IS NOT NEW.paper_price OR OLD.online_price IS NOT NEW.online_price)
+             OR (decks.cached_date >= MIN(OLD.price_date, NEW.price_date)
+                 AND (NEW.paper_price IS NOT deck_entries.paper_price
+                      OR (NEW.online_price IS NOT NULL AND NEW.online_price IS NOT deck_entries.online_price))))
+    ON CONFLICT (deck_id) DO UPDATE SET version = version + 1;
+END;
+"""
+
+# Fills in the card_prices table from the decks cached before it existed, using each card's price in the most recently
+# cached deck containing it
+CARD_PRICES_BACKFILL_QUERY = (
+    "INSERT OR IGNORE INTO card_prices (card_id, paper_price, online_price, price_date)"
+    " SELECT deck_entries.card_id, deck_entries.paper_price, CASE WHEN decks.deck_online_price IS NULL THEN NULL ELSE deck_entries.online_price END,"
+    " decks.cached_date FROM deck_entries JOIN decks ON decks.deck_id = deck_entries.deck_id"
+    " WHERE decks.deck_paper_price IS NOT NULL ORDER BY decks.cached_date DESC")
+
+# Pairs up the latest price of every card with its price as of a given date (the only query parameter), see DeckStore
+PRICE_CHANGES_QUERY = (
+    "SELECT cards.card_name, old_prices.paper_price, old_prices.online_price, new_prices.paper_price, new_prices.online_price"
+    " FROM cards"
+    " JOIN price_history AS old_prices ON old_prices.card_id = cards.card_id AND old_prices.price_date ="
+    " (SELECT MAX(price_date) FROM price_history WHERE card_id = cards.card_id AND price_date <= ?1)"
+    " JOIN price_history AS new_prices ON new_prices.card_id = cards.card_id AND new_prices.price_date ="
+    " (SELECT MAX(price_date) FROM price_history WHERE card_id = cards.card_id)")
+
+# The number of cards listed in the price movers report
+PRICE_MOVERS_REPORT_SIZE = 15
+
+# The local deck cache, opened the first time it's needed (see get_deck_store())
+deck_store = None
+
+# A read-only archive of cached decks, used alongside the deck cache when one is given with --archive (see DeckArchive)
+deck_archive = None
+
+# The directory holding the deck URL lists cached for each category landing page (see get_landing_page_cache_file_path())
+landing_page_cache_dir = os.path.join(os.path.dirname(__file__), 'landing_page_cache')
+
+# The (OwnedCardIndex, DesiredCardIndex, VectorizedDeckScorer) that an evaluation worker process evaluates its batches
+# of decks against, set up once when the worker starts (see DeckEvaluationPool)
+evaluation_worker_indexes = None
+
+# The card names file of the DeckEvaluationPool an evaluation worker process belongs to, opened once when the worker starts
+evaluation_worker_card_names_file = None
+
+# The layout of a deck archive, see DeckArchive. Every number is stored little-endian
+DECK_ARCHIVE_MAGIC = b'MTGDECKA'
+DECK_ARCHIVE_FORMAT_VERSION = 1
+DECK_ARCHIVE_HEADER_FORMAT = '<8sIIIQQ'
+DECK_ARCHIVE_DECK_HEADER_FORMAT = '<BIBIIIddI'
+DECK_ARCHIVE_INDEX_ENTRY_FORMAT = '<IQ'
+
+# How a deck's name or URL is stored in a deck archive, as they may be text, bytes or missing
+ARCHIVED_TEXT_TYPE_STR = 0
+ARCHIVED_TEXT_TYPE_BYTES = 1
+ARCHIVED_TEXT_TYPE_NONE = 2
+
+# Categories of decks which are fetched during a run, see DeckFetchPlan
+DESIRED_DECKS_CATEGORY = 'Desired'
+METAGAME_DECKS_CATEGORY = 'Metagame'
+BUDGET_DECKS_CATEGORY = 'Budget'
+
+# Everything we need from a deck page, pulled out of the browser in a single round-trip rather than one WebDriver call per
+# element/cell. The rows of both the paper and the online deck tables are returned as lists of the textContent of each of
+# their <td> cells, exactly as the individual get_attribute('textContent') calls would have returned them. If the page
+# doesn't have separate price tabs, the first deck table is used for the paper prices and there are no online rows
+DECK_PAGE_EXTRACTION_SCRIPT = """
+function extractRows(tableContainer) {
+    if (!tableContainer) {
+        return null;
+    }
+    var tableBody = tableContainer.getElementsByTagName('tbody')[0];
+    var rows = [];
+    var rowElements = tableBody.getElementsByTagName('tr');
+    for (var i = 0; i < rowElements.length; i++) {
+        var cells = [];
+        var cellElements = rowElements[i].getElementsByTagName('td');
+        for (var j = 0; j < cellElements.length; j++) {
+            cells.push(cellElements[j].textContent);
+        }
+        rows.push(cells);
+    }
+    return rows;
+}
+return {
+    'deck_name': document.getElementsByClassName('title')[0].textContent,
+    'deck_date': document.getElementsByClassName('deck-container-information')[0].textContent,
+    'paper_rows': extractRows(document.querySelector('#tab-paper .deck-table-container') || document.getElementsByClassName('deck-table-container')[0]),
+    'online_rows': extractRows(document.querySelector('#tab-online .deck-table-container'))
+};
+"""
+
+"""
+Interns card names, handing out a small integer ID for each distinct card name so that a name is only stored once no
+matter how many decks contain the card. The IDs are only valid for the current run, which is why decks are pickled
+with their card names rather than their card IDs
+"""
+class CardNameTable(object):
+    def __init__(self):
+        self.card_names = []
+        self.card_ids_by_name = {}
+        self.lock = threading.Lock()
+
+    def get_card_id(self, card_name):
+        card_id = self.card_ids_by_name.get(card_name)
+        if card_id is None:
+            with self.lock:
+                card_id = self.card_ids_by_name.get(card_name)
+                if card_id is None:
+                    card_id = len(self.card_names)
+                    self.card_names.append(card_name)
+                    self.card_ids_by_name[card_name] = card_id
+        return card_id
+
+    def get_card_name(self, card_id):
+        return self.card_names[card_id]
+
+
+# The interned card names shared by every Deck
+card_name_table = CardNameTable()
+
+
 """
-Deck class to contain all of the information pertaining to a single deck
+Deck class to contain all of the information pertaining to a single deck. Both the paper and the online (tix) prices
+are kept for every card, while deck_price and the CARD_PRICE_KEY of each card entry hold whichever of the two
+is being used for this run (see use_price_type())
+
+The cards are stored compactly: the interned ID of each card's name (see CardNameTable) along with its quantity and its
+paper and online prices are kept in parallel arrays. deck_list is still available as a list of card entry dicts using
+CARD_QTY_KEY, CARD_NAME_KEY, CARD_PRICE_KEY, CARD_PAPER_PRICE_KEY and CARD_ONLINE_PRICE_KEY, but it is built fresh on
+every access, so changing those dicts doesn't change the deck. Assign a whole new list to deck_list to do that instead
 """
 class Deck(object):
+    __slots__ = ['deck_name', 'deck_url', 'deck_date', 'deck_price', 'deck_paper_price', 'deck_online_price',
+                 'card_ids', 'card_quantities', 'card_paper_prices', 'card_online_prices', 'uses_online_price', 'deck_size']
+
     def __init__(self):
         self.deck_name = ""
         self.deck_url = ""
         self.deck_date = datetime(1970, 1, 1)
         self.deck_price = 0.0
-        self.deck_list = []
+        self.deck_paper_price = 0.0
+        self.deck_online_price = 0.0
+        self.uses_online_price = False
+        self.set_card_entries([])
+
+    """
+    Replace the cards of this deck
+
+    :param card_entries: A list of (card_name, card_quantity, paper_price, online_price) tuples, where either price may be
+                         None for decks cached before both price types were recorded
+    """
+    def set_card_entries(self, card_entries):
+        self.card_ids = array('i')
+        self.card_quantities = array('i')
+        self.card_paper_prices = array('d')
+        self.card_online_prices = array('d')
+        for (card_name, card_quantity, paper_price, online_price) in card_entries:
+            self.card_ids.append(card_name_table.get_card_id(card_name))
+            self.card_quantities.append(card_quantity)
+            self.card_paper_prices.append(paper_price or 0.0)
+            self.card_online_prices.append(online_price or 0.0)
+        self.deck_size = sum(self.card_quantities)
+
+    """
+    Return a list of (card_name, card_quantity, paper_price, online_price) tuples, one for each card in this deck
+    """
+    def get_card_entries(self):
+        return [(card_name_table.get_card_name(card_id), card_quantity, paper_price, online_price) for (card_id, card_quantity, paper_price, online_price) in zip(
+            self.card_ids, self.card_quantities, self.card_paper_prices, self.card_online_prices)]
+
+    @property
+    def deck_list(self):
+        if self.uses_online_price:
+            card_prices = self.card_online_prices
+        else:
+            card_prices = self.card_paper_prices
+        return [{CARD_QTY_KEY: card_quantity, CARD_NAME_KEY: card_name_table.get_card_name(card_id), CARD_PRICE_KEY: card_price,
+                 CARD_PAPER_PRICE_KEY: paper_price, CARD_ONLINE_PRICE_KEY: online_price}
+                for (card_id, card_quantity, card_price, paper_price, online_price) in zip(
+                    self.card_ids, self.card_quantities, card_prices, self.card_paper_prices, self.card_online_prices)]
+
+    @deck_list.setter
+    def deck_list(self, deck_list):
+        self.set_card_entries([(card_entry[CARD_NAME_KEY], card_entry[CARD_QTY_KEY], card_entry.get(CARD_PAPER_PRICE_KEY),
+                                card_entry.get(CARD_ONLINE_PRICE_KEY)) for card_entry in deck_list])
+
+    """
+    Decks are pickled with their card names, as the interned card IDs don't mean anything outside of the current run
+    """
+    def __getstate__(self):
+        return {'deck_name': self.deck_name, 'deck_url': self.deck_url, 'deck_date': self.deck_date, 'deck_price': self.deck_price,
+                'deck_paper_price': self.deck_paper_price, 'deck_online_price': self.deck_online_price,
+                'uses_online_price': self.uses_online_price, 'card_entries': self.get_card_entries()}
+
+    """
+    Besides the state written by __getstate__(), this also accepts the __dict__ of decks pickled before the cards were
+    stored compactly. Decks cached before both price types were recorded have neither of them
+    """
+    def __setstate__(self, state):
+        self.deck_name = state['deck_name']
+        self.deck_url = state['deck_url']
+        self.deck_date = state['deck_date']
+        self.deck_price = state['deck_price']
+        self.deck_paper_price = state.get('deck_paper_price')
+        self.deck_online_price = state.get('deck_online_price')
+        self.uses_online_price = state.get('uses_online_price', False)
+        if 'card_entries' in state:
+            self.set_card_entries(state['card_entries'])
+        else:
+            self.deck_list = state['deck_list']
 
     def get_deck_name(self):
-        if six.PY2:
-            return self.deck_name.encode('ascii')
-        else:
-            return self.deck_name
+        return self.deck_name
 
     def get_deck_url(self):
         return self.deck_url
@@ -72,11 +506,41 @@ class Deck(object):
     def get_deck_list(self):
         return self.deck_list
 
+    """
+    Whether this deck has prices of the given type. Decks cached before both price types were recorded have neither
+    (as there's no telling which of the two their deck_price is), and a deck whose page had no online prices only has paper prices
+
+    :param use_online_price: True to check for online (tix) prices, False to check for paper prices
+    """
+    def has_price_type(self, use_online_price):
+        if use_online_price:
+            return self.deck_online_price is not None
+        return self.deck_paper_price is not None
+
+    """
+    Point deck_price and the CARD_PRICE_KEY of every card entry at either the paper or the online prices
+
+    :param use_online_price: True to use the online (tix) prices, False to use the paper prices
+    """
+    def use_price_type(self, use_online_price):
+        if use_online_price:
+            self.deck_price = self.deck_online_price
+        else:
+            self.deck_price = self.deck_paper_price
+        self.uses_online_price = use_online_price
+
     def get_deck_size(self):
-        total_cards = 0
-        for card_entry in self.deck_list:
-            total_cards += card_entry[CARD_QTY_KEY]
-        return total_cards
+        return self.deck_size
+
+    """
+    Recompute the paper and online total prices of this deck from the prices of its cards, after those have been updated.
+    A deck without online prices keeps not having them
+    """
+    def recompute_deck_prices(self):
+        self.deck_paper_price = sum([card_quantity * card_price for (card_quantity, card_price) in zip(self.card_quantities, self.card_paper_prices)])
+        if self.deck_online_price is not None:
+            self.deck_online_price = sum([card_quantity * card_price for (card_quantity, card_price) in zip(self.card_quantities, self.card_online_prices)])
+        self.use_price_type(self.uses_online_price)
 
     def __str__(self):
         print_output = "Deck Name: %s\nDeck URL: %s\nDeck Date: %s\nDeck Price: %.2f\nDeck List:\n{\n" % (
@@ -89,349 +553,3738 @@ class Deck(object):
 
 
 """
-Checks all local cache dirs for the presence of this deck using the MTGGoldfish DeckID, as
+The local deck cache: an SQLite database (deck_cache.db) holding every deck fetched from MTGGoldfish.com, along with
+the date it was cached on. Card names are stored once in the cards table, and each deck's list is stored as rows of
+deck_entries pointing at them. Any number of decks can be loaded or saved with a handful of queries in a single
+transaction, and the cached dates can be looked up without loading the decks themselves.
+
+Decklists and prices are cached separately. Besides the prices stored with each deck, the card_prices table holds the
+latest price seen for every card, along with the date it was seen on. When a deck is loaded, any of its cards that have
+been priced more recently than the deck was cached (because another deck containing them was fetched since) take the
+newer price, and the deck's total prices are recomputed from them. So refreshing the price of a card once refreshes it
+in every deck containing it (see DeckFetchPlan.refresh_stale_prices()).
+
+While a deck in the cache is replaced whenever it is fetched again, the price_history table keeps every price that has
+been seen for each card. A card only gets a new row (for the date the deck was cached on) when its paper or online
+price differs from the last one recorded, so the price of a card on any date is the latest row up to that date. The
+price queries run entirely in SQLite, so years of history never need to be loaded into memory.
+
+Decklists get a history of their own as well. Every time a deck is saved with a different list or different prices than
+its cached version, a new revision is added to deck_revisions. Most revisions only store the cards that differ from the
+previous revision (by their position in the deck), with a full copy of the deck stored as a checkpoint every so often
+(see DECK_REVISION_CHECKPOINT_INTERVAL). Any revision can be rebuilt from the checkpoint before it, and deck_entries is
+only rewritten where the deck actually changed.
+
+The score of every Metagame deck is kept as well, along with the Owned Cards (scored_owned_cards) the scores were
+computed from, so that the Metagame decks don't need to be loaded and evaluated again on every run. When owned_cards.txt
+changes, only the scores of the decks containing the added, removed or requantified cards are dropped, which are found
+through the deck_entries_by_card index. Triggers count up the version of a deck in deck_score_versions, dropping its
+score, whenever its header or cards change, it is removed, or one of its cards is repriced in a way that changes the
+prices it's loaded with. Saving a deck that didn't change (only its cached_date moves) leaves its score alone, unless
+that changes which of its cards get their latest price. A score is only saved if the version of its deck is still the
+one the deck was evaluated at, so that scores computed while the deck was changing are never saved, without throwing
+away the scores of any other deck.
+
+:param db_file_path: The path of the SQLite database file, which is created if it doesn't exist yet
+"""
+class DeckStore(object):
+    def __init__(self, db_file_path):
+        self.db_file_path = db_file_path
+        self.connection = sqlite3.connect(db_file_path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+
+        # Several runs (or cache warmers) may share the same cache. With write-ahead logging, readers keep seeing a
+        # consistent snapshot while another process writes, and writers wait their turn instead of failing
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.lock = threading.Lock()
+
+        # Maps each card name to its card_id, loaded the first time a deck is saved
+        self.card_ids = None
+
+        # The deck score version of every deck saved through this DeckStore, as of the end of the transaction saving it
+        self.saved_deck_score_versions = {}
+
+        with self.connection:
+            self.connection.executescript(DECK_STORE_SCHEMA)
+            if self.connection.execute("SELECT COUNT(*) FROM card_prices").fetchone()[0] == 0:
+                self.connection.execute(CARD_PRICES_BACKFILL_QUERY)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    """
+    Return a dict of the date each of the given decks was cached on, leaving out any of them that aren't cached
+
+    :param deck_ids: The list of DeckIDs to look up
+    """
+    def get_cached_dates(self, deck_ids):
+        cached_dates = {}
+        with self.lock:
+            for deck_ids_chunk in split_into_chunks(list(deck_ids), SQLITE_MAX_QUERY_PARAMETERS):
+                rows = self.connection.execute(
+                    "SELECT deck_id, cached_date FROM decks WHERE deck_id IN (%s)" % (", ".join(["?"] * len(deck_ids_chunk))),
+                    deck_ids_chunk)
+                for (deck_id, cached_date) in rows:
+                    cached_dates[deck_id] = datetime.strptime(cached_date, '%Y-%m-%d')
+        return cached_dates
+
+    """
+    Return the DeckIDs of every cached deck
+    """
+    def get_cached_deck_ids(self):
+        with self.lock:
+            return [deck_id for (deck_id,) in self.connection.execute("SELECT deck_id FROM decks ORDER BY deck_id")]
+
+    """
+    Load the given decks, returning a dict of the Deck object of each of them. Decks that aren't cached are left out
+
+    :param deck_ids: The list of DeckIDs to load
+    """
+    def load_decks(self, deck_ids):
+        decks = {}
+        with self.lock:
+
+            # Read everything within a single transaction, so that a deck being replaced by another process at the same
+            # time is either seen entirely before or entirely after the replacement
+            self.connection.execute("BEGIN")
+            try:
+                self.load_decks_in_transaction(deck_ids, decks)
+            finally:
+                self.connection.rollback()
+
+        # Decks which were cached before both price types were recorded are stored without either of them
+        for deck in decks.values():
+            if deck.has_price_type(False):
+                deck.use_price_type(False)
+        return decks
+
+    """
+    Load the given decks into the given dict, once a read transaction was started
+
+    :param deck_ids: The IDs of the decks to load
+    :param decks: The dictionary where the loaded decks are added, by deck ID
+    """
+    def load_decks_in_transaction(self, deck_ids, decks):
+        for deck_ids_chunk in split_into_chunks(list(deck_ids), SQLITE_MAX_QUERY_PARAMETERS):
+            query_parameters = ", ".join(["?"] * len(deck_ids_chunk))
+            cached_dates = {}
+            rows = self.connection.execute(
+                "SELECT deck_id, deck_name, deck_url, deck_date, deck_paper_price, deck_online_price, cached_date FROM decks"
+                " WHERE deck_id IN (%s)" % (query_parameters), deck_ids_chunk)
+            for (deck_id, deck_name, deck_url, deck_date, deck_paper_price, deck_online_price, cached_date) in rows:
+                cached_dates[deck_id] = cached_date
+                deck = Deck()
+                deck.deck_name = deck_name
+                deck.deck_url = deck_url
+                deck.deck_date = datetime.strptime(deck_date, '%Y-%m-%d')
+                deck.deck_paper_price = deck_paper_price
+                deck.deck_online_price = deck_online_price
+                decks[deck_id] = deck
+
+            card_entries = dict((deck_id, []) for deck_id in cached_dates)
+            repriced_deck_ids = set()
+            rows = self.connection.execute(
+                "SELECT deck_entries.deck_id, cards.card_name, deck_entries.quantity, deck_entries.paper_price,"
+                " deck_entries.online_price, card_prices.paper_price, card_prices.online_price, card_prices.price_date"
+                " FROM deck_entries JOIN cards ON cards.card_id = deck_entries.card_id"
+                " LEFT JOIN card_prices ON card_prices.card_id = deck_entries.card_id"
+                " WHERE deck_entries.deck_id IN (%s) ORDER BY deck_entries.deck_id, deck_entries.position" % (query_parameters),
+                deck_ids_chunk)
+            for (deck_id, card_name, quantity, paper_price, online_price, latest_paper_price, latest_online_price, price_date) in rows:
+
+                # Use the latest price of the card if it was seen after this deck was cached. Decks cached before both
+                # price types were recorded don't have any prices to update, they'll be fetched again anyway
+                if price_date is not None and price_date > cached_dates[deck_id] and decks[deck_id].deck_paper_price is not None:
+                    repriced_deck_ids.add(deck_id)
+                    paper_price = latest_paper_price
+                    if latest_online_price is not None:
+                        online_price = latest_online_price
+                card_entries[deck_id].append((card_name, quantity, paper_price, online_price))
+            for (deck_id, deck_card_entries) in card_entries.items():
+                decks[deck_id].set_card_entries(deck_card_entries)
+            for deck_id in repriced_deck_ids:
+                decks[deck_id].recompute_deck_prices()
+
+    """
+    Save the given decks in a single transaction, replacing any previously cached version of them
+
+    :param cached_decks: A list of (deck_id, deck, cached_date) tuples
+    """
+    def save_decks(self, cached_decks):
+        price_observations = {}
+        with self.lock:
+            with self.connection:
+
+                # Take the write lock right away, so that the latest prices read below can't change before they're written
+                self.connection.execute("BEGIN IMMEDIATE")
+                if self.card_ids is None:
+                    self.card_ids = dict(
+                        (card_name, card_id) for (card_id, card_name) in self.connection.execute("SELECT card_id, card_name FROM cards"))
+
+                for (deck_id, deck, cached_date) in cached_decks:
+                    deck_entry_rows = []
+                    for (position, (card_name, quantity, paper_price, online_price)) in enumerate(deck.get_card_entries()):
+                        # Another process sharing the cache may have added this card since we loaded the card_ids
+                        if card_name not in self.card_ids:
+                            self.connection.execute("INSERT OR IGNORE INTO cards (card_name) VALUES (?)", (card_name,))
+                            self.card_ids[card_name] = self.connection.execute(
+                                "SELECT card_id FROM cards WHERE card_name = ?", (card_name,)).fetchone()[0]
+                        deck_entry_rows.append((position, self.card_ids[card_name], quantity, paper_price, online_price))
+
+                        # Decks cached before both price types were recorded don't have any prices worth keeping. A card
+                        # showing up in several of the decks is priced the same in all of them, so the first price seen is kept
+                        if deck.deck_paper_price is not None:
+                            price_observations_of_date = price_observations.setdefault(cached_date.strftime('%Y-%m-%d'), {})
+                            if deck.deck_online_price is None:
+                                online_price = None
+                            if self.card_ids[card_name] not in price_observations_of_date:
+                                price_observations_of_date[self.card_ids[card_name]] = (paper_price, online_price)
+                    self.save_deck_revision(deck_id, (deck.deck_name, deck.deck_url, deck.deck_date.strftime('%Y-%m-%d'),
+                                                      deck.deck_paper_price, deck.deck_online_price),
+                                            cached_date.strftime('%Y-%m-%d'), deck_entry_rows)
+
+                for (price_date, card_prices) in sorted(price_observations.items()):
+                    self.record_card_prices(price_date, card_prices)
+                    self.connection.executemany(
+                        "INSERT INTO card_prices (card_id, paper_price, online_price, price_date) VALUES (?, ?, ?, ?)"
+                        " ON CONFLICT (card_id) DO UPDATE SET paper_price = excluded.paper_price,"
+                        " online_price = COALESCE(excluded.online_price, card_prices.online_price), price_date = excluded.price_date"
+                        " WHERE excluded.price_date >= card_prices.price_date",
+                        [(card_id, paper_price, online_price, price_date) for (card_id, (paper_price, online_price)) in card_prices.items()])
+
+                # The scores of the saved decks can be stored as long as none of them changes again before then
+                saved_deck_ids = [deck_id for (deck_id, deck, cached_date) in cached_decks]
+                for deck_ids_chunk in split_into_chunks(saved_deck_ids, SQLITE_MAX_QUERY_PARAMETERS):
+                    self.saved_deck_score_versions.update(self.connection.execute(
+                        "SELECT deck_id, version FROM deck_score_versions WHERE deck_id IN (%s)" % (
+                            ", ".join(["?"] * len(deck_ids_chunk))), deck_ids_chunk))
+
+    """
+    Save a single deck, adding a revision to its history if it differs from the cached version. Only the cards which
+    differ from the cached version (by position in the deck) are stored in the new revision and rewritten in
+    deck_entries, unless the revision is a checkpoint holding the whole deck. This has to be called from within a
+    transaction
+
+    :param deck_id: The DeckID of the deck
+    :param deck_header: A (deck_name, deck_url, deck_date, deck_paper_price, deck_online_price) tuple, with the date as YYYY-MM-DD
+    :param cached_date: The date the deck was cached on, as YYYY-MM-DD
+    :param deck_entry_rows: A list of (position, card_id, quantity, paper_price, online_price) tuples, one for each card
+    """
+    def save_deck_revision(self, deck_id, deck_header, cached_date, deck_entry_rows):
+        cached_deck_row = self.connection.execute(
+            "SELECT deck_name, deck_url, deck_date, deck_paper_price, deck_online_price, cached_date FROM decks WHERE deck_id = ?",
+            (deck_id,)).fetchone()
+        cached_entry_rows = self.connection.execute(
+            "SELECT position, card_id, quantity, paper_price, online_price FROM deck_entries WHERE deck_id = ? ORDER BY position",
+            (deck_id,)).fetchall()
+        (latest_revision, latest_checkpoint) = self.connection.execute(
+            "SELECT MAX(revision), MAX(CASE WHEN is_checkpoint THEN revision END) FROM deck_revisions WHERE deck_id = ?",
+            (deck_id,)).fetchone()
+
+        # Decks cached before revisions were kept start their history with the version that was cached
+        if latest_revision is None and cached_deck_row is not None:
+            self.add_deck_revision(deck_id, 1, cached_deck_row[5], True, tuple(cached_deck_row[:5]), cached_entry_rows)
+            (latest_revision, latest_checkpoint) = (1, 1)
+
+        self.connection.execute(
+            "INSERT INTO decks (deck_id, deck_name, deck_url, deck_date, deck_paper_price, deck_online_price, cached_date)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (deck_id) DO UPDATE SET deck_name = excluded.deck_name,"
+            " deck_url = excluded.deck_url, deck_date = excluded.deck_date, deck_paper_price = excluded.deck_paper_price,"
+            " deck_online_price = excluded.deck_online_price, cached_date = excluded.cached_date",
+            (deck_id,) + deck_header + (cached_date,))
+
+        changed_entry_rows = [deck_entry_row for deck_entry_row in deck_entry_rows
+                              if deck_entry_row[0] >= len(cached_entry_rows) or tuple(cached_entry_rows[deck_entry_row[0]]) != deck_entry_row]
+        if (cached_deck_row is not None and len(changed_entry_rows) == 0 and len(deck_entry_rows) == len(cached_entry_rows) and
+                tuple(cached_deck_row[:5]) == deck_header):
+            return
+
+        self.connection.execute("DELETE FROM deck_entries WHERE deck_id = ? AND position >= ?", (deck_id, len(deck_entry_rows)))
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO deck_entries (deck_id, position, card_id, quantity, paper_price, online_price)"
+            " VALUES (?, ?, ?, ?, ?, ?)", [(deck_id,) + deck_entry_row for deck_entry_row in changed_entry_rows])
+
+        # Once the changes stop being much smaller than the deck itself, a full copy is stored instead
+        revision = (latest_revision or 0) + 1
+        if latest_revision is None or revision - latest_checkpoint >= DECK_REVISION_CHECKPOINT_INTERVAL or len(changed_entry_rows) * 2 >= len(deck_entry_rows):
+            self.add_deck_revision(deck_id, revision, cached_date, True, deck_header, deck_entry_rows)
+        else:
+            self.add_deck_revision(deck_id, revision, cached_date, False, deck_header, changed_entry_rows, len(deck_entry_rows))
+
+    """
+    Add a revision to the history of a deck. This has to be called from within a transaction
+
+    :param deck_id: The DeckID of the deck
+    :param revision: The number of the revision, one more than the previous revision of the deck
+    :param cached_date: The date this revision was cached on, as YYYY-MM-DD
+    :param is_checkpoint: True if entry_rows holds every card of the deck, False if only those changed since the previous revision
+    :param deck_header: A (deck_name, deck_url, deck_date, deck_paper_price, deck_online_price) tuple
+    :param entry_rows: A list of (position, card_id, quantity, paper_price, online_price) tuples
+    :param num_cards: The number of cards (rows) in the deck, when entry_rows only holds the changed ones
+    """
+    def add_deck_revision(self, deck_id, revision, cached_date, is_checkpoint, deck_header, entry_rows, num_cards=None):
+        if num_cards is None:
+            num_cards = len(entry_rows)
+        self.connection.execute(
+            "INSERT INTO deck_revisions (deck_id, revision, cached_date, is_checkpoint, num_cards, deck_name, deck_url, deck_date,"
+            " deck_paper_price, deck_online_price) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (deck_id, revision, cached_date, int(is_checkpoint), num_cards) + tuple(deck_header))
+        self.connection.executemany(
+            "INSERT INTO deck_revision_entries (deck_id, revision, position, card_id, quantity, paper_price, online_price)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)", [(deck_id, revision) + tuple(entry_row) for entry_row in entry_rows])
+
+    """
+    Return a list of the (revision, cached_date, is_checkpoint) of every revision of the given deck, oldest first
+
+    :param deck_id: The DeckID of the deck
+    """
+    def get_deck_revisions(self, deck_id):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT revision, cached_date, is_checkpoint FROM deck_revisions WHERE deck_id = ? ORDER BY revision", (deck_id,)).fetchall()
+        return [(revision, datetime.strptime(cached_date, '%Y-%m-%d'), bool(is_checkpoint)) for (revision, cached_date, is_checkpoint) in rows]
+
+    """
+    Rebuild the given revision of a deck, starting from the closest checkpoint before it and applying the changes of
+    every revision since. Returns None if the deck doesn't have that revision
+
+    :param deck_id: The DeckID of the deck
+    :param revision: The number of the revision to rebuild
+    """
+    def load_deck_revision(self, deck_id, revision):
+        with self.lock:
+            deck_header = self.connection.execute(
+                "SELECT deck_name, deck_url, deck_date, deck_paper_price, deck_online_price FROM deck_revisions"
+                " WHERE deck_id = ? AND revision = ?", (deck_id, revision)).fetchone()
+            if deck_header is None:
+                return None
+
+            checkpoint = self.connection.execute(
+                "SELECT MAX(revision) FROM deck_revisions WHERE deck_id = ? AND revision <= ? AND is_checkpoint",
+                (deck_id, revision)).fetchone()[0]
+            num_cards_by_revision = dict(self.connection.execute(
+                "SELECT revision, num_cards FROM deck_revisions WHERE deck_id = ? AND revision BETWEEN ? AND ?",
+                (deck_id, checkpoint, revision)))
+            entry_rows_by_revision = {}
+            rows = self.connection.execute(
+                "SELECT deck_revision_entries.revision, deck_revision_entries.position, cards.card_name, deck_revision_entries.quantity,"
+                " deck_revision_entries.paper_price, deck_revision_entries.online_price FROM deck_revision_entries"
+                " JOIN cards ON cards.card_id = deck_revision_entries.card_id"
+                " WHERE deck_revision_entries.deck_id = ? AND deck_revision_entries.revision BETWEEN ? AND ?"
+                " ORDER BY deck_revision_entries.revision, deck_revision_entries.position", (deck_id, checkpoint, revision))
+            for (entry_revision, position, card_name, quantity, paper_price, online_price) in rows:
+                entry_rows_by_revision.setdefault(entry_revision, []).append((position, (card_name, quantity, paper_price, online_price)))
+
+        card_entries = []
+        for entry_revision in sorted(num_cards_by_revision):
+            del card_entries[num_cards_by_revision[entry_revision]:]
+            for (position, card_entry) in entry_rows_by_revision.get(entry_revision, []):
+                if position < len(card_entries):
+                    card_entries[position] = card_entry
+                else:
+                    card_entries.append(card_entry)
+
+        deck = Deck()
+        (deck.deck_name, deck.deck_url, deck_date, deck.deck_paper_price, deck.deck_online_price) = deck_header
+        deck.deck_date = datetime.strptime(deck_date, '%Y-%m-%d')
+        deck.set_card_entries(card_entries)
+        if deck.has_price_type(False):
+            deck.use_price_type(False)
+        return deck
+
+    """
+    Return the cards that changed between two revisions of a deck, as a list of (card_name, old_quantity, new_quantity,
+    old_price, new_price) tuples. Cards are listed in the order of the newer revision, followed by any cards that were
+    removed. A card that was added or removed has a quantity of 0 and a price of None in the revision it isn't in
+
+    :param deck_id: The DeckID of the deck
+    :param old_revision: The number of the older revision
+    :param new_revision: The number of the newer revision
+    :param use_online_price: True to compare online (tix) prices rather than paper prices
+    """
+    def get_deck_changes(self, deck_id, old_revision, new_revision, use_online_price):
+        old_cards = {}
+        for (card_name, quantity, paper_price, online_price) in self.load_deck_revision(deck_id, old_revision).get_card_entries():
+            old_cards[card_name] = (quantity, online_price if use_online_price else paper_price)
+
+        deck_changes = []
+        for (card_name, quantity, paper_price, online_price) in self.load_deck_revision(deck_id, new_revision).get_card_entries():
+            (old_quantity, old_price) = old_cards.pop(card_name, (0, None))
+            new_price = online_price if use_online_price else paper_price
+            if old_quantity != quantity or old_price != new_price:
+                deck_changes.append((card_name, old_quantity, quantity, old_price, new_price))
+        for (card_name, (old_quantity, old_price)) in old_cards.items():
+            deck_changes.append((card_name, old_quantity, 0, old_price, None))
+        return deck_changes
+
+    """
+    Count one more use of each of the given decks, which the cache warmer takes into account (see warm_deck_cache())
+
+    :param deck_ids: The list of DeckIDs used during this run
+    """
+    def record_deck_usage(self, deck_ids):
+        todays_date = datetime.now().strftime('%Y-%m-%d')
+        with self.lock:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO deck_usage (deck_id, times_used, last_used_date) VALUES (?, 1, ?)"
+                    " ON CONFLICT (deck_id) DO UPDATE SET times_used = times_used + 1, last_used_date = excluded.last_used_date",
+                    [(deck_id, todays_date) for deck_id in deck_ids])
+
+    """
+    Return a dict of the (deck_url, cached_date, times_used) of every cached deck
+    """
+    def get_cached_deck_usage(self):
+        cached_deck_usage = {}
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT decks.deck_id, decks.deck_url, decks.cached_date, COALESCE(deck_usage.times_used, 0) FROM decks"
+                " LEFT JOIN deck_usage ON deck_usage.deck_id = decks.deck_id")
+            for (deck_id, deck_url, cached_date, times_used) in rows:
+                cached_deck_usage[deck_id] = (deck_url, datetime.strptime(cached_date, '%Y-%m-%d'), times_used)
+        return cached_deck_usage
+
+    """
+    Return the number of cached decks, along with the number of bytes that the cached decks and their revisions take up
+    in the database (see CACHED_DECK_TABLES). The database file itself doesn't shrink as decks are removed, but its free
+    space is reused before the file grows again
+    """
+    def get_cache_size(self):
+        with self.lock:
+            num_decks = self.connection.execute("SELECT COUNT(*) FROM decks").fetchone()[0]
+            query_parameters = ", ".join(["?"] * len(CACHED_DECK_TABLES))
+            try:
+                # The pages of each table and of its indexes, leaving out the unused bytes within them
+                num_bytes = self.connection.execute(
+                    "SELECT COALESCE(SUM(pgsize - unused), 0) FROM dbstat WHERE name IN"
+                    " (SELECT name FROM sqlite_master WHERE tbl_name IN (%s))" % (query_parameters), CACHED_DECK_TABLES).fetchone()[0]
+            except sqlite3.OperationalError:
+                # SQLite was built without the dbstat table, so estimate the size from the values stored in each row instead
+                num_bytes = 0
+                for table_name in CACHED_DECK_TABLES:
+                    column_names = [column_info[1] for column_info in self.connection.execute("PRAGMA table_info(%s)" % (table_name))]
+                    num_bytes += self.connection.execute(
+                        "SELECT COALESCE(SUM(%s), 0) + COUNT(*) * ? FROM %s" % (
+                            " + ".join(["COALESCE(LENGTH(%s), 0)" % (column_name) for column_name in column_names]), table_name),
+                        (ESTIMATED_SQLITE_ROW_OVERHEAD_BYTES,)).fetchone()[0]
+        return (num_decks, num_bytes)
+
+    """
+    Evict the least recently used decks until there are at most max_decks decks cached and the cached decks take up at
+    most max_bytes bytes of the database (see get_cache_size()). Decks that have never been used by a run count as last
+    used on the day they were cached. Eviction stops early if evicting decks no longer makes the cache any smaller. The
+    revisions, stored scores and deck score versions of the evicted decks are removed with them, as are the prices of
+    the cards that aren't in any cached deck or revision anymore. Returns the number of decks that were evicted
+
+    :param max_decks: The maximum number of decks to keep cached, or None for no limit
+    :param max_bytes: The maximum size of the cache in bytes, or None for no limit
+    :param protected_deck_ids: The DeckIDs which are never evicted, such as those of the desired decks
+    """
+    def evict_least_recently_used_decks(self, max_decks, max_bytes, protected_deck_ids):
+        with self.lock:
+            eviction_candidates = [deck_id for (deck_id,) in self.connection.execute(
+                "SELECT decks.deck_id FROM decks LEFT JOIN deck_usage ON deck_usage.deck_id = decks.deck_id"
+                " ORDER BY COALESCE(deck_usage.last_used_date, decks.cached_date), decks.cached_date, decks.deck_id")
+                                   if deck_id not in protected_deck_ids]
+
+        num_evicted_decks = 0
+        num_bytes_before_eviction = None
+        while num_evicted_decks < len(eviction_candidates):
+            (num_decks, num_bytes) = self.get_cache_size()
+            if max_decks is not None and num_decks > max_decks:
+                num_decks_to_evict = min(num_decks - max_decks, CACHE_EVICTION_BATCH_SIZE)
+            elif max_bytes is not None and num_bytes > max_bytes:
+                # If the last batch didn't free up anything, neither will the next ones
+                if num_bytes_before_eviction is not None and num_bytes >= num_bytes_before_eviction:
+                    break
+                num_decks_to_evict = CACHE_EVICTION_BATCH_SIZE
+            else:
+                break
+            num_bytes_before_eviction = num_bytes
+
+            deck_ids_to_evict = eviction_candidates[num_evicted_decks:num_evicted_decks + num_decks_to_evict]
+            query_parameters = ", ".join(["?"] * len(deck_ids_to_evict))
+            with self.lock:
+                with self.connection:
+
+                    # The entries of each deck are deleted along with it
+                    self.connection.execute("DELETE FROM decks WHERE deck_id IN (%s)" % (query_parameters), deck_ids_to_evict)
+                    self.connection.execute("DELETE FROM deck_usage WHERE deck_id IN (%s)" % (query_parameters), deck_ids_to_evict)
+                    self.connection.execute("DELETE FROM deck_revisions WHERE deck_id IN (%s)" % (query_parameters), deck_ids_to_evict)
+                    self.connection.execute("DELETE FROM deck_revision_entries WHERE deck_id IN (%s)" % (query_parameters), deck_ids_to_evict)
+                    self.connection.execute("DELETE FROM metagame_deck_scores WHERE deck_id IN (%s)" % (query_parameters), deck_ids_to_evict)
+                    self.connection.execute("DELETE FROM deck_score_versions WHERE deck_id IN (%s)" % (query_parameters), deck_ids_to_evict)
+                    self.delete_prices_of_unused_cards()
+            num_evicted_decks += len(deck_ids_to_evict)
+        return num_evicted_decks
+
+    """
+    Remove everything from the database that can't be used anymore: cached decks whose dates can't be read or which
+    don't have any cards, deck entries, usage counts, revisions, stored scores (in either price type) and deck score
+    versions of decks that aren't cached, the prices of cards that aren't in any cached deck or revision, and those cards
+    themselves. The database file is then rebuilt, shrinking it down to the space in use. Returns a dict of the number
+    of rows removed from each table
+    """
+    def compact(self):
+        num_removed_rows = {}
+        with self.lock:
+            with self.connection:
+                unreadable_deck_ids = []
+                rows = self.connection.execute(
+                    "SELECT decks.deck_id, decks.deck_date, decks.cached_date, COUNT(deck_entries.deck_id) FROM decks"
+                    " LEFT JOIN deck_entries ON deck_entries.deck_id = decks.deck_id GROUP BY decks.deck_id")
+                for (deck_id, deck_date, cached_date, num_deck_entries) in rows:
+                    try:
+                        datetime.strptime(deck_date, '%Y-%m-%d')
+                        datetime.strptime(cached_date, '%Y-%m-%d')
+                    except (TypeError, ValueError):
+                        unreadable_deck_ids.append(deck_id)
+                        continue
+                    if num_deck_entries == 0:
+                        unreadable_deck_ids.append(deck_id)
+                for deck_ids_chunk in split_into_chunks(unreadable_deck_ids, SQLITE_MAX_QUERY_PARAMETERS):
+                    self.connection.execute(
+                        "DELETE FROM decks WHERE deck_id IN (%s)" % (", ".join(["?"] * len(deck_ids_chunk))), deck_ids_chunk)
+                num_removed_rows['decks'] = len(unreadable_deck_ids)
+
+                num_removed_rows['deck_entries'] = self.connection.execute(
+                    "DELETE FROM deck_entries WHERE deck_id NOT IN (SELECT deck_id FROM decks)"
+                    " OR card_id NOT IN (SELECT card_id FROM cards)").rowcount
+                num_removed_rows['deck_usage'] = self.connection.execute(
+                    "DELETE FROM deck_usage WHERE deck_id NOT IN (SELECT deck_id FROM decks)").rowcount
+                num_removed_rows['deck_revisions'] = self.connection.execute(
+                    "DELETE FROM deck_revisions WHERE deck_id NOT IN (SELECT deck_id FROM decks)").rowcount
+                self.connection.execute("DELETE FROM deck_revision_entries WHERE deck_id NOT IN (SELECT deck_id FROM decks)")
+                num_removed_rows['metagame_deck_scores'] = self.connection.execute(
+                    "DELETE FROM metagame_deck_scores WHERE deck_id NOT IN (SELECT deck_id FROM decks)").rowcount
+                num_removed_rows['deck_score_versions'] = self.connection.execute(
+                    "DELETE FROM deck_score_versions WHERE deck_id NOT IN (SELECT deck_id FROM decks)").rowcount
+                num_removed_rows['price_history'] = self.delete_prices_of_unused_cards()
+                num_removed_rows['cards'] = self.connection.execute(
+                    "DELETE FROM cards WHERE card_id NOT IN (SELECT card_id FROM deck_entries)"
+                    " AND card_id NOT IN (SELECT card_id FROM deck_revision_entries) AND card_id NOT IN (SELECT card_id FROM price_history)"
+                    " AND card_id NOT IN (SELECT card_id FROM card_prices)").rowcount
+                self.card_ids = None
+
+            # VACUUM can't run within a transaction. Checkpointing afterwards also empties the write-ahead log
+            self.connection.execute("VACUUM")
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return num_removed_rows
+
+    """
+    Remove the price history and latest price of every card that isn't in any cached deck or revision anymore, returning
+    the number of price history rows removed. This has to be called from within a transaction
+    """
+    def delete_prices_of_unused_cards(self):
+        unused_cards_condition = ("card_id NOT IN (SELECT card_id FROM deck_entries)"
+                                  " AND card_id NOT IN (SELECT card_id FROM deck_revision_entries)")
+        self.connection.execute("DELETE FROM card_prices WHERE %s" % (unused_cards_condition))
+        return self.connection.execute("DELETE FROM price_history WHERE %s" % (unused_cards_condition)).rowcount
+
+    """
+    Return a dict of the set of card_ids in each of the given decks whose latest price was seen before the given date
+    (or which have never been priced at all). Decks without any such cards are left out
+
+    :param deck_ids: The list of DeckIDs to check
+    :param stale_before_date: Cards priced before this date are considered stale
+    """
+    def get_stale_card_ids_by_deck(self, deck_ids, stale_before_date):
+        stale_card_ids_by_deck = {}
+        with self.lock:
+            for deck_ids_chunk in split_into_chunks(list(deck_ids), SQLITE_MAX_QUERY_PARAMETERS):
+                rows = self.connection.execute(
+                    "SELECT deck_entries.deck_id, deck_entries.card_id FROM deck_entries"
+                    " LEFT JOIN card_prices ON card_prices.card_id = deck_entries.card_id"
+                    " WHERE deck_entries.deck_id IN (%s) AND (card_prices.price_date IS NULL OR card_prices.price_date < ?)" % (
+                        ", ".join(["?"] * len(deck_ids_chunk))), deck_ids_chunk + [stale_before_date.strftime('%Y-%m-%d')])
+                for (deck_id, card_id) in rows:
+                    stale_card_ids_by_deck.setdefault(deck_id, set()).add(card_id)
+        return stale_card_ids_by_deck
+
+    """
+    Add a row to the price history for each of the given cards whose price differs from the latest one recorded up to
+    price_date. This has to be called from within a transaction
+
+    :param price_date: The date the prices were seen on, as YYYY-MM-DD
+    :param card_prices: A dict of the (paper_price, online_price) of each card_id
+    """
+    def record_card_prices(self, price_date, card_prices):
+        latest_card_prices = {}
+        for card_ids_chunk in split_into_chunks(list(card_prices), SQLITE_MAX_QUERY_PARAMETERS):
+            rows = self.connection.execute(
+                "SELECT card_id, paper_price, online_price FROM price_history AS latest WHERE card_id IN (%s) AND price_date ="
+                " (SELECT MAX(price_date) FROM price_history WHERE card_id = latest.card_id AND price_date <= ?)" % (
+                    ", ".join(["?"] * len(card_ids_chunk))), card_ids_chunk + [price_date])
+            for (card_id, paper_price, online_price) in rows:
+                latest_card_prices[card_id] = (paper_price, online_price)
+
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO price_history (card_id, price_date, paper_price, online_price) VALUES (?, ?, ?, ?)",
+            [(card_id, price_date, paper_price, online_price) for (card_id, (paper_price, online_price)) in card_prices.items()
+             if latest_card_prices.get(card_id) != (paper_price, online_price)])
+
+    """
+    Return the (paper_price, online_price) of a single copy of a card as of the given date, or None if no price was
+    recorded for the card on or before that date
+
+    :param card_name: The name of the card
+    :param price_date: The date to look up the price for
+    """
+    def get_card_price_on_date(self, card_name, price_date):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT paper_price, online_price FROM price_history JOIN cards ON cards.card_id = price_history.card_id"
+                " WHERE cards.card_name = ? AND price_history.price_date <= ? ORDER BY price_history.price_date DESC LIMIT 1",
+                (card_name, price_date.strftime('%Y-%m-%d'))).fetchone()
+
+    """
+    Yield a (card_name, (old_paper_price, old_online_price), (new_paper_price, new_online_price)) tuple for every card whose
+    latest price differs from its price as of the given date. Cards that were first seen after that date aren't included.
+    The rows are read from the database a batch at a time
+
+    :param since_date: The date to compare the latest prices against
+    """
+    def iterate_card_price_changes(self, since_date):
+        with self.lock:
+            cursor = self.connection.execute(
+                PRICE_CHANGES_QUERY + " WHERE old_prices.paper_price IS NOT new_prices.paper_price"
+                " OR old_prices.online_price IS NOT new_prices.online_price", (since_date.strftime('%Y-%m-%d'),))
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(SQLITE_MAX_QUERY_PARAMETERS)
+            if len(rows) == 0:
+                break
+            for (card_name, old_paper_price, old_online_price, new_paper_price, new_online_price) in rows:
+                yield (card_name, (old_paper_price, old_online_price), (new_paper_price, new_online_price))
+
+    """
+    Return the cards whose price changed the most (in either direction) since the given date, as a list of
+    (card_name, old_price, new_price) tuples, biggest change first
+
+    :param since_date: The date to compare the latest prices against
+    :param use_online_price: True to compare the online (tix) prices, False to compare the paper prices
+    :param limit: The maximum number of cards to return
+    """
+    def get_biggest_price_movers(self, since_date, use_online_price, limit):
+        price_column = 'paper_price'
+        if use_online_price:
+            price_column = 'online_price'
+        with self.lock:
+            rows = self.connection.execute(
+                PRICE_CHANGES_QUERY + " WHERE old_prices.{0} IS NOT NULL AND new_prices.{0} IS NOT NULL"
+                " AND old_prices.{0} != new_prices.{0} ORDER BY ABS(new_prices.{0} - old_prices.{0}) DESC, cards.card_name"
+                " LIMIT ?".format(price_column), (since_date.strftime('%Y-%m-%d'), limit)).fetchall()
+        price_index = 1
+        if use_online_price:
+            price_index = 2
+        return [(row[0], row[price_index], row[price_index + 2]) for row in rows]
+
+    """
+    Record the Owned Cards that the Metagame deck scores are computed from, dropping the score of every deck containing
+    a card that was added to, removed from or requantified in owned_cards.txt since the last time. As the owned cards of
+    a deck are added up in the order of owned_cards.txt, every score is dropped if the cards that didn't change are now
+    listed in a different order. Returns the number of changed card names and the number of scores that were dropped
+
+    :param owned_cards_list: The list of Owned Cards as parsed from owned_cards.txt
+    """
+    def update_scored_owned_cards(self, owned_cards_list):
+        owned_card_rows = [(card_entry[CARD_NAME_KEY], card_entry[CARD_QTY_KEY]) for card_entry in owned_cards_list]
+        with self.lock:
+            with self.connection:
+                self.connection.execute("BEGIN IMMEDIATE")
+                scored_owned_card_rows = [tuple(row) for row in self.connection.execute(
+                    "SELECT card_name, quantity FROM scored_owned_cards ORDER BY position")]
+                if scored_owned_card_rows == owned_card_rows:
+                    return (0, 0)
+
+                # Cards are compared by their normalized names, and a card counts as changed if any of its entries did
+                scored_owned_cards_by_name = {}
+                for (card_name, quantity) in scored_owned_card_rows:
+                    scored_owned_cards_by_name.setdefault(normalize_card_name(card_name), []).append((card_name, quantity))
+                owned_cards_by_name = {}
+                for (card_name, quantity) in owned_card_rows:
+                    owned_cards_by_name.setdefault(normalize_card_name(card_name), []).append((card_name, quantity))
+                changed_card_names = set([card_name for card_name in set(scored_owned_cards_by_name) | set(owned_cards_by_name)
+                                          if scored_owned_cards_by_name.get(card_name) != owned_cards_by_name.get(card_name)])
+
+                unchanged_card_order = [normalize_card_name(card_name) for (card_name, quantity) in owned_card_rows
+                                        if normalize_card_name(card_name) not in changed_card_names]
+                scored_unchanged_card_order = [normalize_card_name(card_name) for (card_name, quantity) in scored_owned_card_rows
+                                               if normalize_card_name(card_name) not in changed_card_names]
+                if unchanged_card_order != scored_unchanged_card_order:
+                    num_dropped_scores = self.connection.execute("DELETE FROM metagame_deck_scores").rowcount
+                else:
+                    changed_card_ids = [card_id for (card_id, card_name) in self.connection.execute("SELECT card_id, card_name FROM cards")
+                                        if normalize_card_name(card_name) in changed_card_names]
+                    num_dropped_scores = 0
+                    for card_ids_chunk in split_into_chunks(changed_card_ids, SQLITE_MAX_QUERY_PARAMETERS):
+                        num_dropped_scores += self.connection.execute(
+                            "DELETE FROM metagame_deck_scores WHERE deck_id IN (SELECT deck_id FROM deck_entries WHERE card_id IN (%s))" % (
+                                ", ".join(["?"] * len(card_ids_chunk))), card_ids_chunk).rowcount
+
+                self.connection.execute("DELETE FROM scored_owned_cards")
+                self.connection.executemany("INSERT INTO scored_owned_cards (position, card_name, quantity) VALUES (?, ?, ?)",
+                                            [(position,) + owned_card_row for (position, owned_card_row) in enumerate(owned_card_rows)])
+        return (len(changed_card_names), num_dropped_scores)
+
+    """
+    Return a dict of the current deck score version of each of the given Metagame decks (0 for decks that never had
+    one) along with a dict of the stored score of each of them, leaving out the decks without a score. Each score is a
+    (deck_name, report_entry) tuple, where report_entry is None for decks that we don't own any cards of (see
+    evaluate_metagame_deck())
+
+    :param deck_ids: The list of DeckIDs to look up
+    :param use_online_price: True if the scores should be in online (tix) pricing
+    """
+    def load_metagame_deck_scores(self, deck_ids, use_online_price):
+        deck_score_versions = dict((deck_id, 0) for deck_id in deck_ids)
+        deck_scores = {}
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                for deck_ids_chunk in split_into_chunks(list(deck_ids), SQLITE_MAX_QUERY_PARAMETERS):
+                    deck_score_versions.update(self.connection.execute(
+                        "SELECT deck_id, version FROM deck_score_versions WHERE deck_id IN (%s)" % (
+                            ", ".join(["?"] * len(deck_ids_chunk))), deck_ids_chunk))
+                    rows = self.connection.execute(
+                        "SELECT deck_id, deck_score FROM metagame_deck_scores WHERE uses_online_price = ? AND deck_id IN (%s)" % (
+                            ", ".join(["?"] * len(deck_ids_chunk))), [int(bool(use_online_price))] + deck_ids_chunk)
+                    for (deck_id, deck_score) in rows:
+                        deck_scores[deck_id] = pickle.loads(deck_score)
+            finally:
+                self.connection.rollback()
+        return (deck_score_versions, deck_scores)
+
+    """
+    Store the scores of the given Metagame decks whose deck score version is still the one they were evaluated at, as
+    long as the Owned Cards they were computed from are still the scored_owned_cards. Returns the number of scores stored
+
+    :param deck_scores: A list of (deck_id, deck_name, report_entry) tuples
+    :param use_online_price: True if the scores are in online (tix) pricing
+    :param deck_score_versions: A dict of the deck score version each of the decks was evaluated at, as returned by
+                                load_metagame_deck_scores() or, for decks saved since then, saved_deck_score_versions
+    :param owned_cards_list: The list of Owned Cards the scores were computed from
+    """
+    def save_metagame_deck_scores(self, deck_scores, use_online_price, deck_score_versions, owned_cards_list):
+        owned_card_rows = [(card_entry[CARD_NAME_KEY], card_entry[CARD_QTY_KEY]) for card_entry in owned_cards_list]
+        with self.lock:
+            with self.connection:
+                self.connection.execute("BEGIN IMMEDIATE")
+                scored_owned_card_rows = [tuple(row) for row in self.connection.execute(
+                    "SELECT card_name, quantity FROM scored_owned_cards ORDER BY position")]
+                if scored_owned_card_rows != owned_card_rows:
+                    return 0
+
+                current_deck_score_versions = {}
+                deck_ids = list(set([deck_id for (deck_id, deck_name, report_entry) in deck_scores]))
+                for deck_ids_chunk in split_into_chunks(deck_ids, SQLITE_MAX_QUERY_PARAMETERS):
+                    current_deck_score_versions.update(self.connection.execute(
+                        "SELECT deck_id, version FROM deck_score_versions WHERE deck_id IN (%s)" % (
+                            ", ".join(["?"] * len(deck_ids_chunk))), deck_ids_chunk))
+                unchanged_deck_scores = [(deck_id, deck_name, report_entry) for (deck_id, deck_name, report_entry) in deck_scores
+                                         if deck_id in deck_score_versions and
+                                         current_deck_score_versions.get(deck_id, 0) == deck_score_versions[deck_id]]
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO metagame_deck_scores (deck_id, uses_online_price, deck_score) VALUES (?, ?, ?)",
+                    [(deck_id, int(bool(use_online_price)), sqlite3.Binary(pickle.dumps((deck_name, report_entry), pickle.HIGHEST_PROTOCOL)))
+                     for (deck_id, deck_name, report_entry) in unchanged_deck_scores])
+        return len(unchanged_deck_scores)
+
+    """
+    Import every deck pickled into the old deck_cache directory (one file per deck, named <deck_id>_MM_DD_YYYY), keeping
+    the date each of them was cached on. Returns the number of decks imported
+
+    :param cache_dir: The path of the old deck_cache directory
+    """
+    def import_pickled_decks(self, cache_dir):
+        cached_decks = {}
+        for cached_deck_file_name in os.listdir(cache_dir):
+            cached_deck_id = cached_deck_file_name.split('_')[0]
+            try:
+                cached_date = datetime.strptime(cached_deck_file_name[cached_deck_file_name.find('_') + 1:], '%m_%d_%Y')
+                with open(os.path.join(cache_dir, cached_deck_file_name), 'rb') as input:
+                    deck = pickle.load(input)
+            except Exception:
+                print("   [WARNING]: Couldn't import the cached deck file \"%s\", skipping it." % (cached_deck_file_name))
+                continue
+
+            # Should a deck somehow have been cached more than once, the most recent file is the one we keep
+            if cached_deck_id not in cached_decks or cached_date > cached_decks[cached_deck_id][2]:
+                cached_decks[cached_deck_id] = (cached_deck_id, deck, cached_date)
+
+        self.save_decks(list(cached_decks.values()))
+        return len(cached_decks)
+
+
+"""
+Split a list into consecutive chunks of at most chunk_size items
+
+:param items: The list to split
+:param chunk_size: The maximum number of items in each chunk
+"""
+def split_into_chunks(items, chunk_size):
+    return [items[chunk_start:chunk_start + chunk_size] for chunk_start in range(0, len(items), chunk_size)]
+
+
+"""
+Return the DeckStore holding the deck cache, opening it the first time it's needed during this run
+"""
+def get_deck_store():
+    global deck_store
+    if deck_store is None:
+        deck_store = open_deck_store(os.path.dirname(__file__))
+    return deck_store
+
+
+"""
+Open the deck cache (deck_cache.db) in the given directory, returning its DeckStore. If decks were cached as individual
+pickle files by an older version of this script, they are imported into the store, after which the deck_cache directory
+is renamed to deck_cache_imported so they aren't imported again
+
+:param cache_dir: The directory holding the deck cache, which is the directory of this script
+"""
+def open_deck_store(cache_dir):
+    opened_deck_store = DeckStore(os.path.join(cache_dir, 'deck_cache.db'))
+
+    legacy_cache_dir = os.path.join(cache_dir, 'deck_cache')
+    if os.path.isdir(legacy_cache_dir):
+        num_imported_decks = opened_deck_store.import_pickled_decks(legacy_cache_dir)
+
+        # Another run started at the same time may have imported the directory too, and already renamed it
+        try:
+            os.rename(legacy_cache_dir, os.path.join(cache_dir, 'deck_cache_imported'))
+
+            # The index of the deck_cache directory kept by the previous version of the cache isn't needed anymore
+            legacy_cache_index_file = os.path.join(cache_dir, 'deck_cache_index')
+            if os.path.isfile(legacy_cache_index_file):
+                os.remove(legacy_cache_index_file)
+        except OSError:
+            pass
+        print("   Imported %s cached decks from the deck_cache directory into deck_cache.db." % (num_imported_decks))
+    return opened_deck_store
+
+
+"""
+Close the deck cache, if it has been opened during this run
+"""
+def close_deck_store():
+    global deck_store
+    global deck_archive
+    if deck_store is not None:
+        deck_store.close()
+        deck_store = None
+    if deck_archive is not None:
+        deck_archive.close()
+        deck_archive = None
+
+
+"""
+Open the given deck archive, so that decks are loaded from it rather than from the deck cache whenever the archived
+copy is at least as recent as the cached one (see load_decks_from_cache())
+
+:param archive_file_path: The path of the deck archive, as written by export_deck_archive()
+"""
+def open_deck_archive(archive_file_path):
+    global deck_archive
+    opened_deck_archive = DeckArchive(archive_file_path)
+
+    # Every run looks decks up in the archive anyway, so its deck index is read right away, while a corrupted archive can still
+    # be reported as one that couldn't be opened
+    try:
+        opened_deck_archive.get_deck_record_offsets()
+    except (ValueError, struct.error):
+        opened_deck_archive.close()
+        raise
+    deck_archive = opened_deck_archive
+
+
+"""
+Return a dict of the date each of the given decks was cached on, leaving out any of them that aren't cached. Decks in
+the deck archive count as cached on the date they were cached on before being archived, unless the deck cache has a
+more recent copy of them
+
+:param deck_ids: The list of DeckIDs to look up
+"""
+def get_cached_deck_dates(deck_ids):
+    cached_dates = get_deck_store().get_cached_dates(deck_ids)
+    if deck_archive is not None:
+        for (deck_id, archived_date) in deck_archive.get_cached_dates(deck_ids).items():
+            if deck_id not in cached_dates or archived_date > cached_dates[deck_id]:
+                cached_dates[deck_id] = archived_date
+    return cached_dates
+
+
+"""
+Checks the local deck cache for the presence of this deck using the MTGGoldfish DeckID, as
 parsed from the Deck URL.
 
 :param deck_id: The DeckID of this deck on MTGGoldfish
 """
 def is_deck_cached(deck_id):
-    cache_dir = os.path.join(os.path.dirname(__file__), 'deck_cache')
-    if not os.path.isdir(cache_dir):
+    return deck_id in get_cached_deck_dates([deck_id])
+
+
+"""
+Given the date a deck was cached on, returns how many whole days ago that was
+
+:param cached_date: The date the deck was cached on
+"""
+def get_cached_date_age_days(cached_date):
+    time_delta_since_last_update = datetime.now() - cached_date
+    return time_delta_since_last_update.days
+
+
+"""
+Given the date a deck was cached on, returns true if the date is >= 30 days old
+
+:param cached_date: The date the deck was cached on
+"""
+def cached_date_is_old(cached_date):
+    return get_cached_date_age_days(cached_date) >= OLD_CACHED_DECK_AGE_DAYS
+
+
+"""
+Given a DeckID, looks up the date the deck was cached on and returns how many whole days ago that was, or None if the
+deck isn't cached
+
+:param deck_id: The DeckID of this deck on MTGGoldfish
+"""
+def cached_deck_age_days(deck_id):
+    cached_dates = get_cached_deck_dates([deck_id])
+    if deck_id not in cached_dates:
+        return None
+    return get_cached_date_age_days(cached_dates[deck_id])
+
+
+"""
+Given a DeckID, looks up the date the deck was cached on and returns true if the date is >= 30 days old
+
+:param deck_id: The DeckID of this deck on MTGGoldfish
+"""
+def cached_deck_is_old(deck_id):
+    cached_deck_age = cached_deck_age_days(deck_id)
+    if cached_deck_age is None:
         return False
+    return cached_deck_age >= OLD_CACHED_DECK_AGE_DAYS
+
+
+"""
+Save the given decks to the local deck cache in a single transaction, dated today
+
+:param decks_by_id: A dict of the Deck object of each DeckID from MTGGoldfish.com
+"""
+def save_decks_to_cache(decks_by_id):
+    todays_date = datetime.now()
+    cached_date = datetime(todays_date.year, todays_date.month, todays_date.day)
+    get_deck_store().save_decks([(deck_id, deck, cached_date) for (deck_id, deck) in decks_by_id.items()])
+
+
+"""
+Given a Deck object, save it to the local deck cache
+
+:param deck: The Deck object to store
+:param deck_id: The DeckID for the deck from MTGGoldfish.com
+"""
+def save_deck_to_cache(deck, deck_id):
+    save_decks_to_cache({deck_id: deck})
+
+
+"""
+Given a list of DeckIDs, load all of them from the cache at once, returning a dict of the Deck object of each of them.
+Decks are taken from the deck archive when it has a copy at least as recent as the deck cache's, exactly as they were
+archived, and from the deck cache otherwise
+
+:param deck_ids: The list of DeckIDs to load
+"""
+def load_decks_from_cache(deck_ids):
+    if deck_archive is None:
+        return get_deck_store().load_decks(deck_ids)
+
+    archived_dates = deck_archive.get_cached_dates(deck_ids)
+    cached_dates = get_deck_store().get_cached_dates(list(archived_dates))
+    decks = deck_archive.load_decks([deck_id for (deck_id, archived_date) in archived_dates.items()
+                                     if deck_id not in cached_dates or archived_date >= cached_dates[deck_id]])
+    decks.update(get_deck_store().load_decks([deck_id for deck_id in deck_ids if deck_id not in decks]))
+    return decks
+
 
-    cached_decks = os.listdir(cache_dir)
-    for cached_deck_file_name in cached_decks:
+"""
+Given a DeckID, load the deck from the cache
+"""
+def load_deck_from_cache(deck_id):
+    return load_decks_from_cache([deck_id])[deck_id]
+
+
+"""
+Evict the least recently used decks from the cache if it's over either of the given limits. Decks listed in
+desired_decks.txt are never evicted
 
-        # The deck file names are of the format <deck_id>_MM_DD_YYYY
-        cached_deck_id = cached_deck_file_name.split('_')[0]
-        if cached_deck_id == deck_id:
+:param max_cached_decks: The maximum number of decks to keep cached, or None for no limit
+:param max_cache_mb: The maximum size of the cache in megabytes, or None for no limit
+:param protected_deck_ids: The DeckIDs which are never evicted
+"""
+def enforce_deck_cache_limits(max_cached_decks, max_cache_mb, protected_deck_ids):
+    if max_cached_decks is None and max_cache_mb is None:
+        return
+
+    max_cache_bytes = None
+    if max_cache_mb is not None:
+        max_cache_bytes = int(max_cache_mb * 1024 * 1024)
+    num_evicted_decks = get_deck_store().evict_least_recently_used_decks(max_cached_decks, max_cache_bytes, protected_deck_ids)
+    if num_evicted_decks > 0:
+        (num_decks, num_bytes) = get_deck_store().get_cache_size()
+        print("   Evicted the %s least recently used decks from the cache, %s decks (%.1f MB) remain cached." % (
+            num_evicted_decks, num_decks, num_bytes / (1024.0 * 1024.0)))
+
+
+"""
+Find out what changed in each of the given decks the last time it was fetched, compared to the revision of it that was
+cached before. Returns a list of (deck_name, old_cached_date, new_cached_date, deck_changes) tuples, leaving out decks
+that only have a single revision, see DeckStore.get_deck_changes() for deck_changes
+
+:param deck_ids: The list of DeckIDs to look up
+:param use_online_price: True to compare online (tix) prices rather than paper prices
+"""
+def get_latest_deck_changes(deck_ids, use_online_price):
+    latest_deck_changes = []
+    for deck_id in deck_ids:
+        deck_revisions = get_deck_store().get_deck_revisions(deck_id)
+        if len(deck_revisions) < 2:
+            continue
+
+        ((old_revision, old_cached_date, old_is_checkpoint), (new_revision, new_cached_date, new_is_checkpoint)) = deck_revisions[-2:]
+        latest_deck_changes.append((get_deck_store().load_deck_revision(deck_id, new_revision).get_deck_name(), old_cached_date,
+                                    new_cached_date, get_deck_store().get_deck_changes(deck_id, old_revision, new_revision, use_online_price)))
+    return latest_deck_changes
+
+
+"""
+Compact the deck cache, removing any entries that can't be used anymore, and shrink the files it's kept in
+"""
+def compact_deck_cache():
+    db_file_path = get_deck_store().db_file_path
+    size_before_compaction = os.path.getsize(db_file_path)
+    num_removed_rows = get_deck_store().compact()
+    num_removed_landing_page_files = compact_landing_page_cache()
+    print("   Removed %s unreadable decks, %s orphaned deck entries, %s orphaned usage counts, %s orphaned deck revisions, %s orphaned deck"
+          " scores, %s orphaned deck score versions, %s price history entries of unused cards and %s unused cards." % (
+              num_removed_rows['decks'], num_removed_rows['deck_entries'], num_removed_rows['deck_usage'], num_removed_rows['deck_revisions'],
+              num_removed_rows['metagame_deck_scores'], num_removed_rows['deck_score_versions'], num_removed_rows['price_history'],
+              num_removed_rows['cards']))
+    print("   Removed %s unreadable or leftover files from the landing page cache." % (num_removed_landing_page_files))
+    print("   deck_cache.db went from %.1f MB to %.1f MB." % (
+        size_before_compaction / (1024.0 * 1024.0), os.path.getsize(db_file_path) / (1024.0 * 1024.0)))
+
+
+"""
+A read-only archive of cached decks in a single file, written by export_deck_archive(). The file is memory-mapped rather
+than read, so opening it takes about as long no matter how many decks it holds, and several runs using the same archive
+at the same time share its pages instead of each keeping a copy of their own. Nothing is decoded until it's needed: the
+index of the decks the first time a deck is looked up, and each deck (along with the names of its cards) only when it
+is loaded.
+
+The file starts with a header (see DECK_ARCHIVE_HEADER_FORMAT) holding the number of cards and decks, and the offsets of
+the card table and the deck index. It is followed by one record per deck: a fixed size header (name and URL lengths,
+dates as ordinals, prices, with NaN for a missing price, and the number of cards), the deck's name and URL, and then
+four arrays holding the card indices, quantities, paper prices and online prices of its cards. The card table holds the
+offset of every card name followed by the names themselves, and the deck index holds each DeckID along with the offset
+of its record.
+
+:param archive_file_path: The path of the archive file
+"""
+class DeckArchive(object):
+    def __init__(self, archive_file_path):
+        self.archive_file_path = archive_file_path
+        with open(archive_file_path, 'rb') as archive_file:
+            self.mapped_archive = mmap.mmap(archive_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapped_archive) < struct.calcsize(DECK_ARCHIVE_HEADER_FORMAT):
+            self.mapped_archive.close()
+            raise ValueError("%s is too short to be a deck archive" % (archive_file_path))
+
+        (magic, format_version, self.num_cards, self.num_decks, card_table_offset, self.deck_index_offset) = struct.unpack_from(
+            DECK_ARCHIVE_HEADER_FORMAT, self.mapped_archive, 0)
+        if magic != DECK_ARCHIVE_MAGIC or format_version != DECK_ARCHIVE_FORMAT_VERSION:
+            self.mapped_archive.close()
+            raise ValueError("%s isn't a deck archive this version of the script can read" % (archive_file_path))
+
+        # The card table has to fit between the deck records and the deck index, and be followed by exactly as many bytes of
+        # card names as it says. An archive that was cut short fails these checks as soon as it's missing part of its card table
+        self.card_names_offset = card_table_offset + (self.num_cards + 1) * 8
+        if not (struct.calcsize(DECK_ARCHIVE_HEADER_FORMAT) <= card_table_offset and self.card_names_offset <= self.deck_index_offset and
+                self.deck_index_offset <= len(self.mapped_archive)):
+            self.mapped_archive.close()
+            raise ValueError("%s is corrupted: its card table or deck index lies past the end of the file" % (archive_file_path))
+        self.card_name_offsets = array('Q', self.mapped_archive[card_table_offset:self.card_names_offset])
+        if sys.byteorder == 'big':
+            self.card_name_offsets.byteswap()
+        if self.card_names_offset + self.card_name_offsets[-1] != self.deck_index_offset:
+            self.mapped_archive.close()
+            raise ValueError("%s is corrupted: its card names don't end where its deck index starts" % (archive_file_path))
+        self.card_table_offset = card_table_offset
+
+        # The card_name_table ID of each card in the archive, looked up the first time a deck containing the card is loaded
+        self.card_ids = [None] * self.num_cards
+
+        # Maps each DeckID to the offset of its record, read the first time a deck is looked up
+        self.deck_record_offsets = None
+
+    def close(self):
+        self.mapped_archive.close()
+
+    def get_deck_record_offsets(self):
+        if self.deck_record_offsets is None:
+            deck_record_offsets = {}
+            index_entry_size = struct.calcsize(DECK_ARCHIVE_INDEX_ENTRY_FORMAT)
+            index_entry_offset = self.deck_index_offset
+            for deck_index in range(self.num_decks):
+                (deck_id_length, deck_record_offset) = struct.unpack_from(DECK_ARCHIVE_INDEX_ENTRY_FORMAT, self.mapped_archive, index_entry_offset)
+                index_entry_offset += index_entry_size
+                deck_id = self.mapped_archive[index_entry_offset:index_entry_offset + deck_id_length].decode('utf-8')
+                index_entry_offset += deck_id_length
+                if deck_record_offset >= self.card_table_offset:
+                    raise ValueError("%s is corrupted: deck %s lies past the deck records" % (self.archive_file_path, deck_id))
+                deck_record_offsets[deck_id] = deck_record_offset
+
+            # The deck index is the last thing in the file, so an archive that was cut short is missing part of it
+            if index_entry_offset != len(self.mapped_archive):
+                raise ValueError("%s is corrupted: its deck index doesn't end at the end of the file" % (self.archive_file_path))
+            self.deck_record_offsets = deck_record_offsets
+        return self.deck_record_offsets
+
+    """
+    Return a dict of the date each of the given decks was cached on before being archived, leaving out any of them that
+    aren't in the archive
+
+    :param deck_ids: The list of DeckIDs to look up
+    """
+    def get_cached_dates(self, deck_ids):
+        cached_dates = {}
+        deck_record_offsets = self.get_deck_record_offsets()
+        for deck_id in deck_ids:
+            if deck_id in deck_record_offsets:
+                cached_date_ordinal = struct.unpack_from(DECK_ARCHIVE_DECK_HEADER_FORMAT, self.mapped_archive, deck_record_offsets[deck_id])[5]
+                cached_dates[deck_id] = datetime.fromordinal(cached_date_ordinal)
+        return cached_dates
+
+    """
+    Load the given decks, returning a dict of the Deck object of each of them. Decks that aren't in the archive are left out
+
+    :param deck_ids: The list of DeckIDs to load
+    """
+    def load_decks(self, deck_ids):
+        decks = {}
+        deck_record_offsets = self.get_deck_record_offsets()
+        for deck_id in deck_ids:
+            if deck_id in deck_record_offsets:
+                decks[deck_id] = self.decode_deck(deck_record_offsets[deck_id])
+        return decks
+
+    def get_card_id(self, archive_card_index):
+        card_id = self.card_ids[archive_card_index]
+        if card_id is None:
+            card_name = self.mapped_archive[self.card_names_offset + self.card_name_offsets[archive_card_index]:
+                                            self.card_names_offset + self.card_name_offsets[archive_card_index + 1]].decode('utf-8')
+            card_id = card_name_table.get_card_id(card_name)
+            self.card_ids[archive_card_index] = card_id
+        return card_id
+
+    def decode_deck(self, deck_record_offset):
+        (deck_name_type, deck_name_length, deck_url_type, deck_url_length, deck_date_ordinal, cached_date_ordinal, deck_paper_price,
+         deck_online_price, num_cards) = struct.unpack_from(DECK_ARCHIVE_DECK_HEADER_FORMAT, self.mapped_archive, deck_record_offset)
+        field_offset = deck_record_offset + struct.calcsize(DECK_ARCHIVE_DECK_HEADER_FORMAT)
+
+        deck = Deck()
+        deck.deck_name = decode_archived_text(deck_name_type, self.mapped_archive[field_offset:field_offset + deck_name_length])
+        field_offset += deck_name_length
+        deck.deck_url = decode_archived_text(deck_url_type, self.mapped_archive[field_offset:field_offset + deck_url_length])
+        field_offset += deck_url_length
+        deck.deck_date = datetime.fromordinal(deck_date_ordinal)
+        deck.deck_paper_price = None if math.isnan(deck_paper_price) else deck_paper_price
+        deck.deck_online_price = None if math.isnan(deck_online_price) else deck_online_price
+
+        card_arrays = []
+        for typecode in ['i', 'i', 'd', 'd']:
+            card_array = array(typecode)
+            card_array.frombytes(self.mapped_archive[field_offset:field_offset + num_cards * card_array.itemsize])
+            if sys.byteorder == 'big':
+                card_array.byteswap()
+            field_offset += num_cards * card_array.itemsize
+            card_arrays.append(card_array)
+        (archive_card_indices, deck.card_quantities, deck.card_paper_prices, deck.card_online_prices) = card_arrays
+        if field_offset > self.card_table_offset or (num_cards > 0 and (min(archive_card_indices) < 0 or max(archive_card_indices) >= self.num_cards)):
+            raise ValueError("%s is corrupted: the deck at offset %s doesn't hold valid cards" % (self.archive_file_path, deck_record_offset))
+        deck.card_ids = array('i', [self.get_card_id(archive_card_index) for archive_card_index in archive_card_indices])
+        deck.deck_size = sum(deck.card_quantities)
+
+        if deck.has_price_type(False):
+            deck.use_price_type(False)
+        return deck
+
+
+"""
+Return how a deck's name or URL is stored in a deck archive, as an (ARCHIVED_TEXT_TYPE_*, encoded_text) tuple
+
+:param text: The name or URL of the deck
+"""
+def encode_archived_text(text):
+    if text is None:
+        return (ARCHIVED_TEXT_TYPE_NONE, b'')
+    if isinstance(text, bytes):
+        return (ARCHIVED_TEXT_TYPE_BYTES, text)
+    return (ARCHIVED_TEXT_TYPE_STR, text.encode('utf-8'))
+
+
+"""
+Return a deck's name or URL as it was before it was stored in a deck archive, see encode_archived_text()
+
+:param text_type: One of the ARCHIVED_TEXT_TYPE_* constants
+:param encoded_text: The text, as it's stored in the archive
+"""
+def decode_archived_text(text_type, encoded_text):
+    if text_type == ARCHIVED_TEXT_TYPE_NONE:
+        return None
+    if text_type == ARCHIVED_TEXT_TYPE_BYTES:
+        return bytes(encoded_text)
+    return encoded_text.decode('utf-8')
+
+
+"""
+Export every deck in the deck cache into a single deck archive (see DeckArchive), replacing the file if it exists.
+Decks are exported with the latest prices of their cards, and the archive is written in one step, so a run reading the
+previous archive at the same time isn't affected. Returns the number of decks exported
+
+:param archive_file_path: The path of the archive file to write
+"""
+def export_deck_archive(archive_file_path):
+    def write_deck_archive(output):
+        output.write(b'\0' * struct.calcsize(DECK_ARCHIVE_HEADER_FORMAT))
+        archive_card_indices = {}
+        card_names = []
+        deck_index_entries = []
+
+        for deck_ids_batch in split_into_chunks(get_deck_store().get_cached_deck_ids(), CACHE_LOAD_BATCH_SIZE):
+            cached_decks = get_deck_store().load_decks(deck_ids_batch)
+            cached_dates = get_deck_store().get_cached_dates(deck_ids_batch)
+            for deck_id in deck_ids_batch:
+                if deck_id not in cached_decks:
+                    continue
+                deck = cached_decks[deck_id]
+                deck_index_entries.append((deck_id, output.tell()))
+
+                card_indices = array('i')
+                for card_id in deck.card_ids:
+                    card_name = card_name_table.get_card_name(card_id)
+                    if card_name not in archive_card_indices:
+                        archive_card_indices[card_name] = len(card_names)
+                        card_names.append(card_name)
+                    card_indices.append(archive_card_indices[card_name])
+
+                (deck_name_type, encoded_deck_name) = encode_archived_text(deck.deck_name)
+                (deck_url_type, encoded_deck_url) = encode_archived_text(deck.deck_url)
+                output.write(struct.pack(
+                    DECK_ARCHIVE_DECK_HEADER_FORMAT, deck_name_type, len(encoded_deck_name), deck_url_type, len(encoded_deck_url),
+                    deck.deck_date.toordinal(), cached_dates[deck_id].toordinal(),
+                    float('nan') if deck.deck_paper_price is None else deck.deck_paper_price,
+                    float('nan') if deck.deck_online_price is None else deck.deck_online_price, len(card_indices)))
+                output.write(encoded_deck_name)
+                output.write(encoded_deck_url)
+                for card_array in [card_indices, deck.card_quantities, deck.card_paper_prices, deck.card_online_prices]:
+                    if sys.byteorder == 'big':
+                        card_array = array(card_array.typecode, card_array)
+                        card_array.byteswap()
+                    output.write(card_array.tobytes())
+            cached_decks = None
+
+        card_table_offset = output.tell()
+        encoded_card_names = [card_name.encode('utf-8') for card_name in card_names]
+        card_name_offsets = array('Q', [0])
+        for encoded_card_name in encoded_card_names:
+            card_name_offsets.append(card_name_offsets[-1] + len(encoded_card_name))
+        if sys.byteorder == 'big':
+            card_name_offsets.byteswap()
+        output.write(card_name_offsets.tobytes())
+        output.write(b''.join(encoded_card_names))
+
+        deck_index_offset = output.tell()
+        for (deck_id, deck_record_offset) in deck_index_entries:
+            encoded_deck_id = deck_id.encode('utf-8')
+            output.write(struct.pack(DECK_ARCHIVE_INDEX_ENTRY_FORMAT, len(encoded_deck_id), deck_record_offset))
+            output.write(encoded_deck_id)
+
+        output.seek(0)
+        output.write(struct.pack(DECK_ARCHIVE_HEADER_FORMAT, DECK_ARCHIVE_MAGIC, DECK_ARCHIVE_FORMAT_VERSION, len(card_names),
+                                 len(deck_index_entries), card_table_offset, deck_index_offset))
+        return len(deck_index_entries)
+
+    num_exported_decks = []
+    write_file_atomically(archive_file_path, lambda output: num_exported_decks.append(write_deck_archive(output)))
+    return num_exported_decks[0]
+
+
+"""
+Given the URL of a category landing page, return the path of the file its deck URL list is cached in.
+The file name is the URL with everything other than letters and digits replaced, such as
+"www_mtggoldfish_com_decks_budget_modern_paper"
+
+:param category_landing_page_url: The URL of the category landing page
+"""
+def get_landing_page_cache_file_path(category_landing_page_url):
+    cache_file_name = re.sub(r'[^A-Za-z0-9]+', '_', category_landing_page_url.strip().split('://')[-1]).strip('_')
+    return os.path.join(landing_page_cache_dir, cache_file_name)
+
+
+"""
+Load the deck URLs last scraped from a category landing page, as long as they were scraped less than
+ttl_hours ago. Returns None if there's no cached list, or if it has expired
+
+:param category_landing_page_url: The URL of the category landing page
+:param ttl_hours: How many hours a cached deck URL list stays valid for
+"""
+def load_landing_page_urls_from_cache(category_landing_page_url, ttl_hours):
+    cache_file_path = get_landing_page_cache_file_path(category_landing_page_url)
+    if not os.path.isfile(cache_file_path):
+        return None
+
+    # A file left truncated or corrupt by an interrupted run is simply treated as a missing one
+    try:
+        with open(cache_file_path, 'rb') as input:
+            (fetched_date, deck_url_list) = pickle.load(input)
+    except (EOFError, OSError, ValueError, pickle.UnpicklingError):
+        return None
+
+    time_delta_since_last_update = datetime.now() - fetched_date
+    if time_delta_since_last_update.total_seconds() >= ttl_hours * 60 * 60:
+        return None
+
+    return deck_url_list
+
+
+"""
+Save the deck URLs scraped from a category landing page, together with the time they were scraped
+
+:param category_landing_page_url: The URL of the category landing page
+:param deck_url_list: The list of deck URLs found on the landing page
+"""
+def save_landing_page_urls_to_cache(category_landing_page_url, deck_url_list):
+    cache_file_path = get_landing_page_cache_file_path(category_landing_page_url)
+    write_pickle_file_atomically(cache_file_path, (datetime.now(), deck_url_list))
+
+
+"""
+Pickle an object into a file, so that another run reading the file at the same time sees either the previous content
+of the file or the new one, but never a partially written file (see write_file_atomically())
+
+:param file_path: The path of the file to write
+:param object_to_pickle: The object to pickle into the file
+"""
+def write_pickle_file_atomically(file_path, object_to_pickle):
+    write_file_atomically(file_path, lambda output: pickle.dump(object_to_pickle, output, pickle.HIGHEST_PROTOCOL))
+
+
+"""
+Write a file, so that another run reading the file at the same time sees either the previous content of the file or
+the new one, but never a partially written file. The content is written to a temporary file in the same directory
+first, which then replaces the file in a single step
+
+:param file_path: The path of the file to write
+:param write_content_function: A function writing the content of the file to the binary file object it's given
+"""
+def write_file_atomically(file_path, write_content_function):
+    file_dir = os.path.dirname(os.path.abspath(file_path))
+    try:
+        os.makedirs(file_dir)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    (temporary_file_descriptor, temporary_file_path) = tempfile.mkstemp(dir=file_dir, suffix='.tmp')
+    try:
+        with os.fdopen(temporary_file_descriptor, 'wb') as output:
+            write_content_function(output)
+        os.replace(temporary_file_path, file_path)
+    except BaseException:
+        os.remove(temporary_file_path)
+        raise
+
+
+"""
+Remove the files of the landing page cache that can't be read, as well as any temporary files left behind by a run that
+was killed while writing one. Returns the number of files removed
+"""
+def compact_landing_page_cache():
+    if not os.path.isdir(landing_page_cache_dir):
+        return 0
+
+    num_removed_files = 0
+    for cache_file_name in os.listdir(landing_page_cache_dir):
+        cache_file_path = os.path.join(landing_page_cache_dir, cache_file_name)
+        try:
+            if not cache_file_name.endswith('.tmp'):
+                with open(cache_file_path, 'rb') as input:
+                    (fetched_date, deck_url_list) = pickle.load(input)
+                continue
+        except Exception:
+            pass
+        os.remove(cache_file_path)
+        num_removed_files += 1
+    return num_removed_files
+
+
+"""
+Manages the Firefox WebDriver sessions used during a run. Rather than launching (and tearing down) a brand new
+browser for every page we load, sessions are launched once and handed back out for each navigation. A session
+that has crashed is detected when it is handed out (or when a navigation on it fails) and is replaced with a fresh one.
+Time spent launching browsers vs navigating to pages is tracked so it can be reported at the end of a run.
+
+The pool is safe to share between worker threads. When every session is in use, acquire_session() blocks until
+another thread releases one.
+
+:param max_sessions: The maximum number of browser sessions this pool will keep open at once
+:param headless: If set to True, the browsers are launched without a visible window
+"""
+class BrowserSessionPool(object):
+    def __init__(self, max_sessions=1, headless=False, page_timeout_seconds=30):
+        self.max_sessions = max(1, max_sessions)
+        self.headless = headless
+        self.page_timeout_seconds = page_timeout_seconds
+        self.idle_sessions = []
+        self.num_open_sessions = 0
+        self.num_sessions_launched = 0
+        self.num_sessions_replaced = 0
+        self.num_pages_loaded = 0
+        self.startup_seconds = 0.0
+        self.navigation_seconds = 0.0
+
+        # How long each page took to load (including waiting for the element we need), as (seconds, url) tuples
+        self.page_load_timings = []
+        self.session_available = threading.Condition()
+
+    def launch_session(self):
+        firefox_options = webdriver.FirefoxOptions()
+        if self.headless:
+            firefox_options.add_argument("-headless")
+        firefox_options.page_load_strategy = BROWSER_PAGE_LOAD_STRATEGY
+        for (preference_name, preference_value) in BROWSER_FETCH_PREFERENCES.items():
+            firefox_options.set_preference(preference_name, preference_value)
+
+        start_time = time.time()
+        try:
+            driver = webdriver.Firefox(options=firefox_options)
+            driver.set_page_load_timeout(self.page_timeout_seconds)
+        except:
+            # Give the slot we reserved for this session back so that other threads don't wait on it forever
+            with self.session_available:
+                self.num_open_sessions -= 1
+                self.session_available.notify()
+            raise
+        with self.session_available:
+            self.startup_seconds += time.time() - start_time
+            self.num_sessions_launched += 1
+        return driver
+
+    def session_is_alive(self, driver):
+        # Any call that has to round-trip to the browser will fail once the session (or the browser process itself) is gone
+        try:
+            driver.current_url
             return True
+        except WebDriverException:
+            return False
+
+    def discard_session(self, driver):
+        with self.session_available:
+            self.num_open_sessions -= 1
+            self.session_available.notify()
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def replace_session(self, driver):
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        with self.session_available:
+            self.num_sessions_replaced += 1
+        return self.launch_session()
+
+    """
+    Hand out an idle browser session, launching a new one if none are idle and the pool isn't full yet. If the pool
+    is full, this blocks until another thread releases a session. Crashed sessions are replaced before being handed out
+    """
+    def acquire_session(self):
+        with self.session_available:
+            while len(self.idle_sessions) == 0 and self.num_open_sessions >= self.max_sessions:
+                self.session_available.wait()
+            if len(self.idle_sessions) == 0:
+                # Reserve the slot now, the (slow) browser launch happens outside of the lock
+                self.num_open_sessions += 1
+                driver = None
+            else:
+                driver = self.idle_sessions.pop()
+
+        if driver is None:
+            return self.launch_session()
+        if not self.session_is_alive(driver):
+            driver = self.replace_session(driver)
+        return driver
+
+    def release_session(self, driver):
+        with self.session_available:
+            self.idle_sessions.append(driver)
+            self.session_available.notify()
+
+    """
+    Navigate the given session to the URL, returning the session that actually loaded the page. If the navigation
+    fails because the browser crashed, the session is replaced and the navigation is attempted once more. Any other
+    failure, including the page not loading within page_timeout_seconds, is raised back to the caller
+
+    :param driver: A session previously handed out by acquire_session()
+    :param url: The URL to navigate to
+    :param ready_class_name: If given, also wait (up to page_timeout_seconds) for an element with this class name to
+                             show up on the page before returning
+    """
+    def navigate(self, driver, url, ready_class_name=None):
+        for attempt in range(2):
+            start_time = time.time()
+            try:
+                driver.get(url)
+                if ready_class_name is not None:
+                    WebDriverWait(driver, self.page_timeout_seconds).until(
+                        expected_conditions.presence_of_element_located((By.CLASS_NAME, ready_class_name)))
+                page_load_seconds = time.time() - start_time
+                with self.session_available:
+                    self.navigation_seconds += page_load_seconds
+                    self.num_pages_loaded += 1
+                    self.page_load_timings.append((page_load_seconds, url.strip()))
+                return driver
+            except WebDriverException:
+                with self.session_available:
+                    self.navigation_seconds += time.time() - start_time
+                if attempt > 0 or self.session_is_alive(driver):
+                    raise
+                driver = self.replace_session(driver)
+
+    def close_all_sessions(self):
+        with self.session_available:
+            idle_sessions = self.idle_sessions
+            self.idle_sessions = []
+        for driver in idle_sessions:
+            self.discard_session(driver)
+
+    def print_timing_summary(self):
+        if self.num_sessions_launched == 0:
+            return
+        print("   Browser sessions: %d launched (%d replaced after crashing), %d pages loaded. %.2f seconds spent starting browsers, %.2f seconds spent navigating." % (
+            self.num_sessions_launched, self.num_sessions_replaced, self.num_pages_loaded, self.startup_seconds, self.navigation_seconds))
+        if len(self.page_load_timings) == 0:
+            return
+        sorted_timings = sorted(self.page_load_timings)
+        print("   Page loads: %.2f seconds on average, %.2f seconds median, %.2f seconds slowest (%s)." % (
+            sum([seconds for (seconds, url) in sorted_timings]) / len(sorted_timings),
+            sorted_timings[len(sorted_timings) // 2][0], sorted_timings[-1][0], sorted_timings[-1][1]))
+
+
+"""
+A single element of an HTML document, as built by HtmlTreeBuilder. Only provides the handful of lookups
+that we need for parsing the MTGGoldfish.com pages: by class name, by tag name, attributes and textContent
+"""
+class HtmlElement(object):
+    def __init__(self, tag, attributes, parent):
+        self.tag = tag
+        self.attributes = dict(attributes)
+        self.parent = parent
+
+        # A mix of child HtmlElements and the raw text between them, in document order
+        self.children = []
+
+    def get_attribute(self, attribute_name):
+        return self.attributes.get(attribute_name)
+
+    def has_class(self, class_name):
+        return class_name in (self.attributes.get('class') or '').split()
+
+    def iter_descendants(self):
+        for child in self.children:
+            if isinstance(child, HtmlElement):
+                yield child
+                for descendant in child.iter_descendants():
+                    yield descendant
+
+    def find_all_by_class(self, class_name):
+        return [element for element in self.iter_descendants() if element.has_class(class_name)]
+
+    def find_all_by_tag(self, tag):
+        return [element for element in self.iter_descendants() if element.tag == tag]
+
+    """
+    Return the first descendant with the given class name, raising a ValueError if there isn't one so that
+    a missing element is treated the same way as Selenium's find_element() would treat it
+    """
+    def find_by_class(self, class_name):
+        for element in self.iter_descendants():
+            if element.has_class(class_name):
+                return element
+        raise ValueError("No element with class \"%s\" found" % (class_name))
+
+    def find_by_tag(self, tag):
+        for element in self.iter_descendants():
+            if element.tag == tag:
+                return element
+        raise ValueError("No <%s> element found" % (tag))
+
+    def text_content(self):
+        text_chunks = []
+        for child in self.children:
+            if isinstance(child, HtmlElement):
+                text_chunks.append(child.text_content())
+            else:
+                text_chunks.append(child)
+        return ''.join(text_chunks)
+
+
+"""
+Builds a tree of HtmlElements out of raw HTML using the standard library's HTMLParser, so that pages
+can be parsed without a browser. Tags that were left open (such as an unclosed <td>) are closed the
+same way a browser would close them, which is all the leniency the MTGGoldfish.com pages need
+"""
+class HtmlTreeBuilder(HTMLParser):
+    def __init__(self):
+        HTMLParser.__init__(self, convert_charrefs=True)
+        self.root = HtmlElement('#document', [], None)
+        self.current_element = self.root
+
+    def close_open_element(self, tag, stop_at_tags):
+        element = self.current_element
+        while element is not self.root and element.tag not in stop_at_tags:
+            if element.tag == tag:
+                self.current_element = element.parent
+                return
+            element = element.parent
+
+    def handle_starttag(self, tag, attributes):
+        # A new cell implicitly ends the previous one, and a new row implicitly ends the previous row
+        if tag in ['td', 'th']:
+            self.close_open_element('td', ['tr', 'table'])
+            self.close_open_element('th', ['tr', 'table'])
+        elif tag == 'tr':
+            self.close_open_element('tr', ['tbody', 'thead', 'tfoot', 'table'])
+
+        element = HtmlElement(tag, attributes, self.current_element)
+        self.current_element.children.append(element)
+        if tag not in VOID_HTML_ELEMENTS:
+            self.current_element = element
+
+    def handle_startendtag(self, tag, attributes):
+        self.current_element.children.append(HtmlElement(tag, attributes, self.current_element))
+
+    def handle_endtag(self, tag):
+        # Stray end tags which don't match anything that's open are ignored, just like a browser would
+        element = self.current_element
+        while element is not self.root:
+            if element.tag == tag:
+                self.current_element = element.parent
+                return
+            element = element.parent
+
+    def handle_data(self, data):
+        self.current_element.children.append(data)
+
+
+"""
+Parse raw HTML (bytes or text) into a tree of HtmlElements, returning the root of the document
+
+:param raw_html: The HTML of the page, as bytes or text. Bytes are decoded as UTF-8
+"""
+def parse_html_document(raw_html):
+    if isinstance(raw_html, bytes):
+        raw_html = raw_html.decode('utf-8', 'replace')
+    tree_builder = HtmlTreeBuilder()
+    tree_builder.feed(raw_html)
+    tree_builder.close()
+    return tree_builder.root
+
+
+"""
+Download the raw HTML of a page without a browser
+
+:param url: The URL of the page to download. Saved pages can be loaded using "file://" URLs
+"""
+def download_page_html(url):
+    request = Request(url.strip(), headers={'User-Agent': HTTP_USER_AGENT})
+    response = urlopen(request, timeout=HTTP_TIMEOUT_SECONDS)
+    try:
+        return response.read()
+    finally:
+        response.close()
+
+
+"""
+The browser-free equivalent of running DECK_PAGE_EXTRACTION_SCRIPT on a deck page. Returns the same dict of
+raw text, ready for build_deck_from_extracted_page(). Raises a ValueError if the page doesn't contain a deck
+
+:param raw_html: The HTML of the deck page, as bytes or text
+"""
+def extract_deck_page_from_html(raw_html):
+    document = parse_html_document(raw_html)
+
+    def extract_rows(table_container):
+        if table_container is None:
+            return None
+        rows = []
+        for row in table_container.find_by_tag('tbody').find_all_by_tag('tr'):
+            rows.append([cell.text_content() for cell in row.find_all_by_tag('td')])
+        return rows
+
+    def find_price_tab_table(tab_id):
+        for element in document.iter_descendants():
+            if element.get_attribute('id') == tab_id:
+                tables = element.find_all_by_class('deck-table-container')
+                if len(tables) > 0:
+                    return tables[0]
+        return None
+
+    paper_table = find_price_tab_table('tab-paper')
+    if paper_table is None:
+        paper_table = document.find_by_class('deck-table-container')
+
+    return {PAGE_DECK_NAME_KEY: document.find_by_class('title').text_content(),
+            PAGE_DECK_DATE_KEY: document.find_by_class('deck-container-information').text_content(),
+            PAGE_PAPER_ROWS_KEY: extract_rows(paper_table),
+            PAGE_ONLINE_ROWS_KEY: extract_rows(find_price_tab_table('tab-online'))}
+
+
+"""
+The browser-free equivalent of scraping the deck URLs off of a category landing page. Just like the
+Selenium version, parsing stops at the first deck tile that doesn't have the expected layout
+
+:param raw_html: The HTML of the landing page, as bytes or text
+:param category_landing_page_url: The URL the page was loaded from, used to resolve any relative deck links
+"""
+def extract_deck_urls_from_landing_page_html(raw_html, category_landing_page_url):
+    document = parse_html_document(raw_html)
+
+    deck_URL_container_element_tag = "deck-price-paper"
+    if "#online" in category_landing_page_url.lower():
+        deck_URL_container_element_tag = "deck-price-online"
 
-    return False
+    deck_url_list = []
+    try:
+        for tile in document.find_all_by_class("archetype-tile"):
+            deck_description_container = tile.find_by_class("archetype-tile-description-wrapper").find_by_class(
+                "archetype-tile-description").find_by_class(deck_URL_container_element_tag)
+            deck_url = deck_description_container.find_by_tag('a').get_attribute("href")
+            deck_url_list.append(urljoin(category_landing_page_url, deck_url))
+    except ValueError:
+        return deck_url_list
+
+    return deck_url_list
+
+
+"""
+Schedules a batch of page fetches, retrying any that fail and spacing requests out so that no single host is hit
+more often than the configured rate limit. Fetches run on an asyncio event loop, with up to max_concurrency of them
+in flight at once. The fetch function itself is blocking (a browser navigation or an HTTP download), so each attempt
+is run on a worker thread. A failed attempt is retried after a jittered exponential backoff. URLs which are still
+failing after the last attempt are handed back to the caller rather than aborting the whole batch.
+
+:param fetch_function: A blocking function which takes a URL and returns the fetched result, raising an exception on failure
+:param max_concurrency: The maximum number of fetches in flight at the same time
+:param requests_per_second: The maximum number of requests started per second against any one host. 0 disables the limit
+:param max_retries: The number of times a failed fetch is retried before the URL is given up on
+:param base_backoff_seconds: The backoff before the first retry. Each further retry doubles it, up to max_backoff_seconds
+:param max_backoff_seconds: The upper bound of the backoff between two attempts
+"""
+class AsyncFetchScheduler(object):
+    def __init__(self, fetch_function, max_concurrency=1, requests_per_second=0, max_retries=3, base_backoff_seconds=1.0, max_backoff_seconds=30.0):
+        self.fetch_function = fetch_function
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_second = requests_per_second
+        self.max_retries = max(0, max_retries)
+        self.base_backoff_seconds = base_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.num_retries = 0
+
+    """
+    The "full jitter" backoff: a random delay between zero and the exponential backoff for this attempt, so that
+    workers which failed at the same time don't all retry at the same time too
+    """
+    def backoff_seconds(self, attempt_number):
+        return random.uniform(0, min(self.max_backoff_seconds, self.base_backoff_seconds * (2 ** attempt_number)))
+
+    """
+    Fetch every URL, returning a tuple of (results, failures). The results are in the same order as the URLs,
+    with None in place of anything that failed. The failures are a list of (url, reason) tuples for each URL
+    which never succeeded
+
+    :param urls: The list of URLs to fetch
+    :param on_result: An optional function called with (index, result) as soon as each fetch succeeds
+    """
+    def run(self, urls, on_result=None):
+        if len(urls) == 0:
+            return ([], [])
+
+        event_loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            return event_loop.run_until_complete(self.run_batch(event_loop, executor, urls, on_result))
+        finally:
+            executor.shutdown(wait=True)
+            event_loop.close()
+
+    async def run_batch(self, event_loop, executor, urls, on_result):
+        results = [None] * len(urls)
+        failures = []
+        in_flight_limit = asyncio.Semaphore(self.max_concurrency)
+        host_locks = {}
+        next_request_time_by_host = {}
+
+        async def wait_for_host_slot(url):
+            if self.requests_per_second <= 0:
+                return
+            host = urlparse(url.strip()).netloc
+            if host not in host_locks:
+                host_locks[host] = asyncio.Lock()
+            async with host_locks[host]:
+                now = event_loop.time()
+                request_time = max(now, next_request_time_by_host.get(host, now))
+                next_request_time_by_host[host] = request_time + 1.0 / self.requests_per_second
+            await asyncio.sleep(request_time - now)
+
+        async def fetch_with_retries(url_index, url):
+            async with in_flight_limit:
+                for attempt_number in range(self.max_retries + 1):
+                    await wait_for_host_slot(url)
+                    try:
+                        result = await event_loop.run_in_executor(executor, self.fetch_function, url)
+                    except Exception as error:
+                        if attempt_number == self.max_retries:
+                            failures.append((url, str(error) or error.__class__.__name__))
+                            return
+                        self.num_retries += 1
+                        await asyncio.sleep(self.backoff_seconds(attempt_number))
+                        continue
+                    results[url_index] = result
+                    if on_result is not None:
+                        on_result(url_index, result)
+                    return
+
+        await asyncio.gather(*[fetch_with_retries(url_index, url) for url_index, url in enumerate(urls)])
+        return (results, failures)
+
+
+"""
+Loads deck pages and category landing pages from MTGGoldfish.com using the parsing engine selected for this run.
+The HTML engine downloads and parses the raw page without a browser, and falls back to the Selenium engine for any
+page it isn't able to parse (for example if the page layout ever starts depending on JavaScript). The Selenium engine
+drives the browser sessions in the BrowserSessionPool. Throughput of the HTML engine is tracked for the end of run summary.
+
+:param parse_engine: Either PARSE_ENGINE_HTML or PARSE_ENGINE_SELENIUM
+:param browser_pool: The BrowserSessionPool used by the Selenium engine (and the HTML engine's fallback)
+:param num_workers: The number of pages that may be loaded at the same time
+:param requests_per_second: The maximum number of page requests per second made against MTGGoldfish.com. 0 disables the limit
+:param max_retries: The number of times a page that failed to load is retried before it's added to the retry queue
+"""
+class DeckPageFetcher(object):
+    def __init__(self, parse_engine, browser_pool, num_workers=1, requests_per_second=0, max_retries=3):
+        self.parse_engine = parse_engine
+        self.browser_pool = browser_pool
+        self.num_workers = max(1, num_workers)
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.num_retries = 0
+
+        # Every page which still failed to load after all of its retries, as (url, reason) tuples
+        self.retry_queue = []
+        self.num_pages_parsed = 0
+        self.num_bytes_parsed = 0
+        self.num_selenium_fallbacks = 0
+        self.download_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.stats_lock = threading.Lock()
+
+    def download_page(self, url):
+        start_time = time.time()
+        raw_html = download_page_html(url)
+        with self.stats_lock:
+            self.download_seconds += time.time() - start_time
+        return raw_html
+
+    def record_parse(self, raw_html, start_time):
+        with self.stats_lock:
+            self.parse_seconds += time.time() - start_time
+            self.num_pages_parsed += 1
+            self.num_bytes_parsed += len(raw_html)
+
+    def record_fallback(self):
+        with self.stats_lock:
+            self.num_selenium_fallbacks += 1
+
+    def fetch_deck(self, deck_url, use_online_price):
+        if self.parse_engine == PARSE_ENGINE_HTML:
+            raw_html = self.download_page(deck_url)
+            start_time = time.time()
+            try:
+                extracted_page = extract_deck_page_from_html(raw_html)
+                deck = build_deck_from_extracted_page(deck_url, extracted_page, use_online_price)
+                self.record_parse(raw_html, start_time)
+                return deck
+            except ValueError:
+                self.record_fallback()
+
+        return fetch_deck_from_url(deck_url, use_online_price, self.browser_pool)
+
+    """
+    Load all of the given pages through an AsyncFetchScheduler, returning the results in the same order as the URLs
+    (with None for any page that failed). Pages which failed for good are added to the retry queue
+
+    :param urls: The list of URLs to load
+    :param fetch_function: A blocking function that loads and parses a single URL
+    :param on_result: An optional function called with (index, result) as soon as each page is loaded
+    """
+    def fetch_all(self, urls, fetch_function, on_result=None):
+        scheduler = AsyncFetchScheduler(fetch_function, max_concurrency=self.num_workers,
+            requests_per_second=self.requests_per_second, max_retries=self.max_retries)
+        (results, failures) = scheduler.run(urls, on_result)
+        with self.stats_lock:
+            self.num_retries += scheduler.num_retries
+            self.retry_queue.extend(failures)
+        return results
+
+    def fetch_decks(self, deck_URLs_list, use_online_price, on_result=None):
+        return self.fetch_all(deck_URLs_list, lambda deck_url: self.fetch_deck(deck_url, use_online_price), on_result)
+
+    def fetch_landing_page_deck_urls(self, category_landing_page_url):
+        deck_url_list = self.fetch_all([category_landing_page_url], self.load_landing_page_deck_urls)[0]
+        if deck_url_list is None:
+            return []
+        return deck_url_list
+
+    def load_landing_page_deck_urls(self, category_landing_page_url):
+        if self.parse_engine == PARSE_ENGINE_HTML:
+            raw_html = self.download_page(category_landing_page_url)
+            start_time = time.time()
+            deck_url_list = extract_deck_urls_from_landing_page_html(raw_html, category_landing_page_url)
+            self.record_parse(raw_html, start_time)
+            if len(deck_url_list) > 0:
+                return deck_url_list
+            self.record_fallback()
+
+        return parse_deck_urls_from_landing_page_with_browser(category_landing_page_url, self.browser_pool)
+
+    def print_timing_summary(self):
+        if self.num_pages_parsed > 0:
+            print("   HTML engine: %d pages (%.1f KB) parsed in %.2f seconds (%.1f pages/second), %.2f seconds spent downloading. %d pages fell back to the browser." % (
+                self.num_pages_parsed, self.num_bytes_parsed / 1024.0, self.parse_seconds,
+                self.num_pages_parsed / max(self.parse_seconds, 0.001), self.download_seconds, self.num_selenium_fallbacks))
+        self.browser_pool.print_timing_summary()
+        if self.num_retries > 0:
+            print("   %d page loads were retried after failing." % (self.num_retries))
+
+    def print_retry_queue(self):
+        if len(self.retry_queue) == 0:
+            return
+        print("\n[WARNING]: %d page(s) still couldn't be loaded after %d retries, so they were left out of this run:" % (
+            len(self.retry_queue), self.max_retries))
+        for (url, reason) in self.retry_queue:
+            print("   %s (%s)" % (url.strip(), reason))
+        print("   Check your internet connection. Also note that sometimes MTGGoldfish.com experiences issues, try navigating to these URLs yourself and see if they work. Run the script again to retry them.")
+
+
+"""
+Parse the owned_cards.txt file and return the cards as a list of dictionaries of card records
+using CARD_QTY_KEY and CARD_NAME_KEY
+"""
+def parse_owned_cards():
+    owned_cards = []
+    script_dir = os.path.dirname(__file__)
+    owned_cards_file = open(os.path.join(script_dir, 'owned_cards.txt'), 'r')
+    for line in owned_cards_file:
+
+        # Disregard comments and empty lines
+        if line[0] == "#" or len(line) <= 1:
+            continue
+
+        separator_index = line.find(' ')
+        if separator_index == -1:
+            continue
+        card_quantity = int(line[:separator_index])
+        card_name = line[separator_index + 1:].replace('\n', '')
+
+        # Double-check to make sure the user hasn't entered this card in more than once. If so, we aren't going
+        # to try to resolve this for the user by making assumptions. Instead, we will point this out via a Print
+        # statement for them to resolve, and kill the script
+        for card_entry in owned_cards:
+            if card_entry[CARD_NAME_KEY].lower() == card_name.lower():
+                print("[ERROR]: \"%s\" occurs more than once in owned_cards.txt. Exiting." % (
+                    card_name))
+                sys.exit(0)
+
+        owned_cards.append(
+            {CARD_QTY_KEY: card_quantity, CARD_NAME_KEY: card_name})
+
+    owned_cards_file.close()
+
+    return owned_cards
+
+
+"""
+Parse the desired_decks.txt file and return a list of the URLs contained within
+"""
+def parse_desired_deck_URLs():
+    desired_deck_URLs = []
+    script_dir = os.path.dirname(__file__)
+    desired_cards_file = open(os.path.join(script_dir, 'desired_decks.txt'))
+    for line in desired_cards_file:
+
+        # Disregard comments and empty lines
+        if line[0] == "#" or len(line) <= 1:
+            continue
+
+        desired_deck_URLs.append(line)
+
+    desired_cards_file.close()
+
+    return desired_deck_URLs
+
+
+"""
+The URL format is either "https://www.mtggoldfish.com/deck/784979#paper" for a Budget deck
+or "https://www.mtggoldfish.com/archetype/modern-grixis-death-s-shadow#paper" for a Modern Meta deck
+So we fetch the Deck ID from the last '/' to the '#'
+
+:param deck_url: The URL of the deck on MTGGoldfish.com
+"""
+def parse_deck_id_from_url(deck_url):
+    canonical_deck_url = normalize_deck_url(deck_url)
+    return canonical_deck_url[canonical_deck_url.rfind('/') + 1:]
+
+
+"""
+Strip everything from a deck URL that doesn't identify the deck itself, so that the same deck always maps to the same
+URL no matter where it was listed. This removes surrounding whitespace (such as the newline at the end of each line of
+desired_decks.txt), the query string, the #paper/#online fragment and any trailing '/'
+
+:param deck_url: The URL of the deck on MTGGoldfish.com
+"""
+def normalize_deck_url(deck_url):
+    (scheme, netloc, path, query, fragment) = urlsplit(deck_url.strip())
+    return urlunsplit((scheme, netloc, path.rstrip('/'), '', ''))
+
+
+"""
+Given the raw text pulled out of a deck page (see DECK_PAGE_EXTRACTION_SCRIPT), build the corresponding Deck object
+
+:param deck_url: The URL of the deck on MTGGoldfish.com
+:param extracted_page: A dict containing the raw textContent of the deck name and deck date elements, as well as the
+                       textContent of every cell of every row in the paper and online deck tables
+:param use_online_price: True if the deck's prices should be set up for online (tix) pricing, see Deck.use_price_type()
+"""
+def build_deck_from_extracted_page(deck_url, extracted_page, use_online_price):
+    deck = Deck()
+    deck.deck_url = deck_url
+    raw_deck_name_parse = extracted_page[PAGE_DECK_NAME_KEY].replace('\n', '')
+
+    # The formatting of the name field is different on the meta page vs the budget pages. On the budget pages it is followed with
+    # "by <author>" while on the meta pages it is followed by "Suggest a Better Name"
+    if raw_deck_name_parse.find('by ') > 0:
+        deck.deck_name = raw_deck_name_parse[:raw_deck_name_parse.find(
+            'by ')].encode('ascii')
+    else:
+        deck.deck_name = raw_deck_name_parse[:-
+                                             len("Suggest a Better Name")].encode('ascii')
+
+    deck_date_as_string = extracted_page[PAGE_DECK_DATE_KEY].replace('\n', '')[-len("MMM DD, YYYY"):]
+    # The website uses "9" instead of "09" for date, we need to strip whitespace before parsing the date.   
+    deck_date_as_string = deck_date_as_string.strip()
+    deck.deck_date = datetime.strptime(deck_date_as_string, '%b %d, %Y')
+
+    # The paper table provides the deck list itself, the online table only adds its own prices to it
+    (deck_list, deck.deck_paper_price) = parse_deck_table_rows(extracted_page[PAGE_PAPER_ROWS_KEY])
+    for card_entry in deck_list:
+        card_entry[CARD_PAPER_PRICE_KEY] = card_entry.pop(CARD_PRICE_KEY)
+        card_entry[CARD_ONLINE_PRICE_KEY] = 0.0
+
+    if extracted_page[PAGE_ONLINE_ROWS_KEY] is None:
+        deck.deck_online_price = None
+    else:
+        (online_deck_list, deck.deck_online_price) = parse_deck_table_rows(extracted_page[PAGE_ONLINE_ROWS_KEY])
+        for online_card_entry in online_deck_list:
+            record_already_exist = False
+            for entry in deck_list:
+                if entry[CARD_NAME_KEY] == online_card_entry[CARD_NAME_KEY]:
+                    record_already_exist = True
+                    entry[CARD_ONLINE_PRICE_KEY] = online_card_entry[CARD_PRICE_KEY]
+                    break
+
+            # Cards that are only listed in the online table (which should never really happen) aren't worth anything on paper
+            if not record_already_exist:
+                deck_list.append({CARD_QTY_KEY: online_card_entry[CARD_QTY_KEY], CARD_NAME_KEY: online_card_entry[CARD_NAME_KEY],
+                                  CARD_PAPER_PRICE_KEY: 0.0, CARD_ONLINE_PRICE_KEY: online_card_entry[CARD_PRICE_KEY]})
+
+    # A deck without online prices doesn't get a deck_price for online pricing, it's left out of the online reports
+    deck.deck_list = deck_list
+    deck.use_price_type(use_online_price)
+
+    return deck
+
+
+"""
+Build a deck list out of the cells of every row of a deck table, returning a tuple of (deck_list, deck_total_cost).
+The card entries of the deck list use CARD_QTY_KEY, CARD_NAME_KEY and CARD_PRICE_KEY
+
+:param rows: A list of rows, each of which is a list of the textContent of the row's <td> cells
+"""
+def parse_deck_table_rows(rows):
+    # Iterate over all of the rows in the deck list and build the deck object
+    deck_list = []
+    deck_total_cost = 0.0
+    for columns in rows:
+
+        # Disregard any of the section title rows such as "Creatures", "Planeswalkers", etc
+        if len(columns) == 4:
+            card_name = columns[NAME_INDEX].replace('\n', '')
+
+            # We don't care about Basic Mana in any analysis.
+            if card_name.lower() in ["mountain", "swamp", "plains", "island", "forest"]:
+                continue
+
+            card_quantity_string = columns[QTY_INDEX].replace('\n', '')
+            card_price_string = columns[PRICE_INDEX].replace('\n', '')
+            
+            if card_quantity_string == '':
+                card_quantity_string = '1'
+            if card_price_string == '':
+                card_price_string = '0'
+            # The price kept returning "\xa0" (Fun Fact: \xa0 is unicode for a non-breaking space) 
+            # To fix, I cleaned the string to be able to return a float.
+            else:
+                card_price_string = card_price_string.replace('\xa0', '').replace('$', '')
+
+            card_quantity = int(card_quantity_string)
+            individual_card_price = float(
+                card_price_string.replace(',', '')) / float(card_quantity)
+            deck_total_cost += float(card_price_string.replace(',', ''))
+
+            # It's possible for a card to appear in the list twice if it is present in both the main deck and the sideboard.
+            # If this happens, we need to just update the Quantity and Price of the existing record
+            record_already_exist = False
+            for entry in deck_list:
+                if entry[CARD_NAME_KEY] == card_name:
+                    record_already_exist = True
+                    entry[CARD_QTY_KEY] += card_quantity
+            if not record_already_exist:
+                deck_list.append(
+                    {CARD_QTY_KEY: card_quantity, CARD_NAME_KEY: card_name, CARD_PRICE_KEY: individual_card_price})
+
+    return (deck_list, deck_total_cost)
+
+
+"""
+Load a single deck page with one of the browser sessions from the pool and parse it into a Deck object. All of the
+page content we need is pulled out of the browser with a single script execution rather than one WebDriver call per
+element. Any failure to navigate to the page is raised back to the caller.
+
+:param deck_url: The URL of the deck on MTGGoldfish.com
+:param use_online_price: True if the user wants pricing analysis to be performed in online (tix) pricing
+:param browser_pool: The BrowserSessionPool to borrow a browser session from
+"""
+def fetch_deck_from_url(deck_url, use_online_price, browser_pool):
+    driver = browser_pool.acquire_session()
+    try:
+        driver = browser_pool.navigate(driver, deck_url, DECK_PAGE_READY_CLASS_NAME)
+    except:
+        browser_pool.discard_session(driver)
+        raise
+
+    try:
+        extracted_page = driver.execute_script(DECK_PAGE_EXTRACTION_SCRIPT)
+    finally:
+        browser_pool.release_session(driver)
+
+    return build_deck_from_extracted_page(deck_url, extracted_page, use_online_price)
+
+
+"""
+Start fetching each of the given deck URLs from MTGGoldfish.com on a background thread, returning a queue that
+receives a (deck_index, deck) tuple as soon as each deck has been loaded. Once every fetch has finished (or failed),
+FETCHES_FINISHED is put on the queue.
+
+:param deck_URLs_list: The list of deck URLs to fetch
+:param use_online_price: True if the user wants pricing analysis to be performed in online (tix) pricing
+:param page_fetcher: The DeckPageFetcher used to load each deck
+"""
+def fetch_decks_in_background(deck_URLs_list, use_online_price, page_fetcher):
+    fetched_decks_queue = queue.Queue()
+
+    def fetch_all_decks():
+        try:
+            page_fetcher.fetch_decks(deck_URLs_list, use_online_price,
+                lambda deck_index, deck: fetched_decks_queue.put((deck_index, deck)))
+        finally:
+            fetched_decks_queue.put(FETCHES_FINISHED)
+
+    fetch_thread = threading.Thread(target=fetch_all_decks)
+    fetch_thread.daemon = True
+    fetch_thread.start()
+    return fetched_decks_queue
+
+
+"""
+Given a list of deck URLs, yield a (deck_index, deck) tuple for each of them as soon as the deck is available, where
+deck_index is the position of its URL in deck_URLs_list. Cached decks are yielded right away, while the rest are yielded
+in whatever order they finish being fetched. This lets the caller evaluate each deck while the others are still being
+fetched, without having to hold on to all of them. Decks which couldn't be loaded are skipped (see DeckPageFetcher.retry_queue),
+as are decks whose page had no online prices when use_online_price is set, rather than reporting their paper prices as tix.
+Those are still cached, along with the fact that they have no online prices, so they aren't fetched again on every run.
+
+:param update_cache: If set to True, we will ignore any cached versions of these decks
+:param deck_URLs_list: The list of deck URLs
+:param page_fetcher: The DeckPageFetcher used to load any decks that aren't cached
+:param ranking_status_function: An optional function returning a short description of the results so far, such as
+                                the current best match, which is shown next to the progress bar
+:param cached_deck_dates: An optional dict of the date each of the cached decks was cached on, as already looked up by
+                          a DeckFetchPlan, so that the cache doesn't need to be checked again
+"""
+def iterate_decks_from_list_of_urls(update_cache, deck_URLs_list, use_online_price, page_fetcher, ranking_status_function=None,
+                                    cached_deck_dates=None):
+    progress_bar = IncrementalBar("   Fetching Deck Data", max=len(deck_URLs_list), suffix='%(percent)d%%%(ranking_status)s')
+    progress_bar.ranking_status = ''
+    num_cached_decks = 0
+    num_old_cached_decks = 0
+    num_decks_without_prices = 0
+
+    def advance_progress_bar():
+        if ranking_status_function is not None:
+            progress_bar.ranking_status = ranking_status_function()
+        progress_bar.next()
+
+    if update_cache:
+        print("   Manual cache update requested, updating all local deck caches.")
+
+    # If the same deck shows up more than once, it is only loaded (or fetched) the first time
+    ordered_deck_ids = []
+    deck_URL_of_decks = {}
+    positions_of_decks = {}
+    for deck_index, deck_url in enumerate(deck_URLs_list):
+        deck_id = parse_deck_id_from_url(deck_url)
+        if deck_id not in positions_of_decks:
+            ordered_deck_ids.append(deck_id)
+            deck_URL_of_decks[deck_id] = deck_url
+            positions_of_decks[deck_id] = []
+        positions_of_decks[deck_id].append(deck_index)
+
+    # Check which of the decks are cached locally all at once, and use those instead
+    if cached_deck_dates is None:
+        cached_deck_dates = {}
+        if not update_cache:
+            cached_deck_dates = get_cached_deck_dates(ordered_deck_ids)
+
+    # Anything we can serve from the cache is yielded right away, loading the cached decks in batches rather than one at a time.
+    # Everything else is queued up to be fetched. Decks cached before both the paper and online prices were recorded don't
+    # have either (as we can't tell which of the two they had), so those are fetched again. A deck cached with paper prices
+    # only had no online prices on its page, which fetching it again wouldn't change
+    deck_ids_to_fetch = [deck_id for deck_id in ordered_deck_ids if deck_id not in cached_deck_dates]
+    cached_deck_ids = [deck_id for deck_id in ordered_deck_ids if deck_id in cached_deck_dates]
+    for cached_deck_ids_batch in split_into_chunks(cached_deck_ids, CACHE_LOAD_BATCH_SIZE):
+        cached_decks = load_decks_from_cache(cached_deck_ids_batch)
+        for deck_id in cached_deck_ids_batch:
+            cached_deck = cached_decks.get(deck_id)
+            if cached_deck is None or not cached_deck.has_price_type(False):
+                deck_ids_to_fetch.append(deck_id)
+                continue
+
+            cached_deck.use_price_type(use_online_price)
+            for deck_index in positions_of_decks[deck_id]:
+                num_cached_decks += 1
+                if cached_date_is_old(cached_deck_dates[deck_id]):
+                    num_old_cached_decks += 1
+                if cached_deck.has_price_type(use_online_price):
+                    yield (deck_index, cached_deck)
+                else:
+                    num_decks_without_prices += 1
+                advance_progress_bar()
+        cached_decks = None
+
+    # Decks that couldn't be loaded never show up on the queue, they have already been added to the page fetcher's retry queue.
+    # The fetched decks are cached a batch at a time, each batch in a single transaction
+    deck_URLs_to_fetch = [deck_URL_of_decks[deck_id] for deck_id in deck_ids_to_fetch]
+    decks_to_cache = {}
+    num_fetched_decks = 0
+    fetched_decks_queue = fetch_decks_in_background(deck_URLs_to_fetch, use_online_price, page_fetcher)
+    try:
+        while True:
+            fetched_deck_entry = fetched_decks_queue.get()
+            if fetched_deck_entry is FETCHES_FINISHED:
+                break
+
+            (fetch_index, deck) = fetched_deck_entry
+            num_fetched_decks += 1
+            deck_id = deck_ids_to_fetch[fetch_index]
+
+            decks_to_cache[deck_id] = deck
+            if len(decks_to_cache) >= CACHE_SAVE_BATCH_SIZE:
+                save_decks_to_cache(decks_to_cache)
+                decks_to_cache = {}
+
+            num_cached_decks += len(positions_of_decks[deck_id]) - 1
+            for deck_index in positions_of_decks[deck_id]:
+                if deck.has_price_type(use_online_price):
+                    yield (deck_index, deck)
+                else:
+                    num_decks_without_prices += 1
+                advance_progress_bar()
+    finally:
+        if len(decks_to_cache) > 0:
+            save_decks_to_cache(decks_to_cache)
+    num_failed_decks = len(deck_URLs_to_fetch) - num_fetched_decks
+
+    progress_bar.finish()
+
+    # Print number of cached decks used
+    print("   Finished fetching deck data. %s of %s decks were fetched from the cache." % (
+        num_cached_decks, len(deck_URLs_list)))
+    if num_failed_decks > 0:
+        print("   [WARNING]: %s of %s decks couldn't be loaded and will be retried on the next run." % (
+            num_failed_decks, len(deck_URLs_list)))
+    if num_decks_without_prices > 0:
+        print("   [WARNING]: %s of %s decks have no online prices on MTGGoldfish.com and were left out of the reports." % (
+            num_decks_without_prices, len(deck_URLs_list)))
+
+    # Print number of stale decks and recommend updating
+    if num_old_cached_decks > 0:
+        print("   [WARNING]: %s  of %s cached decks in this fetch were created more than 30 days ago."
+              " Prices may have changed significantly since then."
+              " You should run \"python mtggoldfish.py -u\" to update your cached decks,"
+              " or \"python mtggoldfish.py --price-ttl 7\" to only refresh their card prices." % (num_old_cached_decks, len(deck_URLs_list)))
+
+
+"""
+Given the desired deck URLs, parse all of the decks into Deck objects, in the same order as their URLs
+
+:param update_cache: If set to True, we will ignore any cached versions of these decks
+:param deck_URLs_list: The list of deck URLs
+:param page_fetcher: The DeckPageFetcher used to load any decks that aren't cached
+"""
+def parse_decks_from_list_of_urls(update_cache, deck_URLs_list, use_online_price, page_fetcher):
+    deck_objs_list = [None] * len(deck_URLs_list)
+    for (deck_index, deck) in iterate_decks_from_list_of_urls(update_cache, deck_URLs_list, use_online_price, page_fetcher):
+        deck_objs_list[deck_index] = deck
+    return [deck for deck in deck_objs_list if deck is not None]
+
+
+"""
+Plans every deck load needed during a run in one place. The deck URLs of each category of decks (desired, Metagame and
+Budget) are added to the plan, each URL is normalized to its deck ID, and every deck is only loaded once no matter how many
+categories list it (or how many times a single category lists it). Once all of the URLs have been added, decide_deck_sources()
+checks the cache a single time for each unique deck to determine which decks are loaded from it and which are fetched.
+
+The decks are then loaded with iterate_decks(), one or more categories at a time. Decks belonging to any of the retained
+categories are kept around once loaded, so that a later call for another category listing the same deck reuses it.
+
+:param retained_categories: The categories whose decks are kept in memory after they have been loaded
+"""
+class DeckFetchPlan(object):
+    def __init__(self, retained_categories):
+        self.retained_categories = retained_categories
+
+        # The URL each unique deck is loaded from (the first one listed for it), in the order they were added to the plan
+        self.deck_url_by_id = {}
+        self.ordered_deck_ids = []
+        self.num_deck_urls = 0
+
+        # For each category, its unique deck IDs in the order they were listed in, as well as the position of each of them
+        self.deck_ids_by_category = {}
+        self.deck_positions_by_category = {}
+
+        # The date each of the cached decks was cached on, filled in by decide_deck_sources()
+        self.cached_deck_dates = None
+
+        # Every deck that iterate_decks() has already tried to load, and those of them that were retained
+        self.attempted_deck_ids = set()
+        self.retained_decks = {}
+
+        # For each category, the decks that don't need to be loaded for it (see skip_deck_ids())
+        self.skipped_deck_ids_by_category = {}
+
+    """
+    Add the deck URLs of a category to the plan
+
+    :param category: One of DESIRED_DECKS_CATEGORY, METAGAME_DECKS_CATEGORY or BUDGET_DECKS_CATEGORY
+    :param deck_URLs_list: The list of deck URLs for that category, exactly as they were read in
+    """
+    def add_deck_urls(self, category, deck_URLs_list):
+        category_deck_ids = []
+        category_deck_positions = {}
+        for deck_url in deck_URLs_list:
+            self.num_deck_urls += 1
+            deck_id = parse_deck_id_from_url(deck_url)
+            if deck_id in category_deck_positions:
+                continue
+
+            category_deck_positions[deck_id] = len(category_deck_ids)
+            category_deck_ids.append(deck_id)
+            if deck_id not in self.deck_url_by_id:
+                self.deck_url_by_id[deck_id] = deck_url.strip()
+                self.ordered_deck_ids.append(deck_id)
+
+        self.deck_ids_by_category[category] = category_deck_ids
+        self.deck_positions_by_category[category] = category_deck_positions
+
+    def get_deck_ids(self, category):
+        return self.deck_ids_by_category.get(category, [])
+
+    """
+    Leave the given decks out when iterate_decks() loads the decks of a category, such as the Metagame decks that
+    already have a stored score. They are still loaded for any other category listing them
+
+    :param category: One of DESIRED_DECKS_CATEGORY, METAGAME_DECKS_CATEGORY or BUDGET_DECKS_CATEGORY
+    :param deck_ids: The DeckIDs to leave out
+    """
+    def skip_deck_ids(self, category, deck_ids):
+        self.skipped_deck_ids_by_category.setdefault(category, set()).update(deck_ids)
+
+    """
+    Determine, once for each unique deck in the plan, whether it will be loaded from the cache or fetched
+
+    :param update_cache: If set to True, every deck will be fetched, ignoring any cached versions
+    """
+    def decide_deck_sources(self, update_cache):
+        self.cached_deck_dates = {}
+        if not update_cache:
+            self.cached_deck_dates = get_cached_deck_dates(self.ordered_deck_ids)
+        get_deck_store().record_deck_usage(self.ordered_deck_ids)
+
+        num_unique_decks = len(self.ordered_deck_ids)
+        print("   Planned %s deck URLs: %s unique decks (%s duplicates removed), %s cached and %s to fetch." % (
+            self.num_deck_urls, num_unique_decks, self.num_deck_urls - num_unique_decks,
+            len(self.cached_deck_dates), num_unique_decks - len(self.cached_deck_dates)))
+
+    """
+    Refresh the prices of every card in the cached decks of this plan that was last priced more than price_ttl_days ago.
+    Prices can only be read off of deck pages, so a small set of the cached decks which together contain all of the stale
+    cards is fetched again (see choose_decks_covering_cards()). Since a card's latest price is shared by every deck
+    containing it, each stale card is refreshed once no matter how many decks contain it, and the rest of the decks pick
+    up the new prices when they're loaded. The decklists of the other decks aren't fetched again
+
+    :param price_ttl_days: How many days a card's price is used for before it is refreshed
+    :param use_online_price: True if the user wants pricing analysis to be performed in online (tix) pricing
+    :param page_fetcher: The DeckPageFetcher used to fetch the decks
+    """
+    def refresh_stale_prices(self, price_ttl_days, use_online_price, page_fetcher):
+        todays_date = datetime.now()
+        stale_before_date = datetime(todays_date.year, todays_date.month, todays_date.day) - timedelta(days=price_ttl_days)
+        stale_card_ids_by_deck = get_deck_store().get_stale_card_ids_by_deck(list(self.cached_deck_dates), stale_before_date)
+        if len(stale_card_ids_by_deck) == 0:
+            print("   The prices of every card in the cached decks were refreshed within the last %g days." % (price_ttl_days))
+            return
+
+        deck_ids_to_refetch = choose_decks_covering_cards(stale_card_ids_by_deck)
+        num_stale_cards = len(set().union(*stale_card_ids_by_deck.values()))
+        print("   Refreshing the prices of %s cards last priced more than %g days ago by fetching %s of the %s cached decks containing them." % (
+            num_stale_cards, price_ttl_days, len(deck_ids_to_refetch), len(stale_card_ids_by_deck)))
+
+        # Only the card prices on their pages are needed, so decks without online prices are refetched just the same
+        refetched_deck_ids = set()
+        deck_URLs_list = [self.deck_url_by_id[deck_id] for deck_id in deck_ids_to_refetch]
+        for (deck_index, deck) in iterate_decks_from_list_of_urls(False, deck_URLs_list, False, page_fetcher, None, {}):
+            refetched_deck_ids.add(deck_ids_to_refetch[deck_index])
+        for deck_id in refetched_deck_ids:
+            self.cached_deck_dates[deck_id] = datetime(todays_date.year, todays_date.month, todays_date.day)
+
+    """
+    Load every deck of the given categories which hasn't already been loaded, yielding a (deck, positions) tuple for each
+    of them as soon as it is available (see iterate_decks_from_list_of_urls()). positions is a dict holding, for each of the
+    given categories listing the deck, the position of the deck within that category. Decks that have already been
+    loaded for a retained category are yielded again from memory, while decks that couldn't be loaded are never retried
+
+    :param update_cache: If set to True, we will ignore any cached versions of these decks
+    :param use_online_price: True if the user wants pricing analysis to be performed in online (tix) pricing
+    :param page_fetcher: The DeckPageFetcher used to load any decks that aren't cached
+    :param categories: The list of categories whose decks should be loaded
+    :param ranking_status_function: See iterate_decks_from_list_of_urls()
+    """
+    def iterate_decks(self, update_cache, use_online_price, page_fetcher, categories, ranking_status_function=None):
+        if self.cached_deck_dates is None:
+            self.decide_deck_sources(update_cache)
+
+        def get_deck_positions(deck_id):
+            deck_positions = {}
+            for category in categories:
+                if deck_id in self.skipped_deck_ids_by_category.get(category, ()):
+                    continue
+                if deck_id in self.deck_positions_by_category.get(category, {}):
+                    deck_positions[category] = self.deck_positions_by_category[category][deck_id]
+            return deck_positions
+
+        # Each deck is only listed once, even if several of the categories list it
+        deck_ids_to_load = []
+        listed_deck_ids = set()
+        for category in categories:
+            for deck_id in self.get_deck_ids(category):
+                if deck_id in self.skipped_deck_ids_by_category.get(category, ()):
+                    continue
+                if deck_id in self.attempted_deck_ids and deck_id not in self.retained_decks:
+                    continue
+                self.attempted_deck_ids.add(deck_id)
+                if deck_id not in listed_deck_ids:
+                    listed_deck_ids.add(deck_id)
+                    deck_ids_to_load.append(deck_id)
+
+        num_retained_decks = 0
+        deck_URLs_list = []
+        deck_ids_of_URLs = []
+        for deck_id in deck_ids_to_load:
+            if deck_id in self.retained_decks:
+                num_retained_decks += 1
+                yield (self.retained_decks[deck_id], get_deck_positions(deck_id))
+            else:
+                deck_URLs_list.append(self.deck_url_by_id[deck_id])
+                deck_ids_of_URLs.append(deck_id)
+
+        if num_retained_decks > 0:
+            print("   %s of these decks were already loaded earlier during this run." % (num_retained_decks))
+
+        for (deck_index, deck) in iterate_decks_from_list_of_urls(update_cache, deck_URLs_list, use_online_price, page_fetcher,
+                                                                  ranking_status_function, self.cached_deck_dates):
+            deck_id = deck_ids_of_URLs[deck_index]
+            for category in self.retained_categories:
+                if deck_id in self.deck_positions_by_category.get(category, {}):
+                    self.retained_decks[deck_id] = deck
+            yield (deck, get_deck_positions(deck_id))
+
+
+"""
+Greedily pick a small set of decks which together contain every one of the given cards: the deck containing the most
+cards that haven't been covered yet is picked, until all of them have been. Returns the picked DeckIDs, in the order
+they were picked
+
+:param card_ids_by_deck: A dict of the set of card_ids to cover in each deck
+"""
+def choose_decks_covering_cards(card_ids_by_deck):
+    uncovered_card_ids = set().union(*card_ids_by_deck.values())
+    remaining_card_ids_by_deck = dict(card_ids_by_deck)
+    chosen_deck_ids = []
+    while len(uncovered_card_ids) > 0:
+        best_deck_id = None
+        best_num_covered_cards = 0
+        for (deck_id, card_ids) in remaining_card_ids_by_deck.items():
+            num_covered_cards = len(card_ids & uncovered_card_ids)
+            if num_covered_cards > best_num_covered_cards:
+                best_deck_id = deck_id
+                best_num_covered_cards = num_covered_cards
+
+        chosen_deck_ids.append(best_deck_id)
+        uncovered_card_ids -= remaining_card_ids_by_deck.pop(best_deck_id)
+    return chosen_deck_ids
+
+
+"""
+How urgently a deck should be refreshed by the cache warmer: the older the cached copy and the more runs that have used
+the deck, the sooner it is refreshed. Decks that aren't cached at all come before any cached deck
+
+:param age_days: How many days ago the deck was cached, or None if it isn't cached
+:param times_used: How many runs have used the deck
+"""
+def get_deck_refresh_priority(age_days, times_used):
+    if age_days is None:
+        return (1, times_used)
+    return (0, (age_days + 1) * (times_used + 1))
+
+
+"""
+Choose which decks the cache warmer refreshes this interval: the decks that weren't cached today, most in need of a
+refresh first (see get_deck_refresh_priority()). Returns a tuple of the DeckIDs of all of those decks, and of the ones
+to refresh, which are at most fetch_budget of them
+
+:param deck_refresh_candidates: A dict of the (deck_url, age_days, times_used) of every deck which should be cached,
+                                by DeckID, with an age_days of None for the decks that aren't cached yet
+:param fetch_budget: The maximum number of decks to refresh
+"""
+def choose_decks_to_refresh(deck_refresh_candidates, fetch_budget):
+    stale_deck_ids = [deck_id for (deck_id, (deck_url, age_days, times_used)) in deck_refresh_candidates.items()
+                      if age_days is None or age_days >= 1]
+    stale_deck_ids.sort(key=lambda deck_id: get_deck_refresh_priority(
+        deck_refresh_candidates[deck_id][1], deck_refresh_candidates[deck_id][2]), reverse=True)
+    return (stale_deck_ids, stale_deck_ids[:fetch_budget])
+
+
+"""
+Refresh up to fetch_budget of the decks most in need of it: every cached deck (including those of other formats used
+by earlier runs) as well as the given decks, which may not be cached yet. Decks already cached today are left alone.
+Returns the number of decks that were refreshed
+
+:param deck_URLs_list: The deck URLs which should be cached, such as the current Metagame and Budget decks
+:param page_fetcher: The DeckPageFetcher used to fetch the decks
+:param fetch_budget: The maximum number of decks to fetch
+"""
+def warm_deck_cache(deck_URLs_list, page_fetcher, fetch_budget):
+    deck_refresh_candidates = {}
+    for (deck_id, (deck_url, cached_date, times_used)) in get_deck_store().get_cached_deck_usage().items():
+        deck_refresh_candidates[deck_id] = (deck_url, get_cached_date_age_days(cached_date), times_used)
+    for deck_url in deck_URLs_list:
+        deck_id = parse_deck_id_from_url(deck_url)
+        if deck_id not in deck_refresh_candidates:
+            deck_refresh_candidates[deck_id] = (deck_url.strip(), None, 0)
+
+    (stale_deck_ids, deck_ids_to_refresh) = choose_decks_to_refresh(deck_refresh_candidates, fetch_budget)
+
+    num_old_decks = len([deck_id for deck_id in stale_deck_ids if deck_refresh_candidates[deck_id][1] is not None and
+                         deck_refresh_candidates[deck_id][1] >= OLD_CACHED_DECK_AGE_DAYS])
+    print("   %s of %s decks need refreshing (%s of them are more than %s days old), refreshing %s of them." % (
+        len(stale_deck_ids), len(deck_refresh_candidates), num_old_decks, OLD_CACHED_DECK_AGE_DAYS, len(deck_ids_to_refresh)))
+    if len(deck_ids_to_refresh) == 0:
+        return 0
+
+    num_refreshed_decks = 0
+    deck_URLs_to_refresh = [deck_refresh_candidates[deck_id][0] for deck_id in deck_ids_to_refresh]
+    for (deck_index, deck) in iterate_decks_from_list_of_urls(False, deck_URLs_to_refresh, False, page_fetcher, None, {}):
+        num_refreshed_decks += 1
+    return num_refreshed_decks
+
+
+"""
+Keep the deck cache warm until interrupted (with Ctrl+C): every interval, snapshot the Metagame and Budget deck URLs
+and refresh the decks most in need of it (see warm_deck_cache()), then wait for the next interval
+
+:param desired_deck_URLs: The deck URLs listed in desired_decks.txt
+:param landing_page_URLs: The URLs of the category landing pages whose decks should be kept cached
+:param page_fetcher: The DeckPageFetcher used to fetch the pages
+:param url_cache_ttl_hours: How many hours a snapshotted list of deck URLs is reused for
+:param interval_minutes: How many minutes each interval lasts
+:param fetch_budget: The maximum number of decks fetched per interval
+:param max_cached_decks: The maximum number of decks to keep cached, or None for no limit
+:param max_cache_mb: The maximum size of the cache in megabytes, or None for no limit
+"""
+def run_cache_warmer(desired_deck_URLs, landing_page_URLs, page_fetcher, url_cache_ttl_hours, interval_minutes, fetch_budget,
+                     max_cached_decks=None, max_cache_mb=None):
+    while True:
+        interval_start_time = time.time()
+        print("\n[%s] Warming the deck cache..." % (datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+        deck_URLs_list = list(desired_deck_URLs)
+        for landing_page_URL in landing_page_URLs:
+            deck_URLs_list.extend(parse_deck_urls_from_category_landing_page(
+                landing_page_URL, page_fetcher, False, url_cache_ttl_hours))
+        num_refreshed_decks = warm_deck_cache(deck_URLs_list, page_fetcher, fetch_budget)
+        enforce_deck_cache_limits(max_cached_decks, max_cache_mb, set(parse_deck_id_from_url(url) for url in desired_deck_URLs))
+        page_fetcher.print_retry_queue()
+        page_fetcher.retry_queue = []
+
+        seconds_until_next_interval = max(0, interval_minutes * 60 - (time.time() - interval_start_time))
+        print("   Refreshed %s decks. Next refresh in %d minutes." % (num_refreshed_decks, seconds_until_next_interval / 60))
+        time.sleep(seconds_until_next_interval)
+
+
+"""
+Given the URL for a category landing page on MTGGoldfish.com (such as "https://www.mtggoldfish.com/decks/budget/modern#paper"),
+parse all of the URLs for the various decks on that page. It uses the #paper or #online queryparam to determine which URL to load
+for each deck
+
+:param category_landing_page_url: The URL of the category landing page that contains a list of various decks
+:param page_fetcher: The DeckPageFetcher used to load the landing page
+:param update_cache: If set to True, we will ignore any cached list of deck URLs for this landing page
+:param url_cache_ttl_hours: How many hours a cached list of deck URLs is used for before the landing page is loaded again
+"""
+def parse_deck_urls_from_category_landing_page(category_landing_page_url, page_fetcher, update_cache, url_cache_ttl_hours):
+    if not update_cache and url_cache_ttl_hours > 0:
+        cached_deck_url_list = load_landing_page_urls_from_cache(category_landing_page_url, url_cache_ttl_hours)
+        if cached_deck_url_list is not None:
+            print("   Using the deck URLs snapshotted from MTGGoldfish.com within the last %g hours." % (url_cache_ttl_hours))
+            return cached_deck_url_list
+
+    print("   Snapshotting deck URLs from MTGGoldfish.com real quick, as there might be new decks that we need to fetch data for.")
+    deck_url_list = page_fetcher.fetch_landing_page_deck_urls(category_landing_page_url)
+
+    # An empty list means the landing page couldn't be loaded (or parsed), which isn't worth remembering
+    if len(deck_url_list) > 0:
+        save_landing_page_urls_to_cache(category_landing_page_url, deck_url_list)
+    return deck_url_list
+
+
+"""
+The Selenium engine for parse_deck_urls_from_category_landing_page()
+
+:param category_landing_page_url: The URL of the category landing page that contains a list of various decks
+:param browser_pool: The BrowserSessionPool used to load the landing page
+"""
+def parse_deck_urls_from_landing_page_with_browser(category_landing_page_url, browser_pool):
+    driver = browser_pool.acquire_session()
+    try:
+        driver = browser_pool.navigate(driver, category_landing_page_url, LANDING_PAGE_READY_CLASS_NAME)
+    except:
+        browser_pool.discard_session(driver)
+        raise
+
+    # I didn't change the element names for either paper, online, or budget decks. 
+    # However, it appears that functionality didn't break here, even with the old class names and tags.
+    deck_URL_container_element_tag = "deck-price-paper"
+    if "#online" in category_landing_page_url.lower():
+        deck_URL_container_element_tag = "deck-price-online"
+
+    budget_deck_url_list = []
+    try:
+        # Update Selenenium method from "_by_class_name" to "(By.CLASS_NAME,"/"(By.TAG_NAME,"
+        deck_tiles = driver.find_elements(By.CLASS_NAME, "archetype-tile")
+        for tile in deck_tiles:
+            deck_description_container = tile.find_element(By.CLASS_NAME, "archetype-tile-description-wrapper").find_element(By.CLASS_NAME, 
+                "archetype-tile-description").find_element(By.CLASS_NAME, deck_URL_container_element_tag)
+            deck_url = deck_description_container.find_element(By.TAG_NAME, 
+                'a').get_attribute("href")
+
+            # For some reason, the #paper landing page contains URLS for the #online
+            budget_deck_url_list.append(deck_url)
+    except:
+        browser_pool.release_session(driver)
+        return budget_deck_url_list
+
+    browser_pool.release_session(driver)
+    return budget_deck_url_list
+
+
+"""
+Return the form of a card name that is used to match cards up with each other, as card names are matched regardless of case
+
+:param card_name: The name of the card
+"""
+def normalize_card_name(card_name):
+    return card_name.lower()
 
 
 """
-Given a DeckID, parses the MM_DD_YYYY portion of a cached deck file name
-and returns true if the date is >= 30 days old
+The user's Owned Cards, indexed by their normalized names (see normalize_card_name()). Built once per run and shared by
+every evaluation, so that whether a deck's card is owned is a single lookup, rather than a comparison against every
+card in owned_cards.txt. The evaluations still pick the same owned card that comparing against each of them in order
+would, so the reports don't change
 
-:param deck_id: The DeckID of this deck on MTGGoldfish
+:param owned_cards_list: The list of Owned Cards as parsed from owned_cards.txt
 """
-def cached_deck_is_old(deck_id):
-    cache_dir = os.path.join(os.path.dirname(__file__), 'deck_cache')
-    if not os.path.isdir(cache_dir):
-        return False
+class OwnedCardIndex(object):
+    def __init__(self, owned_cards_list):
+        self.owned_cards_list = owned_cards_list
+
+        # Each normalized card name maps to every entry of owned_cards.txt with that name, along with its position in the file
+        self.owned_entries_by_name = {}
+        for (owned_card_position, owned_card_entry) in enumerate(owned_cards_list):
+            self.owned_entries_by_name.setdefault(normalize_card_name(owned_card_entry[CARD_NAME_KEY]), []).append(
+                (owned_card_position, owned_card_entry))
+
+    """
+    Return the first entry of owned_cards.txt with the same name as the given card, or None if the card isn't owned
+
+    :param card_name: The name of the card
+    """
+    def find_owned_card(self, card_name):
+        owned_entries = self.owned_entries_by_name.get(normalize_card_name(card_name))
+        if owned_entries is None:
+            return None
+        return owned_entries[0][1]
+
+    """
+    Match every entry of owned_cards.txt with the first card of the given deck list with the same name. Returns a list of
+    (owned_card_entry, deck_card_entry) tuples, in the order the owned cards are listed in owned_cards.txt
+
+    :param deck_list: The deck list of a Deck object (see Deck.get_deck_list())
+    """
+    def match_owned_cards(self, deck_list):
+        owned_card_matches = []
+        matched_card_names = set()
+        for deck_card_entry in deck_list:
+            normalized_card_name = normalize_card_name(deck_card_entry[CARD_NAME_KEY])
+            if normalized_card_name in matched_card_names:
+                continue
+            matched_card_names.add(normalized_card_name)
+            for (owned_card_position, owned_card_entry) in self.owned_entries_by_name.get(normalized_card_name, []):
+                owned_card_matches.append((owned_card_position, owned_card_entry, deck_card_entry))
+
+        owned_card_matches.sort(key=lambda owned_card_match: owned_card_match[0])
+        return [(owned_card_entry, deck_card_entry) for (owned_card_position, owned_card_entry, deck_card_entry) in owned_card_matches]
 
-    cached_decks = os.listdir(cache_dir)
-    for cached_deck_file_name in cached_decks:
 
-        # The deck file names are of the format <deck_id>_MM_DD_YYYY
-        cached_deck_id = cached_deck_file_name.split('_')[0]
-        if cached_deck_id == deck_id:
-            cached_date = datetime.strptime(
-                cached_deck_file_name[cached_deck_file_name.find('_') + 1:], '%m_%d_%Y')
-            time_delta_since_last_update = datetime.now() - cached_date
-            if time_delta_since_last_update.days >= 30:
-                return True
+"""
+For a single desired deck, determine how many of the user's Owned Cards overlap with it, returning the
+report entry for that deck (see evaluate_owned_cards())
 
-    return False
+:param desired_deck: A Deck object representing one of the decks in desired_decks.txt
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+"""
+def evaluate_owned_cards_for_deck(desired_deck, owned_card_index):
+    owned_cards_that_overlap = []
+
+    number_of_owned_cards_that_are_in_desired_deck = 0
+    value_reduced_by_owned_cards = 0.0
+    for desired_card_entry in desired_deck.get_deck_list():
+        desired_card_name = desired_card_entry[CARD_NAME_KEY]
+
+        owned_card_entry = owned_card_index.find_owned_card(desired_card_name)
+        if owned_card_entry is not None:
+            if desired_card_entry[CARD_QTY_KEY] >= owned_card_entry[CARD_QTY_KEY]:
+                number_of_owned_cards_that_are_in_desired_deck += owned_card_entry[CARD_QTY_KEY]
+                value_reduced_by_owned_cards += float(
+                    owned_card_entry[CARD_QTY_KEY] * desired_card_entry[CARD_PRICE_KEY])
+                owned_cards_that_overlap.append({CARD_NAME_KEY: desired_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                    owned_card_entry[CARD_QTY_KEY] * desired_card_entry[CARD_PRICE_KEY])})
+            else:
+                number_of_owned_cards_that_are_in_desired_deck += desired_card_entry[CARD_QTY_KEY]
+                value_reduced_by_owned_cards += float(
+                    desired_card_entry[CARD_QTY_KEY]) * desired_card_entry[CARD_PRICE_KEY]
+                owned_cards_that_overlap.append({CARD_NAME_KEY: desired_card_name, CARD_QTY_KEY: desired_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                    desired_card_entry[CARD_QTY_KEY]) * desired_card_entry[CARD_PRICE_KEY]})
+
+    # If we actually own some cards in this desired_deck, save the report. If not, we set the NO_OWNED_OVERLAP_FLAG so that our final report printing can know
+    if value_reduced_by_owned_cards > 0:
+        return {OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_desired_deck, desired_deck.get_deck_size(
+        )), SAVED_VALUE_KEY: value_reduced_by_owned_cards, CARD_LIST_KEY: owned_cards_that_overlap}
+    else:
+        return {SAVED_VALUE_KEY: NO_OWNED_OVERLAP_FLAG}
 
 
 """
-Given a Deck object, utilize the cPickle library to save it to a local file
+For a single metagame deck, determine how much monetary overlap we currently possess for it. Returns the report entry
+for that deck, or None if we don't own any of its cards (see evaluate_metagame_decks())
 
-:param deck: The Deck object to store to the file
-:param deck_id: The DeckID for the deck from MTGGoldfish.com
+:param meta_deck: A Deck object representing one of the Metagame decks on MTGGoldfish.com
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
 """
-def save_deck_to_cache(deck, deck_id):
+def evaluate_metagame_deck(meta_deck, owned_card_index):
+    specific_cards_owned_in_meta_deck = []
+    number_of_owned_cards_that_are_in_meta_deck = 0
+    value_of_meta_deck_owned = 0.0
+
+    # Each of our owned cards is matched with its presence in the meta_deck
+    for (owned_card_entry, meta_card_entry) in owned_card_index.match_owned_cards(meta_deck.get_deck_list()):
+        owned_card_name = owned_card_entry[CARD_NAME_KEY]
+        if owned_card_entry[CARD_QTY_KEY] >= meta_card_entry[CARD_QTY_KEY]:
+            number_of_owned_cards_that_are_in_meta_deck += meta_card_entry[CARD_QTY_KEY]
+            value_of_meta_deck_owned += float(
+                meta_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]
+            specific_cards_owned_in_meta_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: meta_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                meta_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]})
+        else:
+            number_of_owned_cards_that_are_in_meta_deck += owned_card_entry[CARD_QTY_KEY]
+            value_of_meta_deck_owned += float(
+                owned_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]
+            specific_cards_owned_in_meta_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                owned_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]})
+
+    # Only report this Metagame deck if we actually own some of its cards
+    if value_of_meta_deck_owned > 0:
+        return {OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_meta_deck, meta_deck.get_deck_size(
+        )), SAVED_VALUE_KEY: value_of_meta_deck_owned, CARD_LIST_KEY: specific_cards_owned_in_meta_deck, DECK_PRICE_KEY: meta_deck.get_deck_price()}
+    return None
 
-    # If the deck_cache subdirectory hasn't been created yet, create it
-    cache_dir = os.path.join(os.path.dirname(__file__), 'deck_cache')
-    if not os.path.isdir(cache_dir):
-        os.mkdir(cache_dir)
 
-    # If an older version of the Deck is cached, delete it first
-    cached_decks = os.listdir(cache_dir)
-    for existing_cache_file in cached_decks:
+"""
+Scores whole batches of decks against the user's Owned Cards with NumPy, as an alternative to evaluating them one deck
+at a time with evaluate_owned_cards_for_deck() and evaluate_metagame_deck(). The card quantities and prices of a batch
+are laid out as deck x card matrices, so that the owned count and saved value of every deck in the batch come from a
+single minimum() against the owned quantities followed by a price weighted sum. The report entries are the same as the
+ones of the one deck at a time evaluations, down to the last bit of each saved value, as each row is summed in the same
+order as those evaluations add up their cards. Any list of decks can be scored, no matter which format or revision of
+the deck cache (see DeckStore.load_deck_revision()) they came from.
+
+Only available when NumPy is installed (see the -E/--evaluator flag)
+
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param batch_size: The maximum number of decks laid out in the matrices at once, which bounds their memory use
+"""
+class VectorizedDeckScorer(object):
+    def __init__(self, owned_card_index, batch_size=VECTORIZED_EVALUATION_BATCH_SIZE):
+        self.owned_card_index = owned_card_index
+        self.batch_size = batch_size
+        self.owned_card_names = [owned_card_entry[CARD_NAME_KEY] for owned_card_entry in owned_card_index.owned_cards_list]
+
+        # The quantity of each entry of owned_cards.txt, by its position in the file
+        self.owned_card_quantities = numpy.array(
+            [owned_card_entry[CARD_QTY_KEY] for owned_card_entry in owned_card_index.owned_cards_list], dtype=numpy.int64)
+
+        # Every normalized card name gets an ID, starting with the names in owned_cards.txt, so that a card is owned if
+        # the ID of its name is below num_owned_card_names. The positions of the owned entries with each of those names
+        # are the rows of owned_positions_by_name_id, padded with -1
+        self.normalized_name_ids = {}
+        num_owned_entries_per_name = [len(owned_entries) for owned_entries in owned_card_index.owned_entries_by_name.values()]
+        self.num_owned_card_names = len(num_owned_entries_per_name)
+        self.owned_positions_by_name_id = numpy.full((self.num_owned_card_names, max(num_owned_entries_per_name + [1])), -1, dtype=numpy.int64)
+        for (normalized_card_name, owned_entries) in owned_card_index.owned_entries_by_name.items():
+            name_id = self.normalized_name_ids.setdefault(normalized_card_name, len(self.normalized_name_ids))
+            self.owned_positions_by_name_id[name_id, :len(owned_entries)] = [owned_card_position for (owned_card_position, owned_card_entry) in owned_entries]
+
+        # The ID of the normalized name of each card in card_name_table, which is extended as new cards are interned
+        self.name_id_by_card_id = numpy.zeros(0, dtype=numpy.int64)
+
+    """
+    Extend name_id_by_card_id with the cards that were added to card_name_table since it was last extended
+    """
+    def update_name_ids(self):
+        num_card_ids = len(card_name_table.card_names)
+        if num_card_ids > len(self.name_id_by_card_id):
+            new_name_ids = [self.normalized_name_ids.setdefault(normalize_card_name(card_name_table.get_card_name(card_id)), len(self.normalized_name_ids))
+                            for card_id in range(len(self.name_id_by_card_id), num_card_ids)]
+            self.name_id_by_card_id = numpy.concatenate([self.name_id_by_card_id, numpy.array(new_name_ids, dtype=numpy.int64)])
+
+    """
+    Return the cards of all of the given decks, one after another, as the arrays (deck_rows, card_ids, card_quantities,
+    card_prices), where deck_rows is the position of each card's deck in the given list
+
+    :param decks: A list of Deck objects
+    """
+    def lay_out_cards(self, decks):
+        card_ids = array('i')
+        card_quantities = array('i')
+        card_prices = array('d')
+        for deck in decks:
+            card_ids.extend(deck.card_ids)
+            card_quantities.extend(deck.card_quantities)
+            card_prices.extend(deck.card_online_prices if deck.uses_online_price else deck.card_paper_prices)
+        self.update_name_ids()
+
+        deck_rows = numpy.repeat(numpy.arange(len(decks)), [len(deck.card_ids) for deck in decks])
+        return (deck_rows, numpy.array(card_ids, dtype=numpy.int64), numpy.array(card_quantities, dtype=numpy.int64),
+                numpy.array(card_prices, dtype=numpy.float64))
+
+    """
+    Score the owned cards of a batch of decks. The owned cards are laid out as a deck x card matrix, with the owned cards
+    of each deck packed to the front of its row (and the rest of the row left empty), so that the number of owned copies
+    and the value of every card are a single minimum() and multiplication. Each row is then summed up in order, as
+    numpy.sum() adds long rows up pairwise, which can round differently than adding the cards up one at a time does.
+    Returns (owned_card_labels, owned_card_counts, owned_card_values, num_owned_card_labels, numbers_of_owned_cards,
+    owned_values), where the matrices hold the owned cards of each deck and the lists hold the number of them in each
+    row, the owned card count of each deck and the value of each deck's owned cards
+
+    :param num_decks: The number of decks in the batch
+    :param deck_rows: The position of the deck of each owned card within the batch, sorted so that the cards of each
+                      deck are in the order they are added up
+    :param card_labels: The card ID or owned_cards.txt position that identifies each owned card in the report
+    :param card_quantities: The quantity of each owned card in its deck
+    :param owned_quantities: The quantity of each owned card in owned_cards.txt
+    :param card_prices: The price of each owned card
+    """
+    def score_owned_card_matrix(self, num_decks, deck_rows, card_labels, card_quantities, owned_quantities, card_prices):
+        num_owned_card_labels = numpy.bincount(deck_rows, minlength=num_decks)
+        card_slots = numpy.arange(len(deck_rows)) - numpy.repeat(numpy.cumsum(num_owned_card_labels) - num_owned_card_labels, num_owned_card_labels)
+        matrix_shape = (num_decks, int(num_owned_card_labels.max()) if num_decks > 0 else 0)
+
+        owned_card_labels = numpy.zeros(matrix_shape, dtype=numpy.int64)
+        card_quantity_matrix = numpy.zeros(matrix_shape, dtype=numpy.int64)
+        owned_quantity_matrix = numpy.zeros(matrix_shape, dtype=numpy.int64)
+        card_price_matrix = numpy.zeros(matrix_shape)
+        owned_card_labels[deck_rows, card_slots] = card_labels
+        card_quantity_matrix[deck_rows, card_slots] = card_quantities
+        owned_quantity_matrix[deck_rows, card_slots] = owned_quantities
+        card_price_matrix[deck_rows, card_slots] = card_prices
+
+        owned_card_counts = numpy.minimum(card_quantity_matrix, owned_quantity_matrix)
+        owned_card_values = owned_card_counts * card_price_matrix
+        if matrix_shape[1] > 0:
+            owned_values = numpy.cumsum(owned_card_values, axis=1)[:, -1]
+        else:
+            owned_values = numpy.zeros(num_decks)
+        return (owned_card_labels, owned_card_counts, owned_card_values, num_owned_card_labels.tolist(),
+                owned_card_counts.sum(axis=1).tolist(), owned_values.tolist())
+
+    """
+    Return the report entry of each of the given desired decks, in the same order. See evaluate_owned_cards_for_deck()
+
+    :param desired_decks: A list of Deck objects representing decks in desired_decks.txt
+    """
+    def score_owned_cards(self, desired_decks):
+        report_entries = []
+        for batch_start in range(0, len(desired_decks), self.batch_size):
+            report_entries.extend(self.score_owned_cards_batch(desired_decks[batch_start:batch_start + self.batch_size]))
+        return report_entries
+
+    def score_owned_cards_batch(self, desired_decks):
+        (deck_rows, card_ids, card_quantities, card_prices) = self.lay_out_cards(desired_decks)
+
+        # Each desired card is matched with the first owned entry of the same name on its own, in the order of the deck
+        name_ids = self.name_id_by_card_id[card_ids]
+        is_owned_card = name_ids < self.num_owned_card_names
+        owned_quantities = self.owned_card_quantities[self.owned_positions_by_name_id[name_ids[is_owned_card], 0]]
+        (owned_card_ids, owned_card_counts, owned_card_values, num_owned_card_ids, numbers_of_owned_cards, values_reduced_by_owned_cards) = (
+            self.score_owned_card_matrix(len(desired_decks), deck_rows[is_owned_card], card_ids[is_owned_card],
+                                         card_quantities[is_owned_card], owned_quantities, card_prices[is_owned_card]))
+
+        report_entries = []
+        for (row, desired_deck) in enumerate(desired_decks):
+            if values_reduced_by_owned_cards[row] > 0:
+                num_cards = num_owned_card_ids[row]
+                owned_cards_that_overlap = [{CARD_NAME_KEY: card_name_table.get_card_name(card_id), CARD_QTY_KEY: owned_card_count, CARD_PRICE_KEY: owned_card_value}
+                                            for (card_id, owned_card_count, owned_card_value) in zip(
+                                                owned_card_ids[row, :num_cards].tolist(), owned_card_counts[row, :num_cards].tolist(),
+                                                owned_card_values[row, :num_cards].tolist())]
+                report_entries.append({OWNED_CARDS_KEY: "%d/%d" % (numbers_of_owned_cards[row], desired_deck.get_deck_size()),
+                                       SAVED_VALUE_KEY: values_reduced_by_owned_cards[row], CARD_LIST_KEY: owned_cards_that_overlap})
+            else:
+                report_entries.append({SAVED_VALUE_KEY: NO_OWNED_OVERLAP_FLAG})
+        return report_entries
+
+    """
+    Return the report entry of each of the given metagame decks, in the same order, with None for the decks that we
+    don't own any cards of. See evaluate_metagame_deck()
+
+    :param meta_decks: A list of Deck objects representing Metagame decks on MTGGoldfish.com
+    """
+    def score_metagame_decks(self, meta_decks):
+        report_entries = []
+        for batch_start in range(0, len(meta_decks), self.batch_size):
+            report_entries.extend(self.score_metagame_decks_batch(meta_decks[batch_start:batch_start + self.batch_size]))
+        return report_entries
+
+    def score_metagame_decks_batch(self, meta_decks):
+        (deck_rows, card_ids, card_quantities, card_prices) = self.lay_out_cards(meta_decks)
+
+        # Each entry of owned_cards.txt is matched with the first card of the deck with the same name, just like
+        # OwnedCardIndex.match_owned_cards() does, so only the first owned card of each name in each deck is kept
+        name_ids = self.name_id_by_card_id[card_ids]
+        is_owned_card = name_ids < self.num_owned_card_names
+        (deck_rows, card_quantities, card_prices, name_ids) = (
+            deck_rows[is_owned_card], card_quantities[is_owned_card], card_prices[is_owned_card], name_ids[is_owned_card])
+        first_cards = numpy.unique(deck_rows * self.num_owned_card_names + name_ids, return_index=True)[1]
+        (deck_rows, card_quantities, card_prices, name_ids) = (
+            deck_rows[first_cards], card_quantities[first_cards], card_prices[first_cards], name_ids[first_cards])
+
+        # The cards of each deck are added up and listed in the order of owned_cards.txt
+        owned_positions = self.owned_positions_by_name_id[name_ids]
+        is_owned_entry = owned_positions >= 0
+        owned_positions = owned_positions[is_owned_entry]
+        (deck_rows, card_quantities, card_prices) = [
+            numpy.broadcast_to(card_values[:, numpy.newaxis], is_owned_entry.shape)[is_owned_entry]
+            for card_values in [deck_rows, card_quantities, card_prices]]
+        card_order = numpy.lexsort((owned_positions, deck_rows))
+        (owned_card_positions, owned_card_counts, owned_card_values, num_owned_card_positions, numbers_of_owned_cards, values_of_meta_decks_owned) = (
+            self.score_owned_card_matrix(len(meta_decks), deck_rows[card_order], owned_positions[card_order], card_quantities[card_order],
+                                         self.owned_card_quantities[owned_positions[card_order]], card_prices[card_order]))
+
+        report_entries = []
+        for (row, meta_deck) in enumerate(meta_decks):
+            if values_of_meta_decks_owned[row] > 0:
+                num_cards = num_owned_card_positions[row]
+                specific_cards_owned_in_meta_deck = [{CARD_NAME_KEY: self.owned_card_names[owned_card_position], CARD_QTY_KEY: owned_card_count, CARD_PRICE_KEY: owned_card_value}
+                                                     for (owned_card_position, owned_card_count, owned_card_value) in zip(
+                                                         owned_card_positions[row, :num_cards].tolist(), owned_card_counts[row, :num_cards].tolist(),
+                                                         owned_card_values[row, :num_cards].tolist())]
+                report_entries.append({OWNED_CARDS_KEY: "%d/%d" % (numbers_of_owned_cards[row], meta_deck.get_deck_size()),
+                                       SAVED_VALUE_KEY: values_of_meta_decks_owned[row], CARD_LIST_KEY: specific_cards_owned_in_meta_deck,
+                                       DECK_PRICE_KEY: meta_deck.get_deck_price()})
+            else:
+                report_entries.append(None)
+        return report_entries
 
-        # The deck file names are of the format <deck_id>_MM_DD_YYYY
-        cached_deck_id = existing_cache_file.split('_')[0]
-        if cached_deck_id == deck_id:
-            os.remove(os.path.join(cache_dir, existing_cache_file))
 
-    # Generate the file name for this cached Deck of the format <deck_id>_MM_DD_YYYY
-    todays_date = datetime.now()
-    month = todays_date.month
-    day = todays_date.day
-    if month <= 9:
-        month = "0%s" % (todays_date.month)
-    if day <= 9:
-        day = "0%s" % (todays_date.day)
-    cache_file_name = "%s_%s_%s_%s" % (deck_id, month, day, todays_date.year)
+"""
+Return the VectorizedDeckScorer for the given evaluation backend, or None if the decks are evaluated one at a time
 
-    with open(os.path.join(cache_dir, cache_file_name), 'wb') as output:
-        pickle.dump(deck, output, pickle.HIGHEST_PROTOCOL)
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param evaluation_backend: Either EVALUATION_BACKEND_PYTHON or EVALUATION_BACKEND_NUMPY
+"""
+def create_vectorized_scorer(owned_card_index, evaluation_backend):
+    if evaluation_backend == EVALUATION_BACKEND_NUMPY:
+        return VectorizedDeckScorer(owned_card_index)
+    return None
 
 
 """
-Given a DeckID, load the deck from the cache
+Return a DeckEvaluationPool with the given number of worker processes, or None if the decks are evaluated in this process
+
+:param num_processes: The number of worker processes, 1 to evaluate the decks in this process
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param desired_card_index: The DesiredCardIndex of the desired decks, or None if no Budget decks are evaluated
+:param evaluation_backend: Either EVALUATION_BACKEND_PYTHON or EVALUATION_BACKEND_NUMPY
 """
-def load_deck_from_cache(deck_id):
-    deck = Deck()
+def create_evaluation_pool(num_processes, owned_card_index, desired_card_index, evaluation_backend=EVALUATION_BACKEND_PYTHON):
+    if num_processes > 1:
+        return DeckEvaluationPool(num_processes, owned_card_index, desired_card_index, evaluation_backend)
+    return None
 
-    cache_dir = os.path.join(os.path.dirname(__file__), 'deck_cache')
-    cached_decks = os.listdir(cache_dir)
 
-    # Fetch the file name of the cached deck for reading
-    cached_deck_file_path = ""
-    for cached_file in cached_decks:
-        cached_deck_id = cached_file.split('_')[0]
-        if cached_deck_id == deck_id:
-            cached_deck_file_path = os.path.join(cache_dir, cached_file)
-            break
+"""
+The cards of every desired deck, indexed by their normalized names (see normalize_card_name()), so that the desired
+decks sharing cards with a budget deck can be found with one lookup per card of the budget deck, rather than by
+comparing the budget deck against each desired deck card by card
 
-    with open(cached_deck_file_path, 'rb') as input:
-        deck = pickle.load(input)
+:param desired_decks_list: The list of Deck objects representing the decks in desired_decks.txt
+"""
+class DesiredCardIndex(object):
+    def __init__(self, desired_decks_list):
+        self.desired_deck_sizes = []
 
-    return deck
+        # Each normalized card name maps to a (desired_deck_index, card_position, desired_card_entry) tuple for every card of
+        # a desired deck with that name
+        self.desired_entries_by_name = {}
+        for (desired_deck_index, desired_deck) in enumerate(desired_decks_list):
+            desired_deck_list = desired_deck.get_deck_list()
+            self.desired_deck_sizes.append(len(desired_deck_list))
+            for (card_position, desired_card_entry) in enumerate(desired_deck_list):
+                self.desired_entries_by_name.setdefault(normalize_card_name(desired_card_entry[CARD_NAME_KEY]), []).append(
+                    (desired_deck_index, card_position, desired_card_entry))
 
 
 """
-Parse the owned_cards.txt file and return the cards as a list of dictionaries of card records
-using CARD_QTY_KEY and CARD_NAME_KEY
+Which of the user's Owned Cards are in a single budget deck, computed once for the budget deck and then shared by its
+evaluation against every desired deck. Owned cards are recorded in the order of the budget deck's cards, with the
+running totals of the owned quantity and value after each of them, so the overlap with just the first few cards of the
+budget deck is one lookup away (see get_owned_overlap())
+
+:param budget_deck_list: The deck list of the budget deck (see Deck.get_deck_list())
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
 """
-def parse_owned_cards():
-    owned_cards = []
-    script_dir = os.path.dirname(__file__)
-    owned_cards_file = open(os.path.join(script_dir, 'owned_cards.txt'), 'r')
-    for line in owned_cards_file:
+class BudgetDeckOwnedOverlap(object):
+    def __init__(self, budget_deck_list, owned_card_index):
+        self.budget_card_positions = []
+        self.owned_card_records = []
+        self.numbers_of_owned_cards = []
+        self.values_owned = []
+
+        number_of_owned_cards_that_are_in_budget_deck = 0
+        value_of_budget_deck_owned = 0.0
+        owned_card_names_recorded = set()
+        for (budget_card_position, budget_card_entry) in enumerate(budget_deck_list):
+            for (owned_card_position, owned_card_entry) in owned_card_index.owned_entries_by_name.get(
+                    normalize_card_name(budget_card_entry[CARD_NAME_KEY]), []):
+                owned_card_name = owned_card_entry[CARD_NAME_KEY]
+
+                # Only record each owned card once, for the first card of the budget deck with its name
+                if owned_card_name in owned_card_names_recorded:
+                    continue
+                owned_card_names_recorded.add(owned_card_name)
+
+                if owned_card_entry[CARD_QTY_KEY] >= budget_card_entry[CARD_QTY_KEY]:
+                    number_of_owned_cards_that_are_in_budget_deck += budget_card_entry[CARD_QTY_KEY]
+                    value_of_budget_deck_owned += float(
+                        budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+                    self.owned_card_records.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: budget_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                        budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]})
+                else:
+                    number_of_owned_cards_that_are_in_budget_deck += owned_card_entry[CARD_QTY_KEY]
+                    value_of_budget_deck_owned += float(
+                        owned_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+                    self.owned_card_records.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                        owned_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]})
+                self.budget_card_positions.append(budget_card_position)
+                self.numbers_of_owned_cards.append(number_of_owned_cards_that_are_in_budget_deck)
+                self.values_owned.append(value_of_budget_deck_owned)
+
+    """
+    Return the (number_of_owned_cards, value_owned, owned_card_records) of the owned cards found among the first
+    num_budget_cards cards of the budget deck
+
+    :param num_budget_cards: The number of cards of the budget deck to take into account
+    """
+    def get_owned_overlap(self, num_budget_cards):
+        num_records = bisect.bisect_left(self.budget_card_positions, num_budget_cards)
+        if num_records == 0:
+            return (0, 0.0, [])
+        return (self.numbers_of_owned_cards[num_records - 1], self.values_owned[num_records - 1], self.owned_card_records[:num_records])
 
-        # Disregard comments and empty lines
-        if line[0] == "#" or len(line) <= 1:
-            continue
 
-        separator_index = line.find(' ')
-        if separator_index == -1:
-            continue
-        card_quantity = int(line[:separator_index])
-        card_name = line[separator_index + 1:].replace('\n', '')
+"""
+Determine how many cards from a single budget deck are present in each of the desired decks, along with how many of the
+budget deck's cards the user already owns. Returns a list holding the report entry of the budget deck for each desired
+deck, or None for the desired decks it doesn't overlap with at all (see evaluate_budget_decks())
 
-        # Double-check to make sure the user hasn't entered this card in more than once. If so, we aren't going
-        # to try to resolve this for the user by making assumptions. Instead, we will point this out via a Print
-        # statement for them to resolve, and kill the script
-        for card_entry in owned_cards:
-            if card_entry[CARD_NAME_KEY].lower() == card_name.lower():
-                print("[ERROR]: \"%s\" occurs more than once in owned_cards.txt. Exiting." % (
-                    card_name))
-                sys.exit(0)
+Each card of a desired deck is matched with the first card of the budget deck with the same name. The owned cards are
+only looked for among the cards of the budget deck up to the last of those matches, or among all of them if any card of
+the desired deck isn't in the budget deck at all, the same as comparing the decks card by card and stopping at each match
 
-        owned_cards.append(
-            {CARD_QTY_KEY: card_quantity, CARD_NAME_KEY: card_name})
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param desired_card_index: The DesiredCardIndex of the decks in desired_decks.txt
+:param budget_deck: A Deck object representing one of the Budget decks on MTGGoldfish.com
+"""
+def evaluate_budget_deck_against_desired_decks(owned_card_index, desired_card_index, budget_deck):
+    budget_deck_list = budget_deck.get_deck_list()
+    owned_overlap = BudgetDeckOwnedOverlap(budget_deck_list, owned_card_index)
+
+    # Find every card of a desired deck that is also in the budget deck, grouped by desired deck
+    card_matches_by_desired_deck = {}
+    matched_card_names = set()
+    for (budget_card_position, budget_card_entry) in enumerate(budget_deck_list):
+        normalized_card_name = normalize_card_name(budget_card_entry[CARD_NAME_KEY])
+        if normalized_card_name in matched_card_names:
+            continue
+        matched_card_names.add(normalized_card_name)
+        for (desired_deck_index, card_position, desired_card_entry) in desired_card_index.desired_entries_by_name.get(normalized_card_name, []):
+            card_matches_by_desired_deck.setdefault(desired_deck_index, []).append(
+                (card_position, desired_card_entry, budget_card_position, budget_card_entry))
+
+    report_entries = [None] * len(desired_card_index.desired_deck_sizes)
+    for (desired_deck_index, card_matches) in card_matches_by_desired_deck.items():
+        number_of_cards_from_budget_deck_that_are_in_desired_deck = 0
+        value_shared_between_decks = 0.0
+        last_matched_budget_card_position = 0
+
+        # The shared value is added up in the order of the desired deck's cards
+        card_matches.sort(key=lambda card_match: card_match[0])
+        for (card_position, desired_card_entry, budget_card_position, budget_card_entry) in card_matches:
+            if desired_card_entry[CARD_QTY_KEY] >= budget_card_entry[CARD_QTY_KEY]:
+                number_of_cards_from_budget_deck_that_are_in_desired_deck += budget_card_entry[
+                    CARD_QTY_KEY]
+                value_shared_between_decks += float(
+                    budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+            else:
+                number_of_cards_from_budget_deck_that_are_in_desired_deck += desired_card_entry[
+                    CARD_QTY_KEY]
+                value_shared_between_decks += float(
+                    desired_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+            last_matched_budget_card_position = max(last_matched_budget_card_position, budget_card_position)
+
+        # Only bother reporting budget decks that actually overlap
+        if value_shared_between_decks > 0:
+            num_budget_cards_with_owned_cards = last_matched_budget_card_position + 1
+            if len(card_matches) < desired_card_index.desired_deck_sizes[desired_deck_index]:
+                num_budget_cards_with_owned_cards = len(budget_deck_list)
+            (number_of_owned_cards_that_are_in_budget_deck, value_of_budget_deck_owned, specific_owned_cards_in_budget_deck) = owned_overlap.get_owned_overlap(
+                num_budget_cards_with_owned_cards)
+            report_entries[desired_deck_index] = {DECK_PRICE_KEY: budget_deck.get_deck_price(), SHARED_CARDS_KEY: "%d/%d" % (number_of_cards_from_budget_deck_that_are_in_desired_deck, budget_deck.get_deck_size(
+            )), SHARED_VALUE_KEY: value_shared_between_decks, OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_budget_deck, budget_deck.get_deck_size()), SAVED_VALUE_KEY: value_of_budget_deck_owned, CARD_LIST_KEY: specific_owned_cards_in_budget_deck}
+    return report_entries
 
-    owned_cards_file.close()
 
-    return owned_cards
+"""
+Keeps the report entries of a stream of decks which may arrive in any order, keyed by deck name. The result is
+the same as if the decks had been added to a dict one after another in their original order: a later deck with
+the same name replaces an earlier deck's entry, but keeps the earlier deck's position in the dict. The report entries
+may also be PickledReportEntry objects, which are unpickled when they're returned
+
+The entry of every deck name is kept until the end, so memory grows with the number of differently named decks (each
+entry only holds the owned cards of its deck, not the deck itself). Keeping just the top of the ranking isn't enough,
+as a deck arriving later can replace the entry of a deck in the top with a lower one, which the next best entry then
+takes the place of. The best entry so far is kept up to date as the entries are added, so that showing it after every
+deck doesn't need to go through all of them
+
+:param ranking_key: The report entry key that get_best_entry_value() ranks the entries by, such as SAVED_VALUE_KEY, or
+                    None if it isn't used
+"""
+class DeckReportCollector(object):
+    def __init__(self, ranking_key=None):
+        self.ranking_key = ranking_key
+
+        # deck name -> (position of the first deck with this name, position of the deck the entry came from, report entry)
+        self.entries_by_deck_name = {}
+
+        # The name of the deck with the best entry so far, which has to be looked for again once its entry got replaced
+        # with a lower one
+        self.best_deck_name = None
+        self.best_deck_name_is_stale = False
+
+    def add_entry(self, deck_index, deck_name, report_entry):
+        if self.ranking_key is not None and deck_name == self.best_deck_name:
+            previous_rank = self.get_rank(deck_name)
+
+        if deck_name in self.entries_by_deck_name:
+            (first_deck_index, entry_deck_index, existing_report_entry) = self.entries_by_deck_name[deck_name]
+            if deck_index < entry_deck_index:
+                self.entries_by_deck_name[deck_name] = (min(first_deck_index, deck_index), entry_deck_index, existing_report_entry)
+            else:
+                self.entries_by_deck_name[deck_name] = (first_deck_index, deck_index, report_entry)
+        else:
+            self.entries_by_deck_name[deck_name] = (deck_index, deck_index, report_entry)
+
+        if self.ranking_key is None or self.best_deck_name_is_stale:
+            return
+        if deck_name == self.best_deck_name:
+            self.best_deck_name_is_stale = self.get_rank(deck_name) > previous_rank
+        elif self.best_deck_name is None or self.get_rank(deck_name) < self.get_rank(self.best_deck_name):
+            self.best_deck_name = deck_name
+
+    """
+    Return the sort key of the entry of the given deck name in the ranking by ranking_key, which is lowest for the best entry
+    """
+    def get_rank(self, deck_name):
+        (first_deck_index, entry_deck_index, report_entry) = self.entries_by_deck_name[deck_name]
+        return (-report_entry[self.ranking_key], first_deck_index)
+
+    """
+    Return a (deck_name, value) tuple of the best entry so far by ranking_key, the same as the first entry of
+    get_ranking(ranking_key, 1), or None if there aren't any entries yet
+    """
+    def get_best_entry_value(self):
+        if self.best_deck_name_is_stale:
+            self.best_deck_name = min(self.entries_by_deck_name, key=self.get_rank)
+            self.best_deck_name_is_stale = False
+        if self.best_deck_name is None:
+            return None
+        return (self.best_deck_name, self.entries_by_deck_name[self.best_deck_name][2][self.ranking_key])
+
+    def __len__(self):
+        return len(self.entries_by_deck_name)
+
+    """
+    Return the entries as a list of (deck_name, report_entry) tuples in their original dict order
+    """
+    def get_entries(self):
+        return [(deck_name, get_report_entry(entry[2])) for (deck_name, entry) in sorted(self.entries_by_deck_name.items(), key=lambda kv: kv[1][0])]
+
+    """
+    Return the entries as a list of (deck_name, report_entry) tuples sorted by the given report key, descending.
+    Ties keep their original dict order, just like a stable sort of the dict would
+
+    :param sort_key: The report entry key to sort by, such as SAVED_VALUE_KEY
+    :param limit: The maximum number of entries to return
+    """
+    def get_ranking(self, sort_key, limit):
+        ranked_entries = heapq.nsmallest(limit, self.entries_by_deck_name.items(), key=lambda kv: (-kv[1][2][sort_key], kv[1][0]))
+        return [(deck_name, get_report_entry(entry[2])) for (deck_name, entry) in ranked_entries]
 
 
 """
-Parse the desired_decks.txt file and return a list of the URLs contained within
+Evaluate a batch of decks for one of the analyses, returning the report entry of each deck in the same order. Desired
+decks get the report entry of evaluate_owned_cards_for_deck(), Metagame decks the one of evaluate_metagame_deck(), and
+Budget decks the list of report entries returned by evaluate_budget_deck_against_desired_decks()
+
+:param category: DESIRED_DECKS_CATEGORY, METAGAME_DECKS_CATEGORY or BUDGET_DECKS_CATEGORY
+:param decks: A list of Deck objects of that category
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param desired_card_index: The DesiredCardIndex of the desired decks, which is only needed for Budget decks
+:param vectorized_scorer: The VectorizedDeckScorer to score desired and Metagame decks with, or None to evaluate them one at a time
 """
-def parse_desired_deck_URLs():
-    desired_deck_URLs = []
-    script_dir = os.path.dirname(__file__)
-    desired_cards_file = open(os.path.join(script_dir, 'desired_decks.txt'))
-    for line in desired_cards_file:
-
-        # Disregard comments and empty lines
-        if line[0] == "#" or len(line) <= 1:
-            continue
+def evaluate_deck_batch(category, decks, owned_card_index, desired_card_index=None, vectorized_scorer=None):
+    if category == DESIRED_DECKS_CATEGORY:
+        if vectorized_scorer is not None:
+            return vectorized_scorer.score_owned_cards(decks)
+        return [evaluate_owned_cards_for_deck(desired_deck, owned_card_index) for desired_deck in decks]
+    if category == METAGAME_DECKS_CATEGORY:
+        if vectorized_scorer is not None:
+            return vectorized_scorer.score_metagame_decks(decks)
+        return [evaluate_metagame_deck(meta_deck, owned_card_index) for meta_deck in decks]
+    return [evaluate_budget_deck_against_desired_decks(owned_card_index, desired_card_index, budget_deck) for budget_deck in decks]
 
-        desired_deck_URLs.append(line)
 
-    desired_cards_file.close()
+"""
+A batch of decks packed into a few flat arrays to be sent to an evaluation worker process (see DeckEvaluationPool).
+Pickling the arrays is a single copy of their memory, whereas pickling the decks themselves would spell out every card
+by name (see Deck.__getstate__()), which takes longer than evaluating them. The cards keep the IDs they have in
+card_name_table, and the names behind those IDs reach the workers through the DeckEvaluationPool's card names file
 
-    return desired_deck_URLs
+:param decks: A list of Deck objects
+:param num_card_names: The number of card names in the card names file, which covers every card of the decks
+"""
+class PackedDeckBatch(object):
+    def __init__(self, decks, num_card_names):
+        self.num_card_names = num_card_names
+        self.card_ids = array('i')
+        self.card_quantities = array('i')
+        self.card_paper_prices = array('d')
+        self.card_online_prices = array('d')
+
+        # The number of cards of each deck, whose cards follow on from those of the deck before it in the arrays above
+        self.deck_card_counts = array('i')
+        self.deck_headers = []
+        for deck in decks:
+            self.card_ids.extend(deck.card_ids)
+            self.card_quantities.extend(deck.card_quantities)
+            self.card_paper_prices.extend(deck.card_paper_prices)
+            self.card_online_prices.extend(deck.card_online_prices)
+            self.deck_card_counts.append(len(deck.card_ids))
+            self.deck_headers.append((deck.deck_name, deck.deck_price, deck.uses_online_price))
+
+    """
+    Rebuild the decks of this batch in an evaluation worker process, whose card_name_table has to hold at least
+    num_card_names names. The rebuilt decks only have what the evaluations need: their names, their cards and the price
+    they're evaluated with
+    """
+    def unpack(self):
+        decks = []
+        first_card = 0
+        for (num_cards, (deck_name, deck_price, uses_online_price)) in zip(self.deck_card_counts, self.deck_headers):
+            deck = Deck()
+            deck.deck_name = deck_name
+            deck.deck_price = deck_price
+            deck.uses_online_price = uses_online_price
+            deck.card_ids = self.card_ids[first_card:first_card + num_cards]
+            deck.card_quantities = self.card_quantities[first_card:first_card + num_cards]
+            deck.card_paper_prices = self.card_paper_prices[first_card:first_card + num_cards]
+            deck.card_online_prices = self.card_online_prices[first_card:first_card + num_cards]
+            deck.deck_size = sum(deck.card_quantities)
+            decks.append(deck)
+            first_card += num_cards
+        return decks
 
 
 """
-Given the desired deck URLs, parse all of the decks into Deck objects
+A report entry sent back by an evaluation worker process, still pickled. Most report entries never make it into a
+report, so they're only unpickled once they do (see get_report_entry()), and until then take up a fraction of the
+memory. The values that report entries are ranked by are kept unpickled, and can be looked up like those of the report
+entry itself
 
-:param update_cache: If set to True, we will ignore any cached versions of these decks
-:param deck_URLs_list: The list of deck URLs
+:param report_entry: The report entry
 """
-def parse_decks_from_list_of_urls(update_cache, deck_URLs_list, use_online_price):
-    progress_bar = IncrementalBar("   Fetching Deck Data", max=len(deck_URLs_list), suffix='%(percent)d%%')
-    deck_objs_list = []
-    num_cached_decks = 0
-    num_old_cached_decks = 0
+class PickledReportEntry(object):
+    __slots__ = ['ranking_values', 'pickled_report_entry']
 
-    if update_cache:
-        print("   Manual cache update requested, updating all local deck caches.")
+    def __init__(self, report_entry):
+        self.ranking_values = dict((ranking_key, report_entry[ranking_key]) for ranking_key in [SAVED_VALUE_KEY, SHARED_VALUE_KEY]
+                                   if ranking_key in report_entry)
+        self.pickled_report_entry = pickle.dumps(report_entry, pickle.HIGHEST_PROTOCOL)
 
-    for deck_url in deck_URLs_list:
-        deck = Deck()
+    def __getitem__(self, ranking_key):
+        return self.ranking_values[ranking_key]
 
-        # The URL format is either "https://www.mtggoldfish.com/deck/784979#paper" for a Budget deck
-        # or "https://www.mtggoldfish.com/archetype/modern-grixis-death-s-shadow#paper" for a Modern Meta deck
-        # So we fetch the Deck ID from the last '/' to the '#'
-        deck_id = deck_url[deck_url.rfind('/') + 1:].split("#")[0]
 
-        # Check whether or not a cached version of this deck exists locally, and use that instead
-        if not update_cache and is_deck_cached(deck_id):
-            num_cached_decks += 1
-            if cached_deck_is_old(deck_id):
-                num_old_cached_decks += 1
+"""
+Return the given report entry itself, unpickling it if it was sent back by an evaluation worker process (see PickledReportEntry)
 
-            # Load the deck from the cache
-            deck_objs_list.append(load_deck_from_cache(deck_id))
+:param report_entry: A report entry, or a PickledReportEntry
+"""
+def get_report_entry(report_entry):
+    if isinstance(report_entry, PickledReportEntry):
+        return pickle.loads(report_entry.pickled_report_entry)
+    return report_entry
 
-            progress_bar.next()
-            continue
 
-        driver = webdriver.Firefox()
-        try:
-            driver.get(deck_url)
-        except:
-            print("   [ERROR]: Failed to navigate to \"%s\"" % (deck_url))
-            print("   Check your internet connection. Also note that sometimes MTGGoldfish.com experiences issues, try navigating to this URL yourself and see if it works. Try running the script again.")
-            driver.close()
-            sys.exit(0)
+"""
+Set up an evaluation worker process of a DeckEvaluationPool, keeping the indexes that every batch of decks sent to the
+worker is evaluated against. The card names are read from the pool's card names file as the batches need them (see
+read_evaluation_worker_card_names())
+
+:param card_names_file_path: The path of the card names file of the pool
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param desired_card_index: The DesiredCardIndex of the desired decks, or None if no Budget decks are evaluated
+:param evaluation_backend: Either EVALUATION_BACKEND_PYTHON or EVALUATION_BACKEND_NUMPY
+"""
+def initialize_evaluation_worker(card_names_file_path, owned_card_index, desired_card_index, evaluation_backend):
+    global evaluation_worker_card_names_file
+    global evaluation_worker_indexes
+    evaluation_worker_card_names_file = open(card_names_file_path, 'rb')
+    evaluation_worker_indexes = (owned_card_index, desired_card_index, create_vectorized_scorer(owned_card_index, evaluation_backend))
 
-        deck.deck_url = deck_url
-        # find_element_by_class_name method has been deprecated. Replaced with newer Selenium method.
-        raw_deck_name_parse = driver.find_element(By.CLASS_NAME,
-            "title").get_attribute('textContent').replace('\n', '')
 
-        # The formatting of the name field is different on the meta page vs the budget pages. On the budget pages it is followed with
-        # "by <author>" while on the meta pages it is followed by "Suggest a Better Name"
-        if raw_deck_name_parse.find('by ') > 0:
-            deck.deck_name = raw_deck_name_parse[:raw_deck_name_parse.find(
-                'by ')].encode('ascii')
-        else:
-            deck.deck_name = raw_deck_name_parse[:-
-                                                 len("Suggest a Better Name")].encode('ascii')
-
-        # Changed _by_class_name to new (By.CLASS_NAME, to reflect updated Selenium method.
-        deck_date_as_string = driver.find_element(By.CLASS_NAME, 
-            "deck-container-information").get_attribute('textContent').replace('\n', '')[-len("MMM DD, YYYY"):]
-        # The website uses "9" instead of "09" for date, we need to strip whitespace before parsing the date.   
-        deck_date_as_string = deck_date_as_string.strip()
-        deck.deck_date = datetime.strptime(deck_date_as_string, '%b %d, %Y')
-
-        # Iterate over all of the rows in the deck list and build the deck object
-        deck_list = []
-        deck_total_cost = 0.0
-        price_tab_element_tag = 'tab-paper'
-        if use_online_price:
-            price_tab_element_tag = 'tab-online'
-        # Same Selenium method to update the "(By.CLASS_NAME," also applies to "(By,TAG_NAME,".
-        # The website appears to have undergone changes to its structure. I've updated
-            # all the CLASS_NAMES and TAG_NAMES to be able to locate and scrape the desired data.
-        rows_element = driver.find_element(By.CLASS_NAME, "deck-table-container")
-        table_body = rows_element.find_element(By.TAG_NAME, "tbody")
-        rows = table_body.find_elements(By.TAG_NAME, "tr")
-        for row in rows:
-            columns = row.find_elements(By.TAG_NAME, "td")
-
-            # Disregard any of the section title rows such as "Creatures", "Planeswalkers", etc
-            if len(columns) == 4:
-                card_name = columns[NAME_INDEX].get_attribute(
-                    'textContent').replace('\n', '')
-
-                # We don't care about Basic Mana in any analysis.
-                if card_name.lower() in ["mountain", "swamp", "plains", "island", "forest"]:
-                    continue
+"""
+Intern the card names written to the card names file since this evaluation worker process last read it, until
+card_name_table holds at least the given number of names. As the names are interned in the same order as in the main
+process, each of them gets the same ID it has there
 
-                card_quantity_string = columns[QTY_INDEX].get_attribute(
-                    'textContent').replace('\n', '')
-                card_price_string = columns[PRICE_INDEX].get_attribute(
-                    'textContent').replace('\n', '')
-                
-                if card_quantity_string == '':
-                    card_quantity_string = '1'
-                if card_price_string == '':
-                    card_price_string = '0'
-                # The price kept returning "\xa0" (Fun Fact: \xa0 is unicode for a non-breaking space) 
-                # To fix, I cleaned the string to be able to return a float.
-                else:
-                    card_price_string = card_price_string.replace('\xa0', '').replace('$', '')
+:param num_card_names: The number of card names needed
+"""
+def read_evaluation_worker_card_names(num_card_names):
+    while len(card_name_table.card_names) < num_card_names:
+        for card_name in pickle.load(evaluation_worker_card_names_file):
+            card_name_table.get_card_id(card_name)
 
-                card_quantity = int(card_quantity_string)
-                individual_card_price = float(
-                    card_price_string.replace(',', '')) / float(card_quantity)
-                deck_total_cost += float(card_price_string.replace(',', ''))
 
-                # It's possible for a card to appear in the list twice if it is present in both the main deck and the sideboard.
-                # If this happens, we need to just update the Quantity and Price of the existing record
-                record_already_exist = False
-                for entry in deck_list:
-                    if entry[CARD_NAME_KEY] == card_name:
-                        record_already_exist = True
-                        entry[CARD_QTY_KEY] += card_quantity
-                if not record_already_exist:
-                    deck_list.append(
-                        {CARD_QTY_KEY: card_quantity, CARD_NAME_KEY: card_name, CARD_PRICE_KEY: individual_card_price})
+"""
+Evaluate a PackedDeckBatch in an evaluation worker process, returning the report entries pickled (see
+PickledReportEntry and evaluate_deck_batch())
+"""
+def evaluate_deck_batch_in_worker(category, packed_deck_batch):
+    (owned_card_index, desired_card_index, vectorized_scorer) = evaluation_worker_indexes
+    read_evaluation_worker_card_names(packed_deck_batch.num_card_names)
+    report_entries = evaluate_deck_batch(category, packed_deck_batch.unpack(), owned_card_index, desired_card_index, vectorized_scorer)
 
-        deck.deck_list = deck_list
-        deck.deck_price = deck_total_cost
-        deck_objs_list.append(deck)
+    # Budget decks have a list of report entries each, one for every desired deck
+    if category == BUDGET_DECKS_CATEGORY:
+        return [[None if report_entry is None else PickledReportEntry(report_entry) for report_entry in deck_report_entries]
+                for deck_report_entries in report_entries]
+    return [None if report_entry is None else PickledReportEntry(report_entry) for report_entry in report_entries]
 
-        # Cache the deck
-        save_deck_to_cache(deck, deck_id)
 
-        driver.close()
+"""
+A pool of worker processes which evaluate batches of decks (see evaluate_deck_batch()), so that the evaluations are
+spread over every CPU core rather than running on one. The OwnedCardIndex and the DesiredCardIndex are sent to each
+worker once, when it starts, and so is every card name: the names interned in card_name_table are appended to a card
+names file shared with the workers, and each worker reads every name once. So only the packed decks (see
+PackedDeckBatch) and their pickled report entries (see PickledReportEntry) go back and forth with each batch, leaving
+the main process with little more to do than hand out the decks. The workers are started as fresh processes rather
+than forked, as a fork would copy any lock that a fetching thread is holding at the time
+
+:param num_processes: The number of worker processes
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param desired_card_index: The DesiredCardIndex of the desired decks, or None if no Budget decks are evaluated
+:param evaluation_backend: Either EVALUATION_BACKEND_PYTHON or EVALUATION_BACKEND_NUMPY, used by every worker
+:param batch_size: The number of decks sent to a worker at once
+"""
+class DeckEvaluationPool(object):
+    def __init__(self, num_processes, owned_card_index, desired_card_index=None, evaluation_backend=EVALUATION_BACKEND_PYTHON,
+                 batch_size=PARALLEL_EVALUATION_BATCH_SIZE):
+        self.batch_size = batch_size
+        self.card_names_file = tempfile.NamedTemporaryFile(prefix='card_names_', suffix='.pickle', delete=False)
+        self.num_written_card_names = 0
+        self.executor = ProcessPoolExecutor(max_workers=num_processes, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=initialize_evaluation_worker,
+                                            initargs=(self.card_names_file.name, owned_card_index, desired_card_index, evaluation_backend))
+
+    """
+    Append the card names interned since the last time to the card names file, returning the number of names in the file
+    """
+    def write_new_card_names(self):
+        num_card_names = len(card_name_table.card_names)
+        if num_card_names > self.num_written_card_names:
+            pickle.dump(card_name_table.card_names[self.num_written_card_names:num_card_names], self.card_names_file, pickle.HIGHEST_PROTOCOL)
+            self.card_names_file.flush()
+            self.num_written_card_names = num_card_names
+        return self.num_written_card_names
+
+    """
+    Start evaluating a batch of decks in one of the workers, returning the Future of its report entries
+
+    :param category: DESIRED_DECKS_CATEGORY, METAGAME_DECKS_CATEGORY or BUDGET_DECKS_CATEGORY
+    :param decks: A list of Deck objects of that category
+    """
+    def submit(self, category, decks):
+        return self.executor.submit(evaluate_deck_batch_in_worker, category, PackedDeckBatch(decks, self.write_new_card_names()))
+
+    def close(self):
+        self.executor.shutdown()
+        self.card_names_file.close()
+        os.remove(self.card_names_file.name)
 
-        progress_bar.next()
 
-    progress_bar.finish()
+"""
+Gathers the decks added to a streaming evaluator into batches, which are either scored right away by a
+VectorizedDeckScorer, or sent off to a DeckEvaluationPool. Once a batch has been scored, report_entry_function is called
+with the (deck_index, deck_name, report_entry) of each of its decks. Batches are merged back in the order they were
+sent, no matter which worker finishes first, so the reports don't depend on how the decks were spread over the workers
+
+:param category: DESIRED_DECKS_CATEGORY, METAGAME_DECKS_CATEGORY or BUDGET_DECKS_CATEGORY
+:param report_entry_function: The function the report entry of each scored deck is handed to
+:param vectorized_scorer: The VectorizedDeckScorer to score the batches with, if there's no evaluation_pool
+:param evaluation_pool: The DeckEvaluationPool to send the batches to, or None to score them in this process
+"""
+class DeckBatchQueue(object):
+    def __init__(self, category, report_entry_function, vectorized_scorer=None, evaluation_pool=None):
+        self.category = category
+        self.report_entry_function = report_entry_function
+        self.vectorized_scorer = vectorized_scorer
+        self.evaluation_pool = evaluation_pool
+        if evaluation_pool is not None:
+            self.batch_size = evaluation_pool.batch_size
+        else:
+            self.batch_size = vectorized_scorer.batch_size
+        self.pending_decks = []
+
+        # The (deck indexes and names, Future) of each batch sent to the evaluation_pool which hasn't been merged yet, oldest first
+        self.submitted_batches = []
+
+    def add_deck(self, deck_index, deck):
+        self.pending_decks.append((deck_index, deck))
+
+        # Batches scored by the evaluation_pool are merged whenever another batch is sent off to it
+        if len(self.pending_decks) >= self.batch_size:
+            self.score_pending_decks()
+            self.merge_scored_batches(False)
+
+    """
+    Score the decks added since the last batch was scored, or send them off to the evaluation_pool
+    """
+    def score_pending_decks(self):
+        if len(self.pending_decks) == 0:
+            return
+        decks = [deck for (deck_index, deck) in self.pending_decks]
+        deck_indexes_and_names = [(deck_index, deck.get_deck_name()) for (deck_index, deck) in self.pending_decks]
+        self.pending_decks = []
+        if self.evaluation_pool is not None:
+            self.submitted_batches.append((deck_indexes_and_names, self.evaluation_pool.submit(self.category, decks)))
+        else:
+            self.merge_batch(deck_indexes_and_names, evaluate_deck_batch(
+                self.category, decks, self.vectorized_scorer.owned_card_index, vectorized_scorer=self.vectorized_scorer))
 
-    # Print number of cached decks used
-    print("   Finished fetching deck data. %s of %s decks were fetched from the cache." % (
-        num_cached_decks, len(deck_URLs_list)))
+    def merge_batch(self, deck_indexes_and_names, report_entries):
+        for ((deck_index, deck_name), report_entry) in zip(deck_indexes_and_names, report_entries):
+            self.report_entry_function(deck_index, deck_name, report_entry)
 
-    # Print number of stale decks and recommend updating
-    if num_old_cached_decks > 0:
-        print("   [WARNING]: %s  of %s cached decks in this fetch were created more than 30 days ago."
-              " Prices may have changed significantly since then."
-              " You should run \"python mtggoldfish.py -u\" to update your cached decks." % (num_old_cached_decks, len(deck_URLs_list)))
-    return deck_objs_list
+    """
+    Merge the batches sent to the evaluation_pool which have been scored, in the order they were sent
+
+    :param wait_for_all: True to wait for every batch, False to stop at the first one that is still being scored
+    """
+    def merge_scored_batches(self, wait_for_all):
+        while len(self.submitted_batches) > 0 and (wait_for_all or self.submitted_batches[0][1].done()):
+            (deck_indexes_and_names, scored_batch) = self.submitted_batches.pop(0)
+            self.merge_batch(deck_indexes_and_names, scored_batch.result())
+
+    """
+    Score every deck added so far, waiting for any batches still being scored by the evaluation_pool
+    """
+    def finish(self):
+        self.score_pending_decks()
+        self.merge_scored_batches(True)
 
 
 """
-Given the URL for a category landing page on MTGGoldfish.com (such as "https://www.mtggoldfish.com/decks/budget/modern#paper"),
-parse all of the URLs for the various decks on that page. It uses the #paper or #online queryparam to determine which URL to load
-for each deck
+Evaluates the Owned Cards overlap of each desired deck as soon as it is parsed or loaded. See evaluate_owned_cards().
+With a VectorizedDeckScorer or a DeckEvaluationPool, the decks are instead scored a whole batch at a time
 
-:param category_landing_page_url: The URL of the category landing page that contains a list of various decks
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param vectorized_scorer: The VectorizedDeckScorer to score the decks with, or None to evaluate them one at a time
+:param evaluation_pool: The DeckEvaluationPool to evaluate the decks in, or None to evaluate them in this process
 """
-def parse_deck_urls_from_category_landing_page(category_landing_page_url):
-    print("   Opening a browser real quick to snapshot deck URLs from MTGGoldfish.com, as there might be new decks that we need to fetch data for.")
-    driver = webdriver.Firefox()
-    driver.get(category_landing_page_url)
+class StreamingOwnedCardsEvaluator(object):
+    def __init__(self, owned_card_index, vectorized_scorer=None, evaluation_pool=None):
+        self.owned_card_index = owned_card_index
+        self.report_collector = DeckReportCollector()
+        self.deck_batches = None
+        if vectorized_scorer is not None or evaluation_pool is not None:
+            self.deck_batches = DeckBatchQueue(DESIRED_DECKS_CATEGORY, self.add_report_entry, vectorized_scorer, evaluation_pool)
+
+    def add_deck(self, deck_index, desired_deck):
+        if self.deck_batches is not None:
+            self.deck_batches.add_deck(deck_index, desired_deck)
+            return
+        self.add_report_entry(deck_index, desired_deck.get_deck_name(), evaluate_owned_cards_for_deck(desired_deck, self.owned_card_index))
+
+    def add_report_entry(self, deck_index, deck_name, report_entry):
+        self.report_collector.add_entry(deck_index, deck_name, report_entry)
+
+    """
+    Wait for every deck added so far to be scored
+    """
+    def finish(self):
+        if self.deck_batches is not None:
+            self.deck_batches.finish()
+
+    def get_report(self):
+        self.finish()
+        owned_overlap_report = {}
+        for (desired_deck_name, report_entry) in self.report_collector.get_entries():
+            owned_overlap_report[desired_deck_name] = report_entry
+        return owned_overlap_report
 
-    # I didn't change the element names for either paper, online, or budget decks. 
-    # However, it appears that functionality didn't break here, even with the old class names and tags.
-    deck_URL_container_element_tag = "deck-price-paper"
-    if "#online" in category_landing_page_url.lower():
-        deck_URL_container_element_tag = "deck-price-online"
 
-    budget_deck_url_list = []
-    try:
-        # Update Selenenium method from "_by_class_name" to "(By.CLASS_NAME,"/"(By.TAG_NAME,"
-        deck_tiles = driver.find_elements(By.CLASS_NAME, "archetype-tile")
-        for tile in deck_tiles:
-            deck_description_container = tile.find_element(By.CLASS_NAME, "archetype-tile-description-wrapper").find_element(By.CLASS_NAME, 
-                "archetype-tile-description").find_element(By.CLASS_NAME, deck_URL_container_element_tag)
-            deck_url = deck_description_container.find_element(By.TAG_NAME, 
-                'a').get_attribute("href")
+"""
+Evaluates each metagame deck as soon as it is parsed or loaded, so that the ranking of the decks seen so far is
+available while the rest are still being fetched. Only the report entries are kept, not the decks themselves.
+With a VectorizedDeckScorer or a DeckEvaluationPool, the decks are instead scored a whole batch at a time, so the decks
+of a batch that hasn't been scored yet are kept until it is, and are left out of the partial ranking. Decks whose score
+was stored by an earlier run are added with add_stored_deck_score() instead, and the scores of the other decks are kept
+for the next run if keep_deck_scores is set (see DeckStore.save_metagame_deck_scores()). See evaluate_metagame_decks()
+
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param top_k: The number of decks in the final ranking
+:param vectorized_scorer: The VectorizedDeckScorer to score the decks with, or None to evaluate them one at a time
+:param keep_deck_scores: True to keep the score of every evaluated deck, for get_new_deck_scores()
+:param evaluation_pool: The DeckEvaluationPool to evaluate the decks in, or None to evaluate them in this process
+"""
+class StreamingMetagameEvaluator(object):
+    def __init__(self, owned_card_index, top_k=15, vectorized_scorer=None, keep_deck_scores=False, evaluation_pool=None):
+        self.owned_card_index = owned_card_index
+        self.top_k = top_k
+        self.num_decks_evaluated = 0
+        self.report_collector = DeckReportCollector(SAVED_VALUE_KEY)
+        self.deck_batches = None
+        if vectorized_scorer is not None or evaluation_pool is not None:
+            self.deck_batches = DeckBatchQueue(METAGAME_DECKS_CATEGORY, self.add_report_entry, vectorized_scorer, evaluation_pool)
+
+        # deck position -> (deck name, report entry) of every deck evaluated during this run, if keep_deck_scores is set
+        self.new_deck_scores = None
+        if keep_deck_scores:
+            self.new_deck_scores = {}
+
+    def add_deck(self, deck_index, meta_deck):
+        self.num_decks_evaluated += 1
+        if self.deck_batches is not None:
+            self.deck_batches.add_deck(deck_index, meta_deck)
+            return
+        self.add_report_entry(deck_index, meta_deck.get_deck_name(), evaluate_metagame_deck(meta_deck, self.owned_card_index))
+
+    def add_report_entry(self, deck_index, deck_name, report_entry):
+        if self.new_deck_scores is not None:
+            self.new_deck_scores[deck_index] = (deck_name, report_entry)
+        if report_entry is not None:
+            self.report_collector.add_entry(deck_index, deck_name, report_entry)
+
+    """
+    Add a deck by the score that was stored for it by an earlier run, rather than evaluating the deck itself
+
+    :param deck_index: The position of the deck
+    :param deck_name: The name of the deck
+    :param report_entry: The report entry of the deck, or None if we don't own any of its cards
+    """
+    def add_stored_deck_score(self, deck_index, deck_name, report_entry):
+        self.num_decks_evaluated += 1
+        if report_entry is not None:
+            self.report_collector.add_entry(deck_index, deck_name, report_entry)
+
+    """
+    Wait for every deck added so far to be scored
+    """
+    def finish(self):
+        if self.deck_batches is not None:
+            self.deck_batches.finish()
+
+    """
+    Return the (deck_index, deck_name, report_entry) of every deck that was evaluated rather than added by its stored score
+    """
+    def get_new_deck_scores(self):
+        self.finish()
+        return [(deck_index, deck_name, get_report_entry(report_entry)) for (deck_index, (deck_name, report_entry)) in sorted(self.new_deck_scores.items())]
+
+    def get_ranking(self):
+        self.finish()
+        return self.report_collector.get_ranking(SAVED_VALUE_KEY, self.top_k)
+
+    """
+    A short description of the closest match so far, to show next to the fetch progress bar
+    """
+    def describe_partial_ranking(self):
+        best_entry_value = self.report_collector.get_best_entry_value()
+        if best_entry_value is None:
+            return ''
+        return " | Closest match so far: %s (%.2f owned)" % best_entry_value
 
-            # For some reason, the #paper landing page contains URLS for the #online
-            budget_deck_url_list.append(deck_url)
-    except:
-        driver.close()
-        return budget_deck_url_list
 
-    driver.close()
-    return budget_deck_url_list
+"""
+Evaluates each budget deck against every desired deck as soon as it is parsed or loaded, so that the rankings of the
+budget decks seen so far are available while the rest are still being fetched. Only the report entries are kept, not
+the budget decks themselves. With a DeckEvaluationPool, the decks are instead evaluated a whole batch at a time by the
+pool's workers. See evaluate_budget_decks()
+
+:param owned_card_index: The OwnedCardIndex of the Owned Cards as parsed from owned_cards.txt
+:param desired_decks_list: The list of Deck objects representing the decks in desired_decks.txt
+:param top_k: The number of budget decks in the final ranking for each desired deck
+:param evaluation_pool: The DeckEvaluationPool to evaluate the decks in, which has to have been set up with the
+                        DesiredCardIndex of desired_decks_list, or None to evaluate them in this process
+"""
+class StreamingBudgetEvaluator(object):
+    def __init__(self, owned_card_index, desired_decks_list, top_k=5, evaluation_pool=None):
+        self.owned_card_index = owned_card_index
+        self.desired_decks_list = desired_decks_list
+        self.desired_card_index = DesiredCardIndex(desired_decks_list)
+        self.top_k = top_k
+        self.num_decks_evaluated = 0
+        self.report_collectors = [DeckReportCollector(SHARED_VALUE_KEY) for desired_deck in desired_decks_list]
+        self.deck_batches = None
+        if evaluation_pool is not None:
+            self.deck_batches = DeckBatchQueue(BUDGET_DECKS_CATEGORY, self.add_report_entries, evaluation_pool=evaluation_pool)
+
+    def add_deck(self, deck_index, budget_deck):
+        self.num_decks_evaluated += 1
+        if self.deck_batches is not None:
+            self.deck_batches.add_deck(deck_index, budget_deck)
+            return
+        self.add_report_entries(deck_index, budget_deck.get_deck_name(),
+            evaluate_budget_deck_against_desired_decks(self.owned_card_index, self.desired_card_index, budget_deck))
+
+    def add_report_entries(self, deck_index, deck_name, report_entries):
+        for report_entry, report_collector in zip(report_entries, self.report_collectors):
+            if report_entry is not None:
+                report_collector.add_entry(deck_index, deck_name, report_entry)
+
+    """
+    Wait for every deck added so far to be evaluated
+    """
+    def finish(self):
+        if self.deck_batches is not None:
+            self.deck_batches.finish()
+
+    def get_report(self):
+        self.finish()
+        budget_report = {}
+        for desired_deck, report_collector in zip(self.desired_decks_list, self.report_collectors):
+            budget_report[desired_deck.get_deck_name()] = report_collector.get_ranking(SHARED_VALUE_KEY, self.top_k)
+        return budget_report
+
+    """
+    A short description of the best match so far across all of the desired decks, to show next to the fetch progress bar
+    """
+    def describe_partial_ranking(self):
+        best_match = None
+        for report_collector in self.report_collectors:
+            best_entry_value = report_collector.get_best_entry_value()
+            if best_entry_value is not None and (best_match is None or best_entry_value[1] > best_match[1]):
+                best_match = best_entry_value
+        if best_match is None:
+            return ''
+        return " | Best match so far: %s (%.2f shared)" % best_match
 
 
 """
@@ -442,198 +4295,77 @@ The final report is of the format:
 
 :param desired_decks_list: A list of Deck objects representing the decks in desired_decks.txt
 :param owned_cards_list: The list of Owned Cards as parsed from owned_cards.txt
+:param evaluation_backend: Either EVALUATION_BACKEND_PYTHON or EVALUATION_BACKEND_NUMPY
+:param num_processes: The number of worker processes to evaluate the decks in, or 1 to evaluate them in this process
 """
-def evaluate_owned_cards(desired_decks_list, owned_cards_list):
-    progress_bar = IncrementalBar("   Evaluating", max=len(desired_decks_list) * len(owned_cards_list), suffix='%(percent)d%%')
-    owned_overlap_report = {}
-
-    for desired_deck in desired_decks_list:
-        owned_cards_that_overlap = []
-
-        number_of_owned_cards_that_are_in_desired_deck = 0
-        value_reduced_by_owned_cards = 0.0
-        for desired_card_entry in desired_deck.get_deck_list():
-            desired_card_name = desired_card_entry[CARD_NAME_KEY]
-
-            for owned_card_entry in owned_cards_list:
-                progress_bar.next()
-                if owned_card_entry[CARD_NAME_KEY].lower() == desired_card_name.lower():
-                    if desired_card_entry[CARD_QTY_KEY] >= owned_card_entry[CARD_QTY_KEY]:
-                        number_of_owned_cards_that_are_in_desired_deck += owned_card_entry[CARD_QTY_KEY]
-                        value_reduced_by_owned_cards += float(
-                            owned_card_entry[CARD_QTY_KEY] * desired_card_entry[CARD_PRICE_KEY])
-                        owned_cards_that_overlap.append({CARD_NAME_KEY: desired_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
-                            owned_card_entry[CARD_QTY_KEY] * desired_card_entry[CARD_PRICE_KEY])})
-                    else:
-                        number_of_owned_cards_that_are_in_desired_deck += desired_card_entry[CARD_QTY_KEY]
-                        value_reduced_by_owned_cards += float(
-                            desired_card_entry[CARD_QTY_KEY]) * desired_card_entry[CARD_PRICE_KEY]
-                        owned_cards_that_overlap.append({CARD_NAME_KEY: desired_card_name, CARD_QTY_KEY: desired_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
-                            desired_card_entry[CARD_QTY_KEY]) * desired_card_entry[CARD_PRICE_KEY]})
-                    break
-
-        # If we actually own some cards in this desired_deck, save the report. If not, we set the NO_OWNED_OVERLAP_FLAG so that our final report printing can know
-        owned_overlap_report[desired_deck.get_deck_name()] = {}
-        if value_reduced_by_owned_cards > 0:
-            owned_overlap_report[desired_deck.get_deck_name()] = {OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_desired_deck, desired_deck.get_deck_size(
-            )), SAVED_VALUE_KEY: value_reduced_by_owned_cards, CARD_LIST_KEY: owned_cards_that_overlap}
-        else:
-            owned_overlap_report[desired_deck.get_deck_name()] = {
-                SAVED_VALUE_KEY: NO_OWNED_OVERLAP_FLAG}
+def evaluate_owned_cards(desired_decks_list, owned_cards_list, evaluation_backend=EVALUATION_BACKEND_PYTHON, num_processes=1):
+    progress_bar = IncrementalBar("   Evaluating", max=len(desired_decks_list), suffix='%(percent)d%%')
+    owned_card_index = OwnedCardIndex(owned_cards_list)
+    evaluation_pool = create_evaluation_pool(num_processes, owned_card_index, None, evaluation_backend)
+    owned_cards_evaluator = StreamingOwnedCardsEvaluator(
+        owned_card_index, create_vectorized_scorer(owned_card_index, evaluation_backend), evaluation_pool)
+
+    for deck_index, desired_deck in enumerate(desired_decks_list):
+        owned_cards_evaluator.add_deck(deck_index, desired_deck)
+        progress_bar.next()
     
+    owned_cards_evaluator.finish()
     progress_bar.finish()
+    if evaluation_pool is not None:
+        evaluation_pool.close()
 
-    return owned_overlap_report
+    return owned_cards_evaluator.get_report()
 
 
 """
 For each metagame deck in the desired format, we determine how much monetary overlap we currently possess for it,
-and return back a sorted list of the Meta decks, together with which cards and what value we overlap
+and return back a sorted list of the top 15 Meta decks, together with which cards and what value we overlap
 
 :param metagame_decks: A list of Deck objects representing all of the Metagame decks on MTGGoldfish.com
 :param owned_cards: A list of dicts containing card info of the format: {CARD_QTY_KEY: card_quantity, CARD_NAME_KEY: card_name}
+:param evaluation_backend: Either EVALUATION_BACKEND_PYTHON or EVALUATION_BACKEND_NUMPY
+:param num_processes: The number of worker processes to evaluate the decks in, or 1 to evaluate them in this process
 """
-def evaluate_metagame_decks(metagame_decks, owned_cards):
-    progress_bar = IncrementalBar("   Evaluating", max=len(metagame_decks) * len(owned_cards), suffix='%(percent)d%%')
-    metagame_deck_recommendation_report = {}
-
-    for meta_deck in metagame_decks:
-        specific_cards_owned_in_meta_deck = []
-        number_of_owned_cards_that_are_in_meta_deck = 0
-        value_of_meta_deck_owned = 0.0
-
-        for owned_card_entry in owned_cards:
-            owned_card_name = owned_card_entry[CARD_NAME_KEY]
-
-            # Check for this card's presence in the meta_deck
-            for meta_card_entry in meta_deck.get_deck_list():
-                if meta_card_entry[CARD_NAME_KEY].lower() == owned_card_name.lower():
-                    if owned_card_entry[CARD_QTY_KEY] >= meta_card_entry[CARD_QTY_KEY]:
-                        number_of_owned_cards_that_are_in_meta_deck += meta_card_entry[CARD_QTY_KEY]
-                        value_of_meta_deck_owned += float(
-                            meta_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]
-                        specific_cards_owned_in_meta_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: meta_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
-                            meta_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]})
-                    else:
-                        number_of_owned_cards_that_are_in_meta_deck += owned_card_entry[CARD_QTY_KEY]
-                        value_of_meta_deck_owned += float(
-                            owned_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]
-                        specific_cards_owned_in_meta_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
-                            owned_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]})
-                    break
-
-            progress_bar.next()
-
-        # Only save the report if we actually own some cards in this Metagame deck
-        if value_of_meta_deck_owned > 0:
-            metagame_deck_recommendation_report[meta_deck.get_deck_name()] = {
-            }
-            metagame_deck_recommendation_report[meta_deck.get_deck_name()] = {OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_meta_deck, meta_deck.get_deck_size(
-            )), SAVED_VALUE_KEY: value_of_meta_deck_owned, CARD_LIST_KEY: specific_cards_owned_in_meta_deck, DECK_PRICE_KEY: meta_deck.get_deck_price()}
-
-    # Sort entries by value descending
-    metagame_decks_sorted_by_desc_value_saved_as_list = sorted(six.iteritems(
-        metagame_deck_recommendation_report), key=lambda kv: kv[1][SAVED_VALUE_KEY], reverse=True)
+def evaluate_metagame_decks(metagame_decks, owned_cards, evaluation_backend=EVALUATION_BACKEND_PYTHON, num_processes=1):
+    progress_bar = IncrementalBar("   Evaluating", max=len(metagame_decks), suffix='%(percent)d%%')
+    owned_card_index = OwnedCardIndex(owned_cards)
+    evaluation_pool = create_evaluation_pool(num_processes, owned_card_index, None, evaluation_backend)
+    metagame_evaluator = StreamingMetagameEvaluator(
+        owned_card_index, vectorized_scorer=create_vectorized_scorer(owned_card_index, evaluation_backend), evaluation_pool=evaluation_pool)
+
+    for deck_index, meta_deck in enumerate(metagame_decks):
+        metagame_evaluator.add_deck(deck_index, meta_deck)
+        progress_bar.next()
     
+    metagame_evaluator.finish()
     progress_bar.finish()
+    if evaluation_pool is not None:
+        evaluation_pool.close()
 
-    # Return only the top 15
-    if len(metagame_decks_sorted_by_desc_value_saved_as_list) > 15:
-        return metagame_decks_sorted_by_desc_value_saved_as_list[:15]
-    else:
-        return metagame_decks_sorted_by_desc_value_saved_as_list
+    return metagame_evaluator.get_ranking()
 
 
 """
 For each desired deck, we process each budget deck to determine how many cards from each budget deck
 are present in the given desired deck. We then store them into a large multi-level dictionary for
-eventual reporting
-"""
-def evaluate_budget_decks(owned_cards, desired_decks_list, budget_decks_list):
-    progress_bar = IncrementalBar("   Evaluating", max=len(desired_decks_list) * len(budget_decks_list), suffix='%(percent)d%%')
-    budget_report = {}
-    for desired_deck in desired_decks_list:
-        budget_report[desired_deck.get_deck_name()] = {}
-
-        for budget_deck in budget_decks_list:
-            number_of_cards_from_budget_deck_that_are_in_desired_deck = 0
-            value_shared_between_decks = 0.0
-            number_of_owned_cards_that_are_in_budget_deck = 0
-            value_of_budget_deck_owned = 0.0
-            specific_owned_cards_in_budget_deck = []
-
-            # This is literally N^3 and I should be ashamed, but with data sets this small it doesn't matter in the slightest
-            for desired_card_entry in desired_deck.get_deck_list():
-                desired_card_name = desired_card_entry[CARD_NAME_KEY]
-
-                # Check for this card's presence in the first budget deck
-                for budget_card_entry in budget_deck.get_deck_list():
-
-                    # Check to see if we own this card for our Owned Cards mini-report
-                    for owned_card_entry in owned_cards:
-                        owned_card_name = owned_card_entry[CARD_NAME_KEY]
-                        if budget_card_entry[CARD_NAME_KEY].lower() == owned_card_name.lower():
-                            if owned_card_entry[CARD_QTY_KEY] >= budget_card_entry[CARD_QTY_KEY]:
-
-                                # Only process this card if it doesn't already exist in the specific_owned_cards_in_budget_deck list
-                                already_exists = False
-                                for card_record in specific_owned_cards_in_budget_deck:
-                                    if card_record[CARD_NAME_KEY] == owned_card_name:
-                                        already_exists = True
-                                        break
-                                if not already_exists:
-                                    number_of_owned_cards_that_are_in_budget_deck += budget_card_entry[CARD_QTY_KEY]
-                                    value_of_budget_deck_owned += float(
-                                        budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
-                                    specific_owned_cards_in_budget_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: budget_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
-                                        budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]})
-
-                            else:
-
-                                # Only add this card if it doesn't already exist in the specific_owned_cards_in_budget_deck list
-                                already_exists = False
-                                for card_record in specific_owned_cards_in_budget_deck:
-                                    if card_record[CARD_NAME_KEY] == owned_card_name:
-                                        already_exists = True
-                                        break
-                                if not already_exists:
-                                    number_of_owned_cards_that_are_in_budget_deck += owned_card_entry[CARD_QTY_KEY]
-                                    value_of_budget_deck_owned += float(
-                                        owned_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
-                                    specific_owned_cards_in_budget_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
-                                        owned_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]})
-
-                    if budget_card_entry[CARD_NAME_KEY].lower() == desired_card_name.lower():
-                        if desired_card_entry[CARD_QTY_KEY] >= budget_card_entry[CARD_QTY_KEY]:
-                            number_of_cards_from_budget_deck_that_are_in_desired_deck += budget_card_entry[
-                                CARD_QTY_KEY]
-                            value_shared_between_decks += float(
-                                budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
-                        else:
-                            number_of_cards_from_budget_deck_that_are_in_desired_deck += desired_card_entry[
-                                CARD_QTY_KEY]
-                            value_shared_between_decks += float(
-                                desired_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
-                        break
-
-            # Only bother reporting budget decks that actually overlap
-            if value_shared_between_decks > 0:
-                budget_report[desired_deck.get_deck_name()][budget_deck.get_deck_name()] = {DECK_PRICE_KEY: budget_deck.get_deck_price(), SHARED_CARDS_KEY: "%d/%d" % (number_of_cards_from_budget_deck_that_are_in_desired_deck, budget_deck.get_deck_size(
-                )), SHARED_VALUE_KEY: value_shared_between_decks, OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_budget_deck, budget_deck.get_deck_size()), SAVED_VALUE_KEY: value_of_budget_deck_owned, CARD_LIST_KEY: specific_owned_cards_in_budget_deck}
-
-            progress_bar.next()
-
-        # Sort entries by value for this particular desired_deck now that all of the budget decks have been processed
-        budget_decks_sorted_by_desc_value_as_list = sorted(six.iteritems(
-            budget_report[desired_deck.get_deck_name()]), key=lambda kv: kv[1][SHARED_VALUE_KEY], reverse=True)
-
-        # Only keep the top 5 for each
-        budget_report[desired_deck.get_deck_name(
-        )] = budget_decks_sorted_by_desc_value_as_list[:5]
+eventual reporting, keeping only the top 5 budget decks for each desired deck
+"""
+def evaluate_budget_decks(owned_cards, desired_decks_list, budget_decks_list, num_processes=1):
+    progress_bar = IncrementalBar("   Evaluating", max=len(budget_decks_list), suffix='%(percent)d%%')
+    owned_card_index = OwnedCardIndex(owned_cards)
+    evaluation_pool = create_evaluation_pool(num_processes, owned_card_index, DesiredCardIndex(desired_decks_list))
+    budget_evaluator = StreamingBudgetEvaluator(owned_card_index, desired_decks_list, evaluation_pool=evaluation_pool)
+
+    for deck_index, budget_deck in enumerate(budget_decks_list):
+        budget_evaluator.add_deck(deck_index, budget_deck)
+        progress_bar.next()
 
+    budget_evaluator.finish()
     progress_bar.finish()
+    if evaluation_pool is not None:
+        evaluation_pool.close()
 
-    return budget_report
+    return budget_evaluator.get_report()
 
 
 """
@@ -948,6 +4680,73 @@ def print_budget_evaluation_report(report_output_file_name, desired_decks_list,
                         "               None of the cards listed in owned_cards.txt are used in this deck :(")
 
 
+"""
+Print the cards whose price changed the most over the last few days, as recorded in the price history of the deck cache
+
+:param report_output_file_name: The file to append the report to, or "" to print it to the terminal
+:param price_movers: A list of (card_name, old_price, new_price) tuples, see DeckStore.get_biggest_price_movers()
+:param movers_days: The number of days the price changes were measured over
+:param use_online_price: True if the prices are online (tix) prices
+"""
+def print_price_movers_report(report_output_file_name, price_movers, movers_days, use_online_price):
+    report_lines = ["=== Biggest card price movers over the last %d days ===" % (movers_days)]
+    if len(price_movers) == 0:
+        report_lines.append("   No card prices have changed over the last %d days (or no prices were recorded before then)." % (movers_days))
+
+    for (mover_index, (card_name, old_price, new_price)) in enumerate(price_movers):
+        percent_change = ""
+        if old_price != 0:
+            percent_change = ", %+.1f%%" % ((new_price - old_price) / old_price * 100)
+        if use_online_price:
+            report_lines.append("   #%s %s: %.2f tix -> %.2f tix (%+.2f tix%s)" % (
+                mover_index + 1, card_name, old_price, new_price, new_price - old_price, percent_change))
+        else:
+            report_lines.append("   #%s %s: $%.2f -> $%.2f (%+.2f%s)" % (
+                mover_index + 1, card_name, old_price, new_price, new_price - old_price, percent_change))
+
+    # We print to the file if we're actually given a file to print to. Otherwise we print to the terminal
+    if report_output_file_name != "":
+        with open(report_output_file_name, 'a') as output_file:
+            output_file.write("\n\n" + "\n".join(report_lines))
+    else:
+        print("\n" + "\n".join(report_lines))
+
+
+"""
+Print which cards changed in each of the desired decks since the revision of it that was cached before
+
+:param report_output_file_name: The file to append the report to, or "" to print it to the terminal
+:param latest_deck_changes: A list of (deck_name, old_cached_date, new_cached_date, deck_changes) tuples, see get_latest_deck_changes()
+:param use_online_price: True if the prices are online (tix) prices
+"""
+def print_deck_changes_report(report_output_file_name, latest_deck_changes, use_online_price):
+    def format_price(price):
+        if price is None:
+            return "-"
+        if use_online_price:
+            return "%.2f tix" % (price)
+        return "$%.2f" % (price)
+
+    report_lines = ["=== Changes to the Desired Decks listed in desired_decks.txt since they were previously fetched ==="]
+    if len(latest_deck_changes) == 0:
+        report_lines.append("   None of the desired decks have been fetched more than once with a different list or prices.")
+
+    for (deck_name, old_cached_date, new_cached_date, deck_changes) in latest_deck_changes:
+        report_lines.append("   \"%s\" (%s -> %s):" % (deck_name, old_cached_date.strftime('%Y-%m-%d'), new_cached_date.strftime('%Y-%m-%d')))
+        if len(deck_changes) == 0:
+            report_lines.append("      Only the deck's details changed, none of its cards did.")
+        for (card_name, old_quantity, new_quantity, old_price, new_price) in deck_changes:
+            report_lines.append("      %s: %sx -> %sx, %s -> %s" % (
+                card_name, old_quantity, new_quantity, format_price(old_price), format_price(new_price)))
+
+    # We print to the file if we're actually given a file to print to. Otherwise we print to the terminal
+    if report_output_file_name != "":
+        with open(report_output_file_name, 'a') as output_file:
+            output_file.write("\n\n" + "\n".join(report_lines))
+    else:
+        print("\n" + "\n".join(report_lines))
+
+
 """
 Given the desired Format (Modern, Standard, Vintage, etc) and whether or not the user desired online vs paper pricing,
 return a tuple containing the URLs where the corresponding Metagame and Budget decks can be found
@@ -1016,6 +4815,91 @@ if __name__ == "__main__":
         help="Fetches fresh data for all decks required during this run (cache-bust). This can take 10 minutes or more",
         action='store_const',
         const=True)
+    parser.add_option("-w", "--workers",
+        dest="num_workers",
+        type="int",
+        default=1,
+        help="The number of decks to fetch from MTGGoldfish.com at the same time. Each worker drives its own browser, and when more than one worker is used the browsers run headless (without a window) [default: %default]")
+    parser.add_option("--rate-limit",
+        dest="requests_per_second",
+        type="float",
+        default=4.0,
+        help="The maximum number of page requests per second made against MTGGoldfish.com, no matter how many workers are used. 0 disables the limit [default: %default]")
+    parser.add_option("--retries",
+        dest="max_retries",
+        type="int",
+        default=3,
+        help="The number of times a page that fails to load is retried (with an increasing backoff) before it is skipped for this run and reported at the end [default: %default]")
+    parser.add_option("--url-ttl",
+        dest="url_cache_ttl_hours",
+        type="float",
+        default=24,
+        help="The number of hours that the list of Metagame/Budget deck URLs snapshotted from MTGGoldfish.com is reused for before it is snapshotted again. Runs within this window don't need to contact MTGGoldfish.com at all if every deck is already cached. 0 always snapshots a fresh list. The \"-u\" flag also snapshots a fresh list [default: %default]")
+    parser.add_option("-e", "--engine",
+        dest="parse_engine",
+        default=PARSE_ENGINE_HTML,
+        help="Specify how pages from MTGGoldfish.com are parsed. \"html\" downloads and parses the pages directly without a browser, falling back to the browser for any page it can't parse. \"selenium\" always loads pages in Firefox [default: %default]")
+    parser.add_option("-E", "--evaluator",
+        dest="evaluation_backend",
+        default=EVALUATION_BACKEND_PYTHON,
+        help="Specify how the desired and Metagame decks are evaluated against owned_cards.txt. \"python\" evaluates each deck on its own as soon as it's loaded. \"numpy\" scores the decks in batches with NumPy, which is faster for large numbers of decks and gives the same results. Requires NumPy to be installed [default: %default]")
+    parser.add_option("-p", "--processes",
+        dest="num_processes",
+        type="int",
+        default=1,
+        help="The number of worker processes that the Metagame and Budget decks are evaluated in, to spread the evaluations over several CPU cores when there are a lot of decks (e.g. with --archive). The results are the same for any number of processes. 1 evaluates the decks in this process [default: %default]")
+    parser.add_option("--page-timeout",
+        dest="page_timeout_seconds",
+        type="float",
+        default=30,
+        help="The number of seconds the browser waits for a page (and the deck table on it) to load before the load is treated as failed and retried [default: %default]")
+    parser.add_option("--price-ttl",
+        dest="price_ttl_days",
+        type="float",
+        help="Refresh the price of every card in the cached decks that was last priced more than this many days ago, without fetching all of the decks again like the \"-u\" flag does. Each stale card is refreshed once, no matter how many decks contain it, by fetching a small set of the decks that contain those cards. 0 refreshes every price that wasn't already seen today")
+    parser.add_option("--movers",
+        dest="movers_days",
+        type="int",
+        help="Also report the cards whose price changed the most over the given number of days, based on the prices recorded every time a deck is fetched")
+    parser.add_option("--changes",
+        dest="report_deck_changes",
+        help="Also report which cards (and card prices) changed in each deck listed in desired_decks.txt the last time it was fetched",
+        action='store_const',
+        const=True)
+    parser.add_option("--warm",
+        dest="warm_cache",
+        help="Instead of running any analysis, keep running in the background (until stopped with Ctrl+C) and keep the deck cache warm. Every \"--warm-interval\" minutes, the stalest and most used decks (including the current Metagame and Budget decks of the format specified with the -F flag) are refreshed, up to \"--warm-budget\" decks at a time",
+        action='store_const',
+        const=True)
+    parser.add_option("--warm-interval",
+        dest="warm_interval_minutes",
+        type="float",
+        default=60,
+        help="The number of minutes between refreshes of the cache warmer [default: %default]")
+    parser.add_option("--warm-budget",
+        dest="warm_fetch_budget",
+        type="int",
+        default=50,
+        help="The maximum number of decks the cache warmer fetches per refresh [default: %default]")
+    parser.add_option("--export-archive",
+        dest="export_archive_file",
+        help="Instead of running any analysis, export every deck in the deck cache into a single read-only archive file at the given path, which can then be used with the \"--archive\" flag")
+    parser.add_option("--archive",
+        dest="archive_file",
+        help="Load cached decks from the given archive file (written with the \"--export-archive\" flag) rather than from the deck cache, whenever the archived copy of a deck is at least as recent as the cached one. Decks that aren't in the archive are loaded from the deck cache or fetched as usual")
+    parser.add_option("--max-cached-decks",
+        dest="max_cached_decks",
+        type="int",
+        help="The maximum number of decks to keep in the deck cache. Once it holds more decks than this, the least recently used decks are evicted at the end of the run (decks listed in desired_decks.txt are never evicted)")
+    parser.add_option("--max-cache-mb",
+        dest="max_cache_mb",
+        type="float",
+        help="The maximum size of the deck cache in megabytes, counting the cached decks and their revisions but not the card prices. Once it grows larger than this, the least recently used decks are evicted at the end of the run (decks listed in desired_decks.txt are never evicted)")
+    parser.add_option("--compact",
+        dest="compact_cache",
+        help="Instead of running any analysis, compact the deck cache: remove any cached decks that can't be read, along with any leftover data of decks that aren't cached anymore, and shrink deck_cache.db down to the space actually in use",
+        action='store_const',
+        const=True)
     parser.add_option("-f", "--file",
         dest="print_to_file",
         help="Informs the script to print all reports to a .txt file. The file name will be of the format: deck_report_MM_DD_YYYY.txt, overwriting any existing report with the same file name.",
@@ -1036,26 +4920,122 @@ if __name__ == "__main__":
     (url_for_meta_decks, url_for_budget_decks) = determine_meta_and_budget_URLs(
         options.desired_format, options.use_online_price)
 
-    start_time = time.time()
-    print("\nFetching Deck information for decks listed in desired_decks.txt.")
-    desired_decks = parse_decks_from_list_of_urls(
-        options.update_cache, desired_deck_URLs, options.use_online_price)
+    if options.num_workers < 1:
+        print(
+            "\n[ERROR] The number of workers must be at least 1. Exiting")
+        sys.exit(0)
+
+    if options.warm_interval_minutes <= 0 or options.warm_fetch_budget < 1:
+        print(
+            "\n[ERROR] The cache warmer needs an interval greater than 0 minutes and a budget of at least 1 deck. Exiting")
+        sys.exit(0)
+
+    if options.price_ttl_days is not None and options.price_ttl_days < 0:
+        print(
+            "\n[ERROR] The price TTL can't be negative. Exiting")
+        sys.exit(0)
+
+    if options.movers_days is not None and options.movers_days < 1:
+        print(
+            "\n[ERROR] The number of days to report price movers over must be at least 1. Exiting")
+        sys.exit(0)
+
+    if (options.max_cached_decks is not None and options.max_cached_decks < 0) or (options.max_cache_mb is not None and options.max_cache_mb <= 0):
+        print(
+            "\n[ERROR] The deck cache needs to be allowed at least 0 decks and more than 0 MB. Exiting")
+        sys.exit(0)
+
+    if options.page_timeout_seconds <= 0:
+        print(
+            "\n[ERROR] The page timeout must be greater than 0 seconds. Exiting")
+        sys.exit(0)
+
+    if options.parse_engine.lower() not in [PARSE_ENGINE_HTML, PARSE_ENGINE_SELENIUM]:
+        print(
+            "\n[ERROR] Parsing engine \"%s\" is not a valid engine. Exiting" %
+            options.parse_engine)
+        sys.exit(0)
+
+    if options.evaluation_backend.lower() not in [EVALUATION_BACKEND_PYTHON, EVALUATION_BACKEND_NUMPY]:
+        print(
+            "\n[ERROR] Evaluation backend \"%s\" is not a valid backend. Exiting" %
+            options.evaluation_backend)
+        sys.exit(0)
+
+    if options.evaluation_backend.lower() == EVALUATION_BACKEND_NUMPY and numpy is None:
+        print(
+            "\n[ERROR] The \"numpy\" evaluation backend requires NumPy, which isn't installed. Install it with \"pip install numpy\". Exiting")
+        sys.exit(0)
+
+    if options.num_processes < 1:
+        print(
+            "\n[ERROR] The number of evaluation processes must be at least 1. Exiting")
+        sys.exit(0)
+
+    # A single pool of browser sessions is shared by every fetch during this run, with one session per worker. The browsers are only
+    # launched if they're actually needed, which with the HTML engine is only for pages that it wasn't able to parse
+    browser_pool = BrowserSessionPool(
+        max_sessions=options.num_workers, headless=options.num_workers > 1, page_timeout_seconds=options.page_timeout_seconds)
+    page_fetcher = DeckPageFetcher(
+        options.parse_engine.lower(), browser_pool, num_workers=options.num_workers,
+        requests_per_second=options.requests_per_second, max_retries=options.max_retries)
+
+    if options.archive_file is not None:
+        try:
+            open_deck_archive(options.archive_file)
+        except (EnvironmentError, ValueError, struct.error):
+            print(
+                "\n[ERROR] Couldn't read the deck archive \"%s\". Exiting" % (options.archive_file))
+            sys.exit(0)
+
+    if options.export_archive_file is not None:
+        print("\nExport archive flag set. Exporting the deck cache...")
+        num_exported_decks = export_deck_archive(options.export_archive_file)
+        print("   Exported %s decks into \"%s\"." % (num_exported_decks, options.export_archive_file))
+        close_deck_store()
+        sys.exit(0)
+
+    if options.compact_cache:
+        print("\nCompact flag set. Compacting the deck cache...")
+        compact_deck_cache()
+        close_deck_store()
+        sys.exit(0)
+
+    if options.warm_cache:
+        print("\nWarm flag set. Keeping the deck cache warm for %s decks, refreshing up to %d decks every %g minutes. Press Ctrl+C to stop." % (
+            options.desired_format, options.warm_fetch_budget, options.warm_interval_minutes))
+        try:
+            run_cache_warmer(desired_deck_URLs, [url for url in [url_for_meta_decks, url_for_budget_decks] if url], page_fetcher,
+                             options.url_cache_ttl_hours, options.warm_interval_minutes, options.warm_fetch_budget,
+                             options.max_cached_decks, options.max_cache_mb)
+        except KeyboardInterrupt:
+            print("\nStopped warming the deck cache.")
+        browser_pool.close_all_sessions()
+        close_deck_store()
+        sys.exit(0)
 
     # If the User hasn't specified any cards in owned_cards.txt, then the only other reason to run this script at all is
     # to generate a report on the Budget Decks from MTGGoldfish.com. So that's what we will do.
     no_owned_cards_in_list = (len(
         owned_cards) == 1 and owned_cards[0][CARD_NAME_KEY] == "name of card that doesn't exist") or len(
         owned_cards) == 0
+
     should_run_budget_analysis = False
     if options.parse_budget or no_owned_cards_in_list:
         should_run_budget_analysis = True
-    if should_run_budget_analysis and len(desired_decks) == 0:
+    if should_run_budget_analysis and len(desired_deck_URLs) == 0:
         print(
             "\n[ERROR] Budget Analysis implied but there are no decks listed in desired_decks.txt. Exiting")
         sys.exit(0)
 
-    # Perform Metagame Recommendation Analysis if desired
-    metagame_decks = []
+    # Every deck URL needed during this run is gathered up front, so that a deck listed in more than one place (e.g. a
+    # desired deck that is also a Budget deck) is only fetched or loaded from the cache once. Desired decks are kept in
+    # memory, as the Budget analysis compares each Budget deck against all of them
+    start_time = time.time()
+    fetch_plan = DeckFetchPlan(retained_categories=[DESIRED_DECKS_CATEGORY])
+    fetch_plan.add_deck_urls(DESIRED_DECKS_CATEGORY, desired_deck_URLs)
+
+    # Snapshot the Metagame decks if Metagame Recommendation Analysis is desired
     if options.recommend_meta_decks:
 
         # We can't recommend meta decks if the User supplied no cards
@@ -1063,27 +5043,126 @@ if __name__ == "__main__":
             print(
                 "\n[ERROR]: Recommend flag set, but no cards provided in owned_cards.txt. Skipping")
         else:
-            print("\nRecommend flag set. Fetching Deck information of all %s Metagame decks for Recommendation analysis..." %
+            print("\nRecommend flag set. Snapshotting all %s Metagame decks for Recommendation analysis..." %
                 options.desired_format)
-            metagame_urls_list = parse_deck_urls_from_category_landing_page(
-                url_for_meta_decks)
-            metagame_decks = parse_decks_from_list_of_urls(
-                options.update_cache, metagame_urls_list, options.use_online_price)
+            fetch_plan.add_deck_urls(METAGAME_DECKS_CATEGORY, parse_deck_urls_from_category_landing_page(
+                url_for_meta_decks, page_fetcher, options.update_cache, options.url_cache_ttl_hours))
 
-    # Perform Budget Analysis if desired
-    budget_decks = []
+    # Snapshot the Budget decks if Budget Analysis is desired
     if should_run_budget_analysis and len(url_for_budget_decks) > 0:
         status_msg = ""
         if options.parse_budget is True:
             status_msg = "\nBudget flag set. "
         else:
             status_msg = "\nowned_cards.txt was empty. "
-        print(status_msg + "Fetching Deck information of all %s Budget decks for budget analysis..." %
+        print(status_msg + "Snapshotting all %s Budget decks for budget analysis..." %
             options.desired_format)
-        budget_decks_url_list = parse_deck_urls_from_category_landing_page(
-            url_for_budget_decks)
-        budget_decks = parse_decks_from_list_of_urls(
-            options.update_cache, budget_decks_url_list, options.use_online_price)
+        fetch_plan.add_deck_urls(BUDGET_DECKS_CATEGORY, parse_deck_urls_from_category_landing_page(
+            url_for_budget_decks, page_fetcher, options.update_cache, options.url_cache_ttl_hours))
+
+    print("\nPlanning which decks to fetch...")
+    fetch_plan.decide_deck_sources(options.update_cache)
+
+    # A fully updated cache (-u) has fresh prices already
+    if options.price_ttl_days is not None and not options.update_cache:
+        print("\nChecking for stale card prices in the cached decks...")
+        fetch_plan.refresh_stale_prices(options.price_ttl_days, options.use_online_price, page_fetcher)
+
+    # Every deck is evaluated as soon as it has been parsed or loaded from the cache, rather than after all of the fetching is done
+    print("\nFetching Deck information for decks listed in desired_decks.txt.")
+    owned_card_index = OwnedCardIndex(owned_cards)
+    vectorized_scorer = create_vectorized_scorer(owned_card_index, options.evaluation_backend.lower())
+    owned_cards_evaluator = StreamingOwnedCardsEvaluator(owned_card_index, vectorized_scorer)
+    desired_decks_by_position = {}
+    for (desired_deck, deck_positions) in fetch_plan.iterate_decks(
+            options.update_cache, options.use_online_price, page_fetcher, [DESIRED_DECKS_CATEGORY]):
+        deck_index = deck_positions[DESIRED_DECKS_CATEGORY]
+        desired_decks_by_position[deck_index] = desired_deck
+        if not no_owned_cards_in_list:
+            owned_cards_evaluator.add_deck(deck_index, desired_deck)
+    desired_decks = [desired_decks_by_position[deck_index] for deck_index in sorted(desired_decks_by_position)]
+
+    if should_run_budget_analysis and len(desired_decks) == 0:
+        print(
+            "\n[ERROR] Budget Analysis implied but none of the decks listed in desired_decks.txt could be loaded. Exiting")
+        sys.exit(0)
+
+    # The Metagame and Budget decks are evaluated by a pool of worker processes if more than one was asked for, while they're
+    # still being fetched. The desired decks are too few to be worth sending off to the workers
+    evaluation_pool = None
+    if len(fetch_plan.get_deck_ids(METAGAME_DECKS_CATEGORY)) > 0 or len(fetch_plan.get_deck_ids(BUDGET_DECKS_CATEGORY)) > 0:
+        evaluation_pool = create_evaluation_pool(options.num_processes, owned_card_index, DesiredCardIndex(desired_decks),
+                                                 options.evaluation_backend.lower())
+
+    # The score of each Metagame deck is stored for the next run. Metagame decks that already have a stored score aren't
+    # loaded at all, unless they're also Budget decks, as long as none of their cards changed in owned_cards.txt or in
+    # price since then. The decks of a read-only deck archive don't have stored scores
+    keep_metagame_deck_scores = len(fetch_plan.get_deck_ids(METAGAME_DECKS_CATEGORY)) > 0 and deck_archive is None
+    metagame_evaluator = StreamingMetagameEvaluator(owned_card_index, vectorized_scorer=vectorized_scorer,
+                                                    keep_deck_scores=keep_metagame_deck_scores, evaluation_pool=evaluation_pool)
+    if keep_metagame_deck_scores:
+        (num_changed_owned_cards, num_dropped_deck_scores) = get_deck_store().update_scored_owned_cards(owned_cards)
+        (deck_score_versions, stored_deck_scores) = get_deck_store().load_metagame_deck_scores(
+            fetch_plan.get_deck_ids(METAGAME_DECKS_CATEGORY), options.use_online_price)
+        if options.update_cache:
+            stored_deck_scores = {}
+        for (deck_index, deck_id) in enumerate(fetch_plan.get_deck_ids(METAGAME_DECKS_CATEGORY)):
+            if deck_id in stored_deck_scores:
+                metagame_evaluator.add_stored_deck_score(deck_index, stored_deck_scores[deck_id][0], stored_deck_scores[deck_id][1])
+        fetch_plan.skip_deck_ids(METAGAME_DECKS_CATEGORY, stored_deck_scores)
+        print("\nReusing the stored scores of %s of the %s Metagame decks. %s cards changed in owned_cards.txt since the last run, dropping %s scores." % (
+            len(stored_deck_scores), len(fetch_plan.get_deck_ids(METAGAME_DECKS_CATEGORY)), num_changed_owned_cards, num_dropped_deck_scores))
+
+    # The Metagame and Budget decks are loaded together, so that a deck appearing in both is only loaded once, and each
+    # deck is handed to the evaluator of every category that lists it
+    budget_evaluator = StreamingBudgetEvaluator(owned_card_index, desired_decks, evaluation_pool=evaluation_pool)
+    metagame_and_budget_categories = [category for category in [METAGAME_DECKS_CATEGORY, BUDGET_DECKS_CATEGORY]
+                                      if len(fetch_plan.get_deck_ids(category)) > 0]
+    if len(metagame_and_budget_categories) > 0:
+
+        def describe_partial_rankings():
+            partial_rankings = ''
+            if METAGAME_DECKS_CATEGORY in metagame_and_budget_categories:
+                partial_rankings += metagame_evaluator.describe_partial_ranking()
+            if BUDGET_DECKS_CATEGORY in metagame_and_budget_categories:
+                partial_rankings += budget_evaluator.describe_partial_ranking()
+            return partial_rankings
+
+        print("\nFetching Deck information of all %s %s decks..." % (
+            options.desired_format, " and ".join(metagame_and_budget_categories)))
+        for (deck, deck_positions) in fetch_plan.iterate_decks(
+                options.update_cache, options.use_online_price, page_fetcher, metagame_and_budget_categories,
+                describe_partial_rankings):
+            if METAGAME_DECKS_CATEGORY in deck_positions:
+                metagame_evaluator.add_deck(deck_positions[METAGAME_DECKS_CATEGORY], deck)
+            if BUDGET_DECKS_CATEGORY in deck_positions:
+                budget_evaluator.add_deck(deck_positions[BUDGET_DECKS_CATEGORY], deck)
+
+    metagame_evaluator.finish()
+    budget_evaluator.finish()
+    if evaluation_pool is not None:
+        evaluation_pool.close()
+
+    # The decks fetched by this run were evaluated as they were saved. The score of a deck that changed since it was
+    # evaluated (by this run or any other) isn't stored, as it may have been evaluated with different cards or prices
+    if keep_metagame_deck_scores:
+        metagame_deck_ids = fetch_plan.get_deck_ids(METAGAME_DECKS_CATEGORY)
+        deck_score_versions.update(get_deck_store().saved_deck_score_versions)
+        get_deck_store().save_metagame_deck_scores(
+            [(metagame_deck_ids[deck_index], deck_name, report_entry) for (deck_index, deck_name, report_entry) in metagame_evaluator.get_new_deck_scores()],
+            options.use_online_price, deck_score_versions, owned_cards)
+
+    browser_pool.close_all_sessions()
+
+    if options.movers_days is not None:
+        print("\nComputing card price movers over the last %d days..." % (options.movers_days))
+        price_movers = get_deck_store().get_biggest_price_movers(
+            datetime.now() - timedelta(days=options.movers_days), options.use_online_price, PRICE_MOVERS_REPORT_SIZE)
+    if options.report_deck_changes:
+        print("\nComparing the desired decks against their previous revisions...")
+        latest_deck_changes = get_latest_deck_changes(fetch_plan.get_deck_ids(DESIRED_DECKS_CATEGORY), options.use_online_price)
+    enforce_deck_cache_limits(options.max_cached_decks, options.max_cache_mb, set(fetch_plan.get_deck_ids(DESIRED_DECKS_CATEGORY)))
+    close_deck_store()
 
     # Print a statement about the time it took to perform the fetches
     remaining_seconds = (time.time() - start_time)
@@ -1092,28 +5171,27 @@ if __name__ == "__main__":
         num_minutes = remaining_seconds / 60
         remaining_seconds -= (num_minutes * 60)
     print("\nDone fetching all Deck information. Fetch took %d minutes and %d seconds" % (
-        num_minutes, remaining_seconds))          
+        num_minutes, remaining_seconds))
+    page_fetcher.print_timing_summary()
+    page_fetcher.print_retry_queue()
 
     if not no_owned_cards_in_list and len(desired_decks) != 0:
         print("\nComputing Owned Cards evaluations...")
-        owned_cards_overlap_report = evaluate_owned_cards(
-            desired_decks, owned_cards)
+        owned_cards_overlap_report = owned_cards_evaluator.get_report()
 
     # We can't recommend meta decks if the User supplied no cards
     if options.recommend_meta_decks and not no_owned_cards_in_list:
         print("\nComputing %s Metagame Deck Recommendation evaluations..." %
             options.desired_format)
-        metagame_deck_recommendation_report = evaluate_metagame_decks(
-            metagame_decks, owned_cards)
+        metagame_deck_recommendation_report = metagame_evaluator.get_ranking()
 
-    if should_run_budget_analysis and len(budget_decks) == 0:
+    if should_run_budget_analysis and budget_evaluator.num_decks_evaluated == 0:
         print("\n[ERROR]: There aren't any Budget decks for %s to run an analysis on. Skipping Budget analysis." %
                 options.desired_format)
 
-    if should_run_budget_analysis and len(budget_decks) > 0:
+    if should_run_budget_analysis and budget_evaluator.num_decks_evaluated > 0:
         print("\nComputing Budget Deck List evaluations...")
-        budget_deck_report = evaluate_budget_decks(
-            owned_cards, desired_decks, budget_decks)
+        budget_deck_report = budget_evaluator.get_report()
 
     report_output_file_name = ""
     if options.print_to_file:
@@ -1154,11 +5232,20 @@ if __name__ == "__main__":
         print_metagame_deck_recommendation_report(
             report_output_file_name, metagame_deck_recommendation_report, options.use_online_price)
 
-    if should_run_budget_analysis and len(budget_decks) > 0:
+    if should_run_budget_analysis and budget_evaluator.num_decks_evaluated > 0:
         analysis_has_been_performed = True
         print_budget_evaluation_report(
             report_output_file_name, desired_decks, budget_deck_report, options.use_online_price)
 
+    if options.movers_days is not None:
+        analysis_has_been_performed = True
+        print_price_movers_report(
+            report_output_file_name, price_movers, options.movers_days, options.use_online_price)
+
+    if options.report_deck_changes:
+        analysis_has_been_performed = True
+        print_deck_changes_report(report_output_file_name, latest_deck_changes, options.use_online_price)
+
     if options.print_to_file and analysis_has_been_performed:
         todays_date = datetime.now()
         month = todays_date.month
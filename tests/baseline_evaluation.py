@@ -0,0 +1,199 @@
+"""
+The Owned Cards, Metagame and Budget deck evaluations exactly as the original version of mtggoldfish.py implemented
+them, comparing every card against every other card. The reports of the current evaluations (and of every evaluation
+backend and number of worker processes) are checked against these, down to the order of their keys. Only the progress
+bars were taken out.
+"""
+from mtggoldfish import (CARD_LIST_KEY, CARD_NAME_KEY, CARD_PRICE_KEY, CARD_QTY_KEY, DECK_PRICE_KEY, NO_OWNED_OVERLAP_FLAG,
+                         OWNED_CARDS_KEY, SAVED_VALUE_KEY, SHARED_CARDS_KEY, SHARED_VALUE_KEY)
+
+
+"""
+For each desired deck, we determine how many of the user's Owned Cards overlap with the deck
+and aggregate all such cards into a multi-level dictionary for eventual reporting/price analysis.
+The final report is of the format:
+    [{'Eldrazi Tron', {'Shared Value': 2.87, 'Shared Cards': '1/72', 'Card List': [{'Card Name': 'Scalding Tarn', 'Card Quantity': '1'}, ...]}}, ...]
+
+:param desired_decks_list: A list of Deck objects representing the decks in desired_decks.txt
+:param owned_cards_list: The list of Owned Cards as parsed from owned_cards.txt
+"""
+def evaluate_owned_cards(desired_decks_list, owned_cards_list):
+    owned_overlap_report = {}
+
+    for desired_deck in desired_decks_list:
+        owned_cards_that_overlap = []
+
+        number_of_owned_cards_that_are_in_desired_deck = 0
+        value_reduced_by_owned_cards = 0.0
+        for desired_card_entry in desired_deck.get_deck_list():
+            desired_card_name = desired_card_entry[CARD_NAME_KEY]
+
+            for owned_card_entry in owned_cards_list:
+                if owned_card_entry[CARD_NAME_KEY].lower() == desired_card_name.lower():
+                    if desired_card_entry[CARD_QTY_KEY] >= owned_card_entry[CARD_QTY_KEY]:
+                        number_of_owned_cards_that_are_in_desired_deck += owned_card_entry[CARD_QTY_KEY]
+                        value_reduced_by_owned_cards += float(
+                            owned_card_entry[CARD_QTY_KEY] * desired_card_entry[CARD_PRICE_KEY])
+                        owned_cards_that_overlap.append({CARD_NAME_KEY: desired_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                            owned_card_entry[CARD_QTY_KEY] * desired_card_entry[CARD_PRICE_KEY])})
+                    else:
+                        number_of_owned_cards_that_are_in_desired_deck += desired_card_entry[CARD_QTY_KEY]
+                        value_reduced_by_owned_cards += float(
+                            desired_card_entry[CARD_QTY_KEY]) * desired_card_entry[CARD_PRICE_KEY]
+                        owned_cards_that_overlap.append({CARD_NAME_KEY: desired_card_name, CARD_QTY_KEY: desired_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                            desired_card_entry[CARD_QTY_KEY]) * desired_card_entry[CARD_PRICE_KEY]})
+                    break
+
+        # If we actually own some cards in this desired_deck, save the report. If not, we set the NO_OWNED_OVERLAP_FLAG so that our final report printing can know
+        owned_overlap_report[desired_deck.get_deck_name()] = {}
+        if value_reduced_by_owned_cards > 0:
+            owned_overlap_report[desired_deck.get_deck_name()] = {OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_desired_deck, desired_deck.get_deck_size(
+            )), SAVED_VALUE_KEY: value_reduced_by_owned_cards, CARD_LIST_KEY: owned_cards_that_overlap}
+        else:
+            owned_overlap_report[desired_deck.get_deck_name()] = {
+                SAVED_VALUE_KEY: NO_OWNED_OVERLAP_FLAG}
+
+    return owned_overlap_report
+
+
+"""
+For each metagame deck in the desired format, we determine how much monetary overlap we currently possess for it,
+and return back a sorted list of the Meta decks, together with which cards and what value we overlap
+
+:param metagame_decks: A list of Deck objects representing all of the Metagame decks on MTGGoldfish.com
+:param owned_cards: A list of dicts containing card info of the format: {CARD_QTY_KEY: card_quantity, CARD_NAME_KEY: card_name}
+"""
+def evaluate_metagame_decks(metagame_decks, owned_cards):
+    metagame_deck_recommendation_report = {}
+
+    for meta_deck in metagame_decks:
+        specific_cards_owned_in_meta_deck = []
+        number_of_owned_cards_that_are_in_meta_deck = 0
+        value_of_meta_deck_owned = 0.0
+
+        for owned_card_entry in owned_cards:
+            owned_card_name = owned_card_entry[CARD_NAME_KEY]
+
+            # Check for this card's presence in the meta_deck
+            for meta_card_entry in meta_deck.get_deck_list():
+                if meta_card_entry[CARD_NAME_KEY].lower() == owned_card_name.lower():
+                    if owned_card_entry[CARD_QTY_KEY] >= meta_card_entry[CARD_QTY_KEY]:
+                        number_of_owned_cards_that_are_in_meta_deck += meta_card_entry[CARD_QTY_KEY]
+                        value_of_meta_deck_owned += float(
+                            meta_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]
+                        specific_cards_owned_in_meta_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: meta_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                            meta_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]})
+                    else:
+                        number_of_owned_cards_that_are_in_meta_deck += owned_card_entry[CARD_QTY_KEY]
+                        value_of_meta_deck_owned += float(
+                            owned_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]
+                        specific_cards_owned_in_meta_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                            owned_card_entry[CARD_QTY_KEY]) * meta_card_entry[CARD_PRICE_KEY]})
+                    break
+
+
+        # Only save the report if we actually own some cards in this Metagame deck
+        if value_of_meta_deck_owned > 0:
+            metagame_deck_recommendation_report[meta_deck.get_deck_name()] = {
+            }
+            metagame_deck_recommendation_report[meta_deck.get_deck_name()] = {OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_meta_deck, meta_deck.get_deck_size(
+            )), SAVED_VALUE_KEY: value_of_meta_deck_owned, CARD_LIST_KEY: specific_cards_owned_in_meta_deck, DECK_PRICE_KEY: meta_deck.get_deck_price()}
+
+    # Sort entries by value descending
+    metagame_decks_sorted_by_desc_value_saved_as_list = sorted(
+        metagame_deck_recommendation_report.items(), key=lambda kv: kv[1][SAVED_VALUE_KEY], reverse=True)
+
+    # Return only the top 15
+    if len(metagame_decks_sorted_by_desc_value_saved_as_list) > 15:
+        return metagame_decks_sorted_by_desc_value_saved_as_list[:15]
+    else:
+        return metagame_decks_sorted_by_desc_value_saved_as_list
+
+
+"""
+For each desired deck, we process each budget deck to determine how many cards from each budget deck
+are present in the given desired deck. We then store them into a large multi-level dictionary for
+eventual reporting
+"""
+def evaluate_budget_decks(owned_cards, desired_decks_list, budget_decks_list):
+    budget_report = {}
+    for desired_deck in desired_decks_list:
+        budget_report[desired_deck.get_deck_name()] = {}
+
+        for budget_deck in budget_decks_list:
+            number_of_cards_from_budget_deck_that_are_in_desired_deck = 0
+            value_shared_between_decks = 0.0
+            number_of_owned_cards_that_are_in_budget_deck = 0
+            value_of_budget_deck_owned = 0.0
+            specific_owned_cards_in_budget_deck = []
+
+            # This is literally N^3 and I should be ashamed, but with data sets this small it doesn't matter in the slightest
+            for desired_card_entry in desired_deck.get_deck_list():
+                desired_card_name = desired_card_entry[CARD_NAME_KEY]
+
+                # Check for this card's presence in the first budget deck
+                for budget_card_entry in budget_deck.get_deck_list():
+
+                    # Check to see if we own this card for our Owned Cards mini-report
+                    for owned_card_entry in owned_cards:
+                        owned_card_name = owned_card_entry[CARD_NAME_KEY]
+                        if budget_card_entry[CARD_NAME_KEY].lower() == owned_card_name.lower():
+                            if owned_card_entry[CARD_QTY_KEY] >= budget_card_entry[CARD_QTY_KEY]:
+
+                                # Only process this card if it doesn't already exist in the specific_owned_cards_in_budget_deck list
+                                already_exists = False
+                                for card_record in specific_owned_cards_in_budget_deck:
+                                    if card_record[CARD_NAME_KEY] == owned_card_name:
+                                        already_exists = True
+                                        break
+                                if not already_exists:
+                                    number_of_owned_cards_that_are_in_budget_deck += budget_card_entry[CARD_QTY_KEY]
+                                    value_of_budget_deck_owned += float(
+                                        budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+                                    specific_owned_cards_in_budget_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: budget_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                                        budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]})
+
+                            else:
+
+                                # Only add this card if it doesn't already exist in the specific_owned_cards_in_budget_deck list
+                                already_exists = False
+                                for card_record in specific_owned_cards_in_budget_deck:
+                                    if card_record[CARD_NAME_KEY] == owned_card_name:
+                                        already_exists = True
+                                        break
+                                if not already_exists:
+                                    number_of_owned_cards_that_are_in_budget_deck += owned_card_entry[CARD_QTY_KEY]
+                                    value_of_budget_deck_owned += float(
+                                        owned_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+                                    specific_owned_cards_in_budget_deck.append({CARD_NAME_KEY: owned_card_name, CARD_QTY_KEY: owned_card_entry[CARD_QTY_KEY], CARD_PRICE_KEY: float(
+                                        owned_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]})
+
+                    if budget_card_entry[CARD_NAME_KEY].lower() == desired_card_name.lower():
+                        if desired_card_entry[CARD_QTY_KEY] >= budget_card_entry[CARD_QTY_KEY]:
+                            number_of_cards_from_budget_deck_that_are_in_desired_deck += budget_card_entry[
+                                CARD_QTY_KEY]
+                            value_shared_between_decks += float(
+                                budget_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+                        else:
+                            number_of_cards_from_budget_deck_that_are_in_desired_deck += desired_card_entry[
+                                CARD_QTY_KEY]
+                            value_shared_between_decks += float(
+                                desired_card_entry[CARD_QTY_KEY]) * budget_card_entry[CARD_PRICE_KEY]
+                        break
+
+            # Only bother reporting budget decks that actually overlap
+            if value_shared_between_decks > 0:
+                budget_report[desired_deck.get_deck_name()][budget_deck.get_deck_name()] = {DECK_PRICE_KEY: budget_deck.get_deck_price(), SHARED_CARDS_KEY: "%d/%d" % (number_of_cards_from_budget_deck_that_are_in_desired_deck, budget_deck.get_deck_size(
+                )), SHARED_VALUE_KEY: value_shared_between_decks, OWNED_CARDS_KEY: "%d/%d" % (number_of_owned_cards_that_are_in_budget_deck, budget_deck.get_deck_size()), SAVED_VALUE_KEY: value_of_budget_deck_owned, CARD_LIST_KEY: specific_owned_cards_in_budget_deck}
+
+
+        # Sort entries by value for this particular desired_deck now that all of the budget decks have been processed
+        budget_decks_sorted_by_desc_value_as_list = sorted(
+            budget_report[desired_deck.get_deck_name()].items(), key=lambda kv: kv[1][SHARED_VALUE_KEY], reverse=True)
+
+        # Only keep the top 5 for each
+        budget_report[desired_deck.get_deck_name(
+        )] = budget_decks_sorted_by_desc_value_as_list[:5]
+
+
+    return budget_report
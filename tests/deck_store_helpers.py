@@ -0,0 +1,108 @@
+"""
+Helpers shared by the tests of the deck cache: building decks and Owned Cards, fetching decks without MTGGoldfish.com,
+and a test case opening a DeckStore in a temporary directory that is removed again after each test.
+"""
+from datetime import datetime
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mtggoldfish
+
+
+"""
+Return a Deck holding the given cards, with its total prices computed from them
+
+:param deck_name: The name of the deck
+:param card_entries: A list of (card_name, card_quantity, paper_price, online_price) tuples
+:param deck_date: The date the deck was published on
+:param has_online_prices: False for a deck whose page had no online prices
+"""
+def make_deck(deck_name, card_entries, deck_date=datetime(2026, 1, 1), has_online_prices=True):
+    deck = mtggoldfish.Deck()
+    deck.deck_name = deck_name
+    deck.deck_url = 'https://www.mtggoldfish.com/deck/%s' % (deck_name.replace(' ', '-'))
+    deck.deck_date = deck_date
+    if not has_online_prices:
+        deck.deck_online_price = None
+    deck.set_card_entries(card_entries)
+    deck.recompute_deck_prices()
+    return deck
+
+
+"""
+Return a Deck as listed on MTGGoldfish.com under the given DeckID, see make_deck()
+"""
+def make_listed_deck(deck_id, card_entries, has_online_prices=True):
+    deck = make_deck("Deck %s" % (deck_id), card_entries, has_online_prices=has_online_prices)
+    deck.deck_url = 'https://www.mtggoldfish.com/deck/%s#paper' % (deck_id)
+    return deck
+
+
+"""
+Return a Deck as cached before both price types were recorded, without either of them
+"""
+def make_unpriced_deck(deck_name, card_entries, deck_date=datetime(2026, 1, 1)):
+    deck = make_deck(deck_name, card_entries, deck_date)
+    deck.deck_paper_price = None
+    deck.deck_online_price = None
+    deck.use_price_type(False)
+    return deck
+
+
+"""
+Return a list of Owned Cards, as parsed from owned_cards.txt
+
+:param owned_cards: A list of (card_name, card_quantity) tuples
+"""
+def make_owned_cards(owned_cards):
+    return [{mtggoldfish.CARD_NAME_KEY: card_name, mtggoldfish.CARD_QTY_KEY: card_quantity} for (card_name, card_quantity) in owned_cards]
+
+
+"""
+Return the name, URL, dates, prices and cards of a deck, for comparing two decks
+"""
+def describe_deck(deck):
+    return (deck.deck_name, deck.deck_url, deck.deck_date, deck.deck_price, deck.deck_paper_price, deck.deck_online_price,
+            deck.get_card_entries())
+
+
+"""
+Stands in for a DeckPageFetcher, loading each deck URL from a dict of the decks currently listed on MTGGoldfish.com
+rather than from its page, and keeping track of the URLs it was asked to load
+"""
+class StubPageFetcher(object):
+    def __init__(self, listed_decks_by_url):
+        self.listed_decks_by_url = listed_decks_by_url
+        self.fetched_deck_urls = []
+
+    def fetch_decks(self, deck_URLs_list, use_online_price, on_result=None):
+        for (deck_index, deck_url) in enumerate(deck_URLs_list):
+            self.fetched_deck_urls.append(deck_url)
+            on_result(deck_index, self.listed_decks_by_url[deck_url])
+
+
+"""
+A test case with a DeckStore in a temporary directory (self.temporary_dir), opened as self.deck_store
+"""
+class DeckStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temporary_dir_handle = tempfile.TemporaryDirectory()
+        self.temporary_dir = self.temporary_dir_handle.name
+        self.db_file_path = os.path.join(self.temporary_dir, 'deck_cache.db')
+        self.deck_store = mtggoldfish.DeckStore(self.db_file_path)
+
+    def tearDown(self):
+        self.deck_store.close()
+        self.temporary_dir_handle.cleanup()
+
+    def query(self, query, query_parameters=()):
+        with self.deck_store.lock:
+            return self.deck_store.connection.execute(query, query_parameters).fetchall()
+
+    def execute_in_transaction(self, query, query_parameters=()):
+        with self.deck_store.lock:
+            with self.deck_store.connection:
+                self.deck_store.connection.execute(query, query_parameters)
@@ -0,0 +1,244 @@
+"""
+Tests of AsyncFetchScheduler against a local HTTP server, fetching with the same download_page_html() that the HTML
+parsing engine uses. The server can fail a page a given number of times before serving it, and records when every
+request reached it so that the retries, backoffs and rate limiting can be checked from the server's side.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import http.server
+import os
+import random
+import sys
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mtggoldfish
+
+# Allowance for the event loop's timer granularity when checking the spacing between two requests
+TIMING_TOLERANCE_SECONDS = 0.02
+
+
+"""
+Serves /page/<name> with the name as the body. A page requested with ?fail=N answers with a 500 error to its first N
+requests, and ?fail=always never stops failing. Every request is recorded as a (time, path) tuple
+"""
+class FlakyRequestHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        (path, query) = (urlsplit(self.path).path, parse_qs(urlsplit(self.path).query))
+        with server.lock:
+            server.requests.append((time.monotonic(), path))
+            num_requests = len([request_path for (request_time, request_path) in server.requests if request_path == path])
+        num_failures = query.get('fail', ['0'])[0]
+        if num_failures == 'always' or num_requests <= int(num_failures):
+            self.send_error(500, "Failing on purpose")
+            return
+
+        body = path.split('/')[-1].encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+"""
+Start a FlakyRequestHandler server on its own thread, returning the server
+"""
+def start_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FlakyRequestHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+"""
+Return the times at which the server received each request for the given path, in order
+"""
+def get_request_times(server, path):
+    with server.lock:
+        return [request_time for (request_time, request_path) in server.requests if request_path == path]
+
+
+"""
+An AsyncFetchScheduler that records every backoff it waits, in the order they were chosen
+"""
+class RecordingFetchScheduler(mtggoldfish.AsyncFetchScheduler):
+    def __init__(self, *args, **kwargs):
+        mtggoldfish.AsyncFetchScheduler.__init__(self, *args, **kwargs)
+        self.backoffs = []
+
+    def backoff_seconds(self, attempt_number):
+        backoff = mtggoldfish.AsyncFetchScheduler.backoff_seconds(self, attempt_number)
+        self.backoffs.append((attempt_number, backoff))
+        return backoff
+
+
+class AsyncFetchSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.server = start_server()
+        self.second_server = start_server()
+
+    def tearDown(self):
+        for server in [self.server, self.second_server]:
+            server.shutdown()
+            server.server_close()
+
+    def get_url(self, path, server=None):
+        return 'http://127.0.0.1:%d%s' % ((server or self.server).server_address[1], path)
+
+    def test_results_are_in_the_order_of_the_urls(self):
+        urls = [self.get_url('/page/%d' % (page_number)) for page_number in range(12)]
+        delivered_results = {}
+        scheduler = mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html, max_concurrency=4)
+        (results, failures) = scheduler.run(urls, lambda url_index, result: delivered_results.__setitem__(url_index, result))
+
+        self.assertEqual(results, [str(page_number).encode('utf-8') for page_number in range(12)])
+        self.assertEqual(failures, [])
+        self.assertEqual(delivered_results, dict(enumerate(results)))
+        self.assertEqual(scheduler.num_retries, 0)
+
+    def test_no_urls(self):
+        self.assertEqual(mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html).run([]), ([], []))
+
+    def test_failed_fetches_are_retried(self):
+        scheduler = mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html, max_retries=3, base_backoff_seconds=0.01)
+        (results, failures) = scheduler.run([self.get_url('/page/flaky?fail=2'), self.get_url('/page/steady')])
+
+        self.assertEqual(results, [b'flaky', b'steady'])
+        self.assertEqual(failures, [])
+        self.assertEqual(scheduler.num_retries, 2)
+        self.assertEqual(len(get_request_times(self.server, '/page/flaky')), 3)
+        self.assertEqual(len(get_request_times(self.server, '/page/steady')), 1)
+
+    def test_urls_failing_every_attempt_are_handed_back(self):
+        failing_url = self.get_url('/page/broken?fail=always')
+        delivered_results = {}
+        scheduler = mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html, max_concurrency=2, max_retries=2,
+                                                    base_backoff_seconds=0.01)
+        (results, failures) = scheduler.run([self.get_url('/page/first'), failing_url, self.get_url('/page/last')],
+                                            lambda url_index, result: delivered_results.__setitem__(url_index, result))
+
+        self.assertEqual(results, [b'first', None, b'last'])
+        self.assertEqual(delivered_results, {0: b'first', 2: b'last'})
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(failures[0][0], failing_url)
+        self.assertIn('500', failures[0][1])
+        self.assertEqual(len(get_request_times(self.server, '/page/broken')), 3)
+        self.assertEqual(scheduler.num_retries, 2)
+
+    def test_no_retries(self):
+        scheduler = mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html, max_retries=0)
+        (results, failures) = scheduler.run([self.get_url('/page/flaky?fail=1')])
+
+        self.assertEqual(results, [None])
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(len(get_request_times(self.server, '/page/flaky')), 1)
+
+    def test_failing_fetch_functions_are_reported_by_their_exception(self):
+        def fail(url):
+            raise ValueError()
+
+        (results, failures) = mtggoldfish.AsyncFetchScheduler(fail, max_retries=0).run(['http://127.0.0.1/'])
+        self.assertEqual(failures, [('http://127.0.0.1/', 'ValueError')])
+
+    def test_backoff_has_full_jitter(self):
+        scheduler = mtggoldfish.AsyncFetchScheduler(None, base_backoff_seconds=1.0, max_backoff_seconds=5.0)
+        random.seed(0)
+        for (attempt_number, backoff_cap) in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 5.0), (10, 5.0)]:
+            backoffs = [scheduler.backoff_seconds(attempt_number) for sample in range(2000)]
+
+            # Spread over the whole range from zero up to the exponential backoff (capped at max_backoff_seconds)
+            self.assertTrue(all(0 <= backoff <= backoff_cap for backoff in backoffs))
+            self.assertLess(min(backoffs), backoff_cap * 0.05)
+            self.assertGreater(max(backoffs), backoff_cap * 0.95)
+            self.assertAlmostEqual(sum(backoffs) / len(backoffs), backoff_cap / 2, delta=backoff_cap * 0.05)
+
+    def test_retries_wait_for_their_backoff(self):
+        scheduler = RecordingFetchScheduler(mtggoldfish.download_page_html, max_retries=3, base_backoff_seconds=0.2)
+        (results, failures) = scheduler.run([self.get_url('/page/flaky?fail=3')])
+
+        self.assertEqual(results, [b'flaky'])
+        self.assertEqual([attempt_number for (attempt_number, backoff) in scheduler.backoffs], [0, 1, 2])
+        request_times = get_request_times(self.server, '/page/flaky')
+        self.assertEqual(len(request_times), 4)
+        for (attempt_number, backoff) in scheduler.backoffs:
+            self.assertGreaterEqual(request_times[attempt_number + 1] - request_times[attempt_number], backoff - TIMING_TOLERANCE_SECONDS)
+
+    def test_requests_to_a_host_are_spaced_out(self):
+        requests_per_second = 20.0
+        urls = [self.get_url('/page/%d' % (page_number)) for page_number in range(8)]
+        scheduler = mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html, max_concurrency=8,
+                                                    requests_per_second=requests_per_second)
+        (results, failures) = scheduler.run(urls)
+
+        self.assertEqual(failures, [])
+        request_times = sorted(request_time for (request_time, path) in self.server.requests)
+        self.assertEqual(len(request_times), 8)
+        for (request_time, next_request_time) in zip(request_times, request_times[1:]):
+            self.assertGreaterEqual(next_request_time - request_time, 1.0 / requests_per_second - TIMING_TOLERANCE_SECONDS)
+
+    def test_retries_are_spaced_out_with_the_other_requests(self):
+        requests_per_second = 20.0
+        urls = [self.get_url('/page/flaky?fail=2')] + [self.get_url('/page/%d' % (page_number)) for page_number in range(4)]
+        scheduler = mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html, max_concurrency=5,
+                                                    requests_per_second=requests_per_second, base_backoff_seconds=0.0)
+        (results, failures) = scheduler.run(urls)
+
+        self.assertEqual(failures, [])
+        request_times = sorted(request_time for (request_time, path) in self.server.requests)
+        self.assertEqual(len(request_times), 7)
+        for (request_time, next_request_time) in zip(request_times, request_times[1:]):
+            self.assertGreaterEqual(next_request_time - request_time, 1.0 / requests_per_second - TIMING_TOLERANCE_SECONDS)
+
+    def test_hosts_are_rate_limited_separately(self):
+        requests_per_second = 5.0
+        urls = []
+        for page_number in range(3):
+            urls.append(self.get_url('/page/%d' % (page_number)))
+            urls.append(self.get_url('/page/%d' % (page_number), self.second_server))
+        scheduler = mtggoldfish.AsyncFetchScheduler(mtggoldfish.download_page_html, max_concurrency=6,
+                                                    requests_per_second=requests_per_second)
+        start_time = time.monotonic()
+        (results, failures) = scheduler.run(urls)
+
+        self.assertEqual(failures, [])
+        for server in [self.server, self.second_server]:
+            request_times = sorted(request_time for (request_time, path) in server.requests)
+            self.assertEqual(len(request_times), 3)
+
+            # Each host gets its first request right away, rather than waiting for the other host's requests
+            self.assertLess(request_times[0] - start_time, 1.0 / requests_per_second)
+            for (request_time, next_request_time) in zip(request_times, request_times[1:]):
+                self.assertGreaterEqual(next_request_time - request_time, 1.0 / requests_per_second - TIMING_TOLERANCE_SECONDS)
+
+    def test_in_flight_fetches_are_limited(self):
+        lock = threading.Lock()
+        in_flight = [0, 0]
+
+        def slow_fetch(url):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return url
+
+        urls = ['http://127.0.0.1/%d' % (page_number) for page_number in range(12)]
+        (results, failures) = mtggoldfish.AsyncFetchScheduler(slow_fetch, max_concurrency=3).run(urls)
+        self.assertEqual(results, urls)
+        self.assertEqual(in_flight[1], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests of the cache warmer (--warm): which decks it picks to refresh each interval, most in need of it first, and that
+it never fetches more than its per-interval budget.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import contextlib
+from datetime import datetime, timedelta
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, StubPageFetcher, make_listed_deck
+import mtggoldfish
+
+
+def make_deck_url(deck_id):
+    return 'https://www.mtggoldfish.com/deck/%s#paper' % (deck_id)
+
+
+class DeckRefreshPriorityTest(unittest.TestCase):
+    def test_older_and_more_used_decks_come_first(self):
+        self.assertEqual(mtggoldfish.get_deck_refresh_priority(0, 0), (0, 1))
+        self.assertEqual(mtggoldfish.get_deck_refresh_priority(4, 0), (0, 5))
+        self.assertEqual(mtggoldfish.get_deck_refresh_priority(4, 2), (0, 15))
+        self.assertGreater(mtggoldfish.get_deck_refresh_priority(1, 9), mtggoldfish.get_deck_refresh_priority(10, 0))
+
+    def test_uncached_decks_come_before_any_cached_deck(self):
+        self.assertEqual(mtggoldfish.get_deck_refresh_priority(None, 3), (1, 3))
+        self.assertGreater(mtggoldfish.get_deck_refresh_priority(None, 0), mtggoldfish.get_deck_refresh_priority(365, 100))
+        self.assertGreater(mtggoldfish.get_deck_refresh_priority(None, 1), mtggoldfish.get_deck_refresh_priority(None, 0))
+
+
+class ChooseDecksToRefreshTest(unittest.TestCase):
+    def setUp(self):
+        # Priorities: 'new-used' (1, 2), 'new' (1, 0), 'used' 3 * 10 = 30, 'old' 41 * 1 = 41, 'stale' 2 * 2 = 4
+        self.deck_refresh_candidates = {
+            'old': (make_deck_url('old'), 40, 0),
+            'used': (make_deck_url('used'), 2, 9),
+            'stale': (make_deck_url('stale'), 1, 1),
+            'today': (make_deck_url('today'), 0, 50),
+            'new': (make_deck_url('new'), None, 0),
+            'new-used': (make_deck_url('new-used'), None, 2)}
+
+    def test_stale_decks_are_ordered_by_priority(self):
+        (stale_deck_ids, deck_ids_to_refresh) = mtggoldfish.choose_decks_to_refresh(self.deck_refresh_candidates, 10)
+        self.assertEqual(stale_deck_ids, ['new-used', 'new', 'old', 'used', 'stale'])
+        self.assertEqual(deck_ids_to_refresh, stale_deck_ids)
+
+    def test_at_most_fetch_budget_decks_are_refreshed(self):
+        self.assertEqual(mtggoldfish.choose_decks_to_refresh(self.deck_refresh_candidates, 3),
+                         (['new-used', 'new', 'old', 'used', 'stale'], ['new-used', 'new', 'old']))
+        self.assertEqual(mtggoldfish.choose_decks_to_refresh(self.deck_refresh_candidates, 0)[1], [])
+
+    def test_decks_cached_today_are_left_alone(self):
+        self.assertEqual(mtggoldfish.choose_decks_to_refresh({'today': (make_deck_url('today'), 0, 50)}, 10), ([], []))
+        self.assertEqual(mtggoldfish.choose_decks_to_refresh({}, 10), ([], []))
+
+
+class WarmDeckCacheTest(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+        mtggoldfish.deck_store = self.deck_store
+
+        # 'today' was cached today, '100' and '200' days ago, and '300' is only listed on a landing page
+        self.deck_store.save_decks([
+            ('today', make_listed_deck('today', [("Card 0", 4, 1.0, 0.1)]), datetime.now()),
+            ('100', make_listed_deck('100', [("Card 1", 4, 1.0, 0.1)]), datetime.now() - timedelta(days=5)),
+            ('200', make_listed_deck('200', [("Card 2", 4, 1.0, 0.1)]), datetime.now() - timedelta(days=2))])
+        for times_used in range(9):
+            self.deck_store.record_deck_usage(['200'])
+        self.page_fetcher = StubPageFetcher(dict((make_deck_url(deck_id), make_listed_deck(deck_id, [("Card 9", 1, 9.0, 0.9)]))
+                                                 for deck_id in ['today', '100', '200', '300']))
+
+    def tearDown(self):
+        mtggoldfish.deck_store = None
+        DeckStoreTestCase.tearDown(self)
+
+    def warm_deck_cache(self, fetch_budget):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            with contextlib.redirect_stderr(io.StringIO()):
+                num_refreshed_decks = mtggoldfish.warm_deck_cache([make_deck_url('300') + '\n'], self.page_fetcher, fetch_budget)
+        return (num_refreshed_decks, output.getvalue())
+
+    def test_each_interval_refreshes_at_most_fetch_budget_decks(self):
+        # The uncached deck first, then '200' at (2 + 1) * (9 + 1) = 30 before '100' at (5 + 1) * (0 + 1) = 6
+        (num_refreshed_decks, output) = self.warm_deck_cache(2)
+        self.assertEqual(num_refreshed_decks, 2)
+        self.assertIn("3 of 4 decks need refreshing (0 of them are more than 30 days old), refreshing 2 of them.", output)
+        self.assertEqual(self.page_fetcher.fetched_deck_urls, [make_deck_url('300'), make_deck_url('200')])
+
+        # Those two were cached today, which leaves the last stale deck for the next interval
+        (num_refreshed_decks, output) = self.warm_deck_cache(2)
+        self.assertEqual(num_refreshed_decks, 1)
+        self.assertEqual(self.page_fetcher.fetched_deck_urls[2:], [make_deck_url('100')])
+
+        (num_refreshed_decks, output) = self.warm_deck_cache(2)
+        self.assertEqual(num_refreshed_decks, 0)
+        self.assertIn("0 of 4 decks need refreshing", output)
+        self.assertEqual(len(self.page_fetcher.fetched_deck_urls), 3)
+        self.assertEqual(self.deck_store.load_decks(['100'])['100'].get_card_entries(),
+                         make_listed_deck('100', [("Card 9", 1, 9.0, 0.9)]).get_card_entries())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Tests of the card prices kept apart from the decklists in the deck cache: the price history and the biggest price movers,
+the latest prices being applied to decks cached before them, and refreshing the prices that are older than --price-ttl
+by fetching again a few of the cached decks which together contain every stale card.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import contextlib
+from datetime import datetime, timedelta
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, StubPageFetcher, make_listed_deck
+import mtggoldfish
+
+
+"""
+Return the date the given number of days before today, as the deck cache dates the decks it saves
+"""
+def days_ago(num_days):
+    todays_date = datetime.now()
+    return datetime(todays_date.year, todays_date.month, todays_date.day) - timedelta(days=num_days)
+
+
+class PriceHistoryTest(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+        self.deck_store.save_decks([('100', make_listed_deck('100', [("Lightning Bolt", 4, 1.5, 0.25), ("Tarmogoyf", 1, 30.0, 8.0)]),
+                                     datetime(2026, 1, 1))])
+        self.deck_store.save_decks([('100', make_listed_deck('100', [("Lightning Bolt", 4, 1.5, 0.25), ("Tarmogoyf", 1, 24.0, 8.5)]),
+                                     datetime(2026, 1, 5))])
+        self.deck_store.save_decks([('200', make_listed_deck('200', [("Lightning Bolt", 4, 2.0, 0.25), ("Snapcaster Mage", 2, 20.0, 3.0),
+                                                                     ("Tarmogoyf", 1, 24.0, 8.5)]), datetime(2026, 1, 10))])
+
+    def test_only_price_changes_are_recorded(self):
+        self.assertEqual(self.query(
+            "SELECT cards.card_name, price_history.price_date, price_history.paper_price, price_history.online_price FROM price_history"
+            " JOIN cards ON cards.card_id = price_history.card_id ORDER BY cards.card_name, price_history.price_date"), [
+            ("Lightning Bolt", '2026-01-01', 1.5, 0.25),
+            ("Lightning Bolt", '2026-01-10', 2.0, 0.25),
+            ("Snapcaster Mage", '2026-01-10', 20.0, 3.0),
+            ("Tarmogoyf", '2026-01-01', 30.0, 8.0),
+            ("Tarmogoyf", '2026-01-05', 24.0, 8.5)])
+
+    def test_card_price_on_date(self):
+        self.assertIsNone(self.deck_store.get_card_price_on_date("Lightning Bolt", datetime(2025, 12, 31)))
+        self.assertEqual(self.deck_store.get_card_price_on_date("Lightning Bolt", datetime(2026, 1, 1)), (1.5, 0.25))
+        self.assertEqual(self.deck_store.get_card_price_on_date("Lightning Bolt", datetime(2026, 1, 9)), (1.5, 0.25))
+        self.assertEqual(self.deck_store.get_card_price_on_date("Lightning Bolt", datetime(2026, 2, 1)), (2.0, 0.25))
+        self.assertEqual(self.deck_store.get_card_price_on_date("Tarmogoyf", datetime(2026, 1, 7)), (24.0, 8.5))
+        self.assertIsNone(self.deck_store.get_card_price_on_date("Snapcaster Mage", datetime(2026, 1, 9)))
+        self.assertIsNone(self.deck_store.get_card_price_on_date("Thoughtseize", datetime(2026, 2, 1)))
+
+    def test_biggest_price_movers(self):
+        # Snapcaster Mage was first priced after the date compared against, so it didn't move
+        self.assertEqual(self.deck_store.get_biggest_price_movers(datetime(2026, 1, 2), False, 10),
+                         [("Tarmogoyf", 30.0, 24.0), ("Lightning Bolt", 1.5, 2.0)])
+        self.assertEqual(self.deck_store.get_biggest_price_movers(datetime(2026, 1, 2), False, 1), [("Tarmogoyf", 30.0, 24.0)])
+        self.assertEqual(self.deck_store.get_biggest_price_movers(datetime(2026, 1, 2), True, 10), [("Tarmogoyf", 8.0, 8.5)])
+        self.assertEqual(self.deck_store.get_biggest_price_movers(datetime(2026, 1, 5), False, 10), [("Lightning Bolt", 1.5, 2.0)])
+        self.assertEqual(self.deck_store.get_biggest_price_movers(datetime(2026, 1, 10), False, 10), [])
+
+    def test_paper_only_prices_keep_the_latest_online_price(self):
+        self.deck_store.save_decks([('300', make_listed_deck('300', [("Tarmogoyf", 1, 26.0, 0.0)], has_online_prices=False),
+                                     datetime(2026, 1, 12))])
+        self.assertEqual(self.deck_store.get_card_price_on_date("Tarmogoyf", datetime(2026, 1, 12)), (26.0, None))
+        self.assertEqual(self.query("SELECT card_prices.paper_price, card_prices.online_price, card_prices.price_date FROM card_prices"
+                                    " JOIN cards ON cards.card_id = card_prices.card_id WHERE cards.card_name = ?", ("Tarmogoyf",)),
+                         [(26.0, 8.5, '2026-01-12')])
+        self.assertEqual(self.deck_store.get_biggest_price_movers(datetime(2026, 1, 10), False, 10), [("Tarmogoyf", 24.0, 26.0)])
+        self.assertEqual(self.deck_store.get_biggest_price_movers(datetime(2026, 1, 10), True, 10), [])
+
+
+class LatestCardPricesTest(DeckStoreTestCase):
+    def test_decks_are_loaded_with_the_latest_card_prices(self):
+        self.deck_store.save_decks([('100', make_listed_deck('100', [("Lightning Bolt", 4, 1.5, 0.25), ("Mountain", 16, 0.0, 0.0)]),
+                                     datetime(2026, 1, 1))])
+        self.deck_store.save_decks([('200', make_listed_deck('200', [("Lightning Bolt", 4, 2.0, 0.5)]), datetime(2026, 1, 3))])
+
+        deck = self.deck_store.load_decks(['100'])['100']
+        self.assertEqual(deck.get_card_entries(), [("Lightning Bolt", 4, 2.0, 0.5), ("Mountain", 16, 0.0, 0.0)])
+        self.assertEqual((deck.deck_paper_price, deck.deck_online_price, deck.deck_price), (8.0, 2.0, 8.0))
+
+        # The decklist itself is left as it was cached
+        self.assertEqual(self.query("SELECT paper_price, online_price FROM deck_entries WHERE deck_id = '100' ORDER BY position"),
+                         [(1.5, 0.25), (0.0, 0.0)])
+
+    def test_paper_only_prices_keep_the_online_price_of_the_deck(self):
+        self.deck_store.save_decks([('100', make_listed_deck('100', [("Lightning Bolt", 4, 1.5, 0.25)]), datetime(2026, 1, 1))])
+        self.deck_store.save_decks([('200', make_listed_deck('200', [("Lightning Bolt", 4, 2.0, 0.0)], has_online_prices=False),
+                                     datetime(2026, 1, 3))])
+        deck = self.deck_store.load_decks(['100'])['100']
+        self.assertEqual(deck.get_card_entries(), [("Lightning Bolt", 4, 2.0, 0.25)])
+        self.assertEqual((deck.deck_paper_price, deck.deck_online_price), (8.0, 1.0))
+
+    def test_older_card_prices_are_not_applied(self):
+        self.deck_store.save_decks([('200', make_listed_deck('200', [("Lightning Bolt", 4, 1.0, 0.1)]), datetime(2026, 1, 1))])
+        self.deck_store.save_decks([('100', make_listed_deck('100', [("Lightning Bolt", 4, 1.5, 0.25)]), datetime(2026, 1, 3))])
+
+        # A deck cached on the same date as the latest price already has it
+        self.deck_store.save_decks([('300', make_listed_deck('300', [("Lightning Bolt", 4, 1.75, 0.25)]), datetime(2026, 1, 3))])
+        self.assertEqual(self.deck_store.load_decks(['100'])['100'].get_card_entries(), [("Lightning Bolt", 4, 1.5, 0.25)])
+        self.assertEqual(self.deck_store.load_decks(['200'])['200'].get_card_entries(), [("Lightning Bolt", 4, 1.75, 0.25)])
+
+
+class ChooseDecksCoveringCardsTest(unittest.TestCase):
+    def test_the_deck_covering_the_most_cards_is_picked_first(self):
+        self.assertEqual(mtggoldfish.choose_decks_covering_cards({
+            '100': set([1, 2]),
+            '200': set([2, 3, 4]),
+            '300': set([1, 5]),
+            '400': set([4]),
+        }), ['200', '300'])
+
+    def test_ties_go_to_the_first_deck(self):
+        self.assertEqual(mtggoldfish.choose_decks_covering_cards({'100': set([1]), '200': set([2]), '300': set([1, 2])}), ['300'])
+        self.assertEqual(mtggoldfish.choose_decks_covering_cards({'100': set([1, 2]), '200': set([2, 3]), '300': set([3, 4])}),
+                         ['100', '300'])
+
+    def test_nothing_to_cover(self):
+        self.assertEqual(mtggoldfish.choose_decks_covering_cards({}), [])
+
+
+class RefreshStalePricesTest(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+        mtggoldfish.deck_store = self.deck_store
+
+        # Cards 2 and 3 are found in three decks, but fetching decks 200 and 300 again is enough to refresh every stale card
+        self.deck_store.save_decks([
+            ('100', make_listed_deck('100', [("Card 1", 4, 1.0, 0.1), ("Card 2", 4, 2.0, 0.2)]), days_ago(10)),
+            ('200', make_listed_deck('200', [("Card 2", 4, 2.0, 0.2), ("Card 3", 4, 3.0, 0.3), ("Card 4", 4, 4.0, 0.4)]), days_ago(10)),
+            ('300', make_listed_deck('300', [("Card 1", 4, 1.0, 0.1), ("Card 5", 1, 5.0, 0.5)]), days_ago(10)),
+            ('400', make_listed_deck('400', [("Card 3", 4, 3.0, 0.3), ("Card 6", 1, 6.0, 0.6)]), days_ago(10)),
+        ])
+
+        # Card 6 was priced again recently, along with a deck the plan doesn't list
+        self.deck_store.save_decks([('500', make_listed_deck('500', [("Card 6", 1, 6.5, 0.65)]), days_ago(2))])
+
+        self.listed_decks_by_url = {}
+        for deck_id in ['100', '200', '300', '400']:
+            deck = self.deck_store.load_decks([deck_id])[deck_id]
+            self.listed_decks_by_url[deck.deck_url] = make_listed_deck(
+                deck_id, [(card_name, quantity, paper_price + 1.0, online_price) for (card_name, quantity, paper_price, online_price)
+                          in deck.get_card_entries()])
+        self.page_fetcher = StubPageFetcher(self.listed_decks_by_url)
+
+        self.fetch_plan = mtggoldfish.DeckFetchPlan([])
+        self.fetch_plan.add_deck_urls(mtggoldfish.METAGAME_DECKS_CATEGORY, sorted(self.listed_decks_by_url) + [
+            'https://www.mtggoldfish.com/deck/600#paper'])
+        self.run_quietly(lambda: self.fetch_plan.decide_deck_sources(False))
+
+    def tearDown(self):
+        mtggoldfish.deck_store = None
+        DeckStoreTestCase.tearDown(self)
+
+    def run_quietly(self, function):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            with contextlib.redirect_stderr(io.StringIO()):
+                function()
+        return output.getvalue()
+
+    def get_card_ids(self, card_names):
+        return set([self.deck_store.card_ids[card_name] for card_name in card_names])
+
+    def test_stale_card_ids_by_deck(self):
+        self.assertEqual(self.deck_store.get_stale_card_ids_by_deck(['100', '200', '300', '400', '500', '600'], days_ago(5)), {
+            '100': self.get_card_ids(["Card 1", "Card 2"]),
+            '200': self.get_card_ids(["Card 2", "Card 3", "Card 4"]),
+            '300': self.get_card_ids(["Card 1", "Card 5"]),
+            '400': self.get_card_ids(["Card 3"]),
+        })
+        self.assertEqual(self.deck_store.get_stale_card_ids_by_deck(['400', '500'], days_ago(1)), {
+            '400': self.get_card_ids(["Card 3", "Card 6"]),
+            '500': self.get_card_ids(["Card 6"]),
+        })
+        self.assertEqual(self.deck_store.get_stale_card_ids_by_deck(['100', '200', '300', '400'], days_ago(10)), {})
+
+    def test_stale_prices_are_refreshed_from_a_covering_set_of_decks(self):
+        output = self.run_quietly(lambda: self.fetch_plan.refresh_stale_prices(7, False, self.page_fetcher))
+        self.assertIn("Refreshing the prices of 5 cards last priced more than 7 days ago by fetching 2 of the 4 cached decks containing them.",
+                      output)
+        self.assertEqual(self.page_fetcher.fetched_deck_urls, ['https://www.mtggoldfish.com/deck/200#paper',
+                                                               'https://www.mtggoldfish.com/deck/300#paper'])
+        self.assertEqual(self.fetch_plan.cached_deck_dates, {'100': days_ago(10), '200': days_ago(0), '300': days_ago(0),
+                                                             '400': days_ago(10)})
+
+        # The decks that weren't fetched again pick up the new prices of their cards, except for the card priced recently
+        self.assertEqual(self.deck_store.load_decks(['400'])['400'].get_card_entries(), [("Card 3", 4, 4.0, 0.3), ("Card 6", 1, 6.5, 0.65)])
+        self.assertEqual(self.deck_store.get_stale_card_ids_by_deck(['100', '200', '300', '400'], days_ago(7)), {})
+
+    def test_prices_within_the_ttl_are_not_refreshed(self):
+        output = self.run_quietly(lambda: self.fetch_plan.refresh_stale_prices(10, False, self.page_fetcher))
+        self.assertIn("The prices of every card in the cached decks were refreshed within the last 10 days.", output)
+        self.assertEqual(self.page_fetcher.fetched_deck_urls, [])
+
+        # Card 6 is the only card priced within the last 2 days
+        self.run_quietly(lambda: self.fetch_plan.refresh_stale_prices(2, False, self.page_fetcher))
+        self.assertEqual(self.page_fetcher.fetched_deck_urls, ['https://www.mtggoldfish.com/deck/200#paper',
+                                                               'https://www.mtggoldfish.com/deck/300#paper'])
+
+    def test_a_ttl_of_zero_refreshes_every_price_seen_before_today(self):
+        self.run_quietly(lambda: self.fetch_plan.refresh_stale_prices(0, False, self.page_fetcher))
+        self.assertEqual(self.page_fetcher.fetched_deck_urls, ['https://www.mtggoldfish.com/deck/200#paper',
+                                                               'https://www.mtggoldfish.com/deck/300#paper',
+                                                               'https://www.mtggoldfish.com/deck/400#paper'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+Tests of several runs writing to the same cache at once: DeckStore connections (from threads of the same run, or from
+separate processes) saving decks into the same deck_cache.db, and files replaced by write_file_atomically() while they're
+being read. Nothing may be lost, and nothing may be seen half written.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import describe_deck, make_deck
+import mtggoldfish
+
+
+NUM_WRITERS = 2
+NUM_BATCHES = 10
+NUM_DECKS_PER_BATCH = 50
+
+# Every writer saves its own version of this deck with each batch, along with decks of its own
+CONTENDED_DECK_ID = 'contended'
+
+
+"""
+Return the decks that the given writer saves with the given batch, by DeckID. Their cards are shared with the other
+writers' decks, and priced the same, so that saving them at once adds the same cards from several connections
+"""
+def make_writer_decks(writer_index, batch_index):
+    writer_decks = {}
+    for deck_index in range(NUM_DECKS_PER_BATCH):
+        writer_decks['%d-%d-%d' % (writer_index, batch_index, deck_index)] = make_deck(
+            "Writer %d Deck %d-%d" % (writer_index, batch_index, deck_index),
+            [("Card %d" % (batch_index * NUM_DECKS_PER_BATCH + deck_index), 4, 1.0, 0.1), ("Card %d" % (batch_index), 2, 3.0, 0.3),
+             ("Writer %d Card %d" % (writer_index, batch_index), 1, 10.0, 1.0)])
+    writer_decks[CONTENDED_DECK_ID] = make_contended_deck(writer_index)
+    return writer_decks
+
+
+def make_contended_deck(writer_index):
+    return make_deck("Contended Deck", [("Card %d" % (card_index), writer_index + 1, 1.0, 0.1) for card_index in range(10)] +
+                     [("Writer %d Card 0" % (writer_index), 1, 10.0, 1.0)])
+
+
+"""
+Save every batch of decks of the given writer through a DeckStore of its own, recording each batch as used by a run
+"""
+def run_writer(db_file_path, writer_index):
+    writer_deck_store = mtggoldfish.DeckStore(db_file_path)
+    try:
+        for batch_index in range(NUM_BATCHES):
+            writer_decks = make_writer_decks(writer_index, batch_index)
+            writer_deck_store.save_decks([(deck_id, deck, datetime(2026, 1, 1)) for (deck_id, deck) in writer_decks.items()])
+            writer_deck_store.record_deck_usage([CONTENDED_DECK_ID])
+    finally:
+        writer_deck_store.close()
+
+
+class ConcurrentDeckStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.temporary_dir_handle = tempfile.TemporaryDirectory()
+        self.db_file_path = os.path.join(self.temporary_dir_handle.name, 'deck_cache.db')
+        self.deck_store = mtggoldfish.DeckStore(self.db_file_path)
+        self.contended_deck_descriptions = [describe_deck(make_contended_deck(writer_index)) for writer_index in range(NUM_WRITERS)]
+
+    def tearDown(self):
+        self.deck_store.close()
+        self.temporary_dir_handle.cleanup()
+
+    """
+    Keep loading the contended deck until the writers are done, checking that it's always one of their versions as a whole
+    """
+    def read_while_writing(self, writers_are_done):
+        num_reads = 0
+        while not writers_are_done() or num_reads == 0:
+            contended_deck = self.deck_store.load_decks([CONTENDED_DECK_ID]).get(CONTENDED_DECK_ID)
+            if contended_deck is not None:
+                self.assertIn(describe_deck(contended_deck), self.contended_deck_descriptions)
+            num_reads += 1
+
+    def check_saved_decks(self):
+        with self.deck_store.lock:
+            self.assertEqual(self.deck_store.connection.execute("PRAGMA integrity_check").fetchone()[0], 'ok')
+            self.assertEqual(self.deck_store.connection.execute("PRAGMA foreign_key_check").fetchall(), [])
+
+        expected_decks = {}
+        for writer_index in range(NUM_WRITERS):
+            for batch_index in range(NUM_BATCHES):
+                expected_decks.update(make_writer_decks(writer_index, batch_index))
+        loaded_decks = self.deck_store.load_decks(list(expected_decks))
+        self.assertEqual(sorted(loaded_decks), sorted(expected_decks))
+        for (deck_id, deck) in expected_decks.items():
+            if deck_id != CONTENDED_DECK_ID:
+                self.assertEqual(describe_deck(loaded_decks[deck_id]), describe_deck(deck))
+        self.assertIn(describe_deck(loaded_decks[CONTENDED_DECK_ID]), self.contended_deck_descriptions)
+
+        # Every revision of the contended deck was stored against the version saved right before it, whichever writer
+        # saved that one, so each of them rebuilds into one of the versions as a whole
+        deck_revisions = self.deck_store.get_deck_revisions(CONTENDED_DECK_ID)
+        self.assertGreater(len(deck_revisions), 0)
+        for (revision, cached_date, is_checkpoint) in deck_revisions:
+            self.assertIn(describe_deck(self.deck_store.load_deck_revision(CONTENDED_DECK_ID, revision)), self.contended_deck_descriptions)
+
+        self.assertEqual(self.deck_store.get_cached_deck_usage()[CONTENDED_DECK_ID][2], NUM_WRITERS * NUM_BATCHES)
+
+    def test_deck_stores_of_several_threads_save_at_once(self):
+        writer_errors = []
+
+        def run_writer_thread(writer_index):
+            try:
+                run_writer(self.db_file_path, writer_index)
+            except Exception as e:
+                writer_errors.append(e)
+
+        writer_threads = [threading.Thread(target=run_writer_thread, args=(writer_index,)) for writer_index in range(NUM_WRITERS)]
+        for writer_thread in writer_threads:
+            writer_thread.start()
+        try:
+            self.read_while_writing(lambda: not any([writer_thread.is_alive() for writer_thread in writer_threads]))
+        finally:
+            for writer_thread in writer_threads:
+                writer_thread.join()
+        self.assertEqual(writer_errors, [])
+        self.check_saved_decks()
+
+    def test_deck_stores_of_several_processes_save_at_once(self):
+        with ProcessPoolExecutor(max_workers=NUM_WRITERS, mp_context=multiprocessing.get_context('spawn')) as executor:
+            writer_futures = [executor.submit(run_writer, self.db_file_path, writer_index) for writer_index in range(NUM_WRITERS)]
+            self.read_while_writing(lambda: all([writer_future.done() for writer_future in writer_futures]))
+
+            # Raises whatever failed in the writer processes
+            for writer_future in writer_futures:
+                writer_future.result()
+        self.check_saved_decks()
+
+
+class WriteFileAtomicallyTest(unittest.TestCase):
+    def setUp(self):
+        self.temporary_dir_handle = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temporary_dir_handle.name, 'cache', 'deck_urls')
+
+    def tearDown(self):
+        self.temporary_dir_handle.cleanup()
+
+    def test_readers_never_see_a_partially_written_file(self):
+        mtggoldfish.write_pickle_file_atomically(self.file_path, (0, ['url'] * 1000))
+        num_versions = 200
+
+        def write_versions():
+            for version in range(1, num_versions + 1):
+                mtggoldfish.write_pickle_file_atomically(self.file_path, (version, ['url %d' % (version)] * (1000 + version * 100)))
+
+        writer_thread = threading.Thread(target=write_versions)
+        writer_thread.start()
+        try:
+            last_version = 0
+            while writer_thread.is_alive():
+                with open(self.file_path, 'rb') as input:
+                    (version, deck_url_list) = pickle.load(input)
+                self.assertGreaterEqual(version, last_version)
+                self.assertEqual(len(deck_url_list), 1000 + version * 100)
+                last_version = version
+        finally:
+            writer_thread.join()
+        with open(self.file_path, 'rb') as input:
+            self.assertEqual(pickle.load(input)[0], num_versions)
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ['deck_urls'])
+
+    def test_a_failed_write_leaves_the_previous_file(self):
+        mtggoldfish.write_file_atomically(self.file_path, lambda output: output.write(b'previous'))
+
+        def write_partially(output):
+            output.write(b'part')
+            raise IOError("Disk full")
+        with self.assertRaises(IOError):
+            mtggoldfish.write_file_atomically(self.file_path, write_partially)
+
+        with open(self.file_path, 'rb') as input:
+            self.assertEqual(input.read(), b'previous')
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ['deck_urls'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""
+Tests of the read-only deck archive: exporting the deck cache into an archive and loading the decks back from it, and
+archives that were cut short or corrupted being refused when they're opened.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+from datetime import datetime
+import os
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, describe_deck, make_deck, make_unpriced_deck
+import mtggoldfish
+
+
+class DeckArchiveTestCase(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+        mtggoldfish.deck_store = self.deck_store
+        self.archive_file_path = os.path.join(self.temporary_dir, 'decks.archive')
+
+        # Deck names parsed off of the budget pages are bytes
+        budget_deck = make_deck("Budget Burn", [("Lightning Bolt", 4, 1.5, 0.25), ("Mountain", 16, 0.0, 0.0)])
+        budget_deck.deck_name = b"Budget Burn"
+        self.decks = {
+            '100': budget_deck,
+            '200': make_deck("Æther Vial Tron", [("Æther Vial", 4, 3.0, 1.0), ("Karn Liberated", 4, 30.0, 12.5)], deck_date=datetime(2025, 12, 24)),
+            '300': make_deck("Paper Only", [("Tarmogoyf", 3, 20.0, 0.0)], has_online_prices=False),
+            '400': make_unpriced_deck("Unpriced", [("Lightning Bolt", 4, 1.5, 0.25), ("Snapcaster Mage", 2, 20.0, 3.0)]),
+            '500': make_deck("No Cards", []),
+        }
+        self.deck_store.save_decks([(deck_id, deck, datetime(2026, 1, 2)) for (deck_id, deck) in self.decks.items()])
+
+    def tearDown(self):
+        if mtggoldfish.deck_archive is not None:
+            mtggoldfish.deck_archive.close()
+            mtggoldfish.deck_archive = None
+        mtggoldfish.deck_store = None
+        DeckStoreTestCase.tearDown(self)
+
+
+class DeckArchiveRoundTripTest(DeckArchiveTestCase):
+    def test_archived_decks_are_loaded_back_the_same(self):
+        self.assertEqual(mtggoldfish.export_deck_archive(self.archive_file_path), 5)
+        mtggoldfish.open_deck_archive(self.archive_file_path)
+        deck_archive = mtggoldfish.deck_archive
+
+        cached_decks = self.deck_store.load_decks(list(self.decks))
+        archived_decks = deck_archive.load_decks(list(self.decks) + ['600'])
+        self.assertEqual(sorted(archived_decks), sorted(self.decks))
+        for deck_id in self.decks:
+            self.assertEqual(describe_deck(archived_decks[deck_id]), describe_deck(cached_decks[deck_id]))
+            self.assertEqual(archived_decks[deck_id].has_price_type(False), cached_decks[deck_id].has_price_type(False))
+            self.assertEqual(archived_decks[deck_id].has_price_type(True), cached_decks[deck_id].has_price_type(True))
+        self.assertEqual(archived_decks['100'].deck_name, b"Budget Burn")
+        self.assertEqual(archived_decks['300'].deck_online_price, None)
+        self.assertEqual(deck_archive.get_cached_dates(['200', '600']), {'200': datetime(2026, 1, 2)})
+
+    def test_decks_are_exported_with_the_latest_card_prices(self):
+        self.deck_store.save_decks([('600', make_deck("Bolt", [("Lightning Bolt", 4, 2.0, 0.5)]), datetime(2026, 1, 3))])
+        mtggoldfish.export_deck_archive(self.archive_file_path)
+        mtggoldfish.open_deck_archive(self.archive_file_path)
+        archived_deck = mtggoldfish.deck_archive.load_decks(['100'])['100']
+        self.assertEqual(archived_deck.get_card_entries(), [("Lightning Bolt", 4, 2.0, 0.5), ("Mountain", 16, 0.0, 0.0)])
+        self.assertEqual(archived_deck.deck_paper_price, 8.0)
+
+    def test_the_more_recent_copy_of_a_deck_is_loaded(self):
+        mtggoldfish.export_deck_archive(self.archive_file_path)
+        mtggoldfish.open_deck_archive(self.archive_file_path)
+
+        # The archive is used along with a deck cache that only has some of its decks, one of them more recent
+        other_deck_store = mtggoldfish.DeckStore(os.path.join(self.temporary_dir, 'other_deck_cache.db'))
+        mtggoldfish.deck_store = other_deck_store
+        try:
+            updated_deck = make_deck("Paper Only", [("Tarmogoyf", 4, 21.0, 0.0)], has_online_prices=False)
+            other_deck_store.save_decks([('300', updated_deck, datetime(2026, 1, 5)), ('100', self.decks['100'], datetime(2026, 1, 1)),
+                                         ('600', make_deck("Bolt", [("Lightning Bolt", 4, 1.0, 0.1)]), datetime(2026, 1, 1))])
+
+            self.assertEqual(mtggoldfish.get_cached_deck_dates(['100', '300', '500', '600', '700']), {
+                '100': datetime(2026, 1, 2), '300': datetime(2026, 1, 5), '500': datetime(2026, 1, 2), '600': datetime(2026, 1, 1)})
+            loaded_decks = mtggoldfish.load_decks_from_cache(['100', '300', '500', '600', '700'])
+            self.assertEqual(sorted(loaded_decks), ['100', '300', '500', '600'])
+            self.assertEqual(describe_deck(loaded_decks['300']), describe_deck(updated_deck))
+            self.assertEqual(describe_deck(loaded_decks['100']), describe_deck(mtggoldfish.deck_archive.load_decks(['100'])['100']))
+            self.assertEqual(loaded_decks['500'].deck_name, "No Cards")
+            self.assertEqual(loaded_decks['600'].deck_name, "Bolt")
+        finally:
+            other_deck_store.close()
+
+    def test_an_empty_cache_is_exported(self):
+        mtggoldfish.deck_store = mtggoldfish.DeckStore(os.path.join(self.temporary_dir, 'empty_deck_cache.db'))
+        try:
+            self.assertEqual(mtggoldfish.export_deck_archive(self.archive_file_path), 0)
+        finally:
+            mtggoldfish.deck_store.close()
+        mtggoldfish.open_deck_archive(self.archive_file_path)
+        self.assertEqual(mtggoldfish.deck_archive.load_decks(['100']), {})
+
+
+class CorruptedDeckArchiveTest(DeckArchiveTestCase):
+    def setUp(self):
+        DeckArchiveTestCase.setUp(self)
+        mtggoldfish.export_deck_archive(self.archive_file_path)
+        with open(self.archive_file_path, 'rb') as archive_file:
+            self.archive_data = archive_file.read()
+
+    def write_archive(self, archive_data):
+        with open(self.archive_file_path, 'wb') as archive_file:
+            archive_file.write(archive_data)
+
+    def assert_archive_is_refused(self, archive_data):
+        self.write_archive(archive_data)
+        with self.assertRaises((ValueError, struct.error)):
+            mtggoldfish.open_deck_archive(self.archive_file_path)
+        self.assertIsNone(mtggoldfish.deck_archive)
+
+    def replace_header(self, **header_fields):
+        header_size = struct.calcsize(mtggoldfish.DECK_ARCHIVE_HEADER_FORMAT)
+        (magic, format_version, num_cards, num_decks, card_table_offset, deck_index_offset) = struct.unpack_from(
+            mtggoldfish.DECK_ARCHIVE_HEADER_FORMAT, self.archive_data, 0)
+        header = dict(magic=magic, format_version=format_version, num_cards=num_cards, num_decks=num_decks,
+                      card_table_offset=card_table_offset, deck_index_offset=deck_index_offset)
+        header.update(header_fields)
+        return struct.pack(mtggoldfish.DECK_ARCHIVE_HEADER_FORMAT, header['magic'], header['format_version'], header['num_cards'],
+                           header['num_decks'], header['card_table_offset'], header['deck_index_offset']) + self.archive_data[header_size:]
+
+    def test_an_archive_cut_short_anywhere_is_refused(self):
+        for archive_length in range(len(self.archive_data)):
+            self.assert_archive_is_refused(self.archive_data[:archive_length])
+
+    def test_trailing_bytes_are_refused(self):
+        self.assert_archive_is_refused(self.archive_data + b'\0')
+
+    def test_corrupted_headers_are_refused(self):
+        self.assert_archive_is_refused(self.replace_header(magic=b'NOTDECKS'))
+        self.assert_archive_is_refused(self.replace_header(format_version=mtggoldfish.DECK_ARCHIVE_FORMAT_VERSION + 1))
+        self.assert_archive_is_refused(self.replace_header(num_cards=1000))
+        self.assert_archive_is_refused(self.replace_header(num_decks=4))
+        self.assert_archive_is_refused(self.replace_header(num_decks=6))
+        self.assert_archive_is_refused(self.replace_header(card_table_offset=len(self.archive_data)))
+        self.assert_archive_is_refused(self.replace_header(deck_index_offset=0))
+
+    def test_corrupted_deck_records_are_refused_when_loaded(self):
+        # The card count of the first deck is the last field of its header, right after the archive's header
+        num_cards_offset = (struct.calcsize(mtggoldfish.DECK_ARCHIVE_HEADER_FORMAT) + struct.calcsize(mtggoldfish.DECK_ARCHIVE_DECK_HEADER_FORMAT) -
+                            struct.calcsize('<I'))
+        self.write_archive(self.archive_data[:num_cards_offset] + struct.pack('<I', 100000) + self.archive_data[num_cards_offset + 4:])
+        mtggoldfish.open_deck_archive(self.archive_file_path)
+        first_deck_id = sorted(mtggoldfish.deck_archive.get_deck_record_offsets().items(), key=lambda deck_record: deck_record[1])[0][0]
+        with self.assertRaises(ValueError):
+            mtggoldfish.deck_archive.load_decks([first_deck_id])
+
+    def test_intact_archive_is_opened(self):
+        self.write_archive(self.archive_data)
+        mtggoldfish.open_deck_archive(self.archive_file_path)
+        self.assertEqual(sorted(mtggoldfish.deck_archive.get_deck_record_offsets()), sorted(self.decks))
+
+
+if __name__ == "__main__":
+    unittest.main()
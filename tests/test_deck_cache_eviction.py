@@ -0,0 +1,194 @@
+"""
+Tests of the deck cache limits and compaction: DeckStore.evict_least_recently_used_decks(), enforce_deck_cache_limits()
+and DeckStore.compact(), on a DeckStore in a temporary directory.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import contextlib
+from datetime import datetime, timedelta
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, describe_deck, make_deck, make_owned_cards
+import mtggoldfish
+
+NUM_DECKS = 60
+
+
+"""
+A DeckStore whose cached decks always take up the same number of bytes, however many of them are evicted
+"""
+class FixedSizeDeckStore(mtggoldfish.DeckStore):
+    def get_cache_size(self):
+        (num_decks, num_bytes) = mtggoldfish.DeckStore.get_cache_size(self)
+        return (num_decks, 1024 * 1024)
+
+
+class DeckCacheEvictionTest(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+
+        # Deck N is cached on day N, and the shared card is in every deck
+        self.decks = {}
+        for deck_number in range(NUM_DECKS):
+            deck_id = 'd%02d' % (deck_number)
+            self.decks[deck_id] = make_deck("Deck %d" % (deck_number), [("Shared Card", 4, 1.0, 0.1)] + [
+                ("Card %d-%d" % (deck_number, card_number), 2, float(card_number), card_number / 10.0) for card_number in range(20)])
+            self.deck_store.save_decks([(deck_id, self.decks[deck_id], datetime(2026, 1, 1) + timedelta(days=deck_number))])
+
+    def get_cached_deck_ids(self):
+        return self.deck_store.get_cached_deck_ids()
+
+    def set_last_used_date(self, deck_id, last_used_date):
+        self.execute_in_transaction("INSERT OR REPLACE INTO deck_usage (deck_id, times_used, last_used_date) VALUES (?, 1, ?)",
+                                    (deck_id, last_used_date.strftime('%Y-%m-%d')))
+
+    def test_least_recently_used_decks_are_evicted_first(self):
+        # Decks 0 and 1 were used after every deck was cached, and Deck 2 before it was cached again
+        self.set_last_used_date('d00', datetime(2026, 6, 1))
+        self.set_last_used_date('d01', datetime(2026, 5, 1))
+        self.set_last_used_date('d02', datetime(2025, 1, 1))
+
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(NUM_DECKS - 1, None, set()), 1)
+        self.assertNotIn('d02', self.get_cached_deck_ids())
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(5, None, set()), NUM_DECKS - 6)
+        self.assertEqual(self.get_cached_deck_ids(), ['d00', 'd01', 'd57', 'd58', 'd59'])
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(5, None, set()), 0)
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(1, None, set()), 4)
+        self.assertEqual(self.get_cached_deck_ids(), ['d00'])
+
+    def test_protected_decks_are_never_evicted(self):
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(0, None, set(['d03', 'd10'])), NUM_DECKS - 2)
+        self.assertEqual(self.get_cached_deck_ids(), ['d03', 'd10'])
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(0, 0, set(['d03', 'd10'])), 0)
+        self.assertEqual(self.get_cached_deck_ids(), ['d03', 'd10'])
+
+    def test_decks_are_evicted_until_the_cache_fits(self):
+        (num_decks, num_bytes) = self.deck_store.get_cache_size()
+        self.assertEqual(num_decks, NUM_DECKS)
+        num_evicted_decks = self.deck_store.evict_least_recently_used_decks(None, num_bytes // 2, set(['d00']))
+        self.assertGreater(num_evicted_decks, 0)
+        self.assertLessEqual(self.deck_store.get_cache_size()[1], num_bytes // 2)
+
+        # The oldest decks are evicted first, in whole batches
+        self.assertEqual(self.get_cached_deck_ids(), ['d00'] + sorted(self.decks)[num_evicted_decks + 1:])
+        self.assertTrue(num_evicted_decks % mtggoldfish.CACHE_EVICTION_BATCH_SIZE == 0)
+
+    def test_eviction_stops_once_it_no_longer_shrinks_the_cache(self):
+        self.deck_store.close()
+        self.deck_store = FixedSizeDeckStore(self.db_file_path)
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(None, 1024, set()), mtggoldfish.CACHE_EVICTION_BATCH_SIZE)
+        self.assertEqual(len(self.get_cached_deck_ids()), NUM_DECKS - mtggoldfish.CACHE_EVICTION_BATCH_SIZE)
+
+        # A limit on the number of decks is still enforced, as evicting decks always brings their number down
+        self.assertEqual(self.deck_store.evict_least_recently_used_decks(10, 1024, set()), NUM_DECKS - mtggoldfish.CACHE_EVICTION_BATCH_SIZE - 10)
+
+    def test_evicted_decks_leave_nothing_behind(self):
+        self.deck_store.update_scored_owned_cards(make_owned_cards([("Shared Card", 1)]))
+        deck_scores = [(deck_id, deck.deck_name, None) for (deck_id, deck) in self.decks.items()]
+        self.deck_store.save_metagame_deck_scores(deck_scores, False, self.deck_store.saved_deck_score_versions, make_owned_cards([("Shared Card", 1)]))
+        self.deck_store.update_scored_owned_cards(make_owned_cards([("Shared Card", 1), ("Card 0-0", 1)]))
+        self.deck_store.save_metagame_deck_scores(deck_scores, True, self.deck_store.load_metagame_deck_scores(list(self.decks), True)[0],
+                                                  make_owned_cards([("Shared Card", 1), ("Card 0-0", 1)]))
+        self.deck_store.record_deck_usage(list(self.decks))
+
+        self.deck_store.evict_least_recently_used_decks(2, None, set(['d00']))
+        cached_deck_ids = [('d00',), ('d59',)]
+        for table_name in ['decks', 'deck_usage', 'deck_revisions', 'deck_score_versions']:
+            self.assertEqual(self.query("SELECT deck_id FROM %s ORDER BY deck_id" % (table_name)), cached_deck_ids, table_name)
+        for table_name in ['deck_entries', 'deck_revision_entries', 'metagame_deck_scores']:
+            self.assertEqual(self.query("SELECT DISTINCT deck_id FROM %s ORDER BY deck_id" % (table_name)), cached_deck_ids, table_name)
+
+        # Only the cards of the remaining decks keep their prices
+        card_names = ["Shared Card"] + ["Card %d-%d" % (deck_number, card_number) for deck_number in [0, 59] for card_number in range(20)]
+        for table_name in ['card_prices', 'price_history']:
+            self.assertEqual(sorted(self.query("SELECT card_name FROM cards JOIN %s ON %s.card_id = cards.card_id" % (table_name, table_name))),
+                             sorted([(card_name,) for card_name in card_names]), table_name)
+        self.assertEqual(self.deck_store.get_card_price_on_date("Card 1-5", datetime(2026, 12, 31)), None)
+        self.assertEqual(self.deck_store.get_card_price_on_date("Card 59-5", datetime(2026, 12, 31)), (5.0, 0.5))
+
+    def test_cache_limits_are_enforced_on_the_deck_store_of_the_run(self):
+        mtggoldfish.deck_store = self.deck_store
+        try:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                mtggoldfish.enforce_deck_cache_limits(None, None, set())
+                self.assertEqual(len(self.get_cached_deck_ids()), NUM_DECKS)
+                mtggoldfish.enforce_deck_cache_limits(3, None, set(['d00']))
+            self.assertEqual(self.get_cached_deck_ids(), ['d00', 'd58', 'd59'])
+            self.assertIn("Evicted the %d least recently used decks from the cache, 3 decks" % (NUM_DECKS - 3), output.getvalue())
+
+            # A cache that already fits isn't touched
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                mtggoldfish.enforce_deck_cache_limits(10, 1024.0, set())
+            self.assertEqual(len(self.get_cached_deck_ids()), 3)
+            self.assertEqual(output.getvalue(), "")
+        finally:
+            mtggoldfish.deck_store = None
+
+
+class DeckCacheCompactionTest(DeckStoreTestCase):
+    def test_compaction_removes_unreadable_decks_and_leftover_rows(self):
+        decks = {
+            'kept': make_deck("Kept", [("Shared Card", 4, 1.0, 0.1), ("Kept Card", 2, 2.0, 0.2)]),
+            'baddate': make_deck("Bad Date", [("Shared Card", 4, 1.0, 0.1), ("Bad Date Card", 2, 3.0, 0.3)]),
+            'empty': make_deck("Empty", [("Empty Card", 1, 4.0, 0.4)]),
+        }
+        self.deck_store.save_decks([(deck_id, deck, datetime(2026, 1, 1)) for (deck_id, deck) in decks.items()])
+        owned_cards = make_owned_cards([("Shared Card", 1)])
+        self.deck_store.update_scored_owned_cards(owned_cards)
+        for use_online_price in [False, True]:
+            self.deck_store.save_metagame_deck_scores([(deck_id, deck.deck_name, None) for (deck_id, deck) in decks.items()],
+                                                      use_online_price, self.deck_store.saved_deck_score_versions, owned_cards)
+        self.deck_store.record_deck_usage(list(decks))
+
+        # One deck's date got mangled, another one lost its cards, and a deck was removed without any of its other rows
+        self.execute_in_transaction("UPDATE decks SET deck_date = 'sometime' WHERE deck_id = 'baddate'")
+        self.execute_in_transaction("DELETE FROM deck_entries WHERE deck_id = 'empty'")
+        self.execute_in_transaction("INSERT INTO deck_usage (deck_id, times_used, last_used_date) VALUES ('gone', 3, '2026-01-01')")
+        self.execute_in_transaction("INSERT INTO deck_score_versions (deck_id, version) VALUES ('gone', 7)")
+        self.execute_in_transaction("INSERT INTO metagame_deck_scores (deck_id, uses_online_price, deck_score) VALUES ('gone', 1, x'00')")
+        self.execute_in_transaction("INSERT INTO deck_revisions (deck_id, revision, cached_date, is_checkpoint, num_cards) VALUES ('gone', 1, '2026-01-01', 1, 0)")
+
+        num_removed_rows = self.deck_store.compact()
+        self.assertEqual(num_removed_rows['decks'], 2)
+        self.assertEqual(num_removed_rows['deck_usage'], 3)
+        self.assertEqual(num_removed_rows['deck_revisions'], 3)
+        self.assertEqual(num_removed_rows['metagame_deck_scores'], 1)
+        self.assertEqual(num_removed_rows['deck_score_versions'], 3)
+        self.assertEqual(num_removed_rows['price_history'], 2)
+        self.assertEqual(num_removed_rows['cards'], 2)
+
+        for table_name in ['decks', 'deck_usage', 'deck_revisions', 'deck_score_versions']:
+            self.assertEqual(self.query("SELECT deck_id FROM %s" % (table_name)), [('kept',)], table_name)
+        for table_name in ['deck_entries', 'deck_revision_entries']:
+            self.assertEqual(self.query("SELECT DISTINCT deck_id FROM %s" % (table_name)), [('kept',)], table_name)
+        self.assertEqual(self.query("SELECT deck_id, uses_online_price FROM metagame_deck_scores ORDER BY uses_online_price"),
+                         [('kept', 0), ('kept', 1)])
+        self.assertEqual(sorted(self.query("SELECT card_name FROM cards")), [("Kept Card",), ("Shared Card",)])
+        for table_name in ['card_prices', 'price_history']:
+            self.assertEqual(self.query("SELECT COUNT(*) FROM %s" % (table_name)), [(2,)], table_name)
+
+        # The deck that was kept is left as it was, and can still be saved along with new cards
+        self.assertEqual(describe_deck(self.deck_store.load_decks(['kept'])['kept']), describe_deck(decks['kept']))
+        self.deck_store.save_decks([('new', make_deck("New", [("Bad Date Card", 1, 5.0, 0.5)]), datetime(2026, 1, 2))])
+        self.assertEqual(self.deck_store.load_decks(['new'])['new'].get_card_entries(), [("Bad Date Card", 1, 5.0, 0.5)])
+
+    def test_compaction_shrinks_the_database_file(self):
+        for deck_number in range(40):
+            self.deck_store.save_decks([('d%d' % (deck_number), make_deck("Deck %d" % (deck_number), [
+                ("Card %d-%d" % (deck_number, card_number), 1, 1.0, 0.1) for card_number in range(50)]), datetime(2026, 1, 1))])
+        self.deck_store.evict_least_recently_used_decks(1, None, set())
+        size_before_compaction = os.path.getsize(self.db_file_path) + os.path.getsize(self.db_file_path + '-wal')
+        self.deck_store.compact()
+        self.assertLess(os.path.getsize(self.db_file_path) + os.path.getsize(self.db_file_path + '-wal'), size_before_compaction)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests of the single fetch plan shared by the desired, Metagame and Budget decks: deck URLs are normalized so that a deck
+listed in several categories, or under differently formatted URLs, is loaded only once and still reaches every
+category listing it.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import contextlib
+from datetime import datetime
+import io
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, StubPageFetcher, make_listed_deck
+import mtggoldfish
+
+
+DESIRED_DECKS_CATEGORY = mtggoldfish.DESIRED_DECKS_CATEGORY
+METAGAME_DECKS_CATEGORY = mtggoldfish.METAGAME_DECKS_CATEGORY
+BUDGET_DECKS_CATEGORY = mtggoldfish.BUDGET_DECKS_CATEGORY
+
+
+class DeckUrlTest(unittest.TestCase):
+    def test_deck_urls_are_normalized(self):
+        for deck_url in ['https://www.mtggoldfish.com/deck/784979#paper', 'https://www.mtggoldfish.com/deck/784979#online\n',
+                         '  https://www.mtggoldfish.com/deck/784979/', 'https://www.mtggoldfish.com/deck/784979?page=2#paper']:
+            self.assertEqual(mtggoldfish.normalize_deck_url(deck_url), 'https://www.mtggoldfish.com/deck/784979')
+            self.assertEqual(mtggoldfish.parse_deck_id_from_url(deck_url), '784979')
+
+    def test_archetype_urls_use_the_archetype_as_their_deck_id(self):
+        self.assertEqual(mtggoldfish.parse_deck_id_from_url('https://www.mtggoldfish.com/archetype/modern-grixis-death-s-shadow#paper'),
+                         'modern-grixis-death-s-shadow')
+        self.assertEqual(mtggoldfish.parse_deck_id_from_url('https://www.mtggoldfish.com/archetype/modern-grixis-death-s-shadow/#online'),
+                         'modern-grixis-death-s-shadow')
+
+
+class DeckFetchPlanTest(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+        mtggoldfish.deck_store = self.deck_store
+
+        # Deck 500 is already cached, everything else has to be fetched
+        self.cached_deck = make_listed_deck('500', [("Card 5", 4, 5.0, 0.5)])
+        self.deck_store.save_decks([('500', self.cached_deck, datetime.now())])
+        self.listed_decks = dict((deck_id, make_listed_deck(deck_id, [("Card %s" % (deck_id), 4, 1.0, 0.1)]))
+                                 for deck_id in ['100', '200', '300', 'modern-burn'])
+
+        self.fetch_plan = mtggoldfish.DeckFetchPlan([DESIRED_DECKS_CATEGORY])
+        self.fetch_plan.add_deck_urls(DESIRED_DECKS_CATEGORY, [
+            'https://www.mtggoldfish.com/deck/100#paper\n',
+            'https://www.mtggoldfish.com/archetype/modern-burn#paper\n',
+            'https://www.mtggoldfish.com/deck/100#online\n'])
+        self.fetch_plan.add_deck_urls(METAGAME_DECKS_CATEGORY, [
+            'https://www.mtggoldfish.com/archetype/modern-burn/#online',
+            'https://www.mtggoldfish.com/deck/200',
+            'https://www.mtggoldfish.com/deck/500#paper'])
+        self.fetch_plan.add_deck_urls(BUDGET_DECKS_CATEGORY, [
+            'https://www.mtggoldfish.com/deck/300#paper',
+            'https://www.mtggoldfish.com/deck/100/?utm_source=budget#paper',
+            'https://www.mtggoldfish.com/deck/200#paper',
+            'https://www.mtggoldfish.com/deck/500#online'])
+
+        # Each deck is fetched from the first URL it was listed under
+        self.page_fetcher = StubPageFetcher(dict([
+            ('https://www.mtggoldfish.com/deck/100#paper', self.listed_decks['100']),
+            ('https://www.mtggoldfish.com/archetype/modern-burn#paper', self.listed_decks['modern-burn']),
+            ('https://www.mtggoldfish.com/deck/200', self.listed_decks['200']),
+            ('https://www.mtggoldfish.com/deck/300#paper', self.listed_decks['300'])]))
+
+    def tearDown(self):
+        mtggoldfish.deck_store = None
+        DeckStoreTestCase.tearDown(self)
+
+    def iterate_decks(self, categories):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            with contextlib.redirect_stderr(io.StringIO()):
+                loaded_decks = list(self.fetch_plan.iterate_decks(False, False, self.page_fetcher, categories))
+        return sorted([(deck.deck_name, deck_positions) for (deck, deck_positions) in loaded_decks])
+
+    def test_duplicate_deck_urls_are_planned_once(self):
+        self.assertEqual(self.fetch_plan.get_deck_ids(DESIRED_DECKS_CATEGORY), ['100', 'modern-burn'])
+        self.assertEqual(self.fetch_plan.get_deck_ids(METAGAME_DECKS_CATEGORY), ['modern-burn', '200', '500'])
+        self.assertEqual(self.fetch_plan.get_deck_ids(BUDGET_DECKS_CATEGORY), ['300', '100', '200', '500'])
+        self.assertEqual(self.fetch_plan.ordered_deck_ids, ['100', 'modern-burn', '200', '500', '300'])
+        self.assertEqual(self.fetch_plan.deck_url_by_id['modern-burn'], 'https://www.mtggoldfish.com/archetype/modern-burn#paper')
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.fetch_plan.decide_deck_sources(False)
+        self.assertIn("Planned 10 deck URLs: 5 unique decks (5 duplicates removed), 1 cached and 4 to fetch.", output.getvalue())
+
+    def test_each_deck_is_fetched_once_and_reaches_every_category(self):
+        self.assertEqual(self.iterate_decks([DESIRED_DECKS_CATEGORY]), [
+            ("Deck 100", {DESIRED_DECKS_CATEGORY: 0}),
+            ("Deck modern-burn", {DESIRED_DECKS_CATEGORY: 1})])
+
+        # The desired decks were kept around, so the Metagame and Budget categories listing them don't fetch them again
+        self.assertEqual(self.iterate_decks([METAGAME_DECKS_CATEGORY, BUDGET_DECKS_CATEGORY]), [
+            ("Deck 100", {BUDGET_DECKS_CATEGORY: 1}),
+            ("Deck 200", {METAGAME_DECKS_CATEGORY: 1, BUDGET_DECKS_CATEGORY: 2}),
+            ("Deck 300", {BUDGET_DECKS_CATEGORY: 0}),
+            ("Deck 500", {METAGAME_DECKS_CATEGORY: 2, BUDGET_DECKS_CATEGORY: 3}),
+            ("Deck modern-burn", {METAGAME_DECKS_CATEGORY: 0})])
+
+        self.assertEqual(sorted(self.page_fetcher.fetched_deck_urls), [
+            'https://www.mtggoldfish.com/archetype/modern-burn#paper', 'https://www.mtggoldfish.com/deck/100#paper',
+            'https://www.mtggoldfish.com/deck/200', 'https://www.mtggoldfish.com/deck/300#paper'])
+        self.assertEqual(sorted(self.deck_store.get_cached_deck_ids()), ['100', '200', '300', '500', 'modern-burn'])
+
+    def test_skipped_decks_still_reach_the_other_categories(self):
+        self.fetch_plan.skip_deck_ids(METAGAME_DECKS_CATEGORY, ['200', '500'])
+        self.assertEqual(self.iterate_decks([METAGAME_DECKS_CATEGORY, BUDGET_DECKS_CATEGORY]), [
+            ("Deck 100", {BUDGET_DECKS_CATEGORY: 1}),
+            ("Deck 200", {BUDGET_DECKS_CATEGORY: 2}),
+            ("Deck 300", {BUDGET_DECKS_CATEGORY: 0}),
+            ("Deck 500", {BUDGET_DECKS_CATEGORY: 3}),
+            ("Deck modern-burn", {METAGAME_DECKS_CATEGORY: 0})])
+        self.assertEqual(len(self.page_fetcher.fetched_deck_urls), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
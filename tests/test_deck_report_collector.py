@@ -0,0 +1,55 @@
+"""
+Tests of DeckReportCollector, whose entries have to come out the same as adding the decks to a dict in their original
+order, and whose best entry has to follow along as the entries arrive in any order.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mtggoldfish
+
+
+class DeckReportCollectorTest(unittest.TestCase):
+    def test_entries_and_best_entry_in_any_order(self):
+        for seed in range(300):
+            random_generator = random.Random(seed)
+            deck_names = ["Deck %d" % (deck_number) for deck_number in range(random_generator.randint(1, 12))]
+
+            # Few distinct values, so that there are plenty of ties, broken by the position of each deck name in the dict
+            report_entries = [(random_generator.choice(deck_names), {mtggoldfish.SAVED_VALUE_KEY: float(random_generator.randint(0, 5))})
+                              for deck_index in range(random_generator.randint(1, 40))]
+            report_dict = {}
+            for (deck_name, report_entry) in report_entries:
+                report_dict[deck_name] = report_entry
+
+            report_collector = mtggoldfish.DeckReportCollector(mtggoldfish.SAVED_VALUE_KEY)
+            self.assertIsNone(report_collector.get_best_entry_value())
+            indexed_entries = list(enumerate(report_entries))
+            random_generator.shuffle(indexed_entries)
+            for (deck_index, (deck_name, report_entry)) in indexed_entries:
+                report_collector.add_entry(deck_index, deck_name, report_entry)
+                ranking = report_collector.get_ranking(mtggoldfish.SAVED_VALUE_KEY, 1)
+                self.assertEqual(report_collector.get_best_entry_value(), (ranking[0][0], ranking[0][1][mtggoldfish.SAVED_VALUE_KEY]))
+
+            self.assertEqual(report_collector.get_entries(), list(report_dict.items()))
+            self.assertEqual(report_collector.get_ranking(mtggoldfish.SAVED_VALUE_KEY, 3),
+                             sorted(report_dict.items(), key=lambda kv: kv[1][mtggoldfish.SAVED_VALUE_KEY], reverse=True)[:3])
+
+    def test_best_entry_replaced_with_a_lower_one(self):
+        report_collector = mtggoldfish.DeckReportCollector(mtggoldfish.SAVED_VALUE_KEY)
+        report_collector.add_entry(0, "First", {mtggoldfish.SAVED_VALUE_KEY: 10.0})
+        report_collector.add_entry(1, "Second", {mtggoldfish.SAVED_VALUE_KEY: 5.0})
+        self.assertEqual(report_collector.get_best_entry_value(), ("First", 10.0))
+
+        # A later deck with the same name replaces the entry of the best deck so far
+        report_collector.add_entry(2, "First", {mtggoldfish.SAVED_VALUE_KEY: 1.0})
+        self.assertEqual(report_collector.get_best_entry_value(), ("Second", 5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+Tests of the deck revision history: DeckStore.save_deck_revision() (through save_decks()), load_deck_revision() and
+get_deck_changes(), on a DeckStore in a temporary directory.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, describe_deck, make_deck
+import mtggoldfish
+
+CARD_NAMES = ["Card %d" % (card_number) for card_number in range(40)]
+
+NUM_REVISIONS = 3 * mtggoldfish.DECK_REVISION_CHECKPOINT_INTERVAL + 5
+
+
+"""
+Return the card entries of a deck with a random change: a few cards replaced, requantified or repriced, cards added to
+or removed from the end of the deck, or nothing changed at all
+
+:param random_generator: The random.Random to choose the change with
+:param card_entries: A list of (card_name, card_quantity, paper_price, online_price) tuples
+:param card_names: The names of the cards to choose from
+"""
+def change_card_entries(random_generator, card_entries, card_names):
+    card_entries = list(card_entries)
+    change = random_generator.choice(['replace', 'requantify', 'reprice', 'grow', 'shrink', 'rewrite', 'none'])
+    if change in ['replace', 'requantify', 'reprice'] and len(card_entries) > 0:
+        for position in random_generator.sample(range(len(card_entries)), random_generator.randint(1, min(3, len(card_entries)))):
+            (card_name, card_quantity, paper_price, online_price) = card_entries[position]
+            if change == 'replace':
+                card_name = random_generator.choice(card_names)
+            elif change == 'requantify':
+                card_quantity = random_generator.randint(1, 4)
+            else:
+                paper_price = round(paper_price + random_generator.uniform(-1, 1), 2)
+            card_entries[position] = (card_name, card_quantity, paper_price, online_price)
+    elif change == 'grow':
+        card_entries += [(random_generator.choice(card_names), random_generator.randint(1, 4), round(random_generator.uniform(0, 20), 2), 0.5)
+                         for card_number in range(random_generator.randint(1, 4))]
+    elif change == 'shrink':
+        del card_entries[random_generator.randint(0, len(card_entries)):]
+    elif change == 'rewrite':
+        card_entries = [(random_generator.choice(card_names), random_generator.randint(1, 4), round(random_generator.uniform(0, 20), 2), 0.5)
+                        for card_number in range(random_generator.randint(0, 15))]
+    return card_entries
+
+
+class DeckRevisionTest(DeckStoreTestCase):
+    def save_deck(self, deck, cached_date):
+        self.deck_store.save_decks([('100', deck, cached_date)])
+
+    def test_every_revision_is_rebuilt_exactly(self):
+        for seed in range(5):
+            random_generator = random.Random(seed)
+            deck_id = 'seed%d' % (seed)
+
+            # The decks of each seed have cards of their own, so that they don't pick up the prices of another seed's decks
+            card_names = ["Seed %d %s" % (seed, card_name) for card_name in CARD_NAMES]
+            card_entries = [(random_generator.choice(card_names), random_generator.randint(1, 4), round(random_generator.uniform(0, 20), 2), 0.5)
+                            for card_number in range(15)]
+            saved_decks = []
+            for save_number in range(NUM_REVISIONS * 2):
+                if len(saved_decks) == NUM_REVISIONS:
+                    break
+                deck = make_deck("Seed %d Deck" % (seed) if random_generator.random() < 0.9 else "Renamed Deck", card_entries)
+                self.deck_store.save_decks([(deck_id, deck, datetime(2026, 1, 1) + timedelta(days=save_number))])
+                if len(saved_decks) == 0 or describe_deck(deck) != describe_deck(saved_decks[-1]):
+                    saved_decks.append(deck)
+                card_entries = change_card_entries(random_generator, card_entries, card_names)
+
+            # Saving a deck that didn't change doesn't add a revision
+            deck_revisions = self.deck_store.get_deck_revisions(deck_id)
+            self.assertEqual([revision for (revision, cached_date, is_checkpoint) in deck_revisions], list(range(1, len(saved_decks) + 1)))
+            for (revision, saved_deck) in enumerate(saved_decks, 1):
+                self.assertEqual(describe_deck(self.deck_store.load_deck_revision(deck_id, revision)), describe_deck(saved_deck), revision)
+            self.assertIsNone(self.deck_store.load_deck_revision(deck_id, len(saved_decks) + 1))
+
+            # The latest revision is the deck that is cached
+            self.assertEqual(describe_deck(self.deck_store.load_decks([deck_id])[deck_id]), describe_deck(saved_decks[-1]))
+
+            # There's a checkpoint at least once every DECK_REVISION_CHECKPOINT_INTERVAL revisions, with deltas in between
+            checkpoints = [revision for (revision, cached_date, is_checkpoint) in deck_revisions if is_checkpoint]
+            self.assertEqual(checkpoints[0], 1)
+            for (checkpoint, next_checkpoint) in zip(checkpoints, checkpoints[1:] + [len(saved_decks) + 1]):
+                self.assertLessEqual(next_checkpoint - checkpoint, mtggoldfish.DECK_REVISION_CHECKPOINT_INTERVAL)
+            self.assertLess(len(checkpoints), len(saved_decks))
+
+    def test_unchanged_decks_are_checkpointed_every_interval(self):
+        card_entries = [(card_name, 2, 1.0, 0.5) for card_name in CARD_NAMES[:20]]
+        for revision in range(1, 2 * mtggoldfish.DECK_REVISION_CHECKPOINT_INTERVAL + 2):
+            card_entries[0] = (CARD_NAMES[0], 2, float(revision), 0.5)
+            self.save_deck(make_deck("Deck", card_entries), datetime(2026, 1, 1) + timedelta(days=revision))
+
+        checkpoints = [revision for (revision, cached_date, is_checkpoint) in self.deck_store.get_deck_revisions('100') if is_checkpoint]
+        self.assertEqual(checkpoints, [1, 1 + mtggoldfish.DECK_REVISION_CHECKPOINT_INTERVAL, 1 + 2 * mtggoldfish.DECK_REVISION_CHECKPOINT_INTERVAL])
+
+        # A delta only stores the card that changed, and the revisions after a checkpoint are rebuilt from it
+        self.assertEqual(self.query("SELECT COUNT(*) FROM deck_revision_entries WHERE deck_id = '100' AND revision = 2"), [(1,)])
+        for revision in [checkpoints[1] - 1, checkpoints[1], checkpoints[1] + 1, checkpoints[2]]:
+            card_entries[0] = (CARD_NAMES[0], 2, float(revision), 0.5)
+            self.assertEqual(self.deck_store.load_deck_revision('100', revision).get_card_entries(), card_entries)
+
+    def test_shrinking_a_deck_removes_its_last_cards(self):
+        card_entries = [(card_name, 1, 1.0, 0.5) for card_name in CARD_NAMES[:20]]
+        self.save_deck(make_deck("Deck", card_entries), datetime(2026, 1, 1))
+        self.save_deck(make_deck("Deck", card_entries[:18]), datetime(2026, 1, 2))
+        self.save_deck(make_deck("Deck", card_entries[:18] + [("New Card", 4, 2.0, 0.5)]), datetime(2026, 1, 3))
+
+        # The deck shrank in a delta, and the position freed up is reused by the card added next
+        self.assertEqual([is_checkpoint for (revision, cached_date, is_checkpoint) in self.deck_store.get_deck_revisions('100')], [True, False, False])
+        self.assertEqual(self.deck_store.load_deck_revision('100', 2).get_card_entries(), card_entries[:18])
+        self.assertEqual(self.deck_store.load_deck_revision('100', 3).get_card_entries(), card_entries[:18] + [("New Card", 4, 2.0, 0.5)])
+        self.assertEqual(self.query("SELECT MAX(position), COUNT(*) FROM deck_entries WHERE deck_id = '100'"), [(18, 19)])
+
+    def test_price_changes_add_revisions(self):
+        card_entries = [(card_name, 1, 1.0, 0.5) for card_name in CARD_NAMES[:10]]
+        self.save_deck(make_deck("Deck", card_entries), datetime(2026, 1, 1))
+        repriced_card_entries = list(card_entries)
+        repriced_card_entries[3] = (CARD_NAMES[3], 1, 1.0, 0.75)
+        self.save_deck(make_deck("Deck", repriced_card_entries), datetime(2026, 1, 2))
+
+        self.assertEqual([(revision, cached_date) for (revision, cached_date, is_checkpoint) in self.deck_store.get_deck_revisions('100')],
+                         [(1, datetime(2026, 1, 1)), (2, datetime(2026, 1, 2))])
+        self.assertEqual(self.deck_store.load_deck_revision('100', 1).get_card_entries(), card_entries)
+        self.assertEqual(self.deck_store.load_deck_revision('100', 2).get_card_entries(), repriced_card_entries)
+        self.assertEqual(self.deck_store.load_deck_revision('100', 2).deck_online_price, 5.25)
+
+        # Only online prices changed, so there's nothing to show in paper prices
+        self.assertEqual(self.deck_store.get_deck_changes('100', 1, 2, False), [])
+        self.assertEqual(self.deck_store.get_deck_changes('100', 1, 2, True), [(CARD_NAMES[3], 1, 1, 0.5, 0.75)])
+
+    def test_deck_changes(self):
+        self.save_deck(make_deck("Deck", [("Lightning Bolt", 4, 1.5, 0.25), ("Goblin Guide", 4, 2.0, 0.5), ("Lava Spike", 4, 0.5, 0.1),
+                                          ("Mountain", 18, 0.0, 0.0)]), datetime(2026, 1, 1))
+        self.save_deck(make_deck("Deck", [("Goblin Guide", 3, 2.5, 0.5), ("Lightning Bolt", 4, 1.5, 0.25), ("Monastery Swiftspear", 4, 1.0, 0.2),
+                                          ("Mountain", 18, 0.0, 0.0)]), datetime(2026, 1, 2))
+
+        # Cards are compared by name wherever they are in the deck, listed in the order of the newer revision and then
+        # the removed ones
+        self.assertEqual(self.deck_store.get_deck_changes('100', 1, 2, False), [
+            ("Goblin Guide", 4, 3, 2.0, 2.5), ("Monastery Swiftspear", 0, 4, None, 1.0), ("Lava Spike", 4, 0, 0.5, None)])
+        self.assertEqual(self.deck_store.get_deck_changes('100', 2, 1, False), [
+            ("Goblin Guide", 3, 4, 2.5, 2.0), ("Lava Spike", 0, 4, None, 0.5), ("Monastery Swiftspear", 4, 0, 1.0, None)])
+        self.assertEqual(self.deck_store.get_deck_changes('100', 1, 1, False), [])
+
+        # The same changes are reported by get_latest_deck_changes() for the deck store of the run
+        mtggoldfish.deck_store = self.deck_store
+        try:
+            self.assertEqual(mtggoldfish.get_latest_deck_changes(['100', '200'], True), [
+                ("Deck", datetime(2026, 1, 1), datetime(2026, 1, 2), [("Goblin Guide", 4, 3, 0.5, 0.5), ("Monastery Swiftspear", 0, 4, None, 0.2),
+                                                                      ("Lava Spike", 4, 0, 0.1, None)])])
+        finally:
+            mtggoldfish.deck_store = None
+
+    def test_decks_cached_before_revisions_start_their_history_with_the_cached_version(self):
+        old_deck = make_deck("Deck", [("Lightning Bolt", 4, 1.5, 0.25), ("Lava Spike", 4, 0.5, 0.1), ("Mountain", 16, 0.0, 0.0)])
+        self.save_deck(old_deck, datetime(2026, 1, 1))
+        self.execute_in_transaction("DELETE FROM deck_revisions")
+        self.execute_in_transaction("DELETE FROM deck_revision_entries")
+
+        new_deck = make_deck("Deck", [("Lightning Bolt", 4, 1.5, 0.25), ("Lava Spike", 4, 0.5, 0.1), ("Mountain", 15, 0.0, 0.0)])
+        self.save_deck(new_deck, datetime(2026, 1, 5))
+        self.assertEqual(self.deck_store.get_deck_revisions('100'), [(1, datetime(2026, 1, 1), True), (2, datetime(2026, 1, 5), False)])
+        self.assertEqual(describe_deck(self.deck_store.load_deck_revision('100', 1)), describe_deck(old_deck))
+        self.assertEqual(describe_deck(self.deck_store.load_deck_revision('100', 2)), describe_deck(new_deck))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Tests of the stored Metagame deck scores: the triggers counting up the deck score versions, update_scored_owned_cards()
+and save_metagame_deck_scores(), on a DeckStore in a temporary directory.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+from datetime import datetime
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, make_deck, make_owned_cards, make_unpriced_deck
+import mtggoldfish
+
+OWNED_CARDS = make_owned_cards([("Xenagos", 1), ("Yawgmoth", 2), ("Zirda", 3)])
+
+
+class DeckScoreInvalidationTest(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+        self.decks = {
+            'a': make_deck("Deck A", [("Xenagos", 4, 1.0, 0.1), ("Yawgmoth", 2, 2.0, 0.2)]),
+            'b': make_deck("Deck B", [("Xenagos", 4, 1.0, 0.1), ("Zirda", 2, 3.0, 0.3)]),
+            'c': make_deck("Deck C", [("Walking Ballista", 4, 4.0, 0.4)]),
+        }
+        self.save_decks(['a', 'b', 'c'], datetime(2026, 1, 1))
+        self.deck_store.update_scored_owned_cards(OWNED_CARDS)
+        self.assertEqual(self.save_scores(['a', 'b', 'c'], self.deck_store.saved_deck_score_versions), 3)
+
+    def save_decks(self, deck_ids, cached_date):
+        self.deck_store.save_decks([(deck_id, self.decks[deck_id], cached_date) for deck_id in deck_ids])
+
+    def save_scores(self, deck_ids, deck_score_versions, owned_cards=OWNED_CARDS):
+        deck_scores = [(deck_id, self.decks[deck_id].deck_name, {mtggoldfish.SAVED_VALUE_KEY: 1.0}) for deck_id in deck_ids]
+        return self.deck_store.save_metagame_deck_scores(deck_scores, False, deck_score_versions, owned_cards)
+
+    def get_scored_deck_ids(self):
+        return sorted(self.deck_store.load_metagame_deck_scores(['a', 'b', 'c', 'd'], False)[1])
+
+    def get_deck_score_versions(self):
+        return self.deck_store.load_metagame_deck_scores(['a', 'b', 'c', 'd'], False)[0]
+
+    """
+    Check that exactly the given decks out of Decks A, B and C have a higher deck score version than they used to. A
+    single save can count the version of a deck up more than once, once for each trigger it sets off
+    """
+    def assert_bumped_versions(self, old_deck_score_versions, bumped_deck_ids):
+        deck_score_versions = self.get_deck_score_versions()
+        for deck_id in ['a', 'b', 'c']:
+            if deck_id in bumped_deck_ids:
+                self.assertGreater(deck_score_versions[deck_id], old_deck_score_versions[deck_id], deck_id)
+            else:
+                self.assertEqual(deck_score_versions[deck_id], old_deck_score_versions[deck_id], deck_id)
+
+    def test_scores_are_loaded_back(self):
+        (deck_score_versions, deck_scores) = self.deck_store.load_metagame_deck_scores(['a', 'd'], False)
+        self.assertEqual(deck_scores, {'a': ("Deck A", {mtggoldfish.SAVED_VALUE_KEY: 1.0})})
+        self.assertEqual(deck_score_versions['d'], 0)
+
+        # Scores are kept separately for each price type
+        self.assertEqual(self.deck_store.load_metagame_deck_scores(['a'], True)[1], {})
+
+    def test_changed_owned_card_drops_only_the_scores_of_decks_containing_it(self):
+        self.assertEqual(self.deck_store.update_scored_owned_cards(OWNED_CARDS), (0, 0))
+        changed_owned_cards = make_owned_cards([("Xenagos", 1), ("Yawgmoth", 2), ("Zirda", 4)])
+        self.assertEqual(self.deck_store.update_scored_owned_cards(changed_owned_cards), (1, 1))
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'c'])
+
+        # Cards are matched by their normalized names, and adding a card that no deck contains drops nothing
+        added_owned_cards = changed_owned_cards + make_owned_cards([("Urza", 1), ("walking ballista", 1)])
+        self.assertEqual(self.deck_store.update_scored_owned_cards(added_owned_cards), (2, 1))
+        self.assertEqual(self.get_scored_deck_ids(), ['a'])
+
+    def test_removed_owned_card_drops_the_scores_of_decks_containing_it(self):
+        self.assertEqual(self.deck_store.update_scored_owned_cards(OWNED_CARDS[:2]), (1, 1))
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'c'])
+
+    def test_reordered_owned_cards_drop_every_score(self):
+        reordered_owned_cards = [OWNED_CARDS[1], OWNED_CARDS[0], OWNED_CARDS[2]]
+        self.assertEqual(self.deck_store.update_scored_owned_cards(reordered_owned_cards), (0, 3))
+        self.assertEqual(self.get_scored_deck_ids(), [])
+
+    def test_scores_of_other_owned_cards_are_not_saved(self):
+        self.deck_store.update_scored_owned_cards(OWNED_CARDS[:2])
+        self.assertEqual(self.save_scores(['b'], self.get_deck_score_versions(), OWNED_CARDS), 0)
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'c'])
+
+    def test_saving_an_unchanged_deck_keeps_its_score(self):
+        deck_score_versions = self.get_deck_score_versions()
+        self.save_decks(['a', 'b', 'c'], datetime(2026, 1, 2))
+        self.assert_bumped_versions(deck_score_versions, [])
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'b', 'c'])
+
+    def test_editing_a_deck_bumps_its_version(self):
+        deck_score_versions = self.get_deck_score_versions()
+        self.decks['a'] = make_deck("Deck A", [("Xenagos", 3, 1.0, 0.1), ("Yawgmoth", 2, 2.0, 0.2)])
+        self.decks['b'] = make_deck("Deck B (Renamed)", [("Xenagos", 4, 1.0, 0.1), ("Zirda", 2, 3.0, 0.3)])
+        self.save_decks(['a', 'b'], datetime(2026, 1, 1))
+        self.assert_bumped_versions(deck_score_versions, ['a', 'b'])
+        self.assertEqual(self.get_scored_deck_ids(), ['c'])
+
+        # The scores of both decks were computed before they changed, so they aren't saved
+        self.assertEqual(self.save_scores(['a', 'b', 'c'], deck_score_versions), 1)
+        self.assertEqual(self.get_scored_deck_ids(), ['c'])
+        self.assertEqual(self.save_scores(['a', 'b'], self.deck_store.saved_deck_score_versions), 2)
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'b', 'c'])
+
+    def test_shrinking_a_deck_bumps_its_version(self):
+        deck_score_versions = self.get_deck_score_versions()
+        # Only the last card is removed, keeping the total prices, so that the deck's header doesn't change
+        shrunk_deck = make_deck("Deck A", [("Xenagos", 4, 1.0, 0.1)])
+        (shrunk_deck.deck_paper_price, shrunk_deck.deck_online_price) = (self.decks['a'].deck_paper_price, self.decks['a'].deck_online_price)
+        self.decks['a'] = shrunk_deck
+        self.save_decks(['a'], datetime(2026, 1, 1))
+        self.assert_bumped_versions(deck_score_versions, ['a'])
+        self.assertEqual(self.get_scored_deck_ids(), ['b', 'c'])
+
+    def test_deleting_a_deck_bumps_its_version(self):
+        deck_score_versions = self.get_deck_score_versions()
+        self.execute_in_transaction("DELETE FROM decks WHERE deck_id = 'a'")
+        self.assert_bumped_versions(deck_score_versions, ['a'])
+        self.assertEqual(self.get_scored_deck_ids(), ['b', 'c'])
+
+        # Saving it again counts up from there, so that a score computed before it was deleted can't be saved
+        deleted_deck_score_versions = self.get_deck_score_versions()
+        self.save_decks(['a'], datetime(2026, 1, 2))
+        self.assert_bumped_versions(deleted_deck_score_versions, ['a'])
+        self.assertEqual(self.save_scores(['a'], deck_score_versions), 0)
+        self.assertEqual(self.save_scores(['a'], deleted_deck_score_versions), 0)
+
+    def test_repricing_a_card_bumps_the_versions_of_the_decks_containing_it(self):
+        deck_score_versions = self.get_deck_score_versions()
+        self.decks['d'] = make_deck("Deck D", [("Xenagos", 1, 5.0, 0.5)])
+        self.save_decks(['d'], datetime(2026, 1, 3))
+        self.assert_bumped_versions(deck_score_versions, ['a', 'b'])
+        self.assertEqual(self.get_scored_deck_ids(), ['c'])
+        self.assertEqual(self.save_scores(['a', 'b', 'c'], deck_score_versions), 1)
+
+        # Seeing the same price again on a later day doesn't change the prices the decks are loaded with
+        deck_score_versions = self.get_deck_score_versions()
+        self.save_decks(['d'], datetime(2026, 1, 4))
+        self.assert_bumped_versions(deck_score_versions, [])
+
+    def test_repricing_a_card_on_an_earlier_day_keeps_the_scores(self):
+        # Deck D is priced on a day before the other decks were cached, so they keep their own prices
+        deck_score_versions = self.get_deck_score_versions()
+        self.decks['d'] = make_deck("Deck D", [("Xenagos", 1, 5.0, 0.5)])
+        self.save_decks(['d'], datetime(2025, 12, 31))
+        self.assert_bumped_versions(deck_score_versions, [])
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'b', 'c'])
+
+    def test_first_price_of_a_card_bumps_the_versions_of_the_decks_containing_it(self):
+        # Unpriced decks don't record card prices, so the first deck priced afterwards adds them to card_prices
+        self.decks['d'] = make_unpriced_deck("Deck D", [("Urza", 1, 0.0, 0.0), ("Walking Ballista", 1, 0.0, 0.0)])
+        self.save_decks(['d'], datetime(2026, 1, 1))
+        self.assertEqual(self.save_scores(['d'], self.deck_store.saved_deck_score_versions), 1)
+        deck_score_versions = self.get_deck_score_versions()
+
+        self.decks['e'] = make_deck("Deck E", [("Urza", 2, 7.0, 0.7)])
+        self.save_decks(['e'], datetime(2026, 1, 2))
+        self.assertEqual(self.query("SELECT COUNT(*) FROM card_prices WHERE card_id = (SELECT card_id FROM cards WHERE card_name = 'Urza')"),
+                         [(1,)])
+        self.assertGreater(self.get_deck_score_versions()['d'], deck_score_versions['d'])
+        self.assert_bumped_versions(deck_score_versions, [])
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'b', 'c'])
+
+    def test_moving_the_cached_date_of_a_deck_across_a_newer_price(self):
+        # Xenagos is seen at 5.0 on January 3rd, so a deck cached before then is loaded with that price instead of its own
+        self.decks['d'] = make_deck("Deck D", [("Xenagos", 1, 5.0, 0.5)])
+        self.save_decks(['d'], datetime(2026, 1, 3))
+        self.assertEqual(self.save_scores(['a', 'b'], self.get_deck_score_versions()), 2)
+
+        for (cached_date, is_invalidated) in [('2026-01-02', False), ('2026-01-03', True), ('2026-01-04', False),
+                                              ('2026-01-01', True), ('2026-01-05', True)]:
+            deck_score_versions = self.get_deck_score_versions()
+            self.execute_in_transaction("UPDATE decks SET cached_date = ? WHERE deck_id = 'a'", (cached_date,))
+            self.assert_bumped_versions(deck_score_versions, ['a'] if is_invalidated else [])
+            self.assertEqual('a' in self.get_scored_deck_ids(), not is_invalidated)
+            self.save_scores(['a'], self.get_deck_score_versions())
+
+    def test_moving_the_cached_date_across_an_unchanged_price_keeps_the_score(self):
+        # Deck C is the only deck with Walking Ballista, whose latest price is the one the deck was cached with
+        deck_score_versions = self.get_deck_score_versions()
+        self.execute_in_transaction("UPDATE card_prices SET price_date = '2026-01-03'"
+                                    " WHERE card_id = (SELECT card_id FROM cards WHERE card_name = 'Walking Ballista')")
+        self.execute_in_transaction("UPDATE decks SET cached_date = '2026-01-05' WHERE deck_id = 'c'")
+        self.assert_bumped_versions(deck_score_versions, [])
+        self.assertEqual(self.get_scored_deck_ids(), ['a', 'b', 'c'])
+
+    def test_scores_of_decks_saved_during_the_evaluation_are_not_saved(self):
+        deck_score_versions = self.get_deck_score_versions()
+        self.execute_in_transaction("DELETE FROM metagame_deck_scores")
+
+        # Deck A is fetched again by another run while this run evaluates the cached copies. Deck B is loaded with the new
+        # price of Xenagos from then on as well
+        self.decks['a'] = make_deck("Deck A", [("Xenagos", 4, 1.5, 0.1), ("Yawgmoth", 2, 2.0, 0.2)])
+        self.save_decks(['a'], datetime(2026, 1, 2))
+        self.assertEqual(self.save_scores(['a', 'b', 'c'], deck_score_versions), 1)
+        self.assertEqual(self.get_scored_deck_ids(), ['c'])
+
+
+if __name__ == "__main__":
+    unittest.main()
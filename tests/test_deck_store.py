@@ -0,0 +1,144 @@
+"""
+Tests of the SQLite deck cache: saving and loading decks through a DeckStore in a temporary directory, and importing the
+decks pickled into the deck_cache directory by the versions of this script that cached one file per deck.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import contextlib
+import copyreg
+from datetime import datetime
+import io
+import os
+import pickle
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import DeckStoreTestCase, describe_deck, make_deck
+import mtggoldfish
+
+
+"""
+A deck as pickled by the versions of this script that cached one file per deck, whose Deck objects only had the
+attributes below, with a single price for every card
+"""
+class PickledDeck(object):
+    def __init__(self, deck_name, deck_url, deck_date, deck_price, deck_list):
+        self.deck_name = deck_name
+        self.deck_url = deck_url
+        self.deck_date = deck_date
+        self.deck_price = deck_price
+        self.deck_list = deck_list
+
+    # Unpickled as a Deck, which is handed the same attribute dict those versions pickled
+    def __reduce_ex__(self, protocol):
+        return (copyreg._reconstructor, (mtggoldfish.Deck, object, None), dict(self.__dict__))
+
+
+"""
+Write a deck into the given deck_cache directory the way those versions did, named <deck_id>_MM_DD_YYYY
+"""
+def write_pickled_deck(cache_dir, deck_id, cached_date, pickled_deck):
+    with open(os.path.join(cache_dir, "%s_%s" % (deck_id, cached_date.strftime('%m_%d_%Y'))), 'wb') as output:
+        pickle.dump(pickled_deck, output, 2)
+
+
+def make_pickled_deck(deck_name, card_entries):
+    return PickledDeck(deck_name, 'https://www.mtggoldfish.com/deck/%s' % (deck_name), datetime(2017, 10, 1),
+                       sum([card_quantity * card_price for (card_name, card_quantity, card_price) in card_entries]),
+                       [{mtggoldfish.CARD_QTY_KEY: card_quantity, mtggoldfish.CARD_NAME_KEY: card_name, mtggoldfish.CARD_PRICE_KEY: card_price}
+                        for (card_name, card_quantity, card_price) in card_entries])
+
+
+class DeckStoreRoundTripTest(DeckStoreTestCase):
+    def test_saved_decks_are_loaded_back_the_same(self):
+        decks = {
+            '100': make_deck("Burn", [("Lightning Bolt", 4, 1.5, 0.25), ("Goblin Guide", 4, 2.25, 0.5), ("Mountain", 12, 0.0, 0.0)]),
+            '200': make_deck("Æther Vial Tron", [("Æther Vial", 4, 3.0, 1.0), ("Lightning Bolt", 2, 1.5, 0.25), ("Lightning Bolt", 1, 1.5, 0.25)],
+                             deck_date=datetime(2025, 12, 24)),
+            '300': make_deck("Paper Only", [("Tarmogoyf", 3, 20.0, 0.0)], has_online_prices=False),
+            '400': make_deck("No Cards", []),
+        }
+        self.deck_store.save_decks([(deck_id, deck, datetime(2026, 1, 2)) for (deck_id, deck) in decks.items()])
+
+        loaded_decks = self.deck_store.load_decks(list(decks) + ['500'])
+        self.assertEqual(sorted(loaded_decks), sorted(decks))
+        for (deck_id, deck) in decks.items():
+            self.assertEqual(describe_deck(loaded_decks[deck_id]), describe_deck(deck))
+        self.assertEqual(self.deck_store.get_cached_dates(['200', '500']), {'200': datetime(2026, 1, 2)})
+        self.assertEqual(self.deck_store.get_cached_deck_ids(), ['100', '200', '300', '400'])
+
+        # Reopening the store finds the same decks
+        self.deck_store.close()
+        self.deck_store = mtggoldfish.DeckStore(self.db_file_path)
+        self.assertEqual(describe_deck(self.deck_store.load_decks(['200'])['200']), describe_deck(decks['200']))
+
+    def test_saving_a_deck_again_replaces_it(self):
+        self.deck_store.save_decks([('100', make_deck("Burn", [("Lightning Bolt", 4, 1.5, 0.25), ("Mountain", 16, 0.0, 0.0)]), datetime(2026, 1, 1))])
+        deck = make_deck("Burn", [("Lightning Bolt", 4, 1.5, 0.25), ("Lava Spike", 4, 0.5, 0.1)])
+        self.deck_store.save_decks([('100', deck, datetime(2026, 1, 3))])
+        self.assertEqual(describe_deck(self.deck_store.load_decks(['100'])['100']), describe_deck(deck))
+        self.assertEqual(self.deck_store.get_cached_dates(['100']), {'100': datetime(2026, 1, 3)})
+
+
+class PickledDeckImportTest(DeckStoreTestCase):
+    def setUp(self):
+        DeckStoreTestCase.setUp(self)
+        self.cache_dir = os.path.join(self.temporary_dir, 'deck_cache')
+        os.mkdir(self.cache_dir)
+        write_pickled_deck(self.cache_dir, '100', datetime(2017, 10, 5), make_pickled_deck("Burn", [("Lightning Bolt", 4, 1.5), ("Mountain", 16, 0.0)]))
+        write_pickled_deck(self.cache_dir, '200', datetime(2017, 9, 30), make_pickled_deck("Old Tron", [("Karn Liberated", 4, 30.0)]))
+        write_pickled_deck(self.cache_dir, '200', datetime(2017, 10, 2), make_pickled_deck("Tron", [("Karn Liberated", 3, 31.0)]))
+        with open(os.path.join(self.cache_dir, '300_10_05_2017'), 'wb') as output:
+            output.write(b'not a pickle')
+
+    def check_imported_decks(self, deck_store):
+        self.assertEqual(deck_store.get_cached_dates(['100', '200', '300']), {'100': datetime(2017, 10, 5), '200': datetime(2017, 10, 2)})
+        loaded_decks = deck_store.load_decks(['100', '200'])
+        self.assertEqual(loaded_decks['100'].deck_name, "Burn")
+        self.assertEqual(loaded_decks['100'].deck_url, 'https://www.mtggoldfish.com/deck/Burn')
+        self.assertEqual(loaded_decks['100'].deck_date, datetime(2017, 10, 1))
+        self.assertEqual([(card_name, card_quantity) for (card_name, card_quantity, paper_price, online_price) in loaded_decks['100'].get_card_entries()],
+                         [("Lightning Bolt", 4), ("Mountain", 16)])
+
+        # The most recently cached copy of a deck is kept. Its single price could be either price type, so it has neither
+        # and is fetched again when its prices are needed
+        self.assertEqual(loaded_decks['200'].deck_name, "Tron")
+        self.assertFalse(loaded_decks['200'].has_price_type(False))
+        self.assertFalse(loaded_decks['200'].has_price_type(True))
+
+    def test_pickled_decks_are_imported(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(self.deck_store.import_pickled_decks(self.cache_dir), 2)
+        self.assertIn("Couldn't import the cached deck file \"300_10_05_2017\"", output.getvalue())
+        self.check_imported_decks(self.deck_store)
+
+    def test_deck_cache_directory_is_imported_once(self):
+        self.deck_store.close()
+        os.remove(self.db_file_path)
+        with open(os.path.join(self.temporary_dir, 'deck_cache_index'), 'wb') as output:
+            pickle.dump({'100': datetime(2017, 10, 5)}, output)
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.deck_store = mtggoldfish.open_deck_store(self.temporary_dir)
+        self.assertIn("Imported 2 cached decks from the deck_cache directory into deck_cache.db.", output.getvalue())
+        self.check_imported_decks(self.deck_store)
+        self.assertEqual(sorted([file_name for file_name in os.listdir(self.temporary_dir) if not file_name.startswith('deck_cache.db')]),
+                         ['deck_cache_imported'])
+        self.assertEqual(len(os.listdir(os.path.join(self.temporary_dir, 'deck_cache_imported'))), 4)
+
+        # The next run finds the decks in deck_cache.db and leaves the renamed directory alone
+        self.deck_store.close()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.deck_store = mtggoldfish.open_deck_store(self.temporary_dir)
+        self.assertEqual(output.getvalue(), "")
+        self.check_imported_decks(self.deck_store)
+
+
+if __name__ == "__main__":
+    unittest.main()
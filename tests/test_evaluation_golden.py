@@ -0,0 +1,261 @@
+"""
+Golden tests of the Owned Cards, Metagame and Budget deck evaluations. Every report (and every per deck report entry)
+is checked against the original evaluations in baseline_evaluation.py, on randomly generated decks and Owned Cards,
+down to the order of the keys of every dict, the type of every value and the last bit of every float. This covers the
+one deck at a time evaluations, the VectorizedDeckScorer, both evaluation backends, and evaluating in this process or
+in a pool of worker processes.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import contextlib
+import io
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import baseline_evaluation
+import mtggoldfish
+
+# Card names differing only in case are the same card, and some of the decks list the same card more than once
+CARD_NAMES = ["Card %d" % (card_number) for card_number in range(60)] + ["card 3", "CARD 7"]
+
+NUM_SCENARIOS = 150
+
+# Starting a pool of worker processes takes a while, so fewer scenarios are evaluated with one
+NUM_POOL_SCENARIOS = 4
+NUM_POOL_PROCESSES = 3
+
+
+"""
+Return a Deck with a random selection of cards. A few of its cards are free, which the evaluations mustn't count
+
+:param random_generator: The random.Random to choose the cards with
+:param deck_names: The deck names to choose from, so that some of the decks share their name
+"""
+def generate_deck(random_generator, deck_names):
+    deck = mtggoldfish.Deck()
+    deck.deck_name = random_generator.choice(deck_names).encode('ascii')
+    card_entries = []
+    for card_name in random_generator.sample(CARD_NAMES, random_generator.randint(0, 25)):
+        paper_price = round(random_generator.uniform(0, 30), 2) if random_generator.random() < 0.9 else 0.0
+        card_entries.append((card_name, random_generator.randint(1, 4), paper_price, paper_price / 10))
+    if len(card_entries) > 0 and random_generator.random() < 0.2:
+        card_entries.append(random_generator.choice(card_entries))
+    deck.set_card_entries(card_entries)
+    deck.recompute_deck_prices()
+    deck.use_price_type(random_generator.random() < 0.3)
+    return deck
+
+
+"""
+Return a random list of Owned Cards, sometimes listing a card more than once (in any case)
+
+:param random_generator: The random.Random to choose the cards with
+"""
+def generate_owned_cards(random_generator):
+    card_names = random_generator.sample(CARD_NAMES, random_generator.randint(0, 40))
+    if len(card_names) > 0 and random_generator.random() < 0.5:
+        card_names += [random_generator.choice(card_names).upper() if random_generator.random() < 0.5 else random_generator.choice(card_names)
+                       for repeat in range(random_generator.randint(1, 5))]
+        random_generator.shuffle(card_names)
+    return [{mtggoldfish.CARD_QTY_KEY: random_generator.randint(1, 4), mtggoldfish.CARD_NAME_KEY: card_name} for card_name in card_names]
+
+
+"""
+Return a (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) tuple of randomly generated decks
+
+:param seed: The seed of the random generator, so that every scenario can be generated again
+"""
+def generate_scenario(seed):
+    random_generator = random.Random(seed)
+    deck_names = ["Deck %d" % (deck_number) for deck_number in range(random_generator.randint(3, 30))]
+    desired_decks = [generate_deck(random_generator, deck_names) for deck_number in range(random_generator.randint(0, 5))]
+    metagame_decks = [generate_deck(random_generator, deck_names) for deck_number in range(random_generator.randint(0, 40))]
+    budget_decks = [generate_deck(random_generator, deck_names) for deck_number in range(random_generator.randint(0, 40))]
+    return (random_generator, desired_decks, metagame_decks, budget_decks, generate_owned_cards(random_generator))
+
+
+"""
+Return the given report with every dict turned into the list of its items and every value tagged with its type, so that
+comparing two reports also compares the order of their keys and the types of their values
+"""
+def ordered(report):
+    if isinstance(report, dict):
+        return ('dict', [(key, ordered(value)) for (key, value) in report.items()])
+    if isinstance(report, (list, tuple)):
+        return (type(report).__name__, [ordered(value) for value in report])
+    return (type(report).__name__, report)
+
+
+"""
+Run the given function without letting its progress bars through
+"""
+def run_quietly(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+class EvaluationGoldenTest(unittest.TestCase):
+    def assertSameReport(self, report, baseline_report, seed):
+        self.assertEqual(ordered(report), ordered(baseline_report), "Scenario %d" % (seed))
+
+    def test_owned_card_index(self):
+        for seed in range(NUM_SCENARIOS):
+            (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+            owned_card_index = mtggoldfish.OwnedCardIndex(owned_cards)
+
+            # The first owned card with the same name, as the original Owned Cards evaluation picks it
+            for card_name in CARD_NAMES + [card_name.upper() for card_name in CARD_NAMES]:
+                first_owned_card = None
+                for owned_card_entry in owned_cards:
+                    if owned_card_entry[mtggoldfish.CARD_NAME_KEY].lower() == card_name.lower():
+                        first_owned_card = owned_card_entry
+                        break
+                self.assertIs(owned_card_index.find_owned_card(card_name), first_owned_card)
+
+            # Every owned card with the first card of the deck with the same name, as the original Metagame evaluation pairs them
+            for metagame_deck in metagame_decks:
+                owned_card_matches = []
+                for owned_card_entry in owned_cards:
+                    for meta_card_entry in metagame_deck.get_deck_list():
+                        if meta_card_entry[mtggoldfish.CARD_NAME_KEY].lower() == owned_card_entry[mtggoldfish.CARD_NAME_KEY].lower():
+                            owned_card_matches.append((owned_card_entry, meta_card_entry))
+                            break
+                self.assertEqual(ordered(owned_card_index.match_owned_cards(metagame_deck.get_deck_list())), ordered(owned_card_matches))
+
+    def test_owned_cards_evaluation_of_each_deck(self):
+        for seed in range(NUM_SCENARIOS):
+            (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+            owned_card_index = mtggoldfish.OwnedCardIndex(owned_cards)
+            for deck in desired_decks + metagame_decks:
+                baseline_report = baseline_evaluation.evaluate_owned_cards([deck], owned_cards)
+                self.assertSameReport(mtggoldfish.evaluate_owned_cards_for_deck(deck, owned_card_index), baseline_report[deck.get_deck_name()], seed)
+
+    def test_metagame_evaluation_of_each_deck(self):
+        for seed in range(NUM_SCENARIOS):
+            (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+            owned_card_index = mtggoldfish.OwnedCardIndex(owned_cards)
+            for deck in metagame_decks:
+                baseline_ranking = baseline_evaluation.evaluate_metagame_decks([deck], owned_cards)
+                report_entry = mtggoldfish.evaluate_metagame_deck(deck, owned_card_index)
+                if report_entry is None:
+                    self.assertEqual(baseline_ranking, [])
+                else:
+                    self.assertSameReport([(deck.get_deck_name(), report_entry)], baseline_ranking, seed)
+
+    def test_budget_evaluation_of_each_deck(self):
+        for seed in range(NUM_SCENARIOS):
+            (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+            owned_card_index = mtggoldfish.OwnedCardIndex(owned_cards)
+            desired_card_index = mtggoldfish.DesiredCardIndex(desired_decks)
+            for budget_deck in budget_decks:
+                report_entries = mtggoldfish.evaluate_budget_deck_against_desired_decks(owned_card_index, desired_card_index, budget_deck)
+                self.assertEqual(len(report_entries), len(desired_decks))
+                for (desired_deck, report_entry) in zip(desired_decks, report_entries):
+                    baseline_ranking = baseline_evaluation.evaluate_budget_decks(owned_cards, [desired_deck], [budget_deck])[desired_deck.get_deck_name()]
+                    if report_entry is None:
+                        self.assertEqual(baseline_ranking, [])
+                    else:
+                        self.assertSameReport([(budget_deck.get_deck_name(), report_entry)], baseline_ranking, seed)
+
+    @unittest.skipIf(mtggoldfish.numpy is None, "NumPy isn't installed")
+    def test_vectorized_deck_scorer(self):
+        for seed in range(NUM_SCENARIOS):
+            (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+            vectorized_scorer = mtggoldfish.VectorizedDeckScorer(mtggoldfish.OwnedCardIndex(owned_cards), batch_size=random_generator.randint(1, 7))
+            decks = desired_decks + metagame_decks
+
+            baseline_report_entries = [baseline_evaluation.evaluate_owned_cards([deck], owned_cards)[deck.get_deck_name()] for deck in decks]
+            self.assertSameReport(vectorized_scorer.score_owned_cards(decks), baseline_report_entries, seed)
+
+            baseline_rankings = [baseline_evaluation.evaluate_metagame_decks([deck], owned_cards) for deck in decks]
+            self.assertSameReport([[(deck.get_deck_name(), report_entry)] if report_entry is not None else []
+                                   for (deck, report_entry) in zip(decks, vectorized_scorer.score_metagame_decks(decks))], baseline_rankings, seed)
+
+    def test_streaming_evaluations_in_any_order(self):
+        for seed in range(NUM_SCENARIOS):
+            (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+            owned_card_index = mtggoldfish.OwnedCardIndex(owned_cards)
+
+            metagame_evaluator = mtggoldfish.StreamingMetagameEvaluator(owned_card_index)
+            indexed_decks = list(enumerate(metagame_decks))
+            random_generator.shuffle(indexed_decks)
+            for (deck_index, deck) in indexed_decks:
+                metagame_evaluator.add_deck(deck_index, deck)
+            metagame_evaluator.finish()
+            self.assertSameReport(metagame_evaluator.get_ranking(), baseline_evaluation.evaluate_metagame_decks(metagame_decks, owned_cards), seed)
+
+            budget_evaluator = mtggoldfish.StreamingBudgetEvaluator(owned_card_index, desired_decks)
+            indexed_decks = list(enumerate(budget_decks))
+            random_generator.shuffle(indexed_decks)
+            for (deck_index, deck) in indexed_decks:
+                budget_evaluator.add_deck(deck_index, deck)
+            budget_evaluator.finish()
+            self.assertSameReport(budget_evaluator.get_report(), baseline_evaluation.evaluate_budget_decks(owned_cards, desired_decks, budget_decks), seed)
+
+    def check_reports(self, evaluation_backend, num_processes, num_scenarios):
+        for seed in range(num_scenarios):
+            (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+            self.assertSameReport(
+                run_quietly(mtggoldfish.evaluate_owned_cards, desired_decks, owned_cards, evaluation_backend, num_processes),
+                baseline_evaluation.evaluate_owned_cards(desired_decks, owned_cards), seed)
+            self.assertSameReport(
+                run_quietly(mtggoldfish.evaluate_metagame_decks, metagame_decks, owned_cards, evaluation_backend, num_processes),
+                baseline_evaluation.evaluate_metagame_decks(metagame_decks, owned_cards), seed)
+
+            # The Budget decks are always evaluated one at a time, whatever the evaluation backend
+            if evaluation_backend == mtggoldfish.EVALUATION_BACKEND_PYTHON:
+                self.assertSameReport(
+                    run_quietly(mtggoldfish.evaluate_budget_decks, owned_cards, desired_decks, budget_decks, num_processes),
+                    baseline_evaluation.evaluate_budget_decks(owned_cards, desired_decks, budget_decks), seed)
+
+    def test_python_backend_reports(self):
+        self.check_reports(mtggoldfish.EVALUATION_BACKEND_PYTHON, 1, NUM_SCENARIOS)
+
+    @unittest.skipIf(mtggoldfish.numpy is None, "NumPy isn't installed")
+    def test_numpy_backend_reports(self):
+        self.check_reports(mtggoldfish.EVALUATION_BACKEND_NUMPY, 1, NUM_SCENARIOS)
+
+    def test_python_backend_reports_in_worker_processes(self):
+        self.check_reports(mtggoldfish.EVALUATION_BACKEND_PYTHON, NUM_POOL_PROCESSES, NUM_POOL_SCENARIOS)
+
+    @unittest.skipIf(mtggoldfish.numpy is None, "NumPy isn't installed")
+    def test_numpy_backend_reports_in_worker_processes(self):
+        self.check_reports(mtggoldfish.EVALUATION_BACKEND_NUMPY, NUM_POOL_PROCESSES, NUM_POOL_SCENARIOS)
+
+    def test_streaming_evaluations_in_worker_processes(self):
+        for evaluation_backend in [mtggoldfish.EVALUATION_BACKEND_PYTHON, mtggoldfish.EVALUATION_BACKEND_NUMPY]:
+            if evaluation_backend == mtggoldfish.EVALUATION_BACKEND_NUMPY and mtggoldfish.numpy is None:
+                continue
+            for seed in range(NUM_POOL_SCENARIOS):
+                (random_generator, desired_decks, metagame_decks, budget_decks, owned_cards) = generate_scenario(seed)
+                owned_card_index = mtggoldfish.OwnedCardIndex(owned_cards)
+                evaluation_pool = mtggoldfish.DeckEvaluationPool(NUM_POOL_PROCESSES, owned_card_index, mtggoldfish.DesiredCardIndex(desired_decks),
+                                                                 evaluation_backend, batch_size=random_generator.randint(1, 9))
+                try:
+                    metagame_evaluator = mtggoldfish.StreamingMetagameEvaluator(owned_card_index, keep_deck_scores=True, evaluation_pool=evaluation_pool)
+                    budget_evaluator = mtggoldfish.StreamingBudgetEvaluator(owned_card_index, desired_decks, evaluation_pool=evaluation_pool)
+                    indexed_decks = [(mtggoldfish.METAGAME_DECKS_CATEGORY, deck_index, deck) for (deck_index, deck) in enumerate(metagame_decks)]
+                    indexed_decks += [(mtggoldfish.BUDGET_DECKS_CATEGORY, deck_index, deck) for (deck_index, deck) in enumerate(budget_decks)]
+                    random_generator.shuffle(indexed_decks)
+                    for (category, deck_index, deck) in indexed_decks:
+                        if category == mtggoldfish.METAGAME_DECKS_CATEGORY:
+                            metagame_evaluator.add_deck(deck_index, deck)
+                        else:
+                            budget_evaluator.add_deck(deck_index, deck)
+                    metagame_evaluator.finish()
+                    budget_evaluator.finish()
+                finally:
+                    evaluation_pool.close()
+
+                self.assertSameReport(metagame_evaluator.get_ranking(), baseline_evaluation.evaluate_metagame_decks(metagame_decks, owned_cards), seed)
+                self.assertSameReport(budget_evaluator.get_report(), baseline_evaluation.evaluate_budget_decks(owned_cards, desired_decks, budget_decks), seed)
+                self.assertEqual(len(metagame_evaluator.get_new_deck_scores()), len(metagame_decks))
+
+
+if __name__ == "__main__":
+    unittest.main()
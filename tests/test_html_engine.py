@@ -0,0 +1,286 @@
+"""
+Tests of the browser-free HTML engine: parsing saved deck and landing pages into the same results that the Selenium
+engine reads out of a browser, and falling back to the browser for any page it can't parse.
+
+The pages below are cut down versions of the MTGGoldfish.com pages, keeping the quirks the parser has to deal with, such
+as unclosed cells and rows, void elements, stray end tags and character references. The extracted pages they are
+compared against are the textContent that DECK_PAGE_EXTRACTION_SCRIPT returns for the same pages in a browser.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+from datetime import datetime
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from deck_store_helpers import describe_deck
+import mtggoldfish
+
+
+# A Budget deck page, with separate paper and online price tabs
+BUDGET_DECK_PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Mono Red Burn by SomePlayer</title>
+<link rel="stylesheet" href="/assets/application.css">
+</head>
+<body>
+<div class="layout-container">
+<h1 class="title">
+Mono Red Burn
+<span class="author">by SomePlayer</span>
+</h1>
+<p class="deck-container-information">Format: Modern<br>
+Event: Modern League<br/>
+Deck Date: Jan 9, 2026
+</p>
+<div class="tab-content">
+<div class="tab-pane active" id="tab-paper">
+<div class="deck-table-container">
+<table class="deck-view-deck-table">
+<thead><tr><th>Qty</th><th>Card</th><th>Mana</th><th>Price</th></tr></thead>
+<tbody>
+<tr><td colspan="4" class="deck-header">Creatures (8)</td></tr>
+<tr><td>4<td><a href="/price/Zendikar/Goblin+Guide">Goblin Guide</a><td><img src="r.svg" alt="R"><td>$&nbsp;10.00
+<tr><td>4</td><td><a href="/price/Khans/Monastery+Swiftspear">Monastery Swiftspear</a></td><td></td><td>1,200.50</td></tr>
+<tr><td colspan="4" class="deck-header">Lands (12)</td></tr>
+<tr><td>12</td><td><a href="/price/Basic/Mountain">Mountain</a></span></td><td></td><td>1.20</td></tr>
+<tr><td colspan="4" class="deck-header">Sideboard (2)</td></tr>
+<tr><td>2</td><td><a href="/price/Zendikar/Goblin+Guide">Goblin Guide</a></td><td></td><td>$&nbsp;5.00</td></tr>
+</tbody>
+</table>
+</div>
+</div>
+<div class="tab-pane" id="tab-online">
+<div class="deck-table-container">
+<table class="deck-view-deck-table">
+<tbody>
+<tr><td>4</td><td>Goblin Guide</td><td></td><td>2.00</td></tr>
+<tr><td>4</td><td>Monastery Swiftspear</td><td></td><td>0.40</td></tr>
+<tr><td>1</td><td>Fireblast &amp; Friends</td><td></td><td>0.10</td></tr>
+</tbody>
+</table>
+</div>
+</div>
+</div>
+</div>
+</body>
+</html>
+"""
+
+BUDGET_DECK_EXTRACTED_PAGE = {
+    mtggoldfish.PAGE_DECK_NAME_KEY: "\nMono Red Burn\nby SomePlayer\n",
+    mtggoldfish.PAGE_DECK_DATE_KEY: "Format: Modern\nEvent: Modern League\nDeck Date: Jan 9, 2026\n",
+    mtggoldfish.PAGE_PAPER_ROWS_KEY: [
+        ["Creatures (8)"],
+        ["4", "Goblin Guide", "", "$\xa010.00\n"],
+        ["4", "Monastery Swiftspear", "", "1,200.50"],
+        ["Lands (12)"],
+        ["12", "Mountain", "", "1.20"],
+        ["Sideboard (2)"],
+        ["2", "Goblin Guide", "", "$\xa05.00"],
+    ],
+    mtggoldfish.PAGE_ONLINE_ROWS_KEY: [
+        ["4", "Goblin Guide", "", "2.00"],
+        ["4", "Monastery Swiftspear", "", "0.40"],
+        ["1", "Fireblast & Friends", "", "0.10"],
+    ],
+}
+
+# A Metagame deck page, without price tabs
+METAGAME_DECK_PAGE_HTML = """<html><body>
+<h1 class="title">Izzet Murktide<a class="suggest">Suggest a Better Name</a></h1>
+<div class="deck-container-information">Deck Date: Dec 24, 2025</div>
+<div class="deck-table-container"><table><tbody>
+<tr><td>4</td><td>Murktide Regent</td><td></td><td>80.00</td></tr>
+</tbody></table></div>
+</body></html>
+"""
+
+METAGAME_DECK_EXTRACTED_PAGE = {
+    mtggoldfish.PAGE_DECK_NAME_KEY: "Izzet MurktideSuggest a Better Name",
+    mtggoldfish.PAGE_DECK_DATE_KEY: "Deck Date: Dec 24, 2025",
+    mtggoldfish.PAGE_PAPER_ROWS_KEY: [["4", "Murktide Regent", "", "80.00"]],
+    mtggoldfish.PAGE_ONLINE_ROWS_KEY: None,
+}
+
+# A deck page whose table is still being loaded, which the browser waits for but the HTML engine can't parse
+DECK_PAGE_WITHOUT_TABLE_BODY_HTML = """<html><body>
+<h1 class="title">Mono Red Burn by SomePlayer</h1>
+<div class="deck-container-information">Deck Date: Jan 9, 2026</div>
+<div class="deck-table-container"><table><thead><tr><th>Qty</th></tr></thead></table></div>
+</body></html>
+"""
+
+LANDING_PAGE_HTML = """<html><body>
+<div class="archetype-tile">
+<div class="archetype-tile-description-wrapper"><div class="archetype-tile-description">
+<div class="deck-price-paper"><a href="/archetype/modern-burn#paper">$ 300</a></div>
+<div class="deck-price-online"><a href="/archetype/modern-burn#online">30 tix</a></div>
+</div></div>
+</div>
+<div class="archetype-tile featured">
+<div class="archetype-tile-description-wrapper"><div class="archetype-tile-description">
+<div class="deck-price-paper"><a href="https://www.mtggoldfish.com/deck/123456#paper">$ 90</a></div>
+<div class="deck-price-online"><a href="https://www.mtggoldfish.com/deck/123456#online">9 tix</a></div>
+</div></div>
+</div>
+<div class="archetype-tile"><div class="archetype-tile-image"></div></div>
+<div class="archetype-tile">
+<div class="archetype-tile-description-wrapper"><div class="archetype-tile-description">
+<div class="deck-price-paper"><a href="/archetype/modern-tron#paper">$ 500</a></div>
+</div></div>
+</div>
+</body></html>
+"""
+
+
+"""
+Stands in for a BrowserSessionPool, with a single browser session that returns the given extracted page for every
+deck page it loads, and keeps track of the URLs it was asked to load
+"""
+class StubBrowserPool(object):
+    def __init__(self, extracted_page):
+        self.driver = StubBrowserSession(extracted_page)
+        self.navigated_urls = []
+
+    def acquire_session(self):
+        return self.driver
+
+    def navigate(self, driver, url, ready_class_name=None):
+        self.navigated_urls.append(url)
+        return driver
+
+    def release_session(self, driver):
+        pass
+
+    def discard_session(self, driver):
+        pass
+
+
+class StubBrowserSession(object):
+    def __init__(self, extracted_page):
+        self.extracted_page = extracted_page
+
+    def execute_script(self, script):
+        return self.extracted_page
+
+
+class HtmlTreeBuilderTest(unittest.TestCase):
+    def test_unclosed_cells_and_rows_are_closed_like_a_browser_would(self):
+        document = mtggoldfish.parse_html_document("<table><tbody><tr><td>1<td>a<b>b</b><tr><td>2</td></span><td>c</tbody></table>")
+        rows = document.find_by_tag('tbody').find_all_by_tag('tr')
+        self.assertEqual([[cell.text_content() for cell in row.find_all_by_tag('td')] for row in rows], [["1", "ab"], ["2", "c"]])
+
+    def test_void_elements_and_character_references(self):
+        document = mtggoldfish.parse_html_document(b"<p class='info note'>A<br>B<img src='x.png'>&amp;C&#39;s\xc2\xa0D<br/>E</p><p>F</p>")
+        paragraph = document.find_by_class('note')
+        self.assertEqual(paragraph.text_content(), "AB&C's\xa0DE")
+        self.assertEqual([child.tag for child in paragraph.children if isinstance(child, mtggoldfish.HtmlElement)], ['br', 'img', 'br'])
+        self.assertEqual(paragraph.find_by_tag('img').get_attribute('src'), 'x.png')
+        self.assertEqual(len(document.find_all_by_tag('p')), 2)
+
+    def test_missing_elements_raise_value_error(self):
+        document = mtggoldfish.parse_html_document("<div class='title'>Deck</div>")
+        with self.assertRaises(ValueError):
+            document.find_by_class('deck-table-container')
+        with self.assertRaises(ValueError):
+            document.find_by_tag('tbody')
+
+
+class DeckPageExtractionTest(unittest.TestCase):
+    def test_budget_deck_page_is_extracted_like_the_browser_does(self):
+        self.assertEqual(mtggoldfish.extract_deck_page_from_html(BUDGET_DECK_PAGE_HTML), BUDGET_DECK_EXTRACTED_PAGE)
+        self.assertEqual(mtggoldfish.extract_deck_page_from_html(BUDGET_DECK_PAGE_HTML.encode('utf-8')), BUDGET_DECK_EXTRACTED_PAGE)
+
+    def test_metagame_deck_page_is_extracted_like_the_browser_does(self):
+        self.assertEqual(mtggoldfish.extract_deck_page_from_html(METAGAME_DECK_PAGE_HTML), METAGAME_DECK_EXTRACTED_PAGE)
+
+    def test_extracted_pages_build_the_same_decks(self):
+        deck_url = 'https://www.mtggoldfish.com/deck/123456#paper'
+        deck = mtggoldfish.build_deck_from_extracted_page(deck_url, mtggoldfish.extract_deck_page_from_html(BUDGET_DECK_PAGE_HTML), False)
+        self.assertEqual(deck.deck_name, b"Mono Red Burn")
+        self.assertEqual(deck.deck_date, datetime(2026, 1, 9))
+        self.assertEqual((deck.deck_paper_price, deck.deck_online_price, deck.deck_price), (1215.5, 2.5, 1215.5))
+        self.assertEqual(deck.get_card_entries(), [("Goblin Guide", 6, 2.5, 0.5), ("Monastery Swiftspear", 4, 300.125, 0.1),
+                                                   ("Fireblast & Friends", 1, 0.0, 0.1)])
+        self.assertEqual(describe_deck(deck), describe_deck(mtggoldfish.build_deck_from_extracted_page(deck_url, BUDGET_DECK_EXTRACTED_PAGE, False)))
+
+        deck = mtggoldfish.build_deck_from_extracted_page(deck_url, mtggoldfish.extract_deck_page_from_html(METAGAME_DECK_PAGE_HTML), True)
+        self.assertEqual(deck.deck_name, b"Izzet Murktide")
+        self.assertEqual(deck.deck_date, datetime(2025, 12, 24))
+        self.assertIsNone(deck.deck_online_price)
+        self.assertFalse(deck.has_price_type(True))
+
+    def test_pages_without_a_deck_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            mtggoldfish.extract_deck_page_from_html(DECK_PAGE_WITHOUT_TABLE_BODY_HTML)
+        with self.assertRaises(ValueError):
+            mtggoldfish.extract_deck_page_from_html(LANDING_PAGE_HTML)
+
+
+class LandingPageExtractionTest(unittest.TestCase):
+    def test_deck_urls_are_resolved_until_the_first_unexpected_tile(self):
+        self.assertEqual(mtggoldfish.extract_deck_urls_from_landing_page_html(
+            LANDING_PAGE_HTML, 'https://www.mtggoldfish.com/metagame/modern#paper'),
+            ['https://www.mtggoldfish.com/archetype/modern-burn#paper', 'https://www.mtggoldfish.com/deck/123456#paper'])
+
+    def test_online_landing_pages_use_the_online_deck_urls(self):
+        self.assertEqual(mtggoldfish.extract_deck_urls_from_landing_page_html(
+            LANDING_PAGE_HTML.encode('utf-8'), 'https://www.mtggoldfish.com/metagame/modern#online'),
+            ['https://www.mtggoldfish.com/archetype/modern-burn#online', 'https://www.mtggoldfish.com/deck/123456#online'])
+
+    def test_pages_without_deck_tiles_have_no_deck_urls(self):
+        self.assertEqual(mtggoldfish.extract_deck_urls_from_landing_page_html(
+            METAGAME_DECK_PAGE_HTML, 'https://www.mtggoldfish.com/metagame/modern#paper'), [])
+
+
+class DeckPageFetcherTest(unittest.TestCase):
+    def setUp(self):
+        self.temporary_dir_handle = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temporary_dir_handle.cleanup()
+
+    def save_page(self, file_name, page_html):
+        page_file_path = os.path.join(self.temporary_dir_handle.name, file_name)
+        with open(page_file_path, 'w', encoding='utf-8') as page_file:
+            page_file.write(page_html)
+        return pathlib.Path(page_file_path).as_uri()
+
+    def test_deck_pages_are_parsed_without_the_browser(self):
+        deck_url = self.save_page('deck.html', BUDGET_DECK_PAGE_HTML)
+        browser_pool = StubBrowserPool(None)
+        page_fetcher = mtggoldfish.DeckPageFetcher(mtggoldfish.PARSE_ENGINE_HTML, browser_pool)
+        deck = page_fetcher.fetch_deck(deck_url, False)
+        self.assertEqual(describe_deck(deck), describe_deck(mtggoldfish.build_deck_from_extracted_page(deck_url, BUDGET_DECK_EXTRACTED_PAGE, False)))
+        self.assertEqual(browser_pool.navigated_urls, [])
+        self.assertEqual((page_fetcher.num_pages_parsed, page_fetcher.num_selenium_fallbacks), (1, 0))
+
+    def test_pages_the_html_engine_cant_parse_fall_back_to_the_browser(self):
+        deck_url = self.save_page('deck.html', DECK_PAGE_WITHOUT_TABLE_BODY_HTML)
+        browser_pool = StubBrowserPool(BUDGET_DECK_EXTRACTED_PAGE)
+        page_fetcher = mtggoldfish.DeckPageFetcher(mtggoldfish.PARSE_ENGINE_HTML, browser_pool)
+        deck = page_fetcher.fetch_deck(deck_url, False)
+        self.assertEqual(deck.deck_name, b"Mono Red Burn")
+        self.assertEqual(browser_pool.navigated_urls, [deck_url])
+        self.assertEqual((page_fetcher.num_pages_parsed, page_fetcher.num_selenium_fallbacks), (0, 1))
+
+    def test_landing_pages_are_parsed_without_the_browser(self):
+        landing_page_url = self.save_page('landing.html', LANDING_PAGE_HTML)
+        browser_pool = StubBrowserPool(None)
+        page_fetcher = mtggoldfish.DeckPageFetcher(mtggoldfish.PARSE_ENGINE_HTML, browser_pool)
+        # Relative deck links are resolved against wherever the page was loaded from
+        self.assertEqual(page_fetcher.load_landing_page_deck_urls(landing_page_url),
+                         ['file:///archetype/modern-burn#paper', 'https://www.mtggoldfish.com/deck/123456#paper'])
+        self.assertEqual(browser_pool.navigated_urls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+Tests of the cache of the deck URLs scraped from each category landing page: the cached lists expiring after --url-ttl
+hours, -u and --url-ttl 0 loading the landing pages again, and --compact removing the cache files that can't be read.
+
+Run from the root of the repository:
+    python -m pytest tests
+"""
+import contextlib
+from datetime import datetime, timedelta
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import mtggoldfish
+
+
+BUDGET_LANDING_PAGE_URL = 'https://www.mtggoldfish.com/decks/budget/modern#paper'
+
+
+"""
+Stands in for a DeckPageFetcher, returning the deck URLs currently listed on each landing page and keeping track of the
+landing pages it was asked to load
+"""
+class StubLandingPageFetcher(object):
+    def __init__(self, deck_url_lists):
+        self.deck_url_lists = deck_url_lists
+        self.loaded_landing_page_urls = []
+
+    def fetch_landing_page_deck_urls(self, category_landing_page_url):
+        self.loaded_landing_page_urls.append(category_landing_page_url)
+        return list(self.deck_url_lists.get(category_landing_page_url, []))
+
+
+class LandingPageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temporary_dir_handle = tempfile.TemporaryDirectory()
+        self.previous_landing_page_cache_dir = mtggoldfish.landing_page_cache_dir
+        mtggoldfish.landing_page_cache_dir = os.path.join(self.temporary_dir_handle.name, 'landing_page_cache')
+        self.page_fetcher = StubLandingPageFetcher({
+            BUDGET_LANDING_PAGE_URL: ['https://www.mtggoldfish.com/deck/100#paper', 'https://www.mtggoldfish.com/deck/200#paper']})
+
+    def tearDown(self):
+        mtggoldfish.landing_page_cache_dir = self.previous_landing_page_cache_dir
+        self.temporary_dir_handle.cleanup()
+
+    def parse_deck_urls(self, category_landing_page_url, update_cache=False, url_cache_ttl_hours=24):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return mtggoldfish.parse_deck_urls_from_category_landing_page(
+                category_landing_page_url, self.page_fetcher, update_cache, url_cache_ttl_hours)
+
+    def cache_deck_urls(self, category_landing_page_url, fetched_date, deck_url_list):
+        mtggoldfish.write_pickle_file_atomically(
+            mtggoldfish.get_landing_page_cache_file_path(category_landing_page_url), (fetched_date, deck_url_list))
+
+    def test_deck_urls_are_reused_until_they_expire(self):
+        deck_url_list = self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)
+        self.assertEqual(deck_url_list, ['https://www.mtggoldfish.com/deck/100#paper', 'https://www.mtggoldfish.com/deck/200#paper'])
+        self.assertEqual(os.listdir(mtggoldfish.landing_page_cache_dir), ['www_mtggoldfish_com_decks_budget_modern_paper'])
+
+        # The landing page now lists another deck, which isn't seen until the cached list expires
+        self.page_fetcher.deck_url_lists[BUDGET_LANDING_PAGE_URL].append('https://www.mtggoldfish.com/deck/300#paper')
+        self.assertEqual(self.parse_deck_urls(BUDGET_LANDING_PAGE_URL), deck_url_list)
+        self.assertEqual(self.page_fetcher.loaded_landing_page_urls, [BUDGET_LANDING_PAGE_URL])
+
+        self.cache_deck_urls(BUDGET_LANDING_PAGE_URL, datetime.now() - timedelta(hours=23, minutes=59), deck_url_list)
+        self.assertEqual(self.parse_deck_urls(BUDGET_LANDING_PAGE_URL), deck_url_list)
+        self.cache_deck_urls(BUDGET_LANDING_PAGE_URL, datetime.now() - timedelta(hours=24), deck_url_list)
+        self.assertEqual(len(self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)), 3)
+        self.assertEqual(len(self.page_fetcher.loaded_landing_page_urls), 2)
+
+        # The new list was cached in turn, so even a TTL of half an hour uses it
+        self.assertEqual(len(self.parse_deck_urls(BUDGET_LANDING_PAGE_URL, url_cache_ttl_hours=0.5)), 3)
+        self.assertEqual(len(self.page_fetcher.loaded_landing_page_urls), 2)
+
+    def test_update_cache_loads_the_landing_page_again(self):
+        self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)
+        self.page_fetcher.deck_url_lists[BUDGET_LANDING_PAGE_URL] = ['https://www.mtggoldfish.com/deck/300#paper']
+        self.assertEqual(self.parse_deck_urls(BUDGET_LANDING_PAGE_URL, update_cache=True), ['https://www.mtggoldfish.com/deck/300#paper'])
+        self.assertEqual(len(self.page_fetcher.loaded_landing_page_urls), 2)
+
+        # The cache is updated with what was loaded
+        self.assertEqual(self.parse_deck_urls(BUDGET_LANDING_PAGE_URL), ['https://www.mtggoldfish.com/deck/300#paper'])
+        self.assertEqual(len(self.page_fetcher.loaded_landing_page_urls), 2)
+
+    def test_a_ttl_of_zero_disables_the_cache(self):
+        self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)
+        self.parse_deck_urls(BUDGET_LANDING_PAGE_URL, url_cache_ttl_hours=0)
+        self.parse_deck_urls(BUDGET_LANDING_PAGE_URL, url_cache_ttl_hours=0)
+        self.assertEqual(len(self.page_fetcher.loaded_landing_page_urls), 3)
+
+    def test_paper_and_online_landing_pages_are_cached_separately(self):
+        online_landing_page_url = BUDGET_LANDING_PAGE_URL.replace('#paper', '#online')
+        self.page_fetcher.deck_url_lists[online_landing_page_url] = ['https://www.mtggoldfish.com/deck/100#online']
+        self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)
+        self.assertEqual(self.parse_deck_urls(online_landing_page_url), ['https://www.mtggoldfish.com/deck/100#online'])
+        self.assertEqual(self.page_fetcher.loaded_landing_page_urls, [BUDGET_LANDING_PAGE_URL, online_landing_page_url])
+
+    def test_landing_pages_without_deck_urls_are_not_cached(self):
+        metagame_landing_page_url = 'https://www.mtggoldfish.com/metagame/modern#paper'
+        self.assertEqual(self.parse_deck_urls(metagame_landing_page_url), [])
+        self.assertEqual(self.parse_deck_urls(metagame_landing_page_url), [])
+        self.assertEqual(len(self.page_fetcher.loaded_landing_page_urls), 2)
+        self.assertFalse(os.path.exists(mtggoldfish.landing_page_cache_dir))
+
+    def test_unreadable_cache_files_are_treated_as_missing(self):
+        self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)
+        with open(mtggoldfish.get_landing_page_cache_file_path(BUDGET_LANDING_PAGE_URL), 'wb') as cache_file:
+            cache_file.write(b'\x80\x04')
+        self.assertIsNone(mtggoldfish.load_landing_page_urls_from_cache(BUDGET_LANDING_PAGE_URL, 24))
+        self.assertEqual(len(self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)), 2)
+        self.assertEqual(len(self.page_fetcher.loaded_landing_page_urls), 2)
+
+    def test_compact_removes_unreadable_and_temporary_files(self):
+        self.assertEqual(mtggoldfish.compact_landing_page_cache(), 0)
+
+        self.parse_deck_urls(BUDGET_LANDING_PAGE_URL)
+        cache_dir = mtggoldfish.landing_page_cache_dir
+        with open(os.path.join(cache_dir, 'www_mtggoldfish_com_metagame_modern_paper'), 'wb') as cache_file:
+            cache_file.write(b'truncated')
+        with open(os.path.join(cache_dir, 'tmpa1b2c3.tmp'), 'wb') as cache_file:
+            cache_file.write(b'')
+        self.assertEqual(mtggoldfish.compact_landing_page_cache(), 2)
+        self.assertEqual(os.listdir(cache_dir), ['www_mtggoldfish_com_decks_budget_modern_paper'])
+        self.assertEqual(len(mtggoldfish.load_landing_page_urls_from_cache(BUDGET_LANDING_PAGE_URL, 24)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()